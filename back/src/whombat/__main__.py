@@ -1,11 +1,16 @@
 """Main entry point for whombat.
 
-This module is used to run the app using uvicorn.
+This module is used to run the app using uvicorn, and to run job workers
+as separate processes.
 """
 
+import asyncio
+import logging.config
+
 import uvicorn
 
-from whombat.system import get_logging_config, get_settings
+from whombat.system import get_logging_config, get_settings, init_database
+from whombat.system.workers import shutdown_worker_pool, start_worker_pool
 
 
 def main():
@@ -21,5 +26,30 @@ def main():
     )
 
 
+def worker():
+    """Run a job worker until interrupted."""
+    # NOTE: Import the job worker here, as importing the API at module
+    # level would slow down the start of the app.
+    from whombat.api.jobs import JobWorker
+
+    settings = get_settings()
+    logging.config.dictConfig(get_logging_config(settings))
+
+    async def run():
+        await init_database(settings)
+        start_worker_pool(settings)
+        job_worker = JobWorker(settings)
+        try:
+            await job_worker.run()
+        finally:
+            await job_worker.close()
+            shutdown_worker_pool()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == "__main__":
     main()
@@ -10,7 +10,9 @@ from whombat.api.clips import clips
 from whombat.api.datasets import datasets
 from whombat.api.evaluation_sets import evaluation_sets
 from whombat.api.evaluations import evaluations
+from whombat.api.feature_matrices import get_feature_matrix
 from whombat.api.features import features, find_feature, find_feature_value
+from whombat.api.jobs import jobs
 from whombat.api.model_runs import model_runs
 from whombat.api.notes import notes
 from whombat.api.recordings import recordings
@@ -23,6 +25,7 @@ from whombat.api.spectrograms import compute_spectrogram
 from whombat.api.tags import find_tag, find_tag_value, tags
 from whombat.api.user_runs import user_runs
 from whombat.api.users import users
+from whombat.api.viewports import get_viewport
 
 __all__ = [
     "annotation_projects",
@@ -41,6 +44,9 @@ __all__ = [
     "find_feature_value",
     "find_tag",
     "find_tag_value",
+    "get_feature_matrix",
+    "get_viewport",
+    "jobs",
     "load_audio",
     "load_clip_bytes",
     "model_runs",
@@ -2,10 +2,11 @@
 
 import os
 from pathlib import Path
-from typing import Sequence
+from typing import AsyncGenerator, Sequence
 from uuid import UUID
 
 from soundevent import data
+from soundevent.io.aoef.annotation_project import AnnotationProjectAdapter
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +15,9 @@ from whombat.api import common
 from whombat.api.annotation_tasks import annotation_tasks
 from whombat.api.clip_annotations import clip_annotations
 from whombat.api.common import BaseAPI
+from whombat.api.io import arrow
+from whombat.api.io.aoef.common import BATCH_SIZE
+from whombat.api.io.aoef.writer import AOEFWriter, clear_adapter
 from whombat.api.tags import tags
 from whombat.filters.annotation_tasks import (
     AnnotationProjectFilter as AnnotationTaskAnnotationProjectFilter,
@@ -335,29 +339,11 @@ class AnnotationProjectAPI(
             filters=[AnnotationTaskAnnotationProjectFilter(eq=obj.uuid)],
         )
 
-        stmt = (
-            select(models.Clip, models.AnnotationTask.id)
-            .join(
-                models.AnnotationTask,
-                models.Clip.id == models.AnnotationTask.clip_id,
-            )
-            .where(
-                models.AnnotationTask.id.in_({t.id for t in tasks}),
-            )
+        se_tasks = await annotation_tasks.to_soundevent_many(
+            session,
+            tasks,
+            audio_dir=audio_dir,
         )
-        results = await session.execute(stmt)
-        mapping = {r[1]: r[0] for r in results.unique().all()}
-
-        se_tasks = [
-            await annotation_tasks.to_soundevent(
-                session,
-                task,
-                audio_dir=audio_dir,
-                clip=mapping[task.id],
-            )
-            for task in tasks
-            if task.id in mapping
-        ]
 
         annotations, _ = await self.get_annotations(session, obj, limit=-1)
         se_clip_annotations = [
@@ -378,5 +364,156 @@ class AnnotationProjectAPI(
             tasks=se_tasks,
         )
 
+    async def stream_aoef(
+        self,
+        session: AsyncSession,
+        obj: schemas.AnnotationProject,
+        audio_dir: Path | None = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncGenerator[str, None]:
+        """Export an annotation project in AOEF format, in chunks of JSON text.
+
+        Clip annotations and tasks are read in batches of `batch_size` and
+        written out as soon as each batch is converted. The recordings,
+        clips and sound events they reference are spooled to disk and
+        written at the end, so memory use does not grow with the size of
+        the project.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            Whombat annotation project.
+        audio_dir
+            Directory against which recording paths are made relative.
+        batch_size
+            The number of clip annotations or tasks to read at once.
+
+        Yields
+        ------
+        chunk : str
+            The next chunk of the AOEF document.
+        """
+        adapter = AnnotationProjectAdapter(audio_dir=audio_dir)
+        writer = AOEFWriter()
+        writer.spool("recordings", adapter.recording_adapter)
+        writer.spool("clips", adapter.clip_adapter)
+        writer.spool("sound_events", adapter.sound_event_adapter)
+        writer.spool(
+            "sound_event_annotations",
+            adapter.sound_event_annotations_adapter,
+        )
+
+        try:
+            yield writer.start(
+                {
+                    "uuid": obj.uuid,
+                    "collection_type": "annotation_project",
+                    "created_on": obj.created_on,
+                    "name": obj.name or "Annotation Project",
+                    "description": obj.description,
+                    "instructions": obj.annotation_instructions,
+                }
+            )
+
+            yield writer.begin("clip_annotations")
+            async for batch in common.iter_objects_batched(
+                session,
+                models.ClipAnnotation,
+                filters=[AnnotationProjectFilter(eq=obj.uuid)],
+                batch_size=batch_size,
+            ):
+                yield writer.items(
+                    [
+                        adapter.clip_annotation_adapter.to_aoef(
+                            await clip_annotations.to_soundevent(
+                                session,
+                                schemas.ClipAnnotation.model_validate(ca),
+                                audio_dir=audio_dir,
+                            )
+                        )
+                        for ca in batch
+                    ]
+                )
+                writer.collect()
+                clear_adapter(adapter.clip_annotation_adapter)
+            yield writer.end()
+
+            yield writer.begin("tasks")
+            async for batch in common.iter_objects_batched(
+                session,
+                models.AnnotationTask,
+                filters=[AnnotationTaskAnnotationProjectFilter(eq=obj.uuid)],
+                batch_size=batch_size,
+            ):
+                se_tasks = await annotation_tasks.to_soundevent_many(
+                    session,
+                    [schemas.AnnotationTask.model_validate(t) for t in batch],
+                    audio_dir=audio_dir,
+                )
+                yield writer.items(
+                    [
+                        adapter.annotation_task_adapter.to_aoef(task)
+                        for task in se_tasks
+                    ]
+                )
+                writer.collect()
+                clear_adapter(adapter.annotation_task_adapter)
+            yield writer.end()
+
+            project_tags = [
+                adapter.tag_adapter.to_aoef(tags.to_soundevent(tag)).id
+                for tag in obj.tags
+            ]
+            for chunk in writer.finish(
+                {
+                    "project_tags": project_tags or None,
+                    "tags": adapter.tag_adapter.values() or [],
+                    "users": adapter.user_adapter.values() or [],
+                }
+            ):
+                yield chunk
+        finally:
+            writer.close()
+
+    def stream_table(
+        self,
+        session: AsyncSession,
+        obj: schemas.AnnotationProject,
+        format: arrow.TableFormat = "parquet",
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """Export the sound event annotations of a project as a table.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The annotation project to export.
+        format
+            Export a Parquet file or an Arrow IPC stream.
+        batch_size
+            The number of annotations per record batch.
+
+        Returns
+        -------
+        AsyncGenerator[bytes, None]
+            The chunks of the encoded table.
+        """
+        return arrow.stream_sound_event_annotations(
+            session,
+            filters=[
+                models.SoundEventAnnotation.clip_annotation_id.in_(
+                    select(models.AnnotationTask.clip_annotation_id).where(
+                        models.AnnotationTask.annotation_project_id == obj.id
+                    )
+                )
+            ],
+            format=format,
+            batch_size=batch_size,
+        )
+
 
 annotation_projects = AnnotationProjectAPI()
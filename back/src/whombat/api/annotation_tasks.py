@@ -1,6 +1,7 @@
 """Python API for interacting with Tasks."""
 
 from pathlib import Path
+from typing import Sequence
 from uuid import UUID
 
 from soundevent import data
@@ -344,6 +345,55 @@ class AnnotationTaskAPI(
             created_on=task.created_on,
         )
 
+    async def to_soundevent_many(
+        self,
+        session: AsyncSession,
+        tasks: Sequence[schemas.AnnotationTask],
+        audio_dir: Path | None = None,
+    ) -> list[data.AnnotationTask]:
+        """Convert many tasks to `soundevent` tasks.
+
+        The clips of all tasks are fetched in a single query, so the
+        number of queries does not grow with the number of tasks.
+
+        Parameters
+        ----------
+        tasks
+            The tasks to convert.
+
+        Returns
+        -------
+        list[data.AnnotationTask]
+            The converted tasks, in the same order. Tasks whose clip
+            no longer exists are skipped.
+        """
+        if not tasks:
+            return []
+
+        stmt = (
+            select(models.Clip, models.AnnotationTask.id)
+            .join(
+                models.AnnotationTask,
+                models.Clip.id == models.AnnotationTask.clip_id,
+            )
+            .where(models.AnnotationTask.id.in_({t.id for t in tasks}))
+        )
+        results = await session.execute(stmt)
+        mapping = {
+            task_id: schemas.Clip.model_validate(clip)
+            for clip, task_id in results.unique().all()
+        }
+        return [
+            await self.to_soundevent(
+                session,
+                task,
+                clip=mapping[task.id],
+                audio_dir=audio_dir,
+            )
+            for task in tasks
+            if task.id in mapping
+        ]
+
     async def _update_from_soundevent(
         self,
         session: AsyncSession,
@@ -401,7 +401,9 @@ class ClipAnnotationAPI(
         data.ClipAnnotation
             The converted object in the soundevent format.
         """
-        se_clip = clips.to_soundevent(clip_annotation.clip)
+        se_clip = clips.to_soundevent(
+            clip_annotation.clip, audio_dir=audio_dir
+        )
         se_sound_events = [
             await sound_event_annotations.to_soundevent(
                 session,
@@ -5,7 +5,7 @@ from typing import Sequence
 from uuid import UUID
 
 from soundevent import data
-from sqlalchemy import and_, tuple_
+from sqlalchemy import and_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import ColumnElement
 
@@ -289,6 +289,61 @@ class ClipEvaluationAPI(
             score=obj.score,
         )
 
+    async def to_soundevent_many(
+        self,
+        session: AsyncSession,
+        objs: Sequence[schemas.ClipEvaluation],
+        audio_dir: Path | None = None,
+    ) -> list[data.ClipEvaluation]:
+        """Convert many clip evaluations to soundevent format.
+
+        The sound event evaluations of all clip evaluations are fetched in
+        a single query, so the number of queries does not grow with the
+        number of clip evaluations.
+
+        Parameters
+        ----------
+        session
+            An open database session.
+        objs
+            The clip evaluations in whombat format.
+
+        Returns
+        -------
+        list[data.ClipEvaluation]
+            The clip evaluations in soundevent format, in the same order.
+        """
+        if not objs:
+            return []
+
+        stmt = (
+            select(models.SoundEventEvaluation)
+            .where(
+                models.SoundEventEvaluation.clip_evaluation_id.in_(
+                    {obj.id for obj in objs}
+                )
+            )
+            .order_by(models.SoundEventEvaluation.id)
+        )
+        results = await session.scalars(stmt)
+        evaluations: dict[int, list[schemas.SoundEventEvaluation]] = {
+            obj.id: [] for obj in objs
+        }
+        for se_eval in results.unique().all():
+            evaluations[se_eval.clip_evaluation_id].append(
+                schemas.SoundEventEvaluation.model_validate(se_eval)
+            )
+
+        return [
+            await self.to_soundevent(
+                session,
+                obj,
+                audio_dir=audio_dir,
+                evaluations=evaluations[obj.id],
+            )
+            for obj in objs
+        ]
+
     async def get_sound_event_evaluations(
         self,
         session: AsyncSession,
@@ -226,7 +226,9 @@ class ClipPredictionAPI(
         ]
         return data.ClipPrediction(
             uuid=clip_prediction.uuid,
-            clip=clips.to_soundevent(clip_prediction.clip),
+            clip=clips.to_soundevent(
+                clip_prediction.clip, audio_dir=audio_dir
+            ),
             tags=predicted_tags,
             sound_events=sound_events,
         )
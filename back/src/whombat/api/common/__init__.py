@@ -15,6 +15,8 @@ from whombat.api.common.utils import (
     get_objects_from_query,
     get_or_create_object,
     insert_batched,
+    iter_objects_batched,
+    iter_rows_batched,
     remove_feature_from_object,
     remove_note_from_object,
     remove_tag_from_object,
@@ -38,6 +40,8 @@ __all__ = [
     "get_objects_from_query",
     "get_or_create_object",
     "insert_batched",
+    "iter_objects_batched",
+    "iter_rows_batched",
     "remove_feature_from_object",
     "remove_note_from_object",
     "remove_tag_from_object",
@@ -2,15 +2,34 @@
 
 import re
 from dataclasses import MISSING, fields
-from typing import Any, Callable, Generator, Iterable, Sequence, TypeVar
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterable,
+    Sequence,
+    TypeVar,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import Result, Select, func, insert, select
+from sqlalchemy import (
+    Column,
+    Result,
+    Row,
+    Select,
+    Table,
+    UniqueConstraint,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import InstrumentedAttribute
-from sqlalchemy.sql import ColumnExpressionArgument
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
+from sqlalchemy.sql import ColumnExpressionArgument, visitors
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.expression import ColumnElement
 
@@ -50,6 +69,8 @@ __all__ = [
     "get_objects",
     "get_objects_from_query",
     "get_or_create_object",
+    "iter_objects_batched",
+    "iter_rows_batched",
     "remove_feature_from_object",
     "remove_note_from_object",
     "remove_tag_from_object",
@@ -65,6 +86,12 @@ F = TypeVar("F", bound=models.Base)
 
 pattern = re.compile(r"(?<!^)(?=[A-Z])")
 
+_RETURNING_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+"""Dialect specific inserts that support ON CONFLICT and RETURNING."""
+
 
 async def get_count(
     session: AsyncSession,
@@ -368,6 +395,113 @@ async def get_objects(
     return result.unique().scalars().all(), count
 
 
+async def iter_objects_batched(
+    session: AsyncSession,
+    model: type[A],
+    *,
+    filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+    options: Sequence[ExecutableOption] | None = None,
+    batch_size: int = 1000,
+) -> AsyncGenerator[Sequence[A], None]:
+    """Iterate over all objects in batches.
+
+    Objects are returned in order of their database id, see
+    `iter_rows_batched`.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    model
+        The model to query. It must have an integer ``id`` column.
+    filters
+        A list of filters to apply, by default None
+    options
+        Loader options to apply to the query, by default None
+    batch_size
+        The maximum number of objects in a batch.
+
+    Yields
+    ------
+    list[A]
+        The next batch of objects.
+    """
+    id_column = model.id  # type: ignore
+    query = select(model, id_column)
+    if options is not None:
+        query = query.options(*options)
+
+    async for rows in iter_rows_batched(
+        session,
+        query,
+        id_column,
+        filters=filters,
+        batch_size=batch_size,
+    ):
+        yield [row[0] for row in rows]
+
+
+async def iter_rows_batched(
+    session: AsyncSession,
+    query: Select,
+    id_column: InstrumentedAttribute | ColumnElement,
+    *,
+    filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+    batch_size: int = 1000,
+) -> AsyncGenerator[Sequence[Row], None]:
+    """Iterate over the rows of a query in batches.
+
+    Rows are returned in order of an integer id column. Each batch is
+    selected by the ids that follow the last row of the previous batch,
+    instead of with an offset, so that later batches are as fast to fetch
+    as the first one.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    query
+        The query of the rows. It must select `id_column`, and the id must
+        be unique among its rows.
+    id_column
+        The column by which the rows are ordered.
+    filters
+        A list of filters to apply, by default None
+    batch_size
+        The maximum number of rows in a batch.
+
+    Yields
+    ------
+    list[Row]
+        The next batch of rows.
+    """
+    for filter_ in filters or []:
+        if isinstance(filter_, Filter):
+            query = filter_.filter(query)
+        else:
+            query = query.where(filter_)
+
+    last_id = None
+    while True:
+        stmt = query.order_by(None).order_by(id_column).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(id_column > last_id)
+
+        # NOTE: Joined eager loads of collections repeat the rows of each
+        # object, so rows are deduplicated.
+        result = await session.execute(stmt)
+        batch = result.unique().all()
+        if not batch:
+            return
+
+        yield batch
+
+        if len(batch) < batch_size:
+            return
+
+        last_id = batch[-1]._mapping[id_column]
+
+
 async def create_object(
     session: AsyncSession,
     model: type[A],
@@ -489,6 +623,15 @@ async def create_objects_without_duplicates(
     ValueError
         If `avoid_duplicates` is True and `key` or `key_column` are
         not provided.
+
+    Notes
+    -----
+    On SQLite and PostgreSQL all missing objects are inserted with a single
+    executemany ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` statement,
+    which returns the created objects directly. The conflict clause is only
+    added when the key columns have a unique constraint. Other databases
+    insert in batches of `rows_batch` rows and query the created objects
+    afterwards.
     """
     # Remove duplicates from data
     data = remove_duplicates(list(data), key=key)
@@ -519,17 +662,43 @@ async def create_objects_without_duplicates(
     ]
     keys = [key(obj) for obj in missing]
 
-    for batch in batched(values, rows_batch):
-        stmt = insert(model).values(batch)
-        await session.execute(stmt)
-        await session.flush()
+    dialect = session.get_bind().dialect.name
+    if dialect not in _RETURNING_INSERTS:
+        for batch in batched(values, rows_batch):
+            stmt = insert(model).values(batch)
+            await session.execute(stmt)
+            await session.flush()
 
-    return await get_objects_by_keys_batched(
-        session,
-        model,
-        key_column,
-        all_keys if return_all else keys,
+        return await get_objects_by_keys_batched(
+            session,
+            model,
+            key_column,
+            all_keys if return_all else keys,
+        )
+
+    # NOTE: A single executemany with RETURNING creates the objects and
+    # returns them, so there is no need to query them again afterwards.
+    # Objects created concurrently since the query for existing objects
+    # are skipped instead of failing the whole insert.
+    stmt = _RETURNING_INSERTS[dialect](model)
+    conflict_target = _get_conflict_target(model, key_column)
+    if conflict_target is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_target)
+
+    stmt = stmt.returning(model).options(
+        *[
+            selectinload(relationship.class_attribute)
+            for relationship in inspect(model).relationships
+            if relationship.lazy in ("joined", "selectin")
+        ]
     )
+    result = await session.scalars(stmt, values)
+    created = list(result.unique().all())
+
+    if return_all:
+        return [*existing, *created]
+
+    return created
 
 
 async def get_objects_by_keys_batched(
@@ -1118,6 +1287,46 @@ async def remove_feature_from_object(
     return obj
 
 
+def _get_conflict_target(
+    model: type[A],
+    key_column: ColumnElement | InstrumentedAttribute,
+) -> list[str] | None:
+    """Get the unique columns that identify an object by its key.
+
+    Returns None if the key columns are not covered by a unique constraint
+    of the model, as they can not be used as the target of an ON CONFLICT
+    clause.
+    """
+    table = model.__table__
+    if not isinstance(table, Table):
+        return None
+
+    columns = frozenset(
+        element.name
+        for element in visitors.iterate(key_column.expression)
+        if isinstance(element, Column) and element.table is table
+    )
+
+    unique_column_sets = [
+        frozenset(column.name for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+    unique_column_sets.extend(
+        frozenset(column.name for column in index.columns)
+        for index in table.indexes
+        if index.unique
+    )
+    unique_column_sets.append(
+        frozenset(column.name for column in table.primary_key.columns)
+    )
+
+    if columns not in unique_column_sets:
+        return None
+
+    return sorted(columns)
+
+
 def _get_defaults(model: type[A]):
     """Get the default values from a model.
 
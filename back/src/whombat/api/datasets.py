@@ -1,23 +1,30 @@
 """API functions for interacting with datasets."""
 
+import asyncio
 import datetime
+import logging
 import uuid
 import warnings
+from itertools import batched
 from pathlib import Path
-from typing import BinaryIO, Sequence
+from typing import AsyncGenerator, Awaitable, BinaryIO, Callable, Sequence
 
 import pandas as pd
 from soundevent import data
 from soundevent.io.aoef import AOEFObject, to_aeof
-from sqlalchemy import select, tuple_
+from soundevent.io.aoef.dataset import DatasetAdapter
+from sqlalchemy import delete, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.common import BaseAPI
-from whombat.api.io import aoef
+from whombat.api.io import aoef, arrow
+from whombat.api.io.aoef.common import BATCH_SIZE
+from whombat.api.io.aoef.writer import AOEFWriter, clear_adapter
 from whombat.api.recordings import recordings
 from whombat.core import files
+from whombat.core.progress import ProgressTracker
 from whombat.filters.base import Filter
 from whombat.filters.recordings import DatasetFilter
 from whombat.system import get_settings
@@ -27,6 +34,8 @@ __all__ = [
     "datasets",
 ]
 
+logger = logging.getLogger(__name__)
+
 
 class DatasetAPI(
     BaseAPI[
@@ -400,6 +409,7 @@ class DatasetAPI(
         session: AsyncSession,
         obj: schemas.Dataset,
         audio_dir: Path | None = None,
+        full_scan: bool = False,
     ) -> list[schemas.DatasetFile]:
         """Compute the state of the dataset recordings.
 
@@ -423,20 +433,69 @@ class DatasetAPI(
         audio_dir
             The root audio directory, by default None. If None, the root audio
             directory from the settings will be used.
+        full_scan
+            Whether to list every directory, ignoring the scan index of the
+            dataset. By default False.
 
         Returns
         -------
         files : list[schemas.DatasetFile]
+
+        See Also
+        --------
+        iter_state : Stream the state of the dataset files.
+        """
+        return [
+            file
+            async for file in self.iter_state(
+                session,
+                obj,
+                audio_dir=audio_dir,
+                full_scan=full_scan,
+            )
+        ]
+
+    async def iter_state(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+        audio_dir: Path | None = None,
+        full_scan: bool = False,
+        max_workers: int | None = None,
+    ) -> AsyncGenerator[schemas.DatasetFile, None]:
+        """Stream the state of the dataset recordings.
+
+        Registered and unregistered files are yielded as soon as the
+        directory that contains them has been scanned. Missing files are
+        yielded once the scan is complete.
+
+        The filesystem state of the dataset directory is stored in the
+        scan index of the dataset, so that subsequent scans only list
+        the directories that have changed. The index is updated once all
+        files have been yielded.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The dataset to get the state of.
+        audio_dir
+            The root audio directory, by default None. If None, the root audio
+            directory from the settings will be used.
+        full_scan
+            Whether to list every directory, ignoring the scan index of the
+            dataset. By default False.
+        max_workers
+            The number of threads used to list directories concurrently.
+
+        Yields
+        ------
+        file : schemas.DatasetFile
         """
         if audio_dir is None:
             audio_dir = get_settings().audio_dir
 
-        # Get the files in the dataset directory.
-        file_list = files.get_audio_files_in_folder(
-            audio_dir / obj.audio_dir,
-            relative=True,
-        )
-
         # NOTE: Better to use this query than reusing the get_recordings
         # function because we don't need to retrieve all information about the
         # recordings.
@@ -444,38 +503,106 @@ class DatasetAPI(
             models.DatasetRecording.dataset_id == obj.id
         )
         result = await session.execute(query)
-        db_files = [Path(path) for path in result.scalars().all()]
-
-        existing_files = set(file_list) & set(db_files)
-        missing_files = set(db_files) - set(file_list)
-        unregistered_files = set(file_list) - set(db_files)
-
-        ret = []
-        for path in existing_files:
-            ret.append(
-                schemas.DatasetFile(
-                    path=path,
-                    state=schemas.FileState.REGISTERED,
-                )
+        db_files = {Path(path) for path in result.scalars().all()}
+
+        index = await self._get_scan_index(session, obj)
+        scan = files.scan_folder(
+            audio_dir / obj.audio_dir,
+            index=None if full_scan else index,
+            max_workers=max_workers,
+        )
+
+        entries: dict[Path, files.FileEntry] = {}
+        try:
+            # NOTE: Directory listing blocks, so the scan is advanced in
+            # a worker thread to keep the event loop responsive.
+            while batch := await asyncio.to_thread(next, scan, None):
+                for entry in batch:
+                    entries[entry.path] = entry
+
+                    if entry.is_dir:
+                        continue
+
+                    yield schemas.DatasetFile(
+                        path=entry.path,
+                        state=(
+                            schemas.FileState.REGISTERED
+                            if entry.path in db_files
+                            else schemas.FileState.UNREGISTERED
+                        ),
+                    )
+        finally:
+            await asyncio.to_thread(scan.close)
+
+        for path in db_files - entries.keys():
+            yield schemas.DatasetFile(
+                path=path,
+                state=schemas.FileState.MISSING,
             )
 
-        for path in missing_files:
-            ret.append(
-                schemas.DatasetFile(
-                    path=path,
-                    state=schemas.FileState.MISSING,
-                )
+        await self._update_scan_index(session, obj, index, entries)
+
+    async def _get_scan_index(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+    ) -> dict[Path, files.FileEntry]:
+        query = select(
+            models.DatasetScanEntry.path,
+            models.DatasetScanEntry.size,
+            models.DatasetScanEntry.mtime,
+            models.DatasetScanEntry.inode,
+            models.DatasetScanEntry.is_dir,
+        ).where(models.DatasetScanEntry.dataset_id == obj.id)
+        result = await session.execute(query)
+        return {
+            path: files.FileEntry(
+                path=path,
+                size=size,
+                mtime=mtime,
+                inode=inode,
+                is_dir=is_dir,
             )
+            for path, size, mtime, inode, is_dir in result.all()
+        }
 
-        for path in unregistered_files:
-            ret.append(
-                schemas.DatasetFile(
-                    path=path,
-                    state=schemas.FileState.UNREGISTERED,
+    async def _update_scan_index(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+        old: dict[Path, files.FileEntry],
+        new: dict[Path, files.FileEntry],
+        batch_size: int = 200,
+    ) -> None:
+        changed = [
+            entry for path, entry in new.items() if old.get(path) != entry
+        ]
+        stale = [path for path in old if new.get(path) != old[path]]
+
+        for batch in batched(stale, batch_size):
+            await session.execute(
+                delete(models.DatasetScanEntry).where(
+                    models.DatasetScanEntry.dataset_id == obj.id,
+                    models.DatasetScanEntry.path.in_(batch),
                 )
             )
 
-        return ret
+        for batch in batched(changed, batch_size):
+            await common.create_objects(
+                session,
+                models.DatasetScanEntry,
+                [
+                    dict(
+                        dataset_id=obj.id,
+                        path=entry.path,
+                        size=entry.size,
+                        mtime=entry.mtime,
+                        inode=entry.inode,
+                        is_dir=entry.is_dir,
+                    )
+                    for entry in batch
+                ],
+            )
 
     async def from_soundevent(
         self,
@@ -575,13 +702,15 @@ class DatasetAPI(
         dataset_dir: Path,
         description: str | None = None,
         audio_dir: Path | None = None,
+        register: bool = True,
         **kwargs,
     ) -> schemas.Dataset:
         """Create a dataset.
 
         This function will create a dataset and populate it with the audio
         files found in the given directory. It will look recursively for audio
-        files within the directory.
+        files within the directory. Files are registered in batches with
+        `register_files`, which commits the session after every batch.
 
         Parameters
         ----------
@@ -596,6 +725,10 @@ class DatasetAPI(
         audio_dir
             The root audio directory, by default None. If None, the root audio
             directory from the settings will be used.
+        register
+            Whether to register the audio files of the dataset directory, by
+            default True. If False, only the dataset is created and the files
+            can be registered later with `register_files`.
         **kwargs
             Additional keyword arguments to pass to the creation function.
 
@@ -637,27 +770,123 @@ class DatasetAPI(
             **kwargs,
         )
 
-        file_list = files.get_audio_files_in_folder(
-            dataset_dir,
-            relative=False,
-        )
+        if not register:
+            return obj
 
-        recording_list = await recordings.create_many(
-            session,
-            [dict(path=file) for file in file_list],
-            audio_dir=audio_dir,
-        )
+        return await self.register_files(session, obj, audio_dir=audio_dir)
 
-        if recording_list is None:
-            raise RuntimeError("No recordings were created.")
+    async def register_files(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+        audio_dir: Path | None = None,
+        batch_size: int = 100,
+        callback: (
+            Callable[[schemas.DatasetRegistration], Awaitable[None]] | None
+        ) = None,
+    ) -> schemas.Dataset:
+        """Register the unregistered audio files of a dataset.
 
-        dataset_recordigns = await self.add_recordings(
-            session, obj, recording_list
-        )
+        The dataset directory is scanned for files that are not yet
+        registered in the dataset. These are hashed, probed and added to the
+        dataset in batches, and the session is committed after every batch.
+        Hence, if the registration is interrupted, the work done so far is
+        kept and calling this function again resumes the registration.
 
-        obj = obj.model_copy(
-            update=dict(recording_count=len(dataset_recordigns))
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The dataset to register the files of.
+        audio_dir
+            The root audio directory, by default None. If None, the root audio
+            directory from the settings will be used.
+        batch_size
+            The number of files processed per batch, by default 100.
+        callback
+            Called with the progress of the registration after every batch
+            is committed.
+
+        Returns
+        -------
+        dataset : schemas.Dataset
+            The dataset with the updated recording count.
+
+        Notes
+        -----
+        Registrations are not coordinated by this function. Run them as
+        ``register_dataset_files`` jobs, which record their progress in the
+        database and of which only one is submitted at a time for each
+        dataset.
+        """
+        if audio_dir is None:
+            audio_dir = get_settings().audio_dir
+
+        pending = [
+            file.path
+            async for file in self.iter_state(
+                session, obj, audio_dir=audio_dir
+            )
+            if file.state == schemas.FileState.UNREGISTERED
+        ]
+
+        # NOTE: The scan index holds the size of every file, so there is no
+        # need to stat the files again to estimate the remaining work.
+        index = await self._get_scan_index(session, obj)
+        sizes = {
+            path: index[path].size if path in index else 0 for path in pending
+        }
+        tracker = ProgressTracker(
+            total_files=len(pending),
+            total_bytes=sum(sizes.values()),
         )
+
+        # Persist the scan index before starting the slow part.
+        await session.commit()
+
+        dataset_dir = audio_dir / obj.audio_dir
+        for batch in batched(pending, batch_size):
+            recording_list = await recordings.create_many(
+                session,
+                [dict(path=dataset_dir / path) for path in batch],
+                audio_dir=audio_dir,
+            )
+            dataset_recordings = await self.add_recordings(
+                session,
+                obj,
+                recording_list or [],
+            )
+            await session.commit()
+
+            obj = obj.model_copy(
+                update=dict(
+                    recording_count=obj.recording_count
+                    + len(dataset_recordings)
+                )
+            )
+            tracker.advance(
+                files=len(batch),
+                size=sum(sizes[path] for path in batch),
+            )
+            if callback is not None:
+                await callback(
+                    schemas.DatasetRegistration(
+                        status=(
+                            schemas.RegistrationStatus.RUNNING
+                            if tracker.processed_files < tracker.total_files
+                            else schemas.RegistrationStatus.COMPLETED
+                        ),
+                        total_files=tracker.total_files,
+                        processed_files=tracker.processed_files,
+                        total_bytes=tracker.total_bytes,
+                        processed_bytes=tracker.processed_bytes,
+                        files_per_second=tracker.files_per_second,
+                        bytes_per_second=tracker.bytes_per_second,
+                        eta=tracker.eta,
+                    )
+                )
+
         self._update_cache(obj)
         return obj
 
@@ -766,5 +995,121 @@ class DatasetAPI(
         )
         return to_aeof(soundevent_dataset, audio_dir=dataset_audio_dir)
 
+    async def stream_aoef(
+        self,
+        session: AsyncSession,
+        dataset: schemas.Dataset,
+        audio_dir: Path | None = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncGenerator[str, None]:
+        """Export a dataset in AOEF format, in chunks of JSON text.
+
+        Unlike `export_dataset`, the dataset is never held in memory as a
+        whole. Recordings are read in batches of `batch_size` and every
+        batch is written out as soon as it is converted, so the chunks can
+        be sent to a client or a file while the export is still running.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        dataset
+            The dataset to export.
+        audio_dir
+            The root audio directory, by default None. If None, the root
+            audio directory from the settings will be used.
+        batch_size
+            The number of recordings to read at once.
+
+        Yields
+        ------
+        chunk : str
+            The next chunk of the AOEF document.
+        """
+        if audio_dir is None:
+            audio_dir = get_settings().audio_dir
+
+        adapter = DatasetAdapter(audio_dir=audio_dir / dataset.audio_dir)
+        writer = AOEFWriter()
+
+        try:
+            yield writer.start(
+                {
+                    "uuid": dataset.uuid,
+                    "collection_type": "dataset",
+                    "created_on": dataset.created_on,
+                    "name": dataset.name,
+                    "description": dataset.description,
+                }
+            )
+
+            yield writer.begin("recordings")
+            async for batch in common.iter_objects_batched(
+                session,
+                models.Recording,
+                filters=[DatasetFilter(eq=dataset.uuid)],
+                batch_size=batch_size,
+            ):
+                yield writer.items(
+                    [
+                        adapter.recording_adapter.to_aoef(
+                            recordings.to_soundevent(
+                                schemas.Recording.model_validate(recording),
+                                audio_dir=audio_dir,
+                            )
+                        )
+                        for recording in batch
+                    ]
+                )
+                clear_adapter(adapter.recording_adapter)
+            yield writer.end()
+
+            for chunk in writer.finish(
+                {
+                    "tags": adapter.tag_adapter.values() or [],
+                    "users": adapter.user_adapter.values() or [],
+                }
+            ):
+                yield chunk
+        finally:
+            writer.close()
+
+    def stream_table(
+        self,
+        session: AsyncSession,
+        dataset: schemas.Dataset,
+        format: arrow.TableFormat = "parquet",
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """Export the recordings of a dataset as a columnar table.
+
+        Unlike `to_dataframe`, recordings are read in batches straight from
+        the database and encoded as they are read. Paths are relative to
+        the dataset directory.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        dataset
+            The dataset to export.
+        format
+            Export a Parquet file or an Arrow IPC stream.
+        batch_size
+            The number of recordings per record batch.
+
+        Returns
+        -------
+        AsyncGenerator[bytes, None]
+            The chunks of the encoded table.
+        """
+        return arrow.stream_recordings(
+            session,
+            filters=[DatasetFilter(eq=dataset.uuid)],
+            audio_dir=dataset.audio_dir,
+            format=format,
+            batch_size=batch_size,
+        )
+
 
 datasets = DatasetAPI()
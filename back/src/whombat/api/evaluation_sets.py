@@ -2,9 +2,10 @@
 
 import uuid
 from pathlib import Path
-from typing import Sequence
+from typing import AsyncGenerator, Collection, Sequence
 
 from soundevent import data
+from soundevent.io.aoef.evaluation_set import EvaluationSetAdapter
 from sqlalchemy import and_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,7 +16,10 @@ from whombat.api.common import (
     create_object,
     create_objects_without_duplicates,
     delete_object,
+    iter_objects_batched,
 )
+from whombat.api.io.aoef.common import BATCH_SIZE
+from whombat.api.io.aoef.writer import AOEFWriter, clear_adapter
 from whombat.api.model_runs import model_runs
 from whombat.api.tags import tags
 from whombat.api.user_runs import user_runs
@@ -30,6 +34,7 @@ from whombat.filters.user_runs import (
     EvaluationSetFilter as UserRunEvaluationSetFilter,
 )
 from whombat.schemas.evaluation_sets import PredictionTypes
+from whombat.system.settings import get_settings
 
 __all__ = [
     "EvaluationSetAPI",
@@ -382,6 +387,104 @@ class EvaluationSetAPI(
             ],
         )
 
+    async def stream_aoef(
+        self,
+        session: AsyncSession,
+        obj: schemas.EvaluationSet,
+        audio_dir: Path | None = None,
+        exclude_none: bool = False,
+        exclude: Collection[str] = (),
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncGenerator[str, None]:
+        """Export an evaluation set in AOEF format, in chunks of JSON text.
+
+        Clip annotations are read in batches of `batch_size` and written out
+        as soon as each batch is converted. The recordings, clips and sound
+        events they reference are spooled to disk and written at the end.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            The evaluation set to export.
+        audio_dir
+            Directory against which recording paths are made relative. If
+            None, the root audio directory from the settings is used.
+        exclude_none
+            Whether to leave out fields that are None.
+        exclude
+            Fields of the document, or of the evaluation set, to leave out.
+        batch_size
+            The number of clip annotations to read at once.
+
+        Yields
+        ------
+        chunk : str
+            The next chunk of the AOEF document.
+        """
+        if audio_dir is None:
+            audio_dir = get_settings().audio_dir
+
+        adapter = EvaluationSetAdapter(audio_dir=audio_dir)
+        writer = AOEFWriter(exclude_none=exclude_none, exclude=exclude)
+        writer.spool("recordings", adapter.recording_adapter)
+        writer.spool("clips", adapter.clip_adapter)
+        writer.spool("sound_events", adapter.sound_event_adapter)
+        writer.spool(
+            "sound_event_annotations",
+            adapter.sound_event_annotations_adapter,
+        )
+
+        try:
+            yield writer.start(
+                {
+                    "uuid": obj.uuid,
+                    "collection_type": "evaluation_set",
+                    "created_on": obj.created_on,
+                    "name": obj.name or "Evaluation Set",
+                    "description": obj.description,
+                }
+            )
+
+            yield writer.begin("clip_annotations")
+            async for batch in iter_objects_batched(
+                session,
+                models.ClipAnnotation,
+                filters=[ClipAnnotationEvaluationSetFilter(eq=obj.uuid)],
+                batch_size=batch_size,
+            ):
+                yield writer.items(
+                    [
+                        adapter.clip_annotation_adapter.to_aoef(
+                            await clip_annotations.to_soundevent(
+                                session,
+                                schemas.ClipAnnotation.model_validate(ca),
+                                audio_dir=audio_dir,
+                            )
+                        )
+                        for ca in batch
+                    ]
+                )
+                writer.collect()
+                clear_adapter(adapter.clip_annotation_adapter)
+            yield writer.end()
+
+            evaluation_tags = [
+                adapter.tag_adapter.to_aoef(tags.to_soundevent(tag)).id
+                for tag in obj.tags
+            ]
+            for chunk in writer.finish(
+                {
+                    "evaluation_tags": evaluation_tags or None,
+                    "tags": adapter.tag_adapter.values() or [],
+                    "users": adapter.user_adapter.values() or [],
+                }
+            ):
+                yield chunk
+        finally:
+            writer.close()
+
     async def _create_from_soundevent(
         self,
         session: AsyncSession,
@@ -1,30 +1,67 @@
 """API functions to interact with evaluations."""
 
+import datetime
+from functools import partial
+from itertools import batched
 from pathlib import Path
-from typing import Callable, Mapping, Sequence
+from typing import Awaitable, Callable, Hashable, Mapping, Sequence
 from uuid import UUID
 
+import cachetools
+import numpy as np
 from soundevent import data
 from soundevent import evaluation as evaluate
-from soundevent.io.aoef import EvaluationObject, to_aeof
-from sqlalchemy import and_
+from sqlalchemy import (
+    Row,
+    String,
+    and_,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
+from whombat.api.clip_annotations import clip_annotations
 from whombat.api.clip_evaluations import clip_evaluations
+from whombat.api.clip_predictions import clip_predictions
 from whombat.api.common import (
     BaseAPI,
     create_object,
     delete_object,
+    get_object,
+    iter_objects_batched,
     update_object,
 )
-from whombat.api.evaluation_sets import evaluation_sets
 from whombat.api.features import features
-from whombat.api.io.aoef.evaluations import import_evaluation
-from whombat.api.model_runs import model_runs
+from whombat.api.io.aoef.common import BATCH_SIZE, get_mapping
+from whombat.api.io.aoef.features import import_feature_names
+from whombat.api.tags import tags
+from whombat.core.evaluation import (
+    EVALUATION_TASKS,
+    ClipExamples,
+    EvaluationAccumulator,
+    evaluate_clip_pair,
+    fingerprint_clip,
+)
+from whombat.core.evaluation_dashboards import (
+    ClassCurve,
+    compute_class_curves,
+    confusion_matrix,
+    downsample_curve,
+    encode_true_classes,
+)
 from whombat.filters.base import Filter
+from whombat.filters.clip_annotations import EvaluationSetFilter
 from whombat.filters.clip_evaluations import EvaluationFilter
+from whombat.filters.clip_predictions import ModelRunFilter
 from whombat.schemas.evaluation_sets import PredictionTypes
+from whombat.system.workers import WorkerPool, get_worker_pool
 
 
 class EvaluationAPI(
@@ -41,6 +78,10 @@ class EvaluationAPI(
     _model = models.Evaluation
     _schema = schemas.Evaluation
 
+    def __init__(self):
+        super().__init__()
+        self._dashboards: cachetools.LRUCache = cachetools.LRUCache(maxsize=32)
+
     async def create(
         self,
         session: AsyncSession,
@@ -277,12 +318,30 @@ class EvaluationAPI(
         session: AsyncSession,
         obj: schemas.Evaluation,
         audio_dir: Path | None = None,
+        batch_size: int = BATCH_SIZE,
     ) -> data.Evaluation:
-        """Create a sound event evaluation from an evaluation."""
-        evals, _ = await self.get_clip_evaluations(
+        """Create a sound event evaluation from an evaluation.
+
+        Clip evaluations are converted in batches of `batch_size`, using a
+        fixed number of queries per batch.
+        """
+        se_clip_evaluations = []
+        async for batch in iter_objects_batched(
             session,
-            obj,
-        )
+            models.ClipEvaluation,
+            filters=[EvaluationFilter(eq=obj.uuid)],
+            batch_size=batch_size,
+        ):
+            se_clip_evaluations.extend(
+                await clip_evaluations.to_soundevent_many(
+                    session,
+                    [
+                        schemas.ClipEvaluation.model_validate(ce)
+                        for ce in batch
+                    ],
+                    audio_dir=audio_dir,
+                )
+            )
 
         metrics = [features.to_soundevent(m) for m in obj.metrics]
 
@@ -292,14 +351,7 @@ class EvaluationAPI(
             score=obj.score,
             evaluation_task=obj.task,
             metrics=metrics,
-            clip_evaluations=[
-                await clip_evaluations.to_soundevent(
-                    session,
-                    ce,
-                    audio_dir=audio_dir,
-                )
-                for ce in evals
-            ],
+            clip_evaluations=se_clip_evaluations,
         )
 
     async def evaluate_model_run(
@@ -309,41 +361,730 @@ class EvaluationAPI(
         evaluation_set: schemas.EvaluationSet,
         audio_dir: Path,
         user: schemas.SimpleUser,
+        batch_size: int = 100,
+        callback: Callable[[int], Awaitable[None]] | None = None,
+        pool: WorkerPool | None = None,
+        **kwargs,
     ) -> schemas.Evaluation:
-        model_run_se = await model_runs.to_soundevent(
+        """Evaluate the predictions of a model run on an evaluation set.
+
+        The clip predictions of the model run are read in batches of
+        `batch_size`, together with the clip annotations of the evaluation
+        set for the same clips. The clips of each batch are evaluated in
+        parallel in the worker pool, and their clip and sound event
+        evaluations are written to the database before the next batch is
+        read. The metrics of the whole run are aggregated incrementally, so
+        memory use does not grow with the number of clips beyond one array
+        entry per evaluated example.
+
+        If the model run was already evaluated on the evaluation set, its
+        evaluation is updated instead. Only the clips whose annotations or
+        predictions changed since they were evaluated are evaluated again.
+        The examples of the other clips are read from the database, and the
+        metrics of the whole run are recomputed from them. The clips that
+        are evaluated again are written to a staging evaluation, and only
+        replace the outdated clips of the evaluation after the last batch.
+        Hence, the batches can be committed as they are written while the
+        evaluation is left as it was until the update finishes, and
+        deleting the staging evaluation discards an interrupted update.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        model_run
+            The model run to evaluate.
+        evaluation_set
+            The evaluation set to evaluate against.
+        audio_dir
+            Root directory of the audio files.
+        user
+            The user that requested the evaluation.
+        batch_size
+            The number of clip predictions to evaluate at once.
+        callback
+            Called after each batch with the number of clip predictions
+            processed so far.
+        pool
+            The worker processes that evaluate the clips. If None, the
+            worker pool of the application is used.
+        **kwargs
+            Additional fields of the evaluation if it is created, or of the
+            staging evaluation if it is updated, such as its UUID.
+
+        Returns
+        -------
+        schemas.Evaluation
+            The created or updated evaluation.
+        """
+        task = EVALUATION_TASKS.get(evaluation_set.task.value)
+        if task is None:
+            raise ValueError(f"Task {evaluation_set.task} not supported.")
+
+        if pool is None:
+            pool = get_worker_pool()
+
+        prediction_type = evaluation_set.task.value
+        evaluation_tags = tuple(
+            tags.to_soundevent(tag) for tag in evaluation_set.tags
+        )
+        accumulator = EvaluationAccumulator(task)
+
+        db_eval = await session.scalar(
+            select(models.Evaluation)
+            .join(
+                models.ModelRunEvaluation,
+                models.ModelRunEvaluation.evaluation_id
+                == models.Evaluation.id,
+            )
+            .where(
+                models.ModelRunEvaluation.model_run_id == model_run.id,
+                models.ModelRunEvaluation.evaluation_set_id
+                == evaluation_set.id,
+            )
+        )
+        is_new = db_eval is None
+        db_target = models.Evaluation(
+            task=task.name,
+            score=0,
+            created_on=datetime.datetime.now(),
+            **kwargs,
+        )
+        session.add(db_target)
+        await session.flush()
+        if db_eval is None:
+            db_eval = db_target
+
+        feature_names: dict[str, int] = {}
+        kept: set[int] = set()
+        processed = 0
+        async for batch in iter_objects_batched(
             session,
-            model_run,
+            models.ClipPrediction,
+            filters=[ModelRunFilter(eq=model_run.uuid)],
+            batch_size=batch_size,
+        ):
+            predictions = [
+                schemas.ClipPrediction.model_validate(cp) for cp in batch
+            ]
+            annotations = await self._get_clip_annotations(
+                session,
+                evaluation_set,
+                {cp.clip.id for cp in predictions},
+            )
+            pairs = [
+                (annotations[prediction.clip.id], prediction)
+                for prediction in predictions
+                if prediction.clip.id in annotations
+            ]
+            inputs = [
+                (
+                    await clip_annotations.to_soundevent(
+                        session,
+                        annotation,
+                        audio_dir=audio_dir,
+                    ),
+                    await clip_predictions.to_soundevent(
+                        session,
+                        prediction,
+                        audio_dir=audio_dir,
+                    ),
+                )
+                for annotation, prediction in pairs
+            ]
+            fingerprints = [
+                fingerprint_clip(prediction_type, evaluation_tags, *pair)
+                for pair in inputs
+            ]
+
+            stored = (
+                {}
+                if is_new
+                else await self._get_stored_clip_evaluations(
+                    session,
+                    db_eval.id,
+                    [prediction.id for _, prediction in pairs],
+                )
+            )
+            changed = [
+                index
+                for index, ((annotation, prediction), fingerprint) in (
+                    enumerate(zip(pairs, fingerprints, strict=True))
+                )
+                if not _is_up_to_date(
+                    stored.get((annotation.id, prediction.id)),
+                    fingerprint,
+                )
+            ]
+            results = await pool.map(
+                partial(
+                    evaluate_clip_pair,
+                    prediction_type=prediction_type,
+                    tags=evaluation_tags,
+                ),
+                [inputs[index] for index in changed],
+            )
+            evaluated_clips = dict(zip(changed, results, strict=True))
+
+            # NOTE: Results come back in the order of the clips, and are
+            # merged with the stored examples in that order, so the metrics
+            # do not depend on how the batch was sharded or which clips
+            # were evaluated again.
+            evaluated = []
+            for index, (annotation, prediction) in enumerate(pairs):
+                row = stored.get((annotation.id, prediction.id))
+                result = evaluated_clips.get(index)
+                if result is None:
+                    # NOTE: Only clips with an up to date row are skipped.
+                    assert row is not None
+                    accumulator.add_examples(
+                        ClipExamples.from_json(row.examples)
+                    )
+                    kept.add(row.id)
+                    continue
+
+                examples = ClipExamples.from_evaluated(result)
+                accumulator.add_examples(examples)
+                evaluated.append(
+                    (
+                        annotation,
+                        prediction,
+                        result[2],
+                        fingerprints[index],
+                        examples,
+                    )
+                )
+
+            await self._add_clip_evaluations(
+                session,
+                db_target.id,
+                evaluated,
+                feature_names,
+            )
+
+            processed += len(batch)
+            if callback is not None:
+                await callback(processed)
+
+        if not is_new:
+            await self._delete_clip_evaluations(
+                session,
+                [
+                    clip_evaluation_id
+                    for clip_evaluation_id in await session.scalars(
+                        select(models.ClipEvaluation.id).where(
+                            models.ClipEvaluation.evaluation_id == db_eval.id
+                        )
+                    )
+                    if clip_evaluation_id not in kept
+                ],
+            )
+            await session.execute(
+                update(models.ClipEvaluation)
+                .where(models.ClipEvaluation.evaluation_id == db_target.id)
+                .values(evaluation_id=db_eval.id),
+                execution_options={"synchronize_session": False},
+            )
+            await session.delete(db_target)
+            await session.execute(
+                delete(models.EvaluationMetric).where(
+                    models.EvaluationMetric.evaluation_id == db_eval.id
+                )
+            )
+
+        db_eval.score = accumulator.score
+        await self._add_metrics(
+            session,
+            db_eval.id,
+            accumulator.compute_metrics(),
+            feature_names,
         )
-        evaluation_set_se = await evaluation_sets.to_soundevent(
+
+        if is_new:
+            session.add(
+                models.ModelRunEvaluation(
+                    model_run_id=model_run.id,
+                    evaluation_id=db_eval.id,
+                    evaluation_set_id=evaluation_set.id,
+                )
+            )
+
+        await session.flush()
+        await session.refresh(db_eval)
+        obj = schemas.Evaluation.model_validate(db_eval)
+        self._clear_from_cache(obj)
+        return obj
+
+    async def get_dashboard(
+        self,
+        session: AsyncSession,
+        obj: schemas.Evaluation,
+        max_points: int = 200,
+    ) -> schemas.EvaluationDashboard:
+        """Get precision-recall curves and a confusion matrix of an evaluation.
+
+        The dashboard is computed from the examples stored with each clip
+        evaluation, and cached per evaluation. The cache is checked against
+        the number and latest id of the clip evaluations, which change
+        whenever the evaluation is computed again, so a dashboard is not
+        served stale even if the evaluation was updated by another process.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            The evaluation of a model run on an evaluation set.
+        max_points
+            The maximum number of points of each precision-recall curve.
+
+        Returns
+        -------
+        schemas.EvaluationDashboard
+
+        Raises
+        ------
+        whombat.exceptions.NotFoundError
+            If the evaluation is not of a run on an evaluation set.
+        whombat.exceptions.DataIntegrityError
+            If the evaluation set has other tags than when the clips were
+            evaluated, or if the examples of some clips were not stored, as
+            for imported evaluations. The run must be evaluated again.
+        """
+        evaluation_set = await self._get_evaluation_set(session, obj)
+        count, last_id = (
+            await session.execute(
+                select(
+                    func.count(models.ClipEvaluation.id),
+                    func.max(models.ClipEvaluation.id),
+                ).where(models.ClipEvaluation.evaluation_id == obj.id)
+            )
+        ).one()
+        version: Hashable = (
+            count,
+            last_id,
+            tuple(tag.id for tag in evaluation_set.tags),
+        )
+
+        key = (obj.id, max_points)
+        cached = self._dashboards.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        dashboard = await self._compute_dashboard(
             session,
+            obj,
             evaluation_set,
+            max_points,
+        )
+        self._dashboards[key] = (version, dashboard)
+        return dashboard
+
+    def _clear_from_cache(self, obj: schemas.Evaluation) -> None:
+        super()._clear_from_cache(obj)
+        for key in [key for key in self._dashboards if key[0] == obj.id]:
+            del self._dashboards[key]
+
+    async def _get_stored_clip_evaluations(
+        self,
+        session: AsyncSession,
+        evaluation_id: int,
+        clip_prediction_ids: list[int],
+    ) -> dict[tuple[int, int], Row]:
+        """Get the stored clip evaluations of a batch of clip predictions.
+
+        Returns the id, fingerprint and examples of each clip evaluation,
+        by clip annotation and clip prediction id.
+        """
+        if not clip_prediction_ids:
+            return {}
+
+        result = await session.execute(
+            select(
+                models.ClipEvaluation.id,
+                models.ClipEvaluation.clip_annotation_id,
+                models.ClipEvaluation.clip_prediction_id,
+                models.ClipEvaluation.fingerprint,
+                models.ClipEvaluation.examples,
+            ).where(
+                models.ClipEvaluation.evaluation_id == evaluation_id,
+                models.ClipEvaluation.clip_prediction_id.in_(
+                    clip_prediction_ids
+                ),
+            )
         )
-        evaluation = evaluate_predictions(
-            model_run_se.clip_predictions,
-            evaluation_set_se.clip_annotations,
-            evaluation_set_se.evaluation_tags,
-            evaluation_set.task,
+        return {
+            (row.clip_annotation_id, row.clip_prediction_id): row
+            for row in result
+        }
+
+    async def _delete_clip_evaluations(
+        self,
+        session: AsyncSession,
+        clip_evaluation_ids: list[int],
+    ) -> None:
+        """Delete clip evaluations with their matches and metrics."""
+        for ids in batched(clip_evaluation_ids, BATCH_SIZE):
+            sound_event_evaluation_ids = select(
+                models.SoundEventEvaluation.id
+            ).where(models.SoundEventEvaluation.clip_evaluation_id.in_(ids))
+            await session.execute(
+                delete(models.SoundEventEvaluationMetric).where(
+                    models.SoundEventEvaluationMetric.sound_event_evaluation_id.in_(
+                        sound_event_evaluation_ids
+                    )
+                ),
+                execution_options={"synchronize_session": False},
+            )
+            await session.execute(
+                delete(models.SoundEventEvaluation).where(
+                    models.SoundEventEvaluation.clip_evaluation_id.in_(ids)
+                ),
+                execution_options={"synchronize_session": False},
+            )
+            await session.execute(
+                delete(models.ClipEvaluationMetric).where(
+                    models.ClipEvaluationMetric.clip_evaluation_id.in_(ids)
+                ),
+                execution_options={"synchronize_session": False},
+            )
+            await session.execute(
+                delete(models.ClipEvaluation).where(
+                    models.ClipEvaluation.id.in_(ids)
+                ),
+                execution_options={"synchronize_session": False},
+            )
+
+    async def _get_evaluation_set(
+        self,
+        session: AsyncSession,
+        obj: schemas.Evaluation,
+    ) -> schemas.EvaluationSet:
+        """Get the evaluation set of the run an evaluation is of."""
+        evaluation_set_id = await session.scalar(
+            select(models.ModelRunEvaluation.evaluation_set_id)
+            .where(models.ModelRunEvaluation.evaluation_id == obj.id)
+            .union(
+                select(models.UserRunEvaluation.evaluation_set_id).where(
+                    models.UserRunEvaluation.evaluation_id == obj.id
+                )
+            )
         )
-        obj: EvaluationObject = to_aeof(evaluation)  # type: ignore
-        db_eval = await import_evaluation(
+        if evaluation_set_id is None:
+            raise exceptions.NotFoundError(
+                f"Evaluation {obj.uuid} is not of a run on an evaluation set."
+            )
+
+        db_evaluation_set = await get_object(
             session,
-            obj.model_dump(),
-            audio_dir=audio_dir,
-            base_audio_dir=audio_dir,
-            imported_by=user,
+            models.EvaluationSet,
+            models.EvaluationSet.id == evaluation_set_id,
         )
+        return schemas.EvaluationSet.model_validate(db_evaluation_set)
+
+    async def _compute_dashboard(
+        self,
+        session: AsyncSession,
+        obj: schemas.Evaluation,
+        evaluation_set: schemas.EvaluationSet,
+        max_points: int,
+    ) -> schemas.EvaluationDashboard:
+        """Compute the dashboard of an evaluation from its stored examples."""
+        task = EVALUATION_TASKS.get(evaluation_set.task.value)
+        if task is None:
+            raise ValueError(f"Task {evaluation_set.task} not supported.")
+
+        # NOTE: Examples are only stored by `evaluate_model_run`. Imported
+        # evaluations, and those computed before examples were stored,
+        # cannot be summarised until the run is evaluated again.
+        if await session.scalar(
+            select(
+                exists().where(
+                    models.ClipEvaluation.evaluation_id == obj.id,
+                    # NOTE: Rows written before the column kept Python None
+                    # as SQL NULL hold a JSON null instead.
+                    or_(
+                        models.ClipEvaluation.examples.is_(None),
+                        cast(models.ClipEvaluation.examples, String) == "null",
+                    ),
+                )
+            )
+        ):
+            raise exceptions.DataIntegrityError(
+                f"Evaluation {obj.uuid} has no stored examples for some of "
+                "its clips. Evaluate the run again."
+            )
 
-        # Create model run evaluation
-        model_run_eval = models.ModelRunEvaluation(
-            model_run_id=model_run.id,
-            evaluation_id=db_eval.id,
-            evaluation_set_id=evaluation_set.id,
+        num_classes = len(evaluation_set.tags)
+        accumulator = EvaluationAccumulator(task)
+        clip_count = 0
+        last_id = 0
+        while True:
+            rows = (
+                await session.execute(
+                    select(
+                        models.ClipEvaluation.id,
+                        models.ClipEvaluation.examples,
+                    )
+                    .where(
+                        models.ClipEvaluation.evaluation_id == obj.id,
+                        models.ClipEvaluation.id > last_id,
+                    )
+                    .order_by(models.ClipEvaluation.id)
+                    .limit(BATCH_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+
+            for row in rows:
+                accumulator.add_examples(ClipExamples.from_json(row.examples))
+            clip_count += len(rows)
+            last_id = rows[-1].id
+
+        y_score = (
+            np.concatenate(accumulator.predicted_scores)
+            if accumulator.predicted_scores
+            else np.zeros((0, num_classes), dtype=np.float32)
         )
-        session.add(model_run_eval)
-        await session.flush()
+        if y_score.shape[1] != num_classes:
+            raise exceptions.DataIntegrityError(
+                f"Evaluation {obj.uuid} was computed with other tags than "
+                "those of its evaluation set. Evaluate the run again."
+            )
 
-        await session.refresh(db_eval)
-        return schemas.Evaluation.model_validate(db_eval)
+        true_classes = accumulator.true_classes
+        y_true, has_class = encode_true_classes(true_classes, num_classes)
+
+        # NOTE: Examples without a true class are left out of the curves,
+        # as in the mean average precision of soundevent.
+        curves = compute_class_curves(y_true[has_class], y_score[has_class])
+        precisions = [
+            curve.average_precision
+            for curve in curves
+            if curve.average_precision is not None
+        ]
+
+        multilabel = bool(true_classes) and isinstance(
+            true_classes[0], np.ndarray
+        )
+        return schemas.EvaluationDashboard(
+            evaluation_uuid=obj.uuid,
+            task=obj.task,
+            clip_count=clip_count,
+            example_count=len(true_classes),
+            mean_average_precision=(
+                float(np.mean(precisions)) if precisions else None
+            ),
+            classes=[
+                _get_class_performance(tag, curve, max_points)
+                for tag, curve in zip(
+                    evaluation_set.tags,
+                    curves,
+                    strict=True,
+                )
+            ],
+            confusion_matrix=(
+                None
+                if multilabel
+                else confusion_matrix(true_classes, y_score).tolist()
+            ),
+        )
+
+    async def _get_clip_annotations(
+        self,
+        session: AsyncSession,
+        evaluation_set: schemas.EvaluationSet,
+        clip_ids: set[int],
+    ) -> dict[int, schemas.ClipAnnotation]:
+        """Get the clip annotations of an evaluation set by clip id."""
+        query = (
+            EvaluationSetFilter(eq=evaluation_set.uuid)
+            .filter(select(models.ClipAnnotation))
+            .where(models.ClipAnnotation.clip_id.in_(clip_ids))
+            .order_by(models.ClipAnnotation.id)
+        )
+        result = await session.scalars(query)
+
+        # NOTE: If a clip has several annotations in the evaluation set,
+        # the last one is used, as in the evaluation tasks of soundevent.
+        return {
+            ca.clip_id: schemas.ClipAnnotation.model_validate(ca)
+            for ca in result.unique().all()
+        }
+
+    async def _add_clip_evaluations(
+        self,
+        session: AsyncSession,
+        evaluation_id: int,
+        evaluated: list[
+            tuple[
+                schemas.ClipAnnotation,
+                schemas.ClipPrediction,
+                data.ClipEvaluation,
+                str,
+                ClipExamples,
+            ]
+        ],
+        feature_names: dict[str, int],
+    ) -> list[int]:
+        """Write the evaluations of a batch of clips.
+
+        Returns the ids of the created clip evaluations.
+        """
+        if not evaluated:
+            return []
+
+        created_on = datetime.datetime.now()
+        await session.execute(
+            insert(models.ClipEvaluation),
+            [
+                {
+                    "uuid": clip_evaluation.uuid,
+                    "evaluation_id": evaluation_id,
+                    "clip_annotation_id": annotation.id,
+                    "clip_prediction_id": prediction.id,
+                    "score": clip_evaluation.score or 0,
+                    "fingerprint": fingerprint,
+                    "examples": examples.to_json(),
+                    "created_on": created_on,
+                }
+                for (
+                    annotation,
+                    prediction,
+                    clip_evaluation,
+                    fingerprint,
+                    examples,
+                ) in evaluated
+            ],
+        )
+        clip_evaluation_ids = await get_mapping(
+            session,
+            {clip_evaluation.uuid for _, _, clip_evaluation, *_ in evaluated},
+            models.ClipEvaluation,
+        )
+
+        matches = []
+        for annotation, prediction, clip_evaluation, *_ in evaluated:
+            sources = {se.uuid: se.id for se in prediction.sound_events}
+            targets = {se.uuid: se.id for se in annotation.sound_events}
+            for match in clip_evaluation.matches:
+                matches.append(
+                    {
+                        "uuid": match.uuid,
+                        "clip_evaluation_id": clip_evaluation_ids[
+                            clip_evaluation.uuid
+                        ],
+                        "source_id": (
+                            sources.get(match.source.uuid)
+                            if match.source is not None
+                            else None
+                        ),
+                        "target_id": (
+                            targets.get(match.target.uuid)
+                            if match.target is not None
+                            else None
+                        ),
+                        "affinity": match.affinity,
+                        "score": match.score or 0,
+                        "created_on": created_on,
+                    }
+                )
+
+        if matches:
+            await session.execute(insert(models.SoundEventEvaluation), matches)
+
+        match_ids = await get_mapping(
+            session,
+            {
+                match.uuid
+                for _, _, clip_evaluation, *_ in evaluated
+                for match in clip_evaluation.matches
+                if match.metrics
+            },
+            models.SoundEventEvaluation,
+        )
+
+        await self._insert_metrics(
+            session,
+            models.ClipEvaluationMetric,
+            "clip_evaluation_id",
+            [
+                (clip_evaluation_ids[clip_evaluation.uuid], metric)
+                for _, _, clip_evaluation, *_ in evaluated
+                for metric in clip_evaluation.metrics
+            ],
+            feature_names,
+        )
+        await self._insert_metrics(
+            session,
+            models.SoundEventEvaluationMetric,
+            "sound_event_evaluation_id",
+            [
+                (match_ids[match.uuid], metric)
+                for _, _, clip_evaluation, *_ in evaluated
+                for match in clip_evaluation.matches
+                for metric in match.metrics
+            ],
+            feature_names,
+        )
+        return list(clip_evaluation_ids.values())
+
+    async def _add_metrics(
+        self,
+        session: AsyncSession,
+        evaluation_id: int,
+        metrics: list[data.Feature],
+        feature_names: dict[str, int],
+    ) -> None:
+        """Write the metrics of the whole evaluation."""
+        await self._insert_metrics(
+            session,
+            models.EvaluationMetric,
+            "evaluation_id",
+            [(evaluation_id, metric) for metric in metrics],
+            feature_names,
+        )
+
+    async def _insert_metrics(
+        self,
+        session: AsyncSession,
+        model: type[models.Base],
+        column: str,
+        metrics: list[tuple[int, data.Feature]],
+        feature_names: dict[str, int],
+    ) -> None:
+        """Insert metric rows, creating their feature names as needed.
+
+        Feature names ids are remembered in `feature_names` so that each
+        name is only looked up once per evaluation.
+        """
+        if not metrics:
+            return
+
+        missing = {
+            data.key_from_term(metric.term) for _, metric in metrics
+        } - feature_names.keys()
+        if missing:
+            feature_names.update(
+                await import_feature_names(session, sorted(missing))
+            )
+
+        created_on = datetime.datetime.now()
+        await session.execute(
+            insert(model),
+            [
+                {
+                    column: parent_id,
+                    "feature_name_id": feature_names[
+                        data.key_from_term(metric.term)
+                    ],
+                    "value": metric.value,
+                    "created_on": created_on,
+                }
+                for parent_id, metric in metrics
+            ],
+        )
 
 
 EVALUATION_METHODS: Mapping[PredictionTypes, Callable] = {
@@ -354,6 +1095,33 @@ EVALUATION_METHODS: Mapping[PredictionTypes, Callable] = {
 }
 
 
+def _get_class_performance(
+    tag: schemas.Tag,
+    curve: ClassCurve,
+    max_points: int,
+) -> schemas.ClassPerformance:
+    curve = downsample_curve(curve, max_points)
+    return schemas.ClassPerformance(
+        tag=tag,
+        support=curve.support,
+        average_precision=curve.average_precision,
+        curve=schemas.PrecisionRecallCurve(
+            precision=curve.precision.tolist(),
+            recall=curve.recall.tolist(),
+            thresholds=curve.thresholds.tolist(),
+        ),
+    )
+
+
+def _is_up_to_date(row: Row | None, fingerprint: str) -> bool:
+    """Whether a stored clip evaluation can be reused."""
+    return (
+        row is not None
+        and row.examples is not None
+        and row.fingerprint == fingerprint
+    )
+
+
 def evaluate_predictions(
     clip_predictions: Sequence[data.ClipPrediction],
     clip_annotations: Sequence[data.ClipAnnotation],
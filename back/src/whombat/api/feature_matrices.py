@@ -0,0 +1,311 @@
+"""Dense matrices of the features of sound events.
+
+Features are stored one row per sound event and feature name. Clustering,
+projections and active learning tools need them instead as a dense matrix
+with one row per annotation or prediction and one column per feature.
+
+Matrices are built in keyset-paginated batches: each batch of matching
+annotations or predictions is read with one query, their features with
+another, and the feature rows are scattered into a float32 block with
+NumPy, without building objects per row. Missing features are NaN.
+
+Matrices can be encoded as an Arrow IPC stream, which requires the
+optional ``pyarrow`` package, or as a NumPy ``.npz`` archive.
+"""
+
+import io
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models
+from whombat.api.io.aoef.common import BATCH_SIZE
+from whombat.api.io.arrow import import_pyarrow
+from whombat.filters.base import Filter
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+__all__ = [
+    "FILE_EXTENSIONS",
+    "MEDIA_TYPES",
+    "FeatureMatrix",
+    "MatrixFormat",
+    "encode_feature_matrix",
+    "get_feature_matrix",
+]
+
+MatrixFormat = Literal["arrow", "npz"]
+"""Formats of an encoded feature matrix.
+
+``arrow`` is an Arrow IPC stream with a ``uuid`` column and one float32
+column per feature. ``npz`` is a NumPy archive with the ``values``,
+``uuids`` and ``feature_names`` arrays.
+"""
+
+MEDIA_TYPES: dict[MatrixFormat, str] = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "npz": "application/octet-stream",
+}
+
+FILE_EXTENSIONS: dict[MatrixFormat, str] = {
+    "arrow": "arrows",
+    "npz": "npz",
+}
+
+SoundEventModel = (
+    type[models.SoundEventAnnotation] | type[models.SoundEventPrediction]
+)
+
+
+@dataclass
+class FeatureMatrix:
+    """Features of sound events as a dense matrix."""
+
+    ids: np.ndarray
+    """Database ids of the rows, in increasing order."""
+
+    uuids: list[UUID]
+    """UUIDs of the annotations or predictions of the rows."""
+
+    feature_names: list[str]
+    """Names of the features of the columns."""
+
+    values: np.ndarray
+    """Float32 array of shape (n_rows, n_features), NaN where missing."""
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_arrow(self) -> "pa.Table":
+        """Convert the matrix to an Arrow table."""
+        pa = import_pyarrow()
+        return pa.table(
+            {
+                "uuid": pa.array([str(uuid) for uuid in self.uuids]),
+                **{
+                    name: pa.array(self.values[:, column], type=pa.float32())
+                    for column, name in enumerate(self.feature_names)
+                },
+            }
+        )
+
+
+async def get_feature_matrix(
+    session: AsyncSession,
+    model: SoundEventModel = models.SoundEventAnnotation,
+    features: Sequence[str] | None = None,
+    filters: Sequence[Filter] | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> FeatureMatrix:
+    """Get the features of sound event annotations or predictions.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    model
+        Either `models.SoundEventAnnotation` or
+        `models.SoundEventPrediction`. There is one row per matching
+        object, in the order of their ids.
+    features
+        Names of the features of the columns, in order. Repeated names
+        are only included once. Features that do not exist are columns of
+        NaN. If None, all the features of the matching sound events are
+        included, sorted by name.
+    filters
+        Filters of the annotations or predictions.
+    batch_size
+        The number of rows read at once.
+
+    Returns
+    -------
+    FeatureMatrix
+    """
+    feature_names, feature_name_ids = await _get_columns(
+        session,
+        model,
+        features,
+        filters,
+    )
+
+    # NOTE: Columns are looked up by feature name id with searchsorted, so
+    # ids are kept sorted together with the column they map to.
+    known = feature_name_ids >= 0
+    sorter = np.argsort(feature_name_ids[known])
+    sorted_ids = feature_name_ids[known][sorter]
+    sorted_columns = np.flatnonzero(known)[sorter]
+
+    query = select(model.id, model.uuid, model.sound_event_id)
+    for filter in filters or []:
+        query = filter.filter(query)
+
+    ids: list[np.ndarray] = []
+    uuids: list[UUID] = []
+    blocks: list[np.ndarray] = []
+    last_id = 0
+    while True:
+        result = await session.execute(
+            query.where(model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        )
+        rows = result.tuples().all()
+        if not rows:
+            break
+
+        batch_ids, batch_uuids, sound_event_ids = zip(*rows, strict=True)
+        last_id = batch_ids[-1]
+        ids.append(np.array(batch_ids, dtype=np.int64))
+        uuids.extend(batch_uuids)
+        blocks.append(
+            await _get_block(
+                session,
+                np.array(sound_event_ids, dtype=np.int64),
+                sorted_ids,
+                sorted_columns,
+                len(feature_names),
+            )
+        )
+
+    return FeatureMatrix(
+        ids=np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64),
+        uuids=uuids,
+        feature_names=feature_names,
+        values=(
+            np.concatenate(blocks)
+            if blocks
+            else np.zeros((0, len(feature_names)), dtype=np.float32)
+        ),
+    )
+
+
+def encode_feature_matrix(
+    matrix: FeatureMatrix,
+    format: MatrixFormat = "arrow",
+) -> bytes:
+    """Encode a feature matrix for download.
+
+    Parameters
+    ----------
+    matrix
+        The feature matrix.
+    format
+        The format of the output, see `MatrixFormat`.
+
+    Returns
+    -------
+    bytes
+        The encoded matrix.
+
+    Raises
+    ------
+    whombat.exceptions.MissingDependencyError
+        If the format is ``arrow`` and pyarrow is not installed.
+    """
+    buffer = io.BytesIO()
+    if format == "arrow":
+        pa = import_pyarrow()
+        table = matrix.to_arrow()
+        with pa.ipc.new_stream(buffer, table.schema) as writer:
+            writer.write_table(table)
+    elif format == "npz":
+        np.savez(
+            buffer,
+            values=matrix.values,
+            uuids=np.array([str(uuid) for uuid in matrix.uuids], dtype="<U36"),
+            feature_names=np.array(matrix.feature_names, dtype=np.str_),
+        )
+    else:
+        raise ValueError(f"Unknown matrix format: {format!r}")
+
+    return buffer.getvalue()
+
+
+async def _get_columns(
+    session: AsyncSession,
+    model: SoundEventModel,
+    features: Sequence[str] | None,
+    filters: Sequence[Filter] | None,
+) -> tuple[list[str], np.ndarray]:
+    """Get the feature names and ids of the columns.
+
+    The id of features that do not exist is -1.
+    """
+    if features is not None:
+        # NOTE: Columns are looked up by feature name id, so each name
+        # must map to a single column.
+        features = list(dict.fromkeys(features))
+        result = await session.execute(
+            select(models.FeatureName.name, models.FeatureName.id).where(
+                models.FeatureName.name.in_(features)
+            )
+        )
+        ids = dict(result.tuples().all())
+        return list(features), np.array(
+            [ids.get(name, -1) for name in features],
+            dtype=np.int64,
+        )
+
+    sound_events = select(model.sound_event_id)
+    for filter in filters or []:
+        sound_events = filter.filter(sound_events)
+
+    result = await session.execute(
+        select(models.FeatureName.name, models.FeatureName.id)
+        .where(
+            models.FeatureName.id.in_(
+                select(models.SoundEventFeature.feature_name_id).where(
+                    models.SoundEventFeature.sound_event_id.in_(sound_events)
+                )
+            )
+        )
+        .order_by(models.FeatureName.name)
+    )
+    rows = result.tuples().all()
+    return [name for name, _ in rows], np.array(
+        [id for _, id in rows],
+        dtype=np.int64,
+    )
+
+
+async def _get_block(
+    session: AsyncSession,
+    sound_event_ids: np.ndarray,
+    sorted_ids: np.ndarray,
+    sorted_columns: np.ndarray,
+    num_columns: int,
+) -> np.ndarray:
+    """Read the features of a batch of sound events into a block."""
+    block = np.full((len(sound_event_ids), num_columns), np.nan, np.float32)
+    if not sorted_ids.size:
+        return block
+
+    result = await session.execute(
+        select(
+            models.SoundEventFeature.sound_event_id,
+            models.SoundEventFeature.feature_name_id,
+            models.SoundEventFeature.value,
+        ).where(
+            models.SoundEventFeature.sound_event_id.in_(
+                sound_event_ids.tolist()
+            ),
+            models.SoundEventFeature.feature_name_id.in_(sorted_ids.tolist()),
+        )
+    )
+    rows = np.array(result.tuples().all(), dtype=np.float64).reshape(-1, 3)
+
+    order = np.argsort(sound_event_ids)
+    row_index = order[
+        np.searchsorted(sound_event_ids[order], rows[:, 0].astype(np.int64))
+    ]
+    column_index = sorted_columns[
+        np.searchsorted(sorted_ids, rows[:, 1].astype(np.int64))
+    ]
+    block[row_index, column_index] = rows[:, 2]
+    return block
@@ -85,6 +85,34 @@ class FeatureNameAPI(
             self._update_cache(obj)
             return obj
 
+    async def get_or_create_many(
+        self,
+        session: AsyncSession,
+        names: Sequence[str],
+    ) -> dict[str, schemas.FeatureName]:
+        """Get or create many feature names at once.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        names
+            The names of the features.
+
+        Returns
+        -------
+        dict[str, schemas.FeatureName]
+            The feature names, by name.
+        """
+        feature_names = await self.create_many_without_duplicates(
+            session,
+            [{"name": name} for name in names],
+            return_all=True,
+        )
+        return {
+            feature_name.name: feature_name for feature_name in feature_names
+        }
+
     async def get_feature(
         self,
         session: AsyncSession,
@@ -170,6 +198,12 @@ class FeatureNameAPI(
     def _get_pk_from_obj(self, obj: schemas.FeatureName) -> str:
         return obj.name
 
+    def _key_fn(self, obj: dict):
+        return obj.get("name")
+
+    def _get_key_column(self):
+        return models.FeatureName.name
+
     def _get_pk_condition(self, pk: str) -> Any:
         return models.FeatureName.name == pk
 
@@ -1,24 +1,34 @@
+import asyncio
 import datetime
-import json
 from pathlib import Path
 from typing import BinaryIO
+from uuid import UUID
 
 from soundevent.io import aoef
 from soundevent.io.aoef import AnnotationProjectObject
+from soundevent.io.aoef.annotation_task import AnnotationTaskObject
+from soundevent.io.aoef.clip import ClipObject
+from soundevent.io.aoef.clip_annotations import ClipAnnotationsObject
+from soundevent.io.aoef.sound_event import SoundEventObject
+from soundevent.io.aoef.sound_event_annotation import (
+    SoundEventAnnotationObject,
+)
 from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
 from whombat.api.common import utils
-from whombat.api.io.aoef.annotation_tasks import get_annotation_tasks
-from whombat.api.io.aoef.clip_annotations import get_clip_annotations
-from whombat.api.io.aoef.clips import get_clips
+from whombat.api.io.aoef.annotation_tasks import import_annotation_task
+from whombat.api.io.aoef.clip_annotations import import_clip_annotations
+from whombat.api.io.aoef.clips import import_clips
+from whombat.api.io.aoef.common import BATCH_SIZE, get_mapping
 from whombat.api.io.aoef.features import get_feature_names
-from whombat.api.io.aoef.recordings import get_recordings
 from whombat.api.io.aoef.sound_event_annotations import (
-    get_sound_event_annotations,
+    get_clip_annotations_uuids,
+    import_sound_event_annotations,
 )
-from whombat.api.io.aoef.sound_events import get_sound_events
+from whombat.api.io.aoef.sound_events import import_sound_events
+from whombat.api.io.aoef.spool import AOEFSpool, spool_aoef
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
 from whombat.schemas.users import SimpleUser
@@ -30,93 +40,197 @@ async def import_annotation_project(
     audio_dir: Path,
     base_audio_dir: Path,
     imported_by: SimpleUser,
+    batch_size: int = BATCH_SIZE,
 ) -> models.AnnotationProject:
-    if isinstance(src, (Path, str)):
-        with open(src, "r") as file:
-            data = json.load(file)
-    else:
-        data = json.loads(src.read())
+    """Import an annotation project.
 
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected dict, got {type(data)}")
+    The file is read incrementally and its clips, sound events,
+    annotations and tasks are imported in batches of at most `batch_size`
+    objects, so that memory usage does not grow with the size of the file.
+    """
+    with await asyncio.to_thread(
+        spool_aoef,
+        src,
+        inline=("users", "tags", "project_tags"),
+    ) as spool:
+        obj = spool.validate(aoef.AnnotationProjectObject)
 
-    if "data" not in data:
-        raise ValueError("Missing 'data' key")
+        project = await get_or_create_annotation_project(session, obj)
 
-    obj = aoef.AnnotationProjectObject.model_validate(data["data"])
+        tags = await import_tags(session, obj.tags or [])
 
-    project = await get_or_create_annotation_project(session, obj)
+        users = await import_users(session, obj.users or [])
 
-    tags = await import_tags(session, obj.tags or [])
+        for clip_batch in spool.iter_batches(
+            "clips",
+            ClipObject,
+            batch_size=batch_size,
+        ):
+            feature_names = await get_feature_names(
+                session,
+                obj.model_copy(update=dict(clips=clip_batch)),
+            )
+            recordings = await get_mapping(
+                session,
+                {clip.recording for clip in clip_batch},
+                models.Recording,
+            )
+            await import_clips(
+                session,
+                clip_batch,
+                recordings=recordings,
+                feature_names=feature_names,
+            )
 
-    users = await import_users(session, obj.users or [])
+        for sound_event_batch in spool.iter_batches(
+            "sound_events",
+            SoundEventObject,
+            batch_size=batch_size,
+        ):
+            feature_names = await get_feature_names(
+                session,
+                obj.model_copy(update=dict(sound_events=sound_event_batch)),
+            )
+            recordings = await get_mapping(
+                session,
+                {sound_event.recording for sound_event in sound_event_batch},
+                models.Recording,
+            )
+            await import_sound_events(
+                session,
+                sound_event_batch,
+                recordings=recordings,
+                feature_names=feature_names,
+            )
 
-    feature_names = await get_feature_names(session, obj)
+        # NOTE: Clip annotations are imported together with the sound event
+        # annotations they contain, as these can only be created once the
+        # clip annotation exists.
+        for annotation_batch in spool.iter_batches(
+            "clip_annotations",
+            ClipAnnotationsObject,
+            batch_size=max(batch_size // 10, 1),
+        ):
+            await _import_clip_annotations_batch(
+                session,
+                spool,
+                annotation_batch,
+                users=users,
+                tags=tags,
+                imported_by=imported_by,
+            )
 
-    recordings = await get_recordings(
-        session,
-        obj,
-        tags=tags,
-        users=users,
-        feature_names=feature_names,
-        audio_dir=audio_dir,
-        base_audio_dir=base_audio_dir,
-        should_import=False,
-    )
+        for task_batch in spool.iter_batches(
+            "tasks",
+            AnnotationTaskObject,
+            batch_size=batch_size,
+        ):
+            await _import_annotation_tasks_batch(
+                session,
+                spool,
+                project,
+                task_batch,
+                users=users,
+            )
 
-    clips = await get_clips(
-        session,
-        obj,
-        recordings=recordings,
-        feature_names=feature_names,
-    )
+        await add_annotation_tags(
+            session,
+            obj,
+            project.id,
+            tags,
+        )
+
+    session.expire(project, ["tags"])
+
+    return project
 
-    sound_events = await get_sound_events(
+
+async def _import_clip_annotations_batch(
+    session: AsyncSession,
+    spool: AOEFSpool,
+    annotations: list[ClipAnnotationsObject],
+    users: dict[UUID, UUID],
+    tags: dict[int, int],
+    imported_by: SimpleUser,
+) -> None:
+    clips = await get_mapping(
         session,
-        obj,
-        recordings=recordings,
-        feature_names=feature_names,
+        {annotation.clip for annotation in annotations},
+        models.Clip,
     )
-
-    clip_annotations = await get_clip_annotations(
+    clip_annotations = await import_clip_annotations(
         session,
-        obj,
+        annotations,
         clips=clips,
         users=users,
         tags=tags,
-        user=imported_by,
+        imported_by=imported_by,
+    )
+
+    sound_event_annotations = spool.get_by_uuid(
+        "sound_event_annotations",
+        SoundEventAnnotationObject,
+        {
+            uuid
+            for annotation in annotations
+            for uuid in annotation.sound_events or []
+        },
     )
+    if not sound_event_annotations:
+        return
 
-    await get_sound_event_annotations(
+    sound_events = await get_mapping(
+        session,
+        {annotation.sound_event for annotation in sound_event_annotations},
+        models.SoundEvent,
+    )
+    (
+        sound_event_annotations,
+        clip_annotation_uuids,
+    ) = get_clip_annotations_uuids(sound_event_annotations, annotations)
+    await import_sound_event_annotations(
         session,
-        obj,
+        sound_event_annotations,
+        clip_annotation_uuids,
         sound_events=sound_events,
         clip_annotations=clip_annotations,
         users=users,
         tags=tags,
-        user=imported_by,
+        imported_by=imported_by,
     )
 
-    await get_annotation_tasks(
+
+async def _import_annotation_tasks_batch(
+    session: AsyncSession,
+    spool: AOEFSpool,
+    project: models.AnnotationProject,
+    tasks: list[AnnotationTaskObject],
+    users: dict[UUID, UUID],
+) -> None:
+    clip_uuids = {task.clip for task in tasks}
+    clip_annotation_mapping = {
+        annotation.clip: annotation.uuid
+        for annotation in spool.get_by_clip(
+            "clip_annotations",
+            ClipAnnotationsObject,
+            clip_uuids,
+        )
+    }
+    await import_annotation_task(
         session,
-        obj,
-        clips=clips,
+        tasks,
+        [project.uuid] * len(tasks),
+        clips=await get_mapping(session, clip_uuids, models.Clip),
         annotation_projects={project.uuid: project.id},
         users=users,
-        clip_annotations=clip_annotations,
-    )
-
-    await add_annotation_tags(
-        session,
-        obj,
-        project.id,
-        tags,
+        clip_annotations=await get_mapping(
+            session,
+            set(clip_annotation_mapping.values()),
+            models.ClipAnnotation,
+        ),
+        clip_annotation_mapping=clip_annotation_mapping,
     )
 
-    session.expire(project, ["tags"])
-
-    return project
-
 
 async def get_or_create_annotation_project(
     session: AsyncSession,
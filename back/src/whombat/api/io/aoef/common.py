@@ -11,6 +11,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
 
+BATCH_SIZE = 1000
+"""Number of objects imported or exported at once in AOEF files."""
+
 AOEFObject = (
     EvaluationObject
     | AnnotationSetObject
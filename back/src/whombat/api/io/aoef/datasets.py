@@ -1,15 +1,19 @@
-import json
+import asyncio
 from pathlib import Path
 from typing import BinaryIO
+from uuid import UUID
 
 from soundevent.io import aoef
+from soundevent.io.aoef.recording import RecordingObject
 from sqlalchemy import tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models
 from whombat.api import common
+from whombat.api.io.aoef.common import BATCH_SIZE
 from whombat.api.io.aoef.features import get_feature_names
 from whombat.api.io.aoef.recordings import import_recordings
+from whombat.api.io.aoef.spool import spool_aoef
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
 
@@ -19,19 +23,8 @@ async def import_dataset(
     src: Path | BinaryIO | str,
     dataset_dir: Path,
     audio_dir: Path,
+    batch_size: int = BATCH_SIZE,
 ) -> models.Dataset:
-    if isinstance(src, (Path, str)):
-        with open(src, "r") as file:
-            obj = json.load(file)
-    else:
-        obj = json.loads(src.read())
-
-    if not isinstance(obj, dict):
-        raise TypeError(f"Expected dict, got {type(obj)}")
-
-    if "data" not in obj:
-        raise ValueError("Missing 'data' key")
-
     if not dataset_dir.is_absolute():
         # Assume relative to audio_dir
         dataset_dir = audio_dir / dataset_dir
@@ -42,50 +35,72 @@ async def import_dataset(
             f"to audio directory {audio_dir}"
         )
 
-    data = obj["data"]
-    dataset_object = aoef.DatasetObject.model_validate(data)
-
-    tags = await import_tags(session, dataset_object.tags or [])
-
-    users = await import_users(session, dataset_object.users or [])
+    with await asyncio.to_thread(spool_aoef, src) as spool:
+        dataset_object = spool.validate(aoef.DatasetObject)
+
+        tags = await import_tags(session, dataset_object.tags or [])
+
+        users = await import_users(session, dataset_object.users or [])
+
+        try:
+            dataset = await common.get_object(
+                session,
+                models.Dataset,
+                models.Dataset.uuid == dataset_object.uuid,
+            )
+        except exceptions.NotFoundError:
+            dataset = await common.create_object(
+                session,
+                models.Dataset,
+                name=dataset_object.name,
+                description=dataset_object.description,
+                audio_dir=dataset_dir.relative_to(audio_dir),
+                uuid=dataset_object.uuid,
+            )
+
+        for batch in spool.iter_batches(
+            "recordings",
+            RecordingObject,
+            batch_size=batch_size,
+        ):
+            feature_names = await get_feature_names(
+                session,
+                dataset_object.model_copy(update=dict(recordings=batch)),
+            )
+
+            recordings = await import_recordings(
+                session,
+                batch,
+                tags=tags,
+                users=users,
+                feature_names=feature_names,
+                audio_dir=dataset_dir,
+                base_audio_dir=audio_dir,
+            )
+
+            await _add_dataset_recordings(
+                session,
+                dataset,
+                batch,
+                recordings,
+                dataset_dir,
+            )
 
-    feature_names = await get_feature_names(
-        session,
-        dataset_object,
-    )
-
-    recordings = await import_recordings(
-        session,
-        dataset_object.recordings or [],
-        tags=tags,
-        users=users,
-        feature_names=feature_names,
-        audio_dir=dataset_dir,
-        base_audio_dir=audio_dir,
-    )
+    return dataset
 
-    try:
-        dataset = await common.get_object(
-            session,
-            models.Dataset,
-            models.Dataset.uuid == dataset_object.uuid,
-        )
-    except exceptions.NotFoundError:
-        dataset = await common.create_object(
-            session,
-            models.Dataset,
-            name=dataset_object.name,
-            description=dataset_object.description,
-            audio_dir=dataset_dir.relative_to(audio_dir),
-            uuid=dataset_object.uuid,
-        )
 
+async def _add_dataset_recordings(
+    session: AsyncSession,
+    dataset: models.Dataset,
+    recording_objects: list[RecordingObject],
+    recordings: dict[UUID, int],
+    dataset_dir: Path,
+) -> None:
     path_mapping = {
         recording.uuid: normalize_path(recording.path, dataset_dir)
-        for recording in dataset_object.recordings or []
+        for recording in recording_objects
     }
 
-    # Create dataset recordings
     values = [
         {
             "recording_id": recording_id,
@@ -93,6 +108,7 @@ async def import_dataset(
             "path": path_mapping[recording_uuid],
         }
         for recording_uuid, recording_id in recordings.items()
+        if recording_uuid in path_mapping
     ]
     await common.create_objects_without_duplicates(
         session,
@@ -105,8 +121,6 @@ async def import_dataset(
         ),
     )
 
-    return dataset
-
 
 def normalize_path(path: Path, dataset_dir: Path) -> Path:
     """Normalize a path to a dataset directory."""
@@ -1,22 +1,27 @@
+import asyncio
 import datetime
-import json
 from pathlib import Path
 from typing import BinaryIO
 from uuid import UUID
 
 from soundevent.io.aoef import ModelRunObject
+from soundevent.io.aoef.clip_predictions import ClipPredictionsObject
+from soundevent.io.aoef.sound_event import SoundEventObject
+from soundevent.io.aoef.sound_event_prediction import (
+    SoundEventPredictionObject,
+)
 from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
 from whombat.api.io.aoef.clip_predictions import get_clip_predictions
-from whombat.api.io.aoef.clips import get_clips
+from whombat.api.io.aoef.common import BATCH_SIZE, get_mapping
 from whombat.api.io.aoef.features import get_feature_names
-from whombat.api.io.aoef.recordings import get_recordings
 from whombat.api.io.aoef.sound_event_predictions import (
     get_sound_event_predictions,
 )
-from whombat.api.io.aoef.sound_events import get_sound_events
+from whombat.api.io.aoef.sound_events import import_sound_events
+from whombat.api.io.aoef.spool import AOEFSpool, spool_aoef
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
 
@@ -26,62 +31,101 @@ async def import_model_run(
     src: Path | BinaryIO | str,
     audio_dir: Path,
     base_audio_dir: Path,
+    batch_size: int = BATCH_SIZE,
 ) -> models.ModelRun:
-    """Import model run."""
-    if isinstance(src, (Path, str)):
-        with open(src, "r") as file:
-            data = json.load(file)
-    else:
-        data = json.loads(src.read())
-
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected dict, got {type(data)}")
-
-    if "data" not in data:
-        raise ValueError("Missing 'data' key")
+    """Import model run.
+
+    The file is read incrementally and its sound events and predictions are
+    imported in batches of at most `batch_size` objects, so that memory
+    usage does not grow with the size of the file.
+    """
+    with await asyncio.to_thread(spool_aoef, src) as spool:
+        obj = spool.validate(ModelRunObject)
+
+        model_run = await get_or_create_model_run(session, obj)
+
+        tags = await import_tags(session, obj.tags or [])
+        await import_users(session, obj.users or [])
+
+        for batch in spool.iter_batches(
+            "sound_events",
+            SoundEventObject,
+            batch_size=batch_size,
+        ):
+            feature_names = await get_feature_names(
+                session,
+                obj.model_copy(update=dict(sound_events=batch)),
+            )
+            recordings = await get_mapping(
+                session,
+                {sound_event.recording for sound_event in batch},
+                models.Recording,
+            )
+            await import_sound_events(
+                session,
+                batch,
+                recordings=recordings,
+                feature_names=feature_names,
+            )
+
+        # NOTE: Clip predictions are imported together with the sound event
+        # predictions they contain, as these can only be created once the
+        # clip prediction exists.
+        for batch in spool.iter_batches(
+            "clip_predictions",
+            ClipPredictionsObject,
+            batch_size=max(batch_size // 10, 1),
+        ):
+            await _import_clip_predictions_batch(
+                session,
+                spool,
+                obj.model_copy(update=dict(clip_predictions=batch)),
+                model_run,
+                tags,
+            )
 
-    obj = ModelRunObject.model_validate(data["data"])
+    return model_run
 
-    model_run = await get_or_create_model_run(session, obj)
 
-    tags = await import_tags(session, obj.tags or [])
-    users = await import_users(session, obj.users or [])
-    feature_names = await get_feature_names(
+async def _import_clip_predictions_batch(
+    session: AsyncSession,
+    spool: AOEFSpool,
+    obj: ModelRunObject,
+    model_run: models.ModelRun,
+    tags: dict[int, int],
+) -> None:
+    clip_prediction_objects = obj.clip_predictions or []
+    clips = await get_mapping(
         session,
-        obj,
+        {clip_prediction.clip for clip_prediction in clip_prediction_objects},
+        models.Clip,
     )
-    recordings = await get_recordings(
+    clip_predictions = await get_clip_predictions(
         session,
         obj,
+        clips=clips,
         tags=tags,
-        users=users,
-        feature_names=feature_names,
-        audio_dir=audio_dir,
-        base_audio_dir=base_audio_dir,
-        should_import=False,
     )
-    clips = await get_clips(
-        session,
-        obj,
-        recordings=recordings,
-        feature_names=feature_names,
-        should_import=False,
+
+    sound_event_predictions = spool.get_by_uuid(
+        "sound_event_predictions",
+        SoundEventPredictionObject,
+        {
+            uuid
+            for clip_prediction in clip_prediction_objects
+            for uuid in clip_prediction.sound_events or []
+        },
     )
-    sound_events = await get_sound_events(
+    sound_events = await get_mapping(
         session,
-        obj,
-        recordings=recordings,
-        feature_names=feature_names,
-    )
-    clip_predictions = await get_clip_predictions(
-        session,
-        obj,
-        clips=clips,
-        tags=tags,
+        {prediction.sound_event for prediction in sound_event_predictions},
+        models.SoundEvent,
     )
     await get_sound_event_predictions(
         session,
-        obj,
+        obj.model_copy(
+            update=dict(sound_event_predictions=sound_event_predictions)
+        ),
         sound_events=sound_events,
         clip_predictions=clip_predictions,
         tags=tags,
@@ -94,8 +138,6 @@ async def import_model_run(
         clip_predictions,
     )
 
-    return model_run
-
 
 async def get_or_create_model_run(
     session: AsyncSession,
@@ -2,7 +2,6 @@ import logging
 from pathlib import Path
 from uuid import UUID
 
-from soundevent.audio import compute_md5_checksum
 from soundevent.io.aoef import (
     AnnotationSetObject,
     EvaluationObject,
@@ -16,6 +15,8 @@ from whombat import models
 from whombat.api.common import create_objects_without_duplicates
 from whombat.api.io.aoef.common import get_mapping
 from whombat.api.io.aoef.notes import import_notes
+from whombat.core import files
+from whombat.system import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -218,7 +219,7 @@ def _get_recording_hash(
         return rec.hash
 
     path = base_audio_dir / audio_dir / rec.path
-    return compute_md5_checksum(path)
+    return files.compute_hash(path, get_settings().hash_strategy)
 
 
 async def _create_recordings(
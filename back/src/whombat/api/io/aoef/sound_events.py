@@ -1,19 +1,25 @@
 import datetime
 from uuid import UUID
 
-from soundevent.geometry import compute_geometric_features
+import numpy as np
 from soundevent.io.aoef import (
     AnnotationSetObject,
     EvaluationObject,
     PredictionSetObject,
 )
 from soundevent.io.aoef.sound_event import SoundEventObject
-from sqlalchemy import bindparam, select, tuple_
+from sqlalchemy import bindparam, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
 from whombat.api import common
 from whombat.api.io.aoef.common import get_mapping
+from whombat.api.io.aoef.features import import_feature_names
+from whombat.core.geometry import (
+    GeometryBounds,
+    compute_many_geometric_features,
+    get_geometry_bounds,
+)
 
 
 async def get_sound_events(
@@ -56,12 +62,20 @@ async def import_sound_events(
     if not sound_events:
         return {}
 
+    bounds = {
+        sound_event.uuid: get_geometry_bounds(sound_event.geometry)
+        for sound_event in sound_events
+        # Do not import sound events without geometry
+        if sound_event.geometry is not None
+    }
+
     values = [
         {
             "uuid": sound_events.uuid,
             "recording_id": recordings[sound_events.recording],
             "geometry_type": sound_events.geometry.type,
             "geometry": sound_events.geometry,
+            **bounds[sound_events.uuid]._asdict(),
         }
         for sound_events in sound_events
         # Do not import sound events without geometry
@@ -95,6 +109,7 @@ async def import_sound_events(
         session,
         sound_events=sound_events,
         mapping=mapping,
+        bounds=bounds,
         feature_names=feature_names,
     )
 
@@ -105,68 +120,70 @@ async def _create_sound_event_features(
     session: AsyncSession,
     sound_events: list[SoundEventObject],
     mapping: dict[UUID, int],
+    bounds: dict[UUID, GeometryBounds],
     feature_names: dict[str, int],
 ) -> None:
-    values = []
-    for sound_event in sound_events:
-        if sound_event.geometry is None:
-            continue
-
-        sound_event_db_id = mapping.get(sound_event.uuid)
-        if sound_event_db_id is None:
-            continue
-
-        # Recompute the geometric features to ensure they are up-to-date.
-        geometric_features = compute_geometric_features(sound_event.geometry)
-
-        features = {}
-        if sound_event.features:
-            features.update(sound_event.features)
-
-        for feature in geometric_features:
-            features[feature.name] = feature.value
+    imported = [
+        (mapping[sound_event.uuid], sound_event)
+        for sound_event in sound_events
+        if sound_event.geometry is not None
+        if sound_event.uuid in mapping
+    ]
+    if not imported:
+        return
 
-        for name, value in features.items():
+    features: dict[tuple[int, int], float] = {}
+    for sound_event_db_id, sound_event in imported:
+        for name, value in (sound_event.features or {}).items():
             feature_name_db_id = feature_names.get(name)
 
             if feature_name_db_id is None:
                 continue
 
-            values.append(
-                {
-                    "sound_event_id": sound_event_db_id,
-                    "feature_name_id": feature_name_db_id,
-                    "value": value,
-                    "created_on": datetime.datetime.now(),
-                }
-            )
+            features[(sound_event_db_id, feature_name_db_id)] = value
+
+    # Recompute the geometric features to ensure they are up-to-date.
+    geometric_features = compute_many_geometric_features(
+        [sound_event.geometry for _, sound_event in imported],  # type: ignore
+        bounds=[bounds[sound_event.uuid] for _, sound_event in imported],
+    )
+    geometric_feature_names = await import_feature_names(
+        session,
+        list(geometric_features),
+    )
+    sound_event_db_ids = np.array([db_id for db_id, _ in imported])
+    for name, (indices, values) in geometric_features.items():
+        feature_name_db_id = geometric_feature_names[name]
+        for sound_event_db_id, value in zip(
+            sound_event_db_ids[indices].tolist(),
+            values.tolist(),
+            strict=True,
+        ):
+            features[(sound_event_db_id, feature_name_db_id)] = value
 
     result = await common.select_batched(
         session,
         statement=select(
             models.SoundEventFeature.sound_event_id,
             models.SoundEventFeature.feature_name_id,
-        ).where(
-            tuple_(
-                models.SoundEventFeature.sound_event_id,
-                models.SoundEventFeature.feature_name_id,
-            ).in_(bindparam("values"))
-        ),
-        parameter="values",
-        values=[(v["sound_event_id"], v["feature_name_id"]) for v in values],
+        ).where(models.SoundEventFeature.sound_event_id.in_(bindparam("ids"))),
+        parameter="ids",
+        values=sound_event_db_ids.tolist(),
     )
 
     existing = set(result)
+    created_on = datetime.datetime.now(datetime.timezone.utc)
     missing = [
-        v
-        for v in values
-        if (v["sound_event_id"], v["feature_name_id"]) not in existing
+        {
+            "sound_event_id": sound_event_db_id,
+            "feature_name_id": feature_name_db_id,
+            "value": value,
+            "created_on": created_on,
+        }
+        for (sound_event_db_id, feature_name_db_id), value in features.items()
+        if (sound_event_db_id, feature_name_db_id) not in existing
     ]
     if not missing:
         return
 
-    await common.insert_batched(
-        session,
-        model=models.SoundEventFeature,
-        values=missing,
-    )
+    await session.execute(insert(models.SoundEventFeature), missing)
@@ -0,0 +1,397 @@
+"""Incremental reading of large AOEF files.
+
+AOEF files store every object of a collection in flat lists (recordings,
+clips, sound events, predictions, ...) that reference each other by UUID.
+Loading such a file with ``json.load`` and validating it as a whole needs
+several times the size of the file in memory.
+
+Instead, the file is parsed incrementally and every item of these lists is
+written, as raw JSON, to a temporary SQLite database on disk. Importers can
+then read the items back in bounded, validated batches, in whatever order
+their dependencies require, and look up the items referenced by a batch.
+Only the scalar fields of the collection, and a few small lists such as
+users and tags, are kept in memory.
+"""
+
+import codecs
+import json
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Collection, Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any, BinaryIO, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+__all__ = [
+    "AOEFSpool",
+    "spool_aoef",
+]
+
+M = TypeVar("M", bound=BaseModel)
+
+CHUNK_SIZE = 1024 * 1024
+
+SQLITE_MAX_PARAMETERS = 500
+
+
+class AOEFSpool:
+    """The content of an AOEF file, spooled to disk.
+
+    Use `spool_aoef` to create a spool from a file.
+    """
+
+    def __init__(self, directory: Path):
+        self._directory = directory
+        self._connection = sqlite3.connect(
+            directory / "spool.db",
+            check_same_thread=False,
+        )
+        # The spool is temporary, so there is no need for durability.
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(
+            "CREATE TABLE item ("
+            " section TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " uuid TEXT,"
+            " clip TEXT,"
+            " content TEXT NOT NULL,"
+            " PRIMARY KEY (section, position)"
+            ")"
+        )
+        self.header: dict[str, Any] = {}
+        """Top level fields of the file other than ``data``."""
+
+        self.data: dict[str, Any] = {}
+        """Fields of the collection that were kept in memory."""
+
+        self.sections: set[str] = set()
+        """Names of the lists of the collection that were spooled."""
+
+    def validate(self, model: type[M]) -> M:
+        """Validate the fields of the collection kept in memory.
+
+        Spooled lists are left empty, read them with `iter_batches`.
+        """
+        return model.model_validate(
+            {**self.data, **{section: [] for section in self.sections}}
+        )
+
+    def count(self, section: str) -> int:
+        """Count the items of a section."""
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM item WHERE section = ?",
+            (section,),
+        ).fetchone()
+        return count
+
+    def iter_batches(
+        self,
+        section: str,
+        model: type[M],
+        batch_size: int = 1000,
+    ) -> Iterator[list[M]]:
+        """Iterate over the items of a section in validated batches.
+
+        Items are returned in the order in which they appear in the file.
+        """
+        position = -1
+        while True:
+            rows = self._connection.execute(
+                "SELECT position, content FROM item"
+                " WHERE section = ? AND position > ?"
+                " ORDER BY position LIMIT ?",
+                (section, position, batch_size),
+            ).fetchall()
+
+            if not rows:
+                return
+
+            position = rows[-1][0]
+            yield [model.model_validate_json(content) for _, content in rows]
+
+    def get_by_uuid(
+        self,
+        section: str,
+        model: type[M],
+        uuids: Iterable[UUID],
+    ) -> list[M]:
+        """Get the items of a section with the given UUIDs."""
+        return self._select(section, model, "uuid", uuids)
+
+    def get_by_clip(
+        self,
+        section: str,
+        model: type[M],
+        clips: Iterable[UUID],
+    ) -> list[M]:
+        """Get the items of a section that belong to the given clips."""
+        return self._select(section, model, "clip", clips)
+
+    def close(self) -> None:
+        """Close the spool and delete its temporary files."""
+        self._connection.close()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> "AOEFSpool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _select(
+        self,
+        section: str,
+        model: type[M],
+        column: str,
+        values: Iterable[UUID],
+    ) -> list[M]:
+        keys = sorted({str(value) for value in values})
+        items = []
+        for start in range(0, len(keys), SQLITE_MAX_PARAMETERS):
+            batch = keys[start : start + SQLITE_MAX_PARAMETERS]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self._connection.execute(
+                f"SELECT content FROM item WHERE section = ? "
+                f"AND {column} IN ({placeholders}) ORDER BY position",
+                (section, *batch),
+            ).fetchall()
+            items.extend(model.model_validate_json(row[0]) for row in rows)
+        return items
+
+    def _add(self, section: str, position: int, item: Any, raw: str) -> None:
+        uuid = clip = None
+        if isinstance(item, dict):
+            uuid = _as_key(item.get("uuid"))
+            clip = _as_key(item.get("clip"))
+
+        self._connection.execute(
+            "INSERT INTO item (section, position, uuid, clip, content) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (section, position, uuid, clip, raw),
+        )
+
+    def _index(self) -> None:
+        self._connection.execute(
+            "CREATE INDEX ix_item_uuid ON item (section, uuid)"
+        )
+        self._connection.execute(
+            "CREATE INDEX ix_item_clip ON item (section, clip)"
+        )
+        self._connection.commit()
+
+
+def spool_aoef(
+    src: Path | str | IO[bytes] | IO[str] | BinaryIO,
+    inline: Collection[str] = ("users", "tags"),
+) -> AOEFSpool:
+    """Spool the content of an AOEF file to disk.
+
+    Parameters
+    ----------
+    src
+        The path to the AOEF file, or an open file object in binary or
+        text mode.
+    inline
+        The lists of the collection that are small enough to be kept in
+        memory, in `AOEFSpool.data`. All other lists are spooled.
+
+    Returns
+    -------
+    spool : AOEFSpool
+        The spooled content. Close it once done, or use it as a context
+        manager.
+
+    Raises
+    ------
+    TypeError
+        If the file does not contain a JSON object.
+    ValueError
+        If the file is not valid JSON or has no ``data`` field.
+    """
+    spool = AOEFSpool(Path(tempfile.mkdtemp(prefix="whombat-aoef-")))
+
+    try:
+        if isinstance(src, (Path, str)):
+            with open(src, "rb") as fp:
+                _fill_spool(spool, _JSONReader(fp), inline)
+        else:
+            _fill_spool(spool, _JSONReader(src), inline)
+    except BaseException:
+        spool.close()
+        raise
+
+    return spool
+
+
+def _fill_spool(
+    spool: AOEFSpool,
+    reader: "_JSONReader",
+    inline: Collection[str],
+) -> None:
+    if reader.peek() != "{":
+        raise TypeError("Expected the AOEF file to contain a JSON object.")
+
+    has_data = False
+    for key in reader.iter_object():
+        if key != "data":
+            spool.header[key] = reader.read_value()[0]
+            continue
+
+        if reader.peek() != "{":
+            raise TypeError("Expected 'data' to be a JSON object.")
+
+        has_data = True
+        for section in reader.iter_object():
+            if reader.peek() != "[" or section in inline:
+                spool.data[section] = reader.read_value()[0]
+                continue
+
+            spool.sections.add(section)
+            for position, (item, raw) in enumerate(reader.iter_array()):
+                spool._add(section, position, item, raw)
+
+    if not has_data:
+        raise ValueError("Missing 'data' key")
+
+    spool._index()
+
+
+def _as_key(value: Any) -> str | None:
+    if value is None:
+        return None
+
+    try:
+        return str(UUID(str(value)))
+    except ValueError:
+        return str(value)
+
+
+class _JSONReader:
+    """Pull parser for the structure of a JSON document.
+
+    Objects and arrays are entered one level at a time, while values
+    nested deeper are decoded whole with `json.JSONDecoder.raw_decode`.
+    Only a window of the document is held in memory.
+    """
+
+    def __init__(self, fp: IO[bytes] | IO[str] | BinaryIO):
+        self._fp = fp
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """Return the next non whitespace character, or "" at the end."""
+        while True:
+            length = len(self._buffer)
+            while self._pos < length and self._buffer[self._pos] in " \t\n\r":
+                self._pos += 1
+
+            if self._pos < length:
+                return self._buffer[self._pos]
+
+            if not self._read_more():
+                return ""
+
+    def read_value(self) -> tuple[Any, str]:
+        """Decode the next value and return it with its raw JSON text."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                if self._read_more():
+                    continue
+                raise ValueError(
+                    f"Invalid JSON in AOEF file: {error}"
+                ) from error
+
+            # NOTE: A number at the end of the buffer might continue in the
+            # next chunk.
+            if end == len(self._buffer) and self._read_more():
+                continue
+
+            raw = self._buffer[self._pos : end]
+            self._pos = end
+            return value, raw.replace("\n", " ").replace("\r", " ")
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over the keys of the next object.
+
+        The value of each key must be consumed before advancing.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key, _ = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON in AOEF file: expected a key.")
+
+            self._expect(":")
+            yield key
+
+            if self._separator("}"):
+                return
+
+    def iter_array(self) -> Iterator[tuple[Any, str]]:
+        """Iterate over the items of the next array."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+
+            if self._separator("]"):
+                return
+
+    def _separator(self, closing: str) -> bool:
+        char = self.peek()
+        self._pos += 1
+
+        if char == ",":
+            return False
+
+        if char == closing:
+            return True
+
+        raise ValueError(
+            f"Invalid JSON in AOEF file: expected ',' or '{closing}', "
+            f"got {char!r}."
+        )
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Invalid JSON in AOEF file: expected {char!r}.")
+        self._pos += 1
+
+    def _read_more(self) -> bool:
+        if self._eof:
+            return False
+
+        # Read at least as much as is pending, so that a value spanning
+        # many chunks is decoded in linear time.
+        pending = len(self._buffer) - self._pos
+        chunk = self._fp.read(max(CHUNK_SIZE, pending))
+
+        if isinstance(chunk, bytes):
+            text = self._utf8.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+
+        if not chunk:
+            self._eof = True
+
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return bool(text)
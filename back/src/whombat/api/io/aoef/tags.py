@@ -4,7 +4,8 @@ from soundevent.io.aoef.tag import TagObject
 from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from whombat import models
+from whombat import models, schemas
+from whombat.api.tags import tags as tags_api
 
 
 async def import_tags(
@@ -52,6 +53,12 @@ async def import_tags(
     result = await session.execute(stmt)
     created = {(key, value): id for id, key, value in result.all()}
     mapping.update(created)
+    tags_api.add_to_index(
+        [
+            schemas.Tag(id=id, key=key, value=value)
+            for (key, value), id in created.items()
+        ]
+    )
 
     return {
         tag.id: mapping[(tag.key, tag.value)]
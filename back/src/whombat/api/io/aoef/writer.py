@@ -0,0 +1,214 @@
+"""Incremental writing of large AOEF files.
+
+`soundevent.io.aoef.to_aeof` needs the complete collection as a tree of
+`soundevent.data` objects, which for large collections does not fit in
+memory and delays the export until every object has been loaded.
+
+`AOEFWriter` instead writes the AOEF document piece by piece, so that
+exporters can load the collection in batches and send each batch as soon
+as it is converted. Items of the main lists of the collection are written
+directly. Objects referenced by them, such as recordings, clips or sound
+events, are collected from the `soundevent` adapters after every batch,
+deduplicated, and spooled to temporary files that are appended to the
+document at the end.
+"""
+
+import datetime
+import tempfile
+from collections.abc import Collection, Hashable, Iterator
+from typing import IO, Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from soundevent.io.aoef import AOEF_VERSION
+from soundevent.io.aoef.adapters import DataAdapter
+
+__all__ = [
+    "AOEFWriter",
+    "clear_adapter",
+]
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class AOEFWriter:
+    """Writer of an AOEF document in chunks of text.
+
+    Every method returns the next chunk of the document. The chunks must be
+    written out in the order in which they are returned.
+
+    Parameters
+    ----------
+    exclude_none
+        Whether to leave out fields of the exported objects that are None.
+    exclude
+        Names of the fields of the document, or of the collection, to leave
+        out.
+    """
+
+    def __init__(
+        self,
+        exclude_none: bool = False,
+        exclude: Collection[str] = (),
+    ):
+        self.exclude_none = exclude_none
+        self.exclude = set(exclude)
+        self._spools: dict[
+            str, tuple[DataAdapter, IO[str], set[Hashable]]
+        ] = {}
+        self._has_fields = False
+        self._has_items = False
+        self._skip_section = False
+        self._skip_data = "data" in self.exclude
+
+    def start(self, fields: dict[str, Any]) -> str:
+        """Start the document with the given fields of the collection."""
+        head = {
+            "version": AOEF_VERSION,
+            "created_on": datetime.datetime.now(),
+        }
+        chunk = "{" + ",".join(
+            _key(key) + _value(value)
+            for key, value in head.items()
+            if key not in self.exclude
+        )
+
+        if self._skip_data:
+            return chunk
+
+        comma = "," if len(chunk) > 1 else ""
+        return chunk + comma + '"data":{' + self.fields(fields)
+
+    def fields(self, fields: dict[str, Any]) -> str:
+        """Write fields of the collection."""
+        if self._skip_data:
+            return ""
+
+        return "".join(
+            self._field(key) + _value(value)
+            for key, value in fields.items()
+            if key not in self.exclude
+            if not (self.exclude_none and value is None)
+        )
+
+    def begin(self, section: str) -> str:
+        """Begin a list of the collection whose items are written next."""
+        self._has_items = False
+        self._skip_section = self._skip_data or section in self.exclude
+        if self._skip_section:
+            return ""
+        return self._field(section) + "["
+
+    def items(self, items: Collection[BaseModel]) -> str:
+        """Write items of the current list."""
+        if self._skip_section or not items:
+            return ""
+
+        chunk = ",".join(self._dump(item) for item in items)
+        if self._has_items:
+            chunk = "," + chunk
+
+        self._has_items = True
+        return chunk
+
+    def end(self) -> str:
+        """End the current list."""
+        if self._skip_section:
+            self._skip_section = False
+            return ""
+        return "]"
+
+    def spool(self, section: str, adapter: DataAdapter) -> None:
+        """Collect the objects of an adapter into a list of the collection.
+
+        The objects are taken from the adapter on every call to `collect`
+        and are written once, at the end of the document.
+        """
+        self._spools[section] = (
+            adapter,
+            tempfile.TemporaryFile("w+", encoding="utf-8"),
+            set(),
+        )
+
+    def collect(self) -> None:
+        """Move the objects converted by the spooled adapters to disk.
+
+        The adapters are cleared, so that their memory use is bounded by
+        the size of a batch.
+        """
+        for section, (adapter, fp, written) in self._spools.items():
+            # NOTE: Objects referenced from several batches are converted
+            # again in each of them, so they are only written the first time.
+            for obj in adapter.values() or []:
+                if obj.uuid in written or self._skips(section):
+                    continue
+
+                if written:
+                    fp.write(",")
+
+                fp.write(self._dump(obj))
+                written.add(obj.uuid)
+
+            clear_adapter(adapter)
+
+    def finish(self, fields: dict[str, Any] | None = None) -> Iterator[str]:
+        """Write the spooled lists and the given fields and end the document."""
+        self.collect()
+
+        for section, (_, fp, _) in self._spools.items():
+            if self._skips(section):
+                fp.close()
+                continue
+
+            yield self._field(section) + "["
+            fp.seek(0)
+            while chunk := fp.read(CHUNK_SIZE):
+                yield chunk
+            yield "]"
+            fp.close()
+
+        self._spools.clear()
+
+        if self._skip_data:
+            yield "}"
+            return
+
+        yield self.fields(fields or {}) + "}}"
+
+    def close(self) -> None:
+        """Delete any spooled data of an unfinished document."""
+        for _, fp, _ in self._spools.values():
+            fp.close()
+        self._spools.clear()
+
+    def _skips(self, section: str) -> bool:
+        return self._skip_data or section in self.exclude
+
+    def _field(self, key: str) -> str:
+        comma = "," if self._has_fields else ""
+        self._has_fields = True
+        return comma + _key(key)
+
+    def _dump(self, obj: BaseModel) -> str:
+        return obj.model_dump_json(exclude_none=self.exclude_none)
+
+
+def clear_adapter(adapter: DataAdapter) -> None:
+    """Forget the objects converted by an adapter.
+
+    `soundevent` adapters keep every object they convert and have no
+    public method to forget them. This is the only place where their
+    internal stores are touched, and is why `soundevent` is pinned to
+    major version 2.
+    """
+    adapter._mapping.clear()
+    adapter._aoef_store.clear()
+    adapter._soundevent_store.clear()
+
+
+def _key(key: str) -> str:
+    return to_json(key).decode() + ":"
+
+
+def _value(value: Any) -> str:
+    return to_json(value).decode()
@@ -0,0 +1,695 @@
+"""Columnar export of recordings, annotations and predictions.
+
+Exports are meant to be consumed by data analysis and machine learning
+pipelines, which prefer flat, typed tables over the nested AOEF format.
+Tables are written as Parquet files or Arrow IPC streams.
+
+Rows are read with plain SQL queries, in keyset-paginated batches, and
+each batch of rows is turned directly into an Arrow record batch, without
+building ORM objects or validating schemas per row. Tags and features of
+each batch are fetched with one query each and stored as list columns.
+
+Exports require the optional ``pyarrow`` package.
+"""
+
+import io
+from collections import defaultdict
+from collections.abc import AsyncGenerator, AsyncIterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic_core import to_json
+from sqlalchemy import LargeBinary, Select, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql._typing import ColumnExpressionArgument
+
+from whombat import exceptions, models
+from whombat.api.common import iter_rows_batched
+from whombat.api.io.aoef.common import BATCH_SIZE
+from whombat.core.geometry import unpack_geometry
+from whombat.filters.base import Filter
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+__all__ = [
+    "TableFormat",
+    "encode_batches",
+    "import_pyarrow",
+    "iter_recording_batches",
+    "iter_sound_event_annotation_batches",
+    "iter_sound_event_prediction_batches",
+    "recording_schema",
+    "sound_event_annotation_schema",
+    "sound_event_prediction_schema",
+    "stream_recordings",
+    "stream_sound_event_annotations",
+    "stream_sound_event_predictions",
+]
+
+TableFormat = Literal["parquet", "arrow"]
+"""Formats of a columnar export.
+
+``parquet`` is a Parquet file, ``arrow`` is an Arrow IPC stream.
+"""
+
+MEDIA_TYPES: dict[TableFormat, str] = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+FILE_EXTENSIONS: dict[TableFormat, str] = {
+    "parquet": "parquet",
+    "arrow": "arrows",
+}
+
+TableFilters = Sequence[Filter | ColumnExpressionArgument] | None
+
+
+def recording_schema() -> "pa.Schema":
+    """Get the schema of a recordings table."""
+    pa = import_pyarrow()
+    return pa.schema(
+        [
+            ("uuid", pa.string()),
+            ("hash", pa.string()),
+            ("path", pa.string()),
+            ("duration", pa.float64()),
+            ("samplerate", pa.int64()),
+            ("channels", pa.int64()),
+            ("time_expansion", pa.float64()),
+            ("date", pa.date32()),
+            ("time", pa.time64("us")),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("rights", pa.string()),
+            ("tags", _tags_type(pa)),
+            ("features", _features_type(pa)),
+            ("created_on", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+def sound_event_annotation_schema() -> "pa.Schema":
+    """Get the schema of a sound event annotations table."""
+    pa = import_pyarrow()
+    return pa.schema(
+        [
+            ("uuid", pa.string()),
+            ("clip_annotation_uuid", pa.string()),
+            ("clip_uuid", pa.string()),
+            ("recording_uuid", pa.string()),
+            ("sound_event_uuid", pa.string()),
+            *_geometry_fields(pa),
+            ("tags", _tags_type(pa)),
+            ("features", _features_type(pa)),
+            ("created_on", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+def sound_event_prediction_schema() -> "pa.Schema":
+    """Get the schema of a sound event predictions table."""
+    pa = import_pyarrow()
+    return pa.schema(
+        [
+            ("uuid", pa.string()),
+            ("clip_prediction_uuid", pa.string()),
+            ("clip_uuid", pa.string()),
+            ("recording_uuid", pa.string()),
+            ("sound_event_uuid", pa.string()),
+            ("score", pa.float64()),
+            *_geometry_fields(pa),
+            ("tags", _tags_type(pa, scored=True)),
+            ("features", _features_type(pa)),
+            ("created_on", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+async def iter_recording_batches(
+    session: AsyncSession,
+    *,
+    filters: TableFilters = None,
+    audio_dir: Path | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> AsyncGenerator["pa.RecordBatch", None]:
+    """Iterate over recordings as Arrow record batches.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    filters
+        Filters that select the recordings to export.
+    audio_dir
+        If given, recording paths are written relative to this directory
+        instead of the base audio directory.
+    batch_size
+        The maximum number of rows of a record batch.
+
+    Yields
+    ------
+    pa.RecordBatch
+    """
+    pa = import_pyarrow()
+    schema = recording_schema()
+    query = select(
+        models.Recording.id,
+        models.Recording.uuid,
+        models.Recording.hash,
+        models.Recording.path,
+        models.Recording.duration,
+        models.Recording.samplerate,
+        models.Recording.channels,
+        models.Recording.time_expansion,
+        models.Recording.date,
+        models.Recording.time,
+        models.Recording.latitude,
+        models.Recording.longitude,
+        models.Recording.rights,
+        models.Recording.created_on,
+    )
+
+    async for rows in iter_rows_batched(
+        session,
+        query,
+        models.Recording.id,
+        filters=filters,
+        batch_size=batch_size,
+    ):
+        ids = [row.id for row in rows]
+        tags = await _get_related(
+            session,
+            select(
+                models.RecordingTag.recording_id,
+                models.Tag.key,
+                models.Tag.value,
+            )
+            .join(models.Tag, models.Tag.id == models.RecordingTag.tag_id)
+            .where(models.RecordingTag.recording_id.in_(ids)),
+        )
+        features = await _get_related(
+            session,
+            select(
+                models.RecordingFeature.recording_id,
+                models.FeatureName.name,
+                models.RecordingFeature.value,
+            )
+            .join(
+                models.FeatureName,
+                models.FeatureName.id
+                == models.RecordingFeature.feature_name_id,
+            )
+            .where(models.RecordingFeature.recording_id.in_(ids)),
+        )
+        yield pa.RecordBatch.from_pydict(
+            {
+                "uuid": [str(row.uuid) for row in rows],
+                "hash": [row.hash for row in rows],
+                "path": [
+                    str(_relative_path(row.path, audio_dir)) for row in rows
+                ],
+                "duration": [row.duration for row in rows],
+                "samplerate": [row.samplerate for row in rows],
+                "channels": [row.channels for row in rows],
+                "time_expansion": [row.time_expansion for row in rows],
+                "date": [row.date for row in rows],
+                "time": [row.time for row in rows],
+                "latitude": [row.latitude for row in rows],
+                "longitude": [row.longitude for row in rows],
+                "rights": [row.rights for row in rows],
+                "tags": [tags.get(id_, []) for id_ in ids],
+                "features": [features.get(id_, []) for id_ in ids],
+                "created_on": [row.created_on for row in rows],
+            },
+            schema=schema,
+        )
+
+
+async def iter_sound_event_annotation_batches(
+    session: AsyncSession,
+    *,
+    filters: TableFilters = None,
+    batch_size: int = BATCH_SIZE,
+) -> AsyncGenerator["pa.RecordBatch", None]:
+    """Iterate over sound event annotations as Arrow record batches.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    filters
+        Filters that select the sound event annotations to export.
+    batch_size
+        The maximum number of rows of a record batch.
+
+    Yields
+    ------
+    pa.RecordBatch
+    """
+    pa = import_pyarrow()
+    schema = sound_event_annotation_schema()
+    query = (
+        select(
+            models.SoundEventAnnotation.id,
+            models.SoundEventAnnotation.uuid,
+            models.ClipAnnotation.uuid.label("clip_annotation_uuid"),
+            models.Clip.uuid.label("clip_uuid"),
+            models.Recording.uuid.label("recording_uuid"),
+            models.SoundEvent.id.label("sound_event_id"),
+            models.SoundEvent.uuid.label("sound_event_uuid"),
+            models.SoundEvent.geometry_type,
+            type_coerce(
+                models.SoundEvent.geometry,
+                LargeBinary,
+            ).label("geometry"),
+            models.SoundEvent.start_time,
+            models.SoundEvent.end_time,
+            models.SoundEvent.low_freq,
+            models.SoundEvent.high_freq,
+            models.SoundEventAnnotation.created_on,
+        )
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventAnnotation.sound_event_id,
+        )
+        .join(
+            models.Recording,
+            models.Recording.id == models.SoundEvent.recording_id,
+        )
+        .join(
+            models.ClipAnnotation,
+            models.ClipAnnotation.id
+            == models.SoundEventAnnotation.clip_annotation_id,
+        )
+        .join(models.Clip, models.Clip.id == models.ClipAnnotation.clip_id)
+    )
+
+    async for rows in iter_rows_batched(
+        session,
+        query,
+        models.SoundEventAnnotation.id,
+        filters=filters,
+        batch_size=batch_size,
+    ):
+        ids = [row.id for row in rows]
+        tags = await _get_related(
+            session,
+            select(
+                models.SoundEventAnnotationTag.sound_event_annotation_id,
+                models.Tag.key,
+                models.Tag.value,
+            )
+            .join(
+                models.Tag,
+                models.Tag.id == models.SoundEventAnnotationTag.tag_id,
+            )
+            .where(
+                models.SoundEventAnnotationTag.sound_event_annotation_id.in_(
+                    ids
+                )
+            ),
+        )
+        features = await _get_sound_event_features(
+            session,
+            [row.sound_event_id for row in rows],
+        )
+        yield pa.RecordBatch.from_pydict(
+            {
+                "uuid": [str(row.uuid) for row in rows],
+                "clip_annotation_uuid": [
+                    str(row.clip_annotation_uuid) for row in rows
+                ],
+                "clip_uuid": [str(row.clip_uuid) for row in rows],
+                "recording_uuid": [str(row.recording_uuid) for row in rows],
+                "sound_event_uuid": [
+                    str(row.sound_event_uuid) for row in rows
+                ],
+                **_geometry_columns(rows),
+                "tags": [tags.get(id_, []) for id_ in ids],
+                "features": [
+                    features.get(row.sound_event_id, []) for row in rows
+                ],
+                "created_on": [row.created_on for row in rows],
+            },
+            schema=schema,
+        )
+
+
+async def iter_sound_event_prediction_batches(
+    session: AsyncSession,
+    *,
+    filters: TableFilters = None,
+    batch_size: int = BATCH_SIZE,
+) -> AsyncGenerator["pa.RecordBatch", None]:
+    """Iterate over sound event predictions as Arrow record batches.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    filters
+        Filters that select the sound event predictions to export.
+    batch_size
+        The maximum number of rows of a record batch.
+
+    Yields
+    ------
+    pa.RecordBatch
+    """
+    pa = import_pyarrow()
+    schema = sound_event_prediction_schema()
+    query = (
+        select(
+            models.SoundEventPrediction.id,
+            models.SoundEventPrediction.uuid,
+            models.ClipPrediction.uuid.label("clip_prediction_uuid"),
+            models.Clip.uuid.label("clip_uuid"),
+            models.Recording.uuid.label("recording_uuid"),
+            models.SoundEvent.id.label("sound_event_id"),
+            models.SoundEvent.uuid.label("sound_event_uuid"),
+            models.SoundEventPrediction.score,
+            models.SoundEvent.geometry_type,
+            type_coerce(
+                models.SoundEvent.geometry,
+                LargeBinary,
+            ).label("geometry"),
+            models.SoundEvent.start_time,
+            models.SoundEvent.end_time,
+            models.SoundEvent.low_freq,
+            models.SoundEvent.high_freq,
+            models.SoundEventPrediction.created_on,
+        )
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventPrediction.sound_event_id,
+        )
+        .join(
+            models.Recording,
+            models.Recording.id == models.SoundEvent.recording_id,
+        )
+        .join(
+            models.ClipPrediction,
+            models.ClipPrediction.id
+            == models.SoundEventPrediction.clip_prediction_id,
+        )
+        .join(models.Clip, models.Clip.id == models.ClipPrediction.clip_id)
+    )
+
+    async for rows in iter_rows_batched(
+        session,
+        query,
+        models.SoundEventPrediction.id,
+        filters=filters,
+        batch_size=batch_size,
+    ):
+        ids = [row.id for row in rows]
+        tags = await _get_related(
+            session,
+            select(
+                models.SoundEventPredictionTag.sound_event_prediction_id,
+                models.Tag.key,
+                models.Tag.value,
+                models.SoundEventPredictionTag.score,
+            )
+            .join(
+                models.Tag,
+                models.Tag.id == models.SoundEventPredictionTag.tag_id,
+            )
+            .where(
+                models.SoundEventPredictionTag.sound_event_prediction_id.in_(
+                    ids
+                )
+            ),
+        )
+        features = await _get_sound_event_features(
+            session,
+            [row.sound_event_id for row in rows],
+        )
+        yield pa.RecordBatch.from_pydict(
+            {
+                "uuid": [str(row.uuid) for row in rows],
+                "clip_prediction_uuid": [
+                    str(row.clip_prediction_uuid) for row in rows
+                ],
+                "clip_uuid": [str(row.clip_uuid) for row in rows],
+                "recording_uuid": [str(row.recording_uuid) for row in rows],
+                "sound_event_uuid": [
+                    str(row.sound_event_uuid) for row in rows
+                ],
+                "score": [row.score for row in rows],
+                **_geometry_columns(rows),
+                "tags": [tags.get(id_, []) for id_ in ids],
+                "features": [
+                    features.get(row.sound_event_id, []) for row in rows
+                ],
+                "created_on": [row.created_on for row in rows],
+            },
+            schema=schema,
+        )
+
+
+async def encode_batches(
+    batches: AsyncIterable["pa.RecordBatch"],
+    schema: "pa.Schema",
+    format: TableFormat = "parquet",
+) -> AsyncGenerator[bytes, None]:
+    """Encode record batches as a Parquet file or an Arrow IPC stream.
+
+    The encoded bytes are yielded after every batch, so the table can be
+    sent to a client while it is still being read from the database. Each
+    record batch becomes a row group of the Parquet file.
+
+    Parameters
+    ----------
+    batches
+        The record batches of the table.
+    schema
+        The schema of the table. All batches must have this schema.
+    format
+        The format of the output.
+
+    Yields
+    ------
+    bytes
+        The next chunk of the encoded table.
+    """
+    pa = import_pyarrow()
+    sink = _ChunkSink()
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema)
+    elif format == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    else:
+        raise ValueError(f"Unknown table format: {format!r}")
+
+    try:
+        async for batch in batches:
+            writer.write_batch(batch)
+            if chunk := sink.drain():
+                yield chunk
+    finally:
+        writer.close()
+
+    if chunk := sink.drain():
+        yield chunk
+
+
+def stream_recordings(
+    session: AsyncSession,
+    *,
+    filters: TableFilters = None,
+    audio_dir: Path | None = None,
+    format: TableFormat = "parquet",
+    batch_size: int = BATCH_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """Export recordings as a table, in chunks of bytes.
+
+    See `iter_recording_batches` for the parameters.
+    """
+    return encode_batches(
+        iter_recording_batches(
+            session,
+            filters=filters,
+            audio_dir=audio_dir,
+            batch_size=batch_size,
+        ),
+        recording_schema(),
+        format=format,
+    )
+
+
+def stream_sound_event_annotations(
+    session: AsyncSession,
+    *,
+    filters: TableFilters = None,
+    format: TableFormat = "parquet",
+    batch_size: int = BATCH_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """Export sound event annotations as a table, in chunks of bytes.
+
+    See `iter_sound_event_annotation_batches` for the parameters.
+    """
+    return encode_batches(
+        iter_sound_event_annotation_batches(
+            session,
+            filters=filters,
+            batch_size=batch_size,
+        ),
+        sound_event_annotation_schema(),
+        format=format,
+    )
+
+
+def stream_sound_event_predictions(
+    session: AsyncSession,
+    *,
+    filters: TableFilters = None,
+    format: TableFormat = "parquet",
+    batch_size: int = BATCH_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """Export sound event predictions as a table, in chunks of bytes.
+
+    See `iter_sound_event_prediction_batches` for the parameters.
+    """
+    return encode_batches(
+        iter_sound_event_prediction_batches(
+            session,
+            filters=filters,
+            batch_size=batch_size,
+        ),
+        sound_event_prediction_schema(),
+        format=format,
+    )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects the bytes written to it."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def import_pyarrow():
+    """Import the optional pyarrow package.
+
+    Raises
+    ------
+    whombat.exceptions.MissingDependencyError
+        If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise exceptions.MissingDependencyError(
+            "Parquet and Arrow downloads require the pyarrow package. "
+            "Install it with `pip install whombat[arrow]`."
+        ) from error
+
+    return pyarrow
+
+
+def _tags_type(pa, scored: bool = False) -> "pa.DataType":
+    fields = [("key", pa.string()), ("value", pa.string())]
+    if scored:
+        fields.append(("score", pa.float64()))
+    return pa.list_(pa.struct(fields))
+
+
+def _features_type(pa) -> "pa.DataType":
+    return pa.list_(
+        pa.struct([("name", pa.string()), ("value", pa.float64())])
+    )
+
+
+def _geometry_fields(pa) -> list[tuple[str, "pa.DataType"]]:
+    return [
+        ("geometry_type", pa.string()),
+        ("geometry", pa.string()),
+        ("start_time", pa.float64()),
+        ("end_time", pa.float64()),
+        ("low_freq", pa.float64()),
+        ("high_freq", pa.float64()),
+    ]
+
+
+def _geometry_columns(rows: Sequence[Any]) -> dict[str, list]:
+    return {
+        "geometry_type": [row.geometry_type for row in rows],
+        "geometry": [_geometry_json(row.geometry) for row in rows],
+        "start_time": [row.start_time for row in rows],
+        "end_time": [row.end_time for row in rows],
+        "low_freq": [row.low_freq for row in rows],
+        "high_freq": [row.high_freq for row in rows],
+    }
+
+
+def _geometry_json(value: bytes) -> str:
+    geometry_type, coordinates = unpack_geometry(value)
+    return to_json(
+        {"type": geometry_type, "coordinates": coordinates}
+    ).decode()
+
+
+def _relative_path(path: Path, audio_dir: Path | None) -> Path:
+    if audio_dir is None:
+        return path
+
+    try:
+        return path.relative_to(audio_dir)
+    except ValueError:
+        return path
+
+
+async def _get_related(
+    session: AsyncSession,
+    stmt: Select,
+) -> dict[int, list[dict[str, Any]]]:
+    """Group the rows of a query by their first column."""
+    result = await session.execute(stmt)
+    _, *keys = result.keys()
+    related = defaultdict(list)
+    for owner_id, *values in result.all():
+        related[owner_id].append(dict(zip(keys, values, strict=True)))
+    return related
+
+
+async def _get_sound_event_features(
+    session: AsyncSession,
+    sound_event_ids: list[int],
+) -> dict[int, list[dict[str, Any]]]:
+    return await _get_related(
+        session,
+        select(
+            models.SoundEventFeature.sound_event_id,
+            models.FeatureName.name,
+            models.SoundEventFeature.value,
+        )
+        .join(
+            models.FeatureName,
+            models.FeatureName.id == models.SoundEventFeature.feature_name_id,
+        )
+        .where(models.SoundEventFeature.sound_event_id.in_(sound_event_ids)),
+    )
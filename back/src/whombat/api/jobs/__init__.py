@@ -0,0 +1,21 @@
+"""Python API to run long operations as background jobs."""
+
+# NOTE: The handlers are imported to register them with the job API.
+from whombat.api.jobs import handlers  # noqa: F401
+from whombat.api.jobs.queue import (
+    JobAPI,
+    JobCancelled,
+    JobContext,
+    JobHandler,
+    jobs,
+)
+from whombat.api.jobs.worker import JobWorker
+
+__all__ = [
+    "JobAPI",
+    "JobCancelled",
+    "JobContext",
+    "JobHandler",
+    "JobWorker",
+    "jobs",
+]
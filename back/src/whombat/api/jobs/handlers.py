@@ -0,0 +1,356 @@
+"""Handlers of the operations that run as jobs.
+
+Each handler reads its parameters from the `JobContext`, runs an operation
+of the Python API and returns a JSON serializable result. Exports write
+their document to a file in the directory of the job and return its name
+under the ``file`` key, so that it can be downloaded once the job is done.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+from whombat import exceptions, schemas
+from whombat.api.annotation_projects import annotation_projects
+from whombat.api.datasets import datasets
+from whombat.api.evaluation_sets import evaluation_sets
+from whombat.api.evaluations import evaluations
+from whombat.api.io import aoef
+from whombat.api.jobs.queue import JobContext, jobs
+from whombat.api.model_runs import model_runs
+
+__all__ = [
+    "create_dataset",
+    "evaluate_model_run",
+    "export_annotation_project",
+    "export_dataset",
+    "export_evaluation_set",
+    "import_annotation_project",
+    "import_dataset",
+    "import_evaluation_set",
+    "import_model_run",
+    "register_dataset_files",
+]
+
+REPORT_EVERY = 100
+"""Number of chunks written between progress reports of exports."""
+
+
+@jobs.register("create_dataset")
+async def create_dataset(context: JobContext) -> dict[str, Any]:
+    """Create a dataset and register its audio files.
+
+    Parameters are the ``name``, ``description`` and ``audio_dir`` of the
+    dataset.
+    """
+    dataset = await datasets.create(
+        context.session,
+        name=context.parameters["name"],
+        description=context.parameters.get("description"),
+        dataset_dir=Path(context.parameters["audio_dir"]),
+        audio_dir=context.audio_dir,
+        register=False,
+    )
+    await context.session.commit()
+    await _register_files(context, dataset)
+    return {"dataset_uuid": str(dataset.uuid)}
+
+
+@jobs.register("register_dataset_files")
+async def register_dataset_files(context: JobContext) -> dict[str, Any]:
+    """Register the unregistered audio files of a dataset.
+
+    The only parameter is the ``dataset_uuid``.
+    """
+    dataset = await datasets.get(
+        context.session,
+        UUID(context.parameters["dataset_uuid"]),
+    )
+    dataset = await _register_files(context, dataset)
+    return {
+        "dataset_uuid": str(dataset.uuid),
+        "recording_count": dataset.recording_count,
+    }
+
+
+@jobs.register("import_dataset")
+async def import_dataset(context: JobContext) -> dict[str, Any]:
+    """Import a dataset from an AOEF file.
+
+    Parameters are the name of the uploaded ``file`` and the ``audio_dir``
+    of the dataset.
+    """
+    await context.report(0, "Importing dataset")
+    dataset = await datasets.import_dataset(
+        context.session,
+        context.get_file(context.parameters["file"]),
+        dataset_audio_dir=Path(context.parameters["audio_dir"]),
+        audio_dir=context.audio_dir,
+    )
+    return {"dataset_uuid": str(dataset.uuid)}
+
+
+@jobs.register("export_dataset")
+async def export_dataset(context: JobContext) -> dict[str, Any]:
+    """Export a dataset to an AOEF file.
+
+    The only parameter is the ``dataset_uuid``.
+    """
+    dataset = await datasets.get(
+        context.session,
+        UUID(context.parameters["dataset_uuid"]),
+    )
+    return await _write_file(
+        context,
+        "dataset.json",
+        datasets.stream_aoef(
+            context.session,
+            dataset,
+            audio_dir=context.audio_dir,
+        ),
+    )
+
+
+@jobs.register("import_annotation_project")
+async def import_annotation_project(context: JobContext) -> dict[str, Any]:
+    """Import an annotation project from an AOEF file.
+
+    The only parameter is the name of the uploaded ``file``.
+    """
+    user = await _get_user(context)
+    await context.report(0, "Importing annotation project")
+    db_project = await aoef.import_annotation_project(
+        context.session,
+        context.get_file(context.parameters["file"]),
+        audio_dir=context.audio_dir,
+        base_audio_dir=context.audio_dir,
+        imported_by=user,
+    )
+    await context.session.commit()
+    return {"annotation_project_uuid": str(db_project.uuid)}
+
+
+@jobs.register("export_annotation_project")
+async def export_annotation_project(context: JobContext) -> dict[str, Any]:
+    """Export an annotation project to an AOEF file.
+
+    The only parameter is the ``annotation_project_uuid``.
+    """
+    project = await annotation_projects.get(
+        context.session,
+        UUID(context.parameters["annotation_project_uuid"]),
+    )
+    base_dir = await annotation_projects.get_base_dir(
+        context.session,
+        project,
+    )
+    return await _write_file(
+        context,
+        "annotation_project.json",
+        annotation_projects.stream_aoef(
+            context.session,
+            project,
+            audio_dir=context.audio_dir / base_dir,
+        ),
+    )
+
+
+@jobs.register("import_model_run")
+async def import_model_run(context: JobContext) -> dict[str, Any]:
+    """Import a model run from an AOEF file.
+
+    Parameters are the name of the uploaded ``file`` and, optionally, the
+    ``evaluation_set_uuid`` of the evaluation set to add the model run to.
+    """
+    evaluation_set_uuid = context.parameters.get("evaluation_set_uuid")
+    evaluation_set = None
+    if evaluation_set_uuid is not None:
+        evaluation_set = await evaluation_sets.get(
+            context.session,
+            UUID(evaluation_set_uuid),
+        )
+
+    await context.report(0, "Importing model run")
+    db_model_run = await aoef.import_model_run(
+        context.session,
+        context.get_file(context.parameters["file"]),
+        audio_dir=context.audio_dir,
+        base_audio_dir=context.audio_dir,
+    )
+    await context.session.commit()
+    await context.session.refresh(db_model_run)
+    model_run = schemas.ModelRun.model_validate(db_model_run)
+
+    if evaluation_set is not None:
+        await evaluation_sets.add_model_run(
+            context.session,
+            evaluation_set,
+            model_run,
+        )
+
+    return {"model_run_uuid": str(model_run.uuid)}
+
+
+@jobs.register("evaluate_model_run")
+async def evaluate_model_run(context: JobContext) -> dict[str, Any]:
+    """Evaluate a model run on an evaluation set.
+
+    Parameters are the ``model_run_uuid`` and the ``evaluation_set_uuid``.
+    Every evaluated batch is committed, so the progress is visible and the
+    job can be cancelled while it runs. If the job fails or is cancelled, a
+    new evaluation is deleted, and the staging evaluation of an update is
+    deleted so that the existing evaluation is left as it was.
+    """
+    session = context.session
+    model_run = await model_runs.get(
+        session,
+        UUID(context.parameters["model_run_uuid"]),
+    )
+    evaluation_set = await evaluation_sets.get(
+        session,
+        UUID(context.parameters["evaluation_set_uuid"]),
+    )
+    user = await _get_user(context)
+    _, total = await model_runs.get_clip_predictions(
+        session,
+        model_run,
+        limit=0,
+    )
+
+    async def callback(processed: int) -> None:
+        await context.report(
+            processed / total if total else 1,
+            f"Evaluated {processed} of {total} clips",
+        )
+        await session.commit()
+
+    evaluation_uuid = uuid4()
+    try:
+        evaluation = await evaluations.evaluate_model_run(
+            session,
+            model_run,
+            evaluation_set,
+            audio_dir=context.audio_dir,
+            user=user,
+            callback=callback,
+            uuid=evaluation_uuid,
+        )
+    except BaseException:
+        await session.rollback()
+        await _delete_evaluation(context, evaluation_uuid)
+        raise
+
+    return {"evaluation_uuid": str(evaluation.uuid)}
+
+
+@jobs.register("import_evaluation_set")
+async def import_evaluation_set(context: JobContext) -> dict[str, Any]:
+    """Import an evaluation set from an AOEF file.
+
+    Parameters are the name of the uploaded ``file`` and the ``task`` of
+    the evaluation set.
+    """
+    user = await _get_user(context)
+    await context.report(0, "Importing evaluation set")
+    obj = json.loads(context.get_file(context.parameters["file"]).read_text())
+    db_evaluation_set = await aoef.import_evaluation_set(
+        context.session,
+        obj,
+        audio_dir=context.audio_dir,
+        base_audio_dir=context.audio_dir,
+        task=context.parameters["task"],
+        imported_by=user,
+    )
+    await context.session.commit()
+    return {"evaluation_set_uuid": str(db_evaluation_set.uuid)}
+
+
+@jobs.register("export_evaluation_set")
+async def export_evaluation_set(context: JobContext) -> dict[str, Any]:
+    """Export an evaluation set to an AOEF file.
+
+    Parameters are the ``evaluation_set_uuid`` and, optionally, a list of
+    fields to ``exclude``.
+    """
+    evaluation_set = await evaluation_sets.get(
+        context.session,
+        UUID(context.parameters["evaluation_set_uuid"]),
+    )
+    return await _write_file(
+        context,
+        "evaluation_set.json",
+        evaluation_sets.stream_aoef(
+            context.session,
+            evaluation_set,
+            audio_dir=context.audio_dir,
+            exclude_none=True,
+            exclude=context.parameters.get("exclude") or [],
+        ),
+    )
+
+
+async def _get_user(context: JobContext) -> schemas.SimpleUser:
+    user = await context.get_user()
+    if user is None:
+        raise ValueError("This job must be submitted by a user.")
+    return user
+
+
+async def _register_files(
+    context: JobContext,
+    dataset: schemas.Dataset,
+) -> schemas.Dataset:
+    async def callback(registration: schemas.DatasetRegistration) -> None:
+        await context.report(
+            registration.processed_files / registration.total_files
+            if registration.total_files
+            else 1,
+            f"Registered {registration.processed_files} of "
+            f"{registration.total_files} files",
+            details=registration.model_dump(
+                mode="json",
+                exclude={"status", "error"},
+            ),
+        )
+        # NOTE: Registered files are committed after every batch, so the
+        # progress is committed as well to make it visible.
+        await context.session.commit()
+
+    return await datasets.register_files(
+        context.session,
+        dataset,
+        audio_dir=context.audio_dir,
+        callback=callback,
+    )
+
+
+async def _write_file(
+    context: JobContext,
+    name: str,
+    chunks: AsyncIterator[str],
+) -> dict[str, Any]:
+    context.work_dir.mkdir(parents=True, exist_ok=True)
+    path = context.get_file(name)
+
+    with path.open("w") as file:
+        count = 0
+        async for chunk in chunks:
+            file.write(chunk)
+            count += 1
+            if count % REPORT_EVERY == 0:
+                await context.report(0, f"Written {count} chunks")
+                await context.session.commit()
+
+    return {"file": path.name, "size": path.stat().st_size}
+
+
+async def _delete_evaluation(context: JobContext, uuid: UUID) -> None:
+    try:
+        evaluation = await evaluations.get(context.session, uuid)
+    except exceptions.NotFoundError:
+        return
+
+    await evaluations.delete(context.session, evaluation)
+    await context.session.commit()
@@ -0,0 +1,568 @@
+"""API functions to submit and run jobs."""
+
+import asyncio
+import datetime
+import logging
+import shutil
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import UUID
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import exceptions, models, schemas
+from whombat.api.common import BaseAPI
+from whombat.api.users import users
+from whombat.system.data import get_whombat_jobs_dir
+from whombat.system.settings import get_settings
+
+__all__ = [
+    "JobAPI",
+    "JobCancelled",
+    "JobContext",
+    "JobHandler",
+    "jobs",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised within a job handler when the job is asked to stop."""
+
+
+class JobContext:
+    """Access to a running job for its handler.
+
+    Handlers read their parameters and write their files through the
+    context, and call `report` to record their progress and to stop early
+    when the job is cancelled.
+
+    Progress is written with the session of the job, so other connections
+    see it once the handler commits. Handlers of long operations should
+    commit at checkpoints and report after each one.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        job: schemas.Job,
+        work_dir: Path,
+        audio_dir: Path,
+    ):
+        self.session = session
+        self.job = job
+        self.work_dir = work_dir
+        self.audio_dir = audio_dir
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        """The parameters of the job."""
+        return self.job.parameters
+
+    def get_file(self, name: str) -> Path:
+        """Get the path of a file in the directory of the job."""
+        return self.work_dir / Path(name).name
+
+    async def get_user(self) -> schemas.SimpleUser | None:
+        """Get the user that submitted the job, if any."""
+        if self.job.created_by_id is None:
+            return None
+        return await users.get(self.session, self.job.created_by_id)
+
+    async def report(
+        self,
+        progress: float,
+        message: str | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        """Record the progress of the job.
+
+        Parameters
+        ----------
+        progress
+            The fraction of the job that is done, between 0 and 1.
+        message
+            A description of what the job is doing.
+        details
+            Structured details of the progress, such as processing rates.
+            Must be JSON serializable.
+
+        Raises
+        ------
+        JobCancelled
+            If the job was asked to stop.
+        """
+        cancel_requested = await self.session.scalar(
+            select(models.Job.cancel_requested).where(
+                models.Job.id == self.job.id
+            )
+        )
+        if cancel_requested:
+            raise JobCancelled
+
+        await self.session.execute(
+            update(models.Job)
+            .where(models.Job.id == self.job.id)
+            .values(
+                progress=min(max(progress, 0), 1),
+                message=message,
+                details=details,
+                heartbeat_on=datetime.datetime.now(datetime.timezone.utc),
+            )
+        )
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict[str, Any] | None]]
+"""Function that runs a job and returns its result."""
+
+
+class JobAPI(
+    BaseAPI[
+        UUID,
+        models.Job,
+        schemas.Job,
+        schemas.JobCreate,
+        schemas.JobUpdate,
+    ]
+):
+    """API functions to submit and run jobs.
+
+    The operations that can run as jobs are registered with `register`.
+    Jobs are submitted with the name of an operation and its parameters,
+    and stored as pending until a worker claims and runs them.
+    """
+
+    _model = models.Job
+    _schema = schemas.Job
+
+    def __init__(self):
+        super().__init__()
+        self._handlers: dict[str, JobHandler] = {}
+
+    @property
+    def kinds(self) -> list[str]:
+        """The names of the operations that can run as jobs."""
+        return sorted(self._handlers)
+
+    def register(self, kind: str) -> Callable[[JobHandler], JobHandler]:
+        """Register the handler of an operation.
+
+        Use as a decorator of an async function that receives the
+        `JobContext` of the job, runs the operation and returns a JSON
+        serializable result.
+        """
+
+        def decorator(handler: JobHandler) -> JobHandler:
+            self._handlers[kind] = handler
+            return handler
+
+        return decorator
+
+    async def submit(
+        self,
+        session: AsyncSession,
+        kind: str,
+        parameters: dict[str, Any] | None = None,
+        user: schemas.SimpleUser | None = None,
+        **kwargs,
+    ) -> schemas.Job:
+        """Submit a job.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        kind
+            The name of the operation to run.
+        parameters
+            The parameters of the operation. Must be JSON serializable.
+        user
+            The user that submits the job.
+        **kwargs
+            Additional fields of the job, such as its UUID.
+
+        Returns
+        -------
+        schemas.Job
+            The pending job.
+
+        Raises
+        ------
+        ValueError
+            If no operation with the given name is registered.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind {kind!r}.")
+
+        return await self.create_from_data(
+            session,
+            schemas.JobCreate(
+                kind=kind,
+                parameters=parameters or {},
+                created_by_id=user.id if user is not None else None,
+            ),
+            **kwargs,
+        )
+
+    async def cancel(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+    ) -> schemas.Job:
+        """Cancel a job.
+
+        Pending jobs are cancelled immediately. Running jobs are asked to
+        stop, and are cancelled the next time they report their progress.
+        Finished jobs are left as they are.
+        """
+        if obj.status == schemas.JobStatus.PENDING:
+            await self._set(
+                session,
+                obj,
+                status=schemas.JobStatus.CANCELLED.value,
+                finished_on=datetime.datetime.now(datetime.timezone.utc),
+            )
+        elif obj.status == schemas.JobStatus.RUNNING:
+            await self._set(session, obj, cancel_requested=True)
+
+        return await self.get(session, obj.uuid)
+
+    async def get_latest(
+        self,
+        session: AsyncSession,
+        kind: str,
+        parameters: dict[str, str] | None = None,
+        active: bool = False,
+    ) -> schemas.Job | None:
+        """Get the most recently submitted job of an operation.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        kind
+            The name of the operation.
+        parameters
+            Only jobs with these parameters are considered. Values are
+            compared as strings.
+        active
+            Only consider pending and running jobs.
+
+        Returns
+        -------
+        schemas.Job | None
+            The job, or None if there is no such job.
+        """
+        query = select(models.Job).where(models.Job.kind == kind)
+        for key, value in (parameters or {}).items():
+            query = query.where(
+                models.Job.parameters[key].as_string() == value
+            )
+
+        if active:
+            query = query.where(
+                models.Job.status.in_(
+                    [
+                        schemas.JobStatus.PENDING.value,
+                        schemas.JobStatus.RUNNING.value,
+                    ]
+                )
+            )
+
+        job = await session.scalar(
+            query.order_by(models.Job.id.desc()).limit(1)
+        )
+        if job is None:
+            return None
+        return schemas.Job.model_validate(job)
+
+    async def claim(self, session: AsyncSession) -> schemas.Job | None:
+        """Claim the oldest pending job to run it.
+
+        The job is marked as running and the session is committed, so that
+        no other worker claims the same job. The worker must then record
+        that it is alive with `heartbeat` while the job runs, or the job is
+        failed by `fail_orphaned`.
+
+        Returns
+        -------
+        schemas.Job | None
+            The claimed job, or None if there are no pending jobs.
+        """
+        while True:
+            job_id = await session.scalar(
+                select(models.Job.id)
+                .where(models.Job.status == schemas.JobStatus.PENDING.value)
+                .order_by(models.Job.id)
+                .limit(1)
+            )
+            if job_id is None:
+                return None
+
+            # NOTE: The status is checked again in the update, as another
+            # worker may have claimed the job in the meantime.
+            now = datetime.datetime.now(datetime.timezone.utc)
+            result = await session.execute(
+                update(models.Job)
+                .where(
+                    models.Job.id == job_id,
+                    models.Job.status == schemas.JobStatus.PENDING.value,
+                )
+                .values(
+                    status=schemas.JobStatus.RUNNING.value,
+                    started_on=now,
+                    heartbeat_on=now,
+                )
+            )
+            await session.commit()
+            if result.rowcount == 1:  # type: ignore
+                job = await session.get(
+                    models.Job,
+                    job_id,
+                    populate_existing=True,
+                )
+                return schemas.Job.model_validate(job)
+
+    async def heartbeat(self, session: AsyncSession, obj: schemas.Job) -> None:
+        """Record that the worker running a job is alive.
+
+        The session is committed, so it should not be the session the job
+        runs with.
+        """
+        await session.execute(
+            update(models.Job)
+            .where(
+                models.Job.id == obj.id,
+                models.Job.status == schemas.JobStatus.RUNNING.value,
+            )
+            .values(heartbeat_on=datetime.datetime.now(datetime.timezone.utc))
+        )
+        await session.commit()
+
+    async def fail_orphaned(
+        self,
+        session: AsyncSession,
+        lease: float,
+    ) -> int:
+        """Fail running jobs whose worker stopped.
+
+        A worker that is killed while running a job cannot record its
+        outcome, which would leave the job running forever and block new
+        jobs for the same object. Such jobs are recognised by their worker
+        not having recorded a heartbeat for longer than the lease.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        lease
+            Seconds a running job is kept without a heartbeat.
+
+        Returns
+        -------
+        int
+            The number of failed jobs.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        result = await session.execute(
+            update(models.Job)
+            .where(
+                models.Job.status == schemas.JobStatus.RUNNING.value,
+                or_(
+                    models.Job.heartbeat_on.is_(None),
+                    models.Job.heartbeat_on
+                    < now - datetime.timedelta(seconds=lease),
+                ),
+            )
+            .values(
+                status=schemas.JobStatus.FAILED.value,
+                finished_on=now,
+                error="The worker stopped before the job finished.",
+            )
+        )
+        await session.commit()
+        count = result.rowcount  # type: ignore
+        if count:
+            logger.warning(f"Failed {count} jobs left running by a worker.")
+        return count
+
+    async def run(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+        audio_dir: Path | None = None,
+        jobs_dir: Path | None = None,
+    ) -> schemas.Job:
+        """Run a claimed job and record its outcome.
+
+        The handler of the job runs with the given session, which is
+        committed if the handler succeeds and rolled back otherwise.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            The job to run, as returned by `claim`.
+        audio_dir
+            The root directory of all audio files. If None, the directory
+            from the settings is used.
+        jobs_dir
+            Directory where job files are stored. If None, the directory
+            from the settings is used.
+
+        Returns
+        -------
+        schemas.Job
+            The finished job.
+        """
+        if audio_dir is None:
+            audio_dir = get_settings().audio_dir
+
+        handler = self._handlers.get(obj.kind)
+        context = JobContext(
+            session,
+            obj,
+            self.get_work_dir(obj.uuid, jobs_dir=jobs_dir),
+            audio_dir,
+        )
+
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind {obj.kind!r}.")
+
+            result = await handler(context)
+            await session.commit()
+        except JobCancelled:
+            await session.rollback()
+            await self._finish(session, obj, schemas.JobStatus.CANCELLED)
+        except asyncio.CancelledError:
+            await session.rollback()
+            await self._finish(
+                session,
+                obj,
+                schemas.JobStatus.FAILED,
+                error="The worker stopped before the job finished.",
+            )
+            raise
+        except Exception as error:
+            logger.exception(f"Job {obj.uuid} ({obj.kind}) failed.")
+            await session.rollback()
+            await self._finish(
+                session,
+                obj,
+                schemas.JobStatus.FAILED,
+                error=str(error) or type(error).__name__,
+            )
+        else:
+            await self._finish(
+                session,
+                obj,
+                schemas.JobStatus.COMPLETED,
+                progress=1,
+                result=result,
+            )
+
+        return await self.get(session, obj.uuid)
+
+    async def delete(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+        jobs_dir: Path | None = None,
+    ) -> schemas.Job:
+        """Delete a job and its files."""
+        deleted = await super().delete(session, obj)
+        shutil.rmtree(
+            self.get_work_dir(obj.uuid, jobs_dir=jobs_dir),
+            ignore_errors=True,
+        )
+        return deleted
+
+    def get_work_dir(
+        self,
+        job_uuid: UUID,
+        jobs_dir: Path | None = None,
+    ) -> Path:
+        """Get the directory where the files of a job are stored."""
+        if jobs_dir is None:
+            jobs_dir = get_settings().jobs_dir or get_whombat_jobs_dir()
+        return jobs_dir / str(job_uuid)
+
+    def store_file(
+        self,
+        job_uuid: UUID,
+        name: str,
+        file: BinaryIO,
+        jobs_dir: Path | None = None,
+    ) -> Path:
+        """Store a file, such as an upload, for a job to read.
+
+        Returns
+        -------
+        Path
+            The path of the stored file.
+        """
+        work_dir = self.get_work_dir(job_uuid, jobs_dir=jobs_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        path = work_dir / Path(name).name
+        with path.open("wb") as dst:
+            shutil.copyfileobj(file, dst)
+        return path
+
+    def get_result_file(
+        self,
+        obj: schemas.Job,
+        jobs_dir: Path | None = None,
+    ) -> Path:
+        """Get the file written as the result of a job.
+
+        Raises
+        ------
+        whombat.exceptions.NotFoundError
+            If the job did not write a result file.
+        """
+        name = (obj.result or {}).get("file")
+        if obj.status != schemas.JobStatus.COMPLETED or name is None:
+            raise exceptions.NotFoundError(
+                f"Job {obj.uuid} has no result file."
+            )
+
+        path = self.get_work_dir(obj.uuid, jobs_dir=jobs_dir) / name
+        if not path.is_file():
+            raise exceptions.NotFoundError(
+                f"The result file of job {obj.uuid} no longer exists."
+            )
+        return path
+
+    async def _finish(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+        status: schemas.JobStatus,
+        **values: Any,
+    ) -> None:
+        await self._set(
+            session,
+            obj,
+            status=status.value,
+            finished_on=datetime.datetime.now(datetime.timezone.utc),
+            **values,
+        )
+        await session.commit()
+
+    async def _set(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+        **values: Any,
+    ) -> None:
+        await session.execute(
+            update(models.Job).where(models.Job.id == obj.id).values(**values)
+        )
+
+
+jobs = JobAPI()
@@ -0,0 +1,129 @@
+"""Worker that runs the pending jobs of the queue."""
+
+import asyncio
+import logging
+
+from whombat import schemas
+from whombat.api.jobs.queue import jobs
+from whombat.system.database import (
+    create_async_db_engine,
+    get_async_session,
+    get_database_url,
+    get_sqlite_pragmas,
+)
+from whombat.system.settings import Settings
+
+__all__ = [
+    "JobWorker",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claim pending jobs and run them one at a time.
+
+    The worker polls the database for pending jobs, so any number of
+    workers can run against the same database, within the app or as
+    separate processes started with ``whombat-worker``.
+
+    While a job runs, the worker records a heartbeat every third of
+    ``job_lease`` seconds from a separate session. Jobs left running by
+    workers that stopped without a heartbeat for longer than the lease are
+    failed when a worker starts, and every ``job_lease`` seconds after.
+
+    Parameters
+    ----------
+    settings
+        The settings of the app, from which the database, the root audio
+        directory and the directory of job files are taken.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.engine = create_async_db_engine(
+            get_database_url(settings),
+            sqlite_pragmas=get_sqlite_pragmas(settings),
+        )
+
+    async def run_next(self) -> schemas.Job | None:
+        """Run the oldest pending job, if any.
+
+        Returns
+        -------
+        schemas.Job | None
+            The finished job, or None if there were no pending jobs.
+        """
+        async with get_async_session(self.engine) as session:
+            job = await jobs.claim(session)
+            if job is None:
+                return None
+
+            logger.info(f"Running job {job.uuid} ({job.kind}).")
+            keep_alive = asyncio.create_task(self._keep_alive(job))
+            try:
+                return await jobs.run(
+                    session,
+                    job,
+                    audio_dir=self.settings.audio_dir,
+                    jobs_dir=self.settings.jobs_dir,
+                )
+            finally:
+                keep_alive.cancel()
+
+    async def fail_orphaned(self) -> int:
+        """Fail the jobs left running by workers that stopped.
+
+        Returns
+        -------
+        int
+            The number of failed jobs.
+        """
+        async with get_async_session(self.engine) as session:
+            return await jobs.fail_orphaned(session, self.settings.job_lease)
+
+    async def run(self) -> None:
+        """Run pending jobs until cancelled.
+
+        When there are no pending jobs, the queue is polled again after
+        ``job_poll_interval`` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        last_check = None
+        while True:
+            if (
+                last_check is None
+                or loop.time() - last_check > self.settings.job_lease
+            ):
+                last_check = loop.time()
+                try:
+                    await self.fail_orphaned()
+                except Exception:
+                    logger.exception("Could not fail orphaned jobs.")
+
+            try:
+                job = await self.run_next()
+            except Exception:
+                logger.exception("Could not run the next job.")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.settings.job_poll_interval)
+
+    async def _keep_alive(self, job: schemas.Job) -> None:
+        while True:
+            await asyncio.sleep(self.settings.job_lease / 3)
+            try:
+                async with get_async_session(self.engine) as session:
+                    await jobs.heartbeat(session, job)
+            except Exception:
+                # NOTE: The database may be locked by the job itself for a
+                # while. A missed heartbeat is retried on the next one.
+                logger.warning(
+                    f"Could not record the heartbeat of job {job.uuid}.",
+                    exc_info=True,
+                )
+
+    async def close(self) -> None:
+        """Close the connections to the database."""
+        await self.engine.dispose()
@@ -1,7 +1,7 @@
 """API functions to interact with model runs."""
 
 from pathlib import Path
-from typing import Sequence
+from typing import AsyncGenerator, Sequence
 from uuid import UUID
 
 from soundevent import data
@@ -11,6 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from whombat import exceptions, models, schemas
 from whombat.api.clip_predictions import clip_predictions
 from whombat.api.common import BaseAPI, create_object
+from whombat.api.io import arrow
+from whombat.api.io.aoef.common import BATCH_SIZE
 from whombat.filters.base import Filter
 from whombat.filters.clip_predictions import ModelRunFilter
 
@@ -197,5 +199,43 @@ class ModelRunAPI(
             ],
         )
 
+    def stream_table(
+        self,
+        session: AsyncSession,
+        obj: schemas.ModelRun,
+        format: arrow.TableFormat = "parquet",
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncGenerator[bytes, None]:
+        """Export the sound event predictions of a model run as a table.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The model run to export.
+        format
+            Export a Parquet file or an Arrow IPC stream.
+        batch_size
+            The number of predictions per record batch.
+
+        Returns
+        -------
+        AsyncGenerator[bytes, None]
+            The chunks of the encoded table.
+        """
+        return arrow.stream_sound_event_predictions(
+            session,
+            filters=[
+                models.SoundEventPrediction.clip_prediction_id.in_(
+                    select(models.ModelRunPrediction.clip_prediction_id).where(
+                        models.ModelRunPrediction.model_run_id == obj.id
+                    )
+                )
+            ],
+            format=format,
+            batch_size=batch_size,
+        )
+
 
 model_runs = ModelRunAPI()
@@ -3,7 +3,6 @@
 import datetime
 import logging
 from functools import partial
-from multiprocessing import Pool
 from pathlib import Path
 from typing import Sequence
 from uuid import UUID
@@ -11,8 +10,8 @@ from uuid import UUID
 import cachetools
 import soundfile as sf
 from soundevent import data
-from soundevent.audio import MediaInfo, compute_md5_checksum, get_media_info
-from sqlalchemy import and_
+from soundevent.audio import MediaInfo, get_media_info
+from sqlalchemy import and_, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
@@ -25,6 +24,7 @@ from whombat.api.users import users
 from whombat.core import files
 from whombat.core.common import remove_duplicates
 from whombat.system import get_settings
+from whombat.system.workers import get_worker_pool
 
 __all__ = [
     "RecordingAPI",
@@ -142,6 +142,7 @@ class RecordingAPI(
         time_expansion: float = 1.0,
         rights: str | None = None,
         audio_dir: Path | None = None,
+        hash_strategy: files.HashStrategy | None = None,
         **kwargs,
     ) -> schemas.Recording:
         """Create a recording.
@@ -170,6 +171,9 @@ class RecordingAPI(
         audio_dir
             The root directory for audio files. If not given, it will
             default to the value of `settings.audio_dir`.
+        hash_strategy
+            The algorithm used to hash the file. If not given, it will
+            default to the value of `settings.hash_strategy`.
         **kwargs
             Additional keyword arguments to use when creating the recording,
             (e.g. `uuid` or `created_on`.)
@@ -182,6 +186,9 @@ class RecordingAPI(
         if audio_dir is None:
             audio_dir = get_settings().audio_dir
 
+        if hash_strategy is None:
+            hash_strategy = get_settings().hash_strategy
+
         recording_data = _assemble_recording_data(
             schemas.RecordingCreate(
                 path=path,
@@ -193,6 +200,7 @@ class RecordingAPI(
                 rights=rights,
             ),
             audio_dir=audio_dir,
+            hash_strategy=hash_strategy,
         )
 
         if recording_data is None:
@@ -214,6 +222,7 @@ class RecordingAPI(
         session: AsyncSession,
         data: Sequence[dict],
         audio_dir: Path | None = None,
+        hash_strategy: files.HashStrategy | None = None,
     ) -> None | Sequence[schemas.Recording]:
         """Create recordings.
 
@@ -230,6 +239,9 @@ class RecordingAPI(
         audio_dir
             The root directory for audio files. If not given, it will
             default to the value of `settings.audio_dir`.
+        hash_strategy
+            The algorithm used to hash the files. If not given, it will
+            default to the value of `settings.hash_strategy`.
 
         Returns
         -------
@@ -241,13 +253,20 @@ class RecordingAPI(
         This function will only create recordings for files that:
         - are audio files (according to `files.is_audio_file`)
         - media info can be extracted from it.
-        - do not already exist in the database.
+        - do not already exist in the database, either at the same path or
+          with the same hash.
 
         Any files that do not meet these criteria will be silently ignored.
+        Files whose path is already registered are skipped before hashing,
+        so that recordings stay deduplicated even if they were hashed with a
+        different strategy.
         """
         if audio_dir is None:
             audio_dir = get_settings().audio_dir
 
+        if hash_strategy is None:
+            hash_strategy = get_settings().hash_strategy
+
         validated_data = remove_duplicates(
             [
                 schemas.RecordingCreate.model_validate(recording)
@@ -256,15 +275,29 @@ class RecordingAPI(
             key=lambda x: x.path,
         )
 
-        with Pool() as pool:
-            results = pool.map_async(
-                partial(_assemble_recording_data, audio_dir=audio_dir),
-                validated_data,
-            )
-            # NOTE: This will block until all results are ready. Might
-            # want to change this in the future as it could be very
-            # slow for large numbers of files or large files.
-            all_data: list[dict | None] = results.get()
+        existing_paths = await self._get_existing_paths(
+            session,
+            [
+                recording.path.relative_to(audio_dir)
+                for recording in validated_data
+                if recording.path.is_relative_to(audio_dir)
+            ],
+        )
+        validated_data = [
+            recording
+            for recording in validated_data
+            if not recording.path.is_relative_to(audio_dir)
+            or recording.path.relative_to(audio_dir) not in existing_paths
+        ]
+
+        all_data = await get_worker_pool().map(
+            partial(
+                _assemble_recording_data,
+                audio_dir=audio_dir,
+                hash_strategy=hash_strategy,
+            ),
+            validated_data,
+        )
 
         recordings = await common.create_objects_without_duplicates(
             session,
@@ -276,6 +309,24 @@ class RecordingAPI(
 
         return [schemas.Recording.model_validate(rec) for rec in recordings]
 
+    async def _get_existing_paths(
+        self,
+        session: AsyncSession,
+        paths: Sequence[Path],
+    ) -> set[Path]:
+        if not paths:
+            return set()
+
+        result = await common.select_batched(
+            session,
+            statement=select(models.Recording.path).where(
+                models.Recording.path.in_(bindparam("paths"))
+            ),
+            parameter="paths",
+            values=paths,
+        )
+        return {Path(path) for (path,) in result}
+
     async def update(
         self,
         session: AsyncSession,
@@ -306,7 +357,12 @@ class RecordingAPI(
             audio_dir = get_settings().audio_dir
 
         if data.path is not None:
-            new_hash = compute_md5_checksum(data.path)
+            # NOTE: Hash with the strategy of the stored hash, as it might
+            # differ from the current strategy.
+            new_hash = files.compute_hash(
+                data.path,
+                files.get_hash_strategy(obj.hash),
+            )
 
             if new_hash != obj.hash:
                 raise ValueError(
@@ -933,12 +989,13 @@ def validate_path(
 def _assemble_recording_data(
     data: schemas.RecordingCreate,
     audio_dir: Path,
+    hash_strategy: files.HashStrategy = "md5",
 ) -> dict | None:
     """Get missing recording data from file."""
     logger.debug(f"Assembling recording data from file: {data.path}")
 
     try:
-        info = files.get_file_info(data.path)
+        info = files.get_file_info(data.path, hash_strategy=hash_strategy)
     except (ValueError, KeyError, sf.LibsndfileError) as e:
         logger.warning(
             f"Could not get file info from file. {data.path} Skipping file.",
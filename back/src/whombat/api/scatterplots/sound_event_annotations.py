@@ -1,15 +1,29 @@
+import base64
 from collections import defaultdict
-from typing import Sequence
+from itertools import batched
+from typing import Literal, Sequence
 from uuid import UUID
 
+import numpy as np
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models, schemas
 from whombat.api.common.utils import get_count
+from whombat.api.feature_matrices import get_feature_matrix
+from whombat.api.io.aoef.common import BATCH_SIZE
+from whombat.core.scatterplots import density_downsample, pca
 from whombat.filters.base import Filter
 
+__all__ = [
+    "EncodedArray",
+    "ScatterPlot",
+    "ScatterPlotData",
+    "get_scatterplot",
+    "get_scatterplot_data",
+]
+
 
 class ScatterPlotData(BaseModel):
     """Data for a scatter plot."""
@@ -20,6 +34,69 @@ class ScatterPlotData(BaseModel):
     recording_tags: list[schemas.TagCreate]
 
 
+class EncodedArray(BaseModel):
+    """A NumPy array as base64 encoded little-endian bytes.
+
+    Clients decode `data` into a typed array of `dtype`, such as a
+    `Float32Array`, and read it in row-major order with `shape`.
+    """
+
+    dtype: str
+    shape: list[int]
+    data: str
+
+    @classmethod
+    def from_numpy(cls, array: np.ndarray) -> "EncodedArray":
+        """Encode an array."""
+        array = np.ascontiguousarray(
+            array, dtype=array.dtype.newbyteorder("<")
+        )
+        return cls(
+            dtype=array.dtype.name,
+            shape=list(array.shape),
+            data=base64.b64encode(array.tobytes()).decode(),
+        )
+
+    def to_numpy(self) -> np.ndarray:
+        """Decode the array."""
+        dtype = np.dtype(self.dtype).newbyteorder("<")
+        return np.frombuffer(
+            base64.b64decode(self.data),
+            dtype=dtype,
+        ).reshape(self.shape)
+
+
+class ScatterPlot(BaseModel):
+    """Points of a scatter plot of sound event annotations."""
+
+    total: int
+    """Number of annotations with the plotted features."""
+
+    axes: list[str]
+    """Name of each coordinate: a feature or a principal component."""
+
+    explained_variance: list[float] | None = None
+    """Fraction of the variance explained by each principal component."""
+
+    uuids: list[UUID]
+    """UUIDs of the plotted annotations."""
+
+    coordinates: EncodedArray
+    """Float32 array of shape (n_points, n_axes)."""
+
+    weights: EncodedArray
+    """Float32 array with the number of annotations each point stands for."""
+
+    groups: list[schemas.TagCreate]
+    """Tags the points are grouped by."""
+
+    group_index: EncodedArray
+    """Int32 array with the index in `groups` of the tag of each point.
+
+    -1 for annotations without a tag of the grouping key.
+    """
+
+
 async def get_scatterplot_data(
     session: AsyncSession,
     limit: int = 1000,
@@ -122,3 +199,139 @@ async def get_scatterplot_data(
         )
         for ann_id in mapping.keys()
     ], count
+
+
+async def get_scatterplot(
+    session: AsyncSession,
+    features: Sequence[str] | None = None,
+    projection: Literal["pca"] | None = None,
+    dimensions: int = 2,
+    group_by: str | None = None,
+    max_points: int = 10_000,
+    filters: Sequence[Filter] | None = None,
+) -> ScatterPlot:
+    """Get the points of a scatter plot of sound event annotations.
+
+    The features of all the matching annotations are read as a feature
+    matrix, see `get_feature_matrix`. Annotations are then placed either
+    by the given features, or by the principal components of their
+    features. Annotations without the plotted features are left out. If
+    there are more than `max_points` annotations, they are downsampled
+    favouring sparse regions of the plot, see `density_downsample`.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    features
+        Without projection, the two or three features to use as axes.
+        With a projection, the features to project. If None, all the
+        features of the annotations are projected.
+    projection
+        Either None, to plot the features, or "pca" to plot the principal
+        components of the features.
+    dimensions
+        The number of principal components to plot.
+    group_by
+        Key of the tags used to group the points, such as "species".
+    max_points
+        The maximum number of points to return.
+    filters
+        Filters of the annotations to plot.
+
+    Returns
+    -------
+    ScatterPlot
+    """
+    if features is not None:
+        features = list(dict.fromkeys(features))
+
+    if projection is None and (not features or len(features) not in (2, 3)):
+        raise ValueError("Two or three distinct features are needed as axes.")
+
+    matrix = await get_feature_matrix(
+        session,
+        models.SoundEventAnnotation,
+        features=features,
+        filters=filters,
+    )
+
+    explained = None
+    if projection == "pca":
+        plotted = ~np.isnan(matrix.values).all(axis=1)
+        coordinates, variance = pca(
+            matrix.values[plotted],
+            n_components=dimensions,
+        )
+        axes = [f"PC{index + 1}" for index in range(dimensions)]
+        explained = variance.tolist()
+    else:
+        plotted = ~np.isnan(matrix.values).any(axis=1)
+        coordinates = matrix.values[plotted]
+        axes = matrix.feature_names
+
+    index, weights = density_downsample(coordinates, max_points)
+    rows = np.flatnonzero(plotted)[index]
+    groups, group_index = await _get_groups(
+        session,
+        matrix.ids[rows],
+        group_by,
+    )
+    return ScatterPlot(
+        total=len(coordinates),
+        axes=axes,
+        explained_variance=explained,
+        uuids=[matrix.uuids[row] for row in rows.tolist()],
+        coordinates=EncodedArray.from_numpy(
+            coordinates[index].astype(np.float32)
+        ),
+        weights=EncodedArray.from_numpy(weights),
+        groups=groups,
+        group_index=EncodedArray.from_numpy(group_index),
+    )
+
+
+async def _get_groups(
+    session: AsyncSession,
+    annotation_ids: np.ndarray,
+    key: str | None,
+) -> tuple[list[schemas.TagCreate], np.ndarray]:
+    """Get the tag of each annotation with the given key.
+
+    If an annotation has several tags with the key, the first by value is
+    used.
+    """
+    group_index = np.full(len(annotation_ids), -1, dtype=np.int32)
+    if key is None:
+        return [], group_index
+
+    values: dict[int, str] = {}
+    for ids in batched(annotation_ids.tolist(), BATCH_SIZE):
+        result = await session.execute(
+            select(
+                models.SoundEventAnnotationTag.sound_event_annotation_id,
+                models.Tag.value,
+            )
+            .join(
+                models.Tag,
+                models.Tag.id == models.SoundEventAnnotationTag.tag_id,
+            )
+            .where(
+                models.Tag.key == key,
+                models.SoundEventAnnotationTag.sound_event_annotation_id.in_(
+                    ids
+                ),
+            )
+            .order_by(models.Tag.value.desc())
+        )
+        values.update(result.tuples().all())
+
+    groups = sorted(set(values.values()))
+    positions = {value: position for position, value in enumerate(groups)}
+    for row, id in enumerate(annotation_ids.tolist()):
+        if id in values:
+            group_index[row] = positions[values[id]]
+
+    return [schemas.TagCreate(key=key, value=value) for value in groups], (
+        group_index
+    )
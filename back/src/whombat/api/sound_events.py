@@ -1,12 +1,14 @@
 """API functions to interact with sound events."""
 
+import datetime
 from pathlib import Path
 from typing import Sequence
 from uuid import UUID
 
+import numpy as np
 from soundevent import data
 from soundevent.geometry import compute_geometric_features
-from sqlalchemy import and_, select
+from sqlalchemy import and_, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
@@ -14,6 +16,11 @@ from whombat.api import common
 from whombat.api.common import BaseAPI
 from whombat.api.features import features
 from whombat.api.recordings import recordings
+from whombat.core.geometry import (
+    GeometryBounds,
+    compute_many_geometric_features,
+    get_geometry_bounds,
+)
 
 __all__ = [
     "SoundEventAPI",
@@ -64,12 +71,45 @@ class SoundEventAPI(
             geometry=geometry,
             geometry_type=geometry.type,
             recording_id=recording.id,
+            **get_geometry_bounds(geometry)._asdict(),
             **kwargs,
         )
         await self.create_geometric_features(session, [sound_event])
         await session.refresh(sound_event)
         return self._schema.model_validate(sound_event)
 
+    async def create_many(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+    ) -> None | Sequence[schemas.SoundEvent]:
+        """Create many sound events.
+
+        The time and frequency bounds of every sound event are computed
+        from its geometry.
+        """
+        return await super().create_many(
+            session,
+            [_with_bounds(values) for values in data],
+        )
+
+    async def create_many_without_duplicates(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+        return_all: bool = False,
+    ) -> Sequence[schemas.SoundEvent]:
+        """Create many sound events, skipping existing ones.
+
+        The time and frequency bounds of every sound event are computed
+        from its geometry.
+        """
+        return await super().create_many_without_duplicates(
+            session,
+            [_with_bounds(values) for values in data],
+            return_all=return_all,
+        )
+
     async def update(
         self,
         session: AsyncSession,
@@ -97,7 +137,17 @@ class SoundEventAPI(
         exceptions.NotFoundError
             If the sound event does not exist in the database.
         """
-        obj = await super().update(session, obj, data)
+        pk = self._get_pk_from_obj(obj)
+        updated = await common.update_object(
+            session,
+            self._model,
+            self._get_pk_condition(pk),
+            data,
+            geometry_type=data.geometry.type,
+            **get_geometry_bounds(data.geometry)._asdict(),
+        )
+        obj = self._schema.model_validate(updated)
+        self._update_cache(obj)
         return await self.update_geometric_features(session, obj)
 
     async def add_feature(
@@ -273,6 +323,10 @@ class SoundEventAPI(
     ) -> None:
         """Create sound event features.
 
+        The features of all sound events are computed at once from their
+        stored bounds, their names are resolved with a single query, and
+        they are inserted with a single executemany statement.
+
         Parameters
         ----------
         session
@@ -280,34 +334,43 @@ class SoundEventAPI(
         sound_events
             The sound events.
         """
-        all_features = []
-        for sound_event in sound_events:
-            feats = compute_geometric_features(sound_event.geometry)
-            for feature in feats:
-                all_features.append(
-                    (sound_event.id, feature.name, feature.value)
+        computed = compute_many_geometric_features(
+            [sound_event.geometry for sound_event in sound_events],
+            bounds=[
+                GeometryBounds(
+                    sound_event.start_time,
+                    sound_event.end_time,
+                    sound_event.low_freq,
+                    sound_event.high_freq,
                 )
+                for sound_event in sound_events
+            ],
+        )
+        if not computed:
+            return
 
-        feature_names = {f[1] for f in all_features}
-        feature_mapping = {
-            name: await features.get_or_create(session, name=name)
-            for name in feature_names
-        }
+        feature_names = await features.get_or_create_many(
+            session,
+            list(computed),
+        )
 
-        data = [
+        sound_event_ids = np.array([se.id for se in sound_events])
+        created_on = datetime.datetime.now(datetime.timezone.utc)
+        values = [
             dict(
                 sound_event_id=sound_event_id,
-                feature_name_id=feature_mapping[feature_name].id,
+                feature_name_id=feature_names[name].id,
                 value=value,
+                created_on=created_on,
+            )
+            for name, (indices, feature_values) in computed.items()
+            for sound_event_id, value in zip(
+                sound_event_ids[indices].tolist(),
+                feature_values.tolist(),
+                strict=True,
             )
-            for sound_event_id, feature_name, value in all_features
         ]
-
-        await common.create_objects(
-            session,
-            models.SoundEventFeature,
-            data=data,
-        )
+        await session.execute(insert(models.SoundEventFeature), values)
 
     async def update_geometric_features(
         self,
@@ -456,4 +519,8 @@ class SoundEventAPI(
         return self._model.uuid
 
 
+def _with_bounds(values: dict) -> dict:
+    return {**get_geometry_bounds(values["geometry"])._asdict(), **values}
+
+
 sound_events = SoundEventAPI()
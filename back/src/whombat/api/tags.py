@@ -1,15 +1,18 @@
 """API functions to interact with tags."""
 
+import time
 from typing import Any, Sequence
 
+import cachetools
 from soundevent import data
-from sqlalchemy import and_, desc, func, select, tuple_
+from sqlalchemy import and_, desc, func, select, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import ColumnExpressionArgument
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
+from whombat.core.tag_index import IndexedTag, TagIndex
 from whombat.filters.base import Filter
 
 __all__ = [
@@ -30,6 +33,22 @@ class TagAPI(
     _model = models.Tag
     _schema = schemas.Tag
 
+    usage_ttl: float = 60
+    """Seconds the tag usage counts used to rank suggestions are kept."""
+
+    index_check_interval: float = 10
+    """Seconds between checks of the autocomplete index against the
+    database."""
+
+    def __init__(self):
+        super().__init__()
+        self._index = TagIndex()
+        self._index_checked_on: float | None = None
+        self._usage: cachetools.TTLCache = cachetools.TTLCache(
+            maxsize=128,
+            ttl=self.usage_ttl,
+        )
+
     async def create(
         self,
         session: AsyncSession,
@@ -137,6 +156,208 @@ class TagAPI(
             value=tag.value,
         )
 
+    async def autocomplete(
+        self,
+        session: AsyncSession,
+        prefix: str,
+        annotation_project: schemas.AnnotationProject | None = None,
+        limit: int = 10,
+    ) -> list[schemas.TagCount]:
+        """Suggest tags that start with the text typed so far.
+
+        Tags are looked up in an in-memory prefix index, which is loaded
+        from the database at startup, or on first use, and kept up to date
+        as tags are created through this API. As tags may also be changed
+        by other processes, every `index_check_interval` seconds the
+        number of tags and the largest tag id are compared with those of
+        the database, and the index is loaded again if they differ.
+        Suggestions are ranked by how often the tags are used in
+        annotations.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        prefix
+            The text typed so far. It is matched, ignoring case, against
+            the start of the key, the value, any word of the value or
+            ``key:value``.
+        annotation_project
+            If given, rank tags by their usage in this project instead of
+            in all annotations.
+        limit
+            The maximum number of suggestions.
+
+        Returns
+        -------
+        list[schemas.TagCount]
+            The suggested tags with their usage counts.
+        """
+        if not self._index.loaded or await self._index_is_stale(session):
+            await self.load_index(session)
+
+        counts = await self.get_usage_counts(session, annotation_project)
+        suggestions = self._index.search(
+            prefix,
+            limit=limit,
+            rank=lambda tag: counts.get(tag.id, 0),
+        )
+        return [
+            schemas.TagCount(
+                tag=schemas.Tag(id=tag.id, key=tag.key, value=tag.value),
+                count=counts.get(tag.id, 0),
+            )
+            for tag in suggestions
+        ]
+
+    async def load_index(self, session: AsyncSession) -> None:
+        """Load all tags of the database into the autocomplete index."""
+        result = await session.execute(
+            select(models.Tag.id, models.Tag.key, models.Tag.value)
+        )
+        self._index.load(IndexedTag(*row) for row in result.all())
+        self._index_checked_on = time.monotonic()
+
+    async def _index_is_stale(self, session: AsyncSession) -> bool:
+        """Check whether tags were added or removed outside of this API.
+
+        The database is only queried if the index was not checked in the
+        last `index_check_interval` seconds.
+        """
+        now = time.monotonic()
+        if (
+            self._index_checked_on is not None
+            and now - self._index_checked_on < self.index_check_interval
+        ):
+            return False
+
+        self._index_checked_on = now
+
+        # NOTE: The count and largest id together catch tags created or
+        # deleted by other workers. Tags edited in place elsewhere are not
+        # detected.
+        count, max_id = (
+            await session.execute(
+                select(func.count(models.Tag.id), func.max(models.Tag.id))
+            )
+        ).one()
+        return (count, max_id or 0) != (len(self._index), self._index.max_id)
+
+    def add_to_index(self, tags: Sequence[schemas.Tag]) -> None:
+        """Add tags created outside of this API to the autocomplete index."""
+        for tag in tags:
+            self._index.add(IndexedTag(tag.id, tag.key, tag.value))
+
+    def clear_index(self) -> None:
+        """Empty the autocomplete index and the cached usage counts.
+
+        The index is loaded again from the database on next use.
+        """
+        self._index.clear()
+        self._index_checked_on = None
+        self._usage.clear()
+
+    async def get_usage_counts(
+        self,
+        session: AsyncSession,
+        annotation_project: schemas.AnnotationProject | None = None,
+    ) -> dict[int, int]:
+        """Count how many annotations use each tag.
+
+        Counts are cached for `usage_ttl` seconds, as they only serve to
+        rank suggestions.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        annotation_project
+            If given, only count annotations of this project.
+
+        Returns
+        -------
+        dict[int, int]
+            The number of clip and sound event annotations with each tag,
+            by tag id. Unused tags are left out.
+        """
+        key = annotation_project.id if annotation_project else None
+        if key in self._usage:
+            return self._usage[key]
+
+        clip_query = select(
+            models.ClipAnnotationTag.tag_id.label("tag_id"),
+            models.ClipAnnotationTag.clip_annotation_id.label(
+                "clip_annotation_id"
+            ),
+        )
+        sound_event_query = select(
+            models.SoundEventAnnotationTag.tag_id.label("tag_id"),
+            models.SoundEventAnnotation.clip_annotation_id.label(
+                "clip_annotation_id"
+            ),
+        ).join(
+            models.SoundEventAnnotation,
+            models.SoundEventAnnotation.id
+            == models.SoundEventAnnotationTag.sound_event_annotation_id,
+        )
+        usage = union_all(clip_query, sound_event_query).subquery()
+
+        query = select(usage.c.tag_id, func.count()).group_by(usage.c.tag_id)
+        if annotation_project is not None:
+            query = query.where(
+                usage.c.clip_annotation_id.in_(
+                    select(models.AnnotationTask.clip_annotation_id).where(
+                        models.AnnotationTask.annotation_project_id
+                        == annotation_project.id
+                    )
+                )
+            )
+
+        result = await session.execute(query)
+        counts = {tag_id: count for tag_id, count in result.all()}
+        self._usage[key] = counts
+        return counts
+
+    async def create_many_without_duplicates(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+        return_all: bool = False,
+    ) -> Sequence[schemas.Tag]:
+        """Create many tags, skipping existing ones.
+
+        Created tags are added to the autocomplete index.
+        """
+        created = await super().create_many_without_duplicates(
+            session,
+            data,
+            return_all=return_all,
+        )
+        self.add_to_index(created)
+        return created
+
+    async def create_many(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+    ) -> None | Sequence[schemas.Tag]:
+        """Create many tags.
+
+        The created tags are not returned, so they are added to the
+        autocomplete index when it is next checked against the database.
+        """
+        created = await super().create_many(session, data)
+        self._index_checked_on = None
+        return created
+
+    def _update_cache(self, obj: schemas.Tag) -> None:
+        super()._update_cache(obj)
+        self._index.add(IndexedTag(obj.id, obj.key, obj.value))
+
+    def _clear_from_cache(self, obj: schemas.Tag) -> None:
+        super()._clear_from_cache(obj)
+        self._index.remove(obj.id)
+
     def _get_pk_from_obj(self, obj: schemas.Tag) -> tuple[str, str]:
         return obj.key, obj.value
 
@@ -0,0 +1,272 @@
+"""API functions to get the sound events shown in a spectrogram viewport.
+
+A viewport is a time and frequency window of a recording. Drawing it
+requires every sound event annotation and prediction of the recording
+that overlaps the window, which for model outputs can be thousands of
+objects. These are loaded with column only queries that use the index on
+the recording and bounds of sound events, and their geometries are
+returned as raw coordinates, skipping the construction and validation of
+full schemas.
+"""
+
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import LargeBinary, Select, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.core.geometry import unpack_geometry
+from whombat.filters.sound_events import (
+    FrequencyRangeFilter,
+    TimeRangeFilter,
+)
+
+__all__ = [
+    "get_viewport",
+]
+
+
+async def get_viewport(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    low_freq: float | None = None,
+    high_freq: float | None = None,
+    annotation_project: schemas.AnnotationProject | None = None,
+    model_run: schemas.ModelRun | None = None,
+    min_score: float | None = None,
+    include_annotations: bool = True,
+    include_predictions: bool = True,
+) -> schemas.Viewport:
+    """Get the sound events of a recording that overlap a viewport.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    recording
+        The recording shown in the viewport.
+    start_time
+        Start time of the viewport in seconds.
+    end_time
+        End time of the viewport in seconds.
+    low_freq
+        Lowest frequency of the viewport in Hz. If None, the viewport
+        has no lower frequency bound.
+    high_freq
+        Highest frequency of the viewport in Hz. If None, the viewport
+        has no upper frequency bound.
+    annotation_project
+        If given, only include annotations made in this project.
+    model_run
+        If given, only include predictions of this model run.
+    min_score
+        If given, only include predictions with at least this score.
+    include_annotations
+        Whether to include sound event annotations.
+    include_predictions
+        Whether to include sound event predictions.
+
+    Returns
+    -------
+    schemas.Viewport
+        The annotations and predictions that overlap the viewport, sorted
+        by start time.
+    """
+    viewport = schemas.Viewport()
+
+    if include_annotations:
+        viewport.annotations = await _get_annotations(
+            session,
+            _overlapping(
+                select(
+                    models.SoundEventAnnotation.id,
+                    models.SoundEventAnnotation.uuid,
+                    *_sound_event_columns(),
+                ).join(
+                    models.SoundEvent,
+                    models.SoundEvent.id
+                    == models.SoundEventAnnotation.sound_event_id,
+                ),
+                recording,
+                start_time,
+                end_time,
+                low_freq,
+                high_freq,
+                annotation_project=annotation_project,
+            ),
+        )
+
+    if include_predictions:
+        viewport.predictions = await _get_predictions(
+            session,
+            _overlapping(
+                select(
+                    models.SoundEventPrediction.id,
+                    models.SoundEventPrediction.uuid,
+                    models.SoundEventPrediction.score,
+                    *_sound_event_columns(),
+                ).join(
+                    models.SoundEvent,
+                    models.SoundEvent.id
+                    == models.SoundEventPrediction.sound_event_id,
+                ),
+                recording,
+                start_time,
+                end_time,
+                low_freq,
+                high_freq,
+                model_run=model_run,
+                min_score=min_score,
+            ),
+        )
+
+    return viewport
+
+
+def _sound_event_columns() -> list[Any]:
+    return [
+        models.SoundEvent.uuid.label("sound_event_uuid"),
+        type_coerce(models.SoundEvent.geometry, LargeBinary).label("geometry"),
+    ]
+
+
+def _overlapping(
+    query: Select,
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    low_freq: float | None,
+    high_freq: float | None,
+    annotation_project: schemas.AnnotationProject | None = None,
+    model_run: schemas.ModelRun | None = None,
+    min_score: float | None = None,
+) -> Select:
+    query = query.where(models.SoundEvent.recording_id == recording.id)
+    query = TimeRangeFilter(start=start_time, end=end_time).filter(query)
+    query = FrequencyRangeFilter(low=low_freq, high=high_freq).filter(query)
+
+    if annotation_project is not None:
+        query = query.where(
+            models.SoundEventAnnotation.clip_annotation_id.in_(
+                select(models.AnnotationTask.clip_annotation_id).where(
+                    models.AnnotationTask.annotation_project_id
+                    == annotation_project.id
+                )
+            )
+        )
+
+    if model_run is not None:
+        query = query.where(
+            models.SoundEventPrediction.clip_prediction_id.in_(
+                select(models.ModelRunPrediction.clip_prediction_id).where(
+                    models.ModelRunPrediction.model_run_id == model_run.id
+                )
+            )
+        )
+
+    if min_score is not None:
+        query = query.where(models.SoundEventPrediction.score >= min_score)
+
+    return query.order_by(models.SoundEvent.start_time)
+
+
+async def _get_annotations(
+    session: AsyncSession,
+    query: Select,
+) -> list[schemas.ViewportAnnotation]:
+    rows = (await session.execute(query)).all()
+    if not rows:
+        return []
+
+    tags = await _get_tags(
+        session,
+        select(
+            models.SoundEventAnnotationTag.sound_event_annotation_id,
+            models.Tag.key,
+            models.Tag.value,
+        )
+        .join(
+            models.Tag,
+            models.Tag.id == models.SoundEventAnnotationTag.tag_id,
+        )
+        .where(
+            models.SoundEventAnnotationTag.sound_event_annotation_id.in_(
+                _ids(query, models.SoundEventAnnotation.id)
+            )
+        ),
+    )
+    return [
+        schemas.ViewportAnnotation(
+            uuid=row.uuid,
+            sound_event_uuid=row.sound_event_uuid,
+            **_geometry(row.geometry),
+            tags=[(key, value) for key, value in tags.get(row.id, [])],
+        )
+        for row in rows
+    ]
+
+
+async def _get_predictions(
+    session: AsyncSession,
+    query: Select,
+) -> list[schemas.ViewportPrediction]:
+    rows = (await session.execute(query)).all()
+    if not rows:
+        return []
+
+    tags = await _get_tags(
+        session,
+        select(
+            models.SoundEventPredictionTag.sound_event_prediction_id,
+            models.Tag.key,
+            models.Tag.value,
+            models.SoundEventPredictionTag.score,
+        )
+        .join(
+            models.Tag,
+            models.Tag.id == models.SoundEventPredictionTag.tag_id,
+        )
+        .where(
+            models.SoundEventPredictionTag.sound_event_prediction_id.in_(
+                _ids(query, models.SoundEventPrediction.id)
+            )
+        ),
+    )
+    return [
+        schemas.ViewportPrediction(
+            uuid=row.uuid,
+            sound_event_uuid=row.sound_event_uuid,
+            **_geometry(row.geometry),
+            score=row.score,
+            tags=[
+                (key, value, score)
+                for key, value, score in tags.get(row.id, [])
+            ],
+        )
+        for row in rows
+    ]
+
+
+async def _get_tags(
+    session: AsyncSession,
+    stmt: Select,
+) -> dict[int, list[tuple[Any, ...]]]:
+    """Group the tags selected by a query by their owner id."""
+    tags = defaultdict(list)
+    for owner_id, *values in (await session.execute(stmt)).all():
+        tags[owner_id].append(tuple(values))
+    return tags
+
+
+def _ids(query: Select, column) -> Select:
+    # NOTE: Reuse the viewport query as a subquery, instead of sending
+    # the ids back, as dense viewports can exceed the parameter limit.
+    return query.with_only_columns(column).order_by(None)
+
+
+def _geometry(value: bytes) -> dict[str, Any]:
+    geometry_type, coordinates = unpack_geometry(value)
+    return {"geometry_type": geometry_type, "coordinates": coordinates}
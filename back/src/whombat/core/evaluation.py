@@ -0,0 +1,380 @@
+"""Clip by clip evaluation of predictions.
+
+The evaluation tasks of `soundevent` take a whole model run and evaluation
+set at once and return every clip evaluation in a single object. This
+module evaluates one clip at a time with the same matching and metrics, so
+that large model runs can be evaluated in batches. Of each evaluated clip
+only the encoded true classes and predicted scores are kept, in an
+`EvaluationAccumulator`, to compute the metrics of the whole run at the
+end.
+
+Clips are evaluated independently of each other, so a batch can be
+sharded across worker processes with `evaluate_clip_pair`. As long as
+the results are added to the accumulator in the order of the clips, the
+metrics are the same as if the clips were evaluated one after the other.
+For the same reason, the examples of a clip can be stored as
+`ClipExamples` and added again later without evaluating the clip. A clip
+only needs to be evaluated again when its `fingerprint_clip` changes.
+"""
+
+import hashlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+import numpy as np
+from soundevent import data
+from soundevent.evaluation import metrics
+from soundevent.evaluation.encoding import Encoder, create_tag_encoder
+from soundevent.evaluation.tasks.clip_classification import (
+    EXAMPLE_METRICS as CLIP_CLASSIFICATION_EXAMPLE_METRICS,
+)
+from soundevent.evaluation.tasks.clip_classification import (
+    RUN_METRICS as CLIP_CLASSIFICATION_RUN_METRICS,
+)
+from soundevent.evaluation.tasks.clip_classification import _evaluate_example
+from soundevent.evaluation.tasks.clip_multilabel_classification import (
+    RUN_METRICS as CLIP_TAGGING_RUN_METRICS,
+)
+from soundevent.evaluation.tasks.clip_multilabel_classification import (
+    _evaluate_clip as _evaluate_clip_tags,
+)
+from soundevent.evaluation.tasks.sound_event_classification import (
+    RUN_METRICS as SOUND_EVENT_TAGGING_RUN_METRICS,
+)
+from soundevent.evaluation.tasks.sound_event_classification import (
+    _evaluate_clip as _evaluate_sound_event_tags,
+)
+from soundevent.evaluation.tasks.sound_event_detection import (
+    RUN_METRICS as SOUND_EVENT_DETECTION_RUN_METRICS,
+)
+from soundevent.evaluation.tasks.sound_event_detection import (
+    evaluate_clip as _evaluate_detections,
+)
+
+__all__ = [
+    "EVALUATION_TASKS",
+    "ClipEvaluator",
+    "ClipExamples",
+    "EvaluatedClip",
+    "EvaluationAccumulator",
+    "EvaluationTask",
+    "evaluate_clip",
+    "evaluate_clip_pair",
+    "fingerprint_clip",
+]
+
+
+EvaluatedClip = tuple[list[Any], list[np.ndarray], data.ClipEvaluation]
+"""True classes, predicted class scores and evaluation of a clip."""
+
+ClipEvaluator = Callable[
+    [data.ClipAnnotation, data.ClipPrediction, Encoder],
+    EvaluatedClip,
+]
+
+
+@dataclass(frozen=True)
+class EvaluationTask:
+    """How predictions of a given type are evaluated."""
+
+    name: str
+    """Name of the task, as stored in the evaluation."""
+
+    evaluate_clip: ClipEvaluator
+    """Function that evaluates the predictions of a single clip."""
+
+    run_metrics: Sequence[tuple[data.Term, metrics.Metric]]
+    """Metrics computed over all the evaluated clips."""
+
+
+# NOTE: The per clip functions of the tasks are not exported by soundevent,
+# so they are imported from the task modules, and wrapped so that all of
+# them return a list of examples per clip.
+def _evaluate_sound_event_detection(
+    clip_annotation: data.ClipAnnotation,
+    clip_prediction: data.ClipPrediction,
+    encoder: Encoder,
+) -> EvaluatedClip:
+    return _evaluate_detections(
+        clip_annotations=clip_annotation,
+        clip_predictions=clip_prediction,
+        encoder=encoder,
+    )
+
+
+def _evaluate_sound_event_classification(
+    clip_annotation: data.ClipAnnotation,
+    clip_prediction: data.ClipPrediction,
+    encoder: Encoder,
+) -> EvaluatedClip:
+    return _evaluate_sound_event_tags(
+        clip_annotations=clip_annotation,
+        clip_predictions=clip_prediction,
+        encoder=encoder,
+    )
+
+
+def _evaluate_clip_classification(
+    clip_annotation: data.ClipAnnotation,
+    clip_prediction: data.ClipPrediction,
+    encoder: Encoder,
+) -> EvaluatedClip:
+    true_class, scores, evaluation = _evaluate_example(
+        clip_annotations=clip_annotation,
+        clip_predictions=clip_prediction,
+        encoder=encoder,
+        metrics=CLIP_CLASSIFICATION_EXAMPLE_METRICS,
+        scoring_fn=metrics.classification_score,
+    )
+    return [true_class], [scores], evaluation
+
+
+def _evaluate_clip_tagging(
+    clip_annotation: data.ClipAnnotation,
+    clip_prediction: data.ClipPrediction,
+    encoder: Encoder,
+) -> EvaluatedClip:
+    true_classes, scores, evaluation = _evaluate_clip_tags(
+        clip_annotations=clip_annotation,
+        clip_predictions=clip_prediction,
+        encoder=encoder,
+    )
+    return [true_classes], [scores], evaluation
+
+
+EVALUATION_TASKS: dict[str, EvaluationTask] = {
+    "Sound Event Detection": EvaluationTask(
+        name="sound_event_detection",
+        evaluate_clip=_evaluate_sound_event_detection,
+        run_metrics=SOUND_EVENT_DETECTION_RUN_METRICS,
+    ),
+    "Sound Event Tagging": EvaluationTask(
+        name="sound_event_classification",
+        evaluate_clip=_evaluate_sound_event_classification,
+        run_metrics=SOUND_EVENT_TAGGING_RUN_METRICS,
+    ),
+    "Clip Classification": EvaluationTask(
+        name="clip_classification",
+        evaluate_clip=_evaluate_clip_classification,
+        run_metrics=CLIP_CLASSIFICATION_RUN_METRICS,
+    ),
+    "Clip Tagging": EvaluationTask(
+        name="clip_multilabel_classification",
+        evaluate_clip=_evaluate_clip_tagging,
+        run_metrics=CLIP_TAGGING_RUN_METRICS,
+    ),
+}
+"""Evaluation tasks by the prediction type of the evaluation set."""
+
+
+class ClipExamples(NamedTuple):
+    """The examples of an evaluated clip that the run metrics need."""
+
+    true_classes: list[Any]
+    """The encoded true class of each example."""
+
+    scores: list[np.ndarray]
+    """The predicted class scores of each example."""
+
+    score: float | None
+    """The score of the clip, or None if it has no valid score."""
+
+    @classmethod
+    def from_evaluated(cls, evaluated: EvaluatedClip) -> "ClipExamples":
+        """Get the examples of an evaluated clip."""
+        true_classes, scores, evaluation = evaluated
+        score = evaluation.score
+        if score is not None and np.isnan(score):
+            score = None
+        return cls(list(true_classes), list(scores), score)
+
+    @classmethod
+    def from_json(cls, obj: dict[str, Any]) -> "ClipExamples":
+        """Load examples stored with `to_json`."""
+        return cls(
+            true_classes=[
+                np.asarray(value) if isinstance(value, list) else value
+                for value in obj["true_classes"]
+            ],
+            scores=[np.asarray(value) for value in obj["scores"]],
+            score=obj["score"],
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the examples to JSON serializable data."""
+        return {
+            "true_classes": [
+                value.tolist()
+                if isinstance(value, (np.generic, np.ndarray))
+                else value
+                for value in self.true_classes
+            ],
+            "scores": [
+                np.asarray(value, dtype=np.float32).tolist()
+                for value in self.scores
+            ],
+            "score": self.score,
+        }
+
+
+@dataclass
+class EvaluationAccumulator:
+    """Aggregate the results of clip evaluations into run metrics.
+
+    Clip scores are aggregated into a running mean. The encoded true
+    classes and predicted scores, which the run metrics need in full, are
+    kept as compact arrays instead of the clip evaluations they come from.
+    """
+
+    task: EvaluationTask
+    """The task the clips are evaluated for."""
+
+    score_sum: float = 0.0
+    """Sum of the scores of the clips seen so far."""
+
+    score_count: int = 0
+    """Number of clips with a score seen so far."""
+
+    true_classes: list[Any] = field(default_factory=list)
+    """Encoded true classes of all the examples seen so far."""
+
+    predicted_scores: list[np.ndarray] = field(default_factory=list)
+    """Arrays of predicted class scores of the examples seen so far."""
+
+    def add(self, evaluated: EvaluatedClip) -> None:
+        """Add the results of an evaluated clip."""
+        self.add_examples(ClipExamples.from_evaluated(evaluated))
+
+    def add_examples(self, examples: ClipExamples) -> None:
+        """Add the examples of a clip, such as stored ones."""
+        self.true_classes.extend(examples.true_classes)
+        if examples.scores:
+            self.predicted_scores.append(
+                np.stack(examples.scores).astype(np.float32)
+            )
+
+        if examples.score is not None:
+            self.score_sum += examples.score
+            self.score_count += 1
+
+    @property
+    def score(self) -> float:
+        """Mean score of the clips seen so far."""
+        if not self.score_count:
+            return 0.0
+        return self.score_sum / self.score_count
+
+    def compute_metrics(self) -> list[data.Feature]:
+        """Compute the run metrics over all the examples seen so far.
+
+        Returns no metrics if no example was seen.
+        """
+        if not self.predicted_scores:
+            return []
+
+        scores = np.concatenate(self.predicted_scores)
+        return [
+            data.Feature(
+                term=term,
+                value=metric(self.true_classes, scores),
+            )
+            for term, metric in self.task.run_metrics
+        ]
+
+
+def evaluate_clip(
+    task: EvaluationTask,
+    clip_annotation: data.ClipAnnotation,
+    clip_prediction: data.ClipPrediction,
+    encoder: Encoder,
+) -> EvaluatedClip:
+    """Evaluate the predictions of a single clip.
+
+    Parameters
+    ----------
+    task
+        The evaluation task.
+    clip_annotation
+        The ground truth annotations of the clip.
+    clip_prediction
+        The predictions for the clip.
+    encoder
+        The encoder of the tags of the evaluation set into classes.
+
+    Returns
+    -------
+    true_classes : list
+        The encoded true class of each example in the clip.
+    predicted_scores : list[np.ndarray]
+        The predicted class scores of each example in the clip.
+    evaluation : data.ClipEvaluation
+        The evaluation of the clip, with its matches and metrics.
+    """
+    return task.evaluate_clip(clip_annotation, clip_prediction, encoder)
+
+
+def evaluate_clip_pair(
+    pair: tuple[data.ClipAnnotation, data.ClipPrediction],
+    prediction_type: str,
+    tags: tuple[data.Tag, ...],
+) -> EvaluatedClip:
+    """Evaluate the predictions of a single clip in a worker process.
+
+    Unlike `evaluate_clip`, the task and the encoder are given by the
+    prediction type and the evaluation tags, which are cheap to send to a
+    worker process. The encoder is built once per process and set of tags.
+
+    Parameters
+    ----------
+    pair
+        The ground truth annotations of the clip and its predictions.
+    prediction_type
+        The prediction type of the evaluation set, a key of
+        `EVALUATION_TASKS`.
+    tags
+        The tags of the evaluation set.
+
+    Returns
+    -------
+    EvaluatedClip
+        See `evaluate_clip`.
+    """
+    clip_annotation, clip_prediction = pair
+    return evaluate_clip(
+        EVALUATION_TASKS[prediction_type],
+        clip_annotation,
+        clip_prediction,
+        _get_encoder(tags),
+    )
+
+
+@lru_cache(maxsize=16)
+def _get_encoder(tags: tuple[data.Tag, ...]) -> Encoder:
+    return create_tag_encoder(list(tags))
+
+
+def fingerprint_clip(
+    prediction_type: str,
+    tags: Sequence[data.Tag],
+    clip_annotation: data.ClipAnnotation,
+    clip_prediction: data.ClipPrediction,
+) -> str:
+    """Compute a fingerprint of everything the evaluation of a clip uses.
+
+    The fingerprint changes when the annotations or the predictions of the
+    clip change, or when the evaluation set is given other tags. Notes are
+    left out, as they do not affect the evaluation.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(prediction_type.encode())
+    for tag in sorted(tag.model_dump_json() for tag in tags):
+        digest.update(tag.encode())
+    digest.update(clip_annotation.model_dump_json(exclude={"notes"}).encode())
+    digest.update(clip_prediction.model_dump_json().encode())
+    return digest.hexdigest()
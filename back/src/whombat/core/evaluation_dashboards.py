@@ -0,0 +1,236 @@
+"""Aggregate views of the examples of an evaluation.
+
+Evaluation dashboards summarise how the predictions of a run score against
+each class of the evaluation set: a precision-recall curve and average
+precision per class, and a confusion matrix of true against predicted
+classes. They are computed with NumPy from the encoded true classes and
+predicted scores kept for each evaluated clip, see
+`whombat.core.evaluation.ClipExamples`.
+
+Average precision follows `soundevent.evaluation.metrics`, so that the
+mean of the per class values matches the stored mean average precision:
+examples without a true class are left out, and precision is not
+interpolated.
+"""
+
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+__all__ = [
+    "ClassCurve",
+    "average_precision",
+    "compute_class_curves",
+    "confusion_matrix",
+    "downsample_curve",
+    "encode_true_classes",
+    "precision_recall_curve",
+]
+
+
+class ClassCurve(NamedTuple):
+    """Precision-recall curve of one class."""
+
+    support: int
+    """Number of examples of the class."""
+
+    average_precision: float | None
+    """Average precision, or None if the class has no examples."""
+
+    precision: np.ndarray
+    """Precision at each threshold, by decreasing threshold."""
+
+    recall: np.ndarray
+    """Recall at each threshold, by decreasing threshold."""
+
+    thresholds: np.ndarray
+    """Distinct predicted scores, in decreasing order."""
+
+
+def encode_true_classes(
+    true_classes: Sequence[Any],
+    num_classes: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Encode true classes as a boolean matrix of examples by classes.
+
+    Parameters
+    ----------
+    true_classes
+        The true class of each example, as returned by the evaluation
+        tasks: an int or None for single label tasks, or an array of class
+        indicators for multi-label tasks.
+    num_classes
+        The number of classes.
+
+    Returns
+    -------
+    y_true : np.ndarray
+        Boolean array of shape (n_examples, num_classes).
+    has_class : np.ndarray
+        Boolean array of shape (n_examples,), False for the examples of
+        single label tasks without a true class.
+    """
+    if not true_classes:
+        return (
+            np.zeros((0, num_classes), dtype=bool),
+            np.zeros(0, dtype=bool),
+        )
+
+    if isinstance(true_classes[0], np.ndarray):
+        y_true = np.stack(true_classes).astype(bool)
+        return y_true, np.ones(len(y_true), dtype=bool)
+
+    labels = _get_labels(true_classes, num_classes)
+    y_true = np.eye(num_classes + 1, dtype=bool)[labels, :num_classes]
+    return y_true, labels < num_classes
+
+
+def precision_recall_curve(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the precision-recall curve of a binary problem.
+
+    There is one point per distinct score, taken as a threshold: examples
+    with a score at or above it are predicted positive. Points are sorted
+    by decreasing threshold, so recall increases along the curve.
+
+    Parameters
+    ----------
+    y_true
+        Boolean array of shape (n_examples,).
+    y_score
+        Array of predicted scores of shape (n_examples,).
+
+    Returns
+    -------
+    precision : np.ndarray
+    recall : np.ndarray
+        All zeros if there are no positive examples.
+    thresholds : np.ndarray
+    """
+    if not y_score.size:
+        empty = np.zeros(0, dtype=np.float64)
+        return empty, empty, empty
+
+    order = np.argsort(y_score, kind="mergesort")[::-1]
+    y_score = y_score[order]
+    y_true = y_true[order]
+
+    # NOTE: Only the last example of each run of equal scores is a point of
+    # the curve, as all of them are positive at the same threshold.
+    last = np.r_[np.flatnonzero(np.diff(y_score)), y_true.size - 1]
+    true_positives = np.cumsum(y_true, dtype=np.int64)[last]
+    predicted = last + 1
+
+    precision = true_positives / predicted
+    total = true_positives[-1] if true_positives.size else 0
+    recall = (
+        true_positives / total
+        if total
+        else np.zeros(true_positives.shape, dtype=np.float64)
+    )
+    return precision, recall, y_score[last]
+
+
+def average_precision(precision: np.ndarray, recall: np.ndarray) -> float:
+    """Compute the average precision of a precision-recall curve.
+
+    Average precision is the sum of the precision at each point weighted
+    by the increase in recall from the previous point.
+    """
+    return float(np.sum(np.diff(recall, prepend=0) * precision))
+
+
+def compute_class_curves(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+) -> list[ClassCurve]:
+    """Compute the precision-recall curve of each class, one against rest.
+
+    Parameters
+    ----------
+    y_true
+        Boolean array of shape (n_examples, n_classes).
+    y_score
+        Array of predicted scores of shape (n_examples, n_classes).
+    """
+    curves = []
+    for column in range(y_score.shape[1]):
+        precision, recall, thresholds = precision_recall_curve(
+            y_true[:, column],
+            y_score[:, column],
+        )
+        support = int(y_true[:, column].sum())
+        curves.append(
+            ClassCurve(
+                support=support,
+                average_precision=(
+                    average_precision(precision, recall) if support else None
+                ),
+                precision=precision,
+                recall=recall,
+                thresholds=thresholds,
+            )
+        )
+    return curves
+
+
+def downsample_curve(curve: ClassCurve, max_points: int) -> ClassCurve:
+    """Keep at most `max_points` evenly spaced points of a curve.
+
+    The first and last points are always kept. The average precision is
+    left as computed from the full curve.
+    """
+    size = curve.thresholds.size
+    if size <= max_points:
+        return curve
+
+    index = np.unique(np.linspace(0, size - 1, max_points).round().astype(int))
+    return curve._replace(
+        precision=curve.precision[index],
+        recall=curve.recall[index],
+        thresholds=curve.thresholds[index],
+    )
+
+
+def confusion_matrix(
+    true_classes: Sequence[Any],
+    y_score: np.ndarray,
+) -> np.ndarray:
+    """Count examples by true and predicted class.
+
+    The predicted class of an example is that of its highest score. As in
+    the balanced accuracy of `soundevent`, the probability of no class is
+    one minus the sum of the scores, and competes with the classes. Only
+    for single label tasks.
+
+    Parameters
+    ----------
+    true_classes
+        The true class of each example, an int or None.
+    y_score
+        Array of predicted scores of shape (n_examples, n_classes).
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_classes + 1, n_classes + 1) of counts, with true
+        classes as rows and predicted classes as columns. The last row and
+        column are for no class.
+    """
+    num_classes = y_score.shape[1]
+    size = num_classes + 1
+    labels = _get_labels(true_classes, num_classes)
+    predicted = np.c_[y_score, 1 - y_score.sum(axis=1)].argmax(axis=1)
+    counts = np.bincount(labels * size + predicted, minlength=size * size)
+    return counts.reshape(size, size)
+
+
+def _get_labels(true_classes: Sequence[Any], num_classes: int) -> np.ndarray:
+    """Get the class index of each example, with num_classes for None."""
+    return np.array(
+        [num_classes if value is None else value for value in true_classes],
+        dtype=np.int64,
+    )
@@ -1,8 +1,13 @@
 """File handling functions."""
 
+import hashlib
 import logging
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, Literal, Mapping
 
 from soundevent.audio import (
     MediaInfo,
@@ -10,18 +15,68 @@ from soundevent.audio import (
     get_media_info,
     is_audio_file,
 )
+from soundevent.audio.files import VALID_AUDIO_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
+    "FileEntry",
+    "FileInfo",
+    "HashStrategy",
+    "compute_hash",
     "get_audio_files_in_folder",
+    "check_hash_strategy",
     "get_file_info",
-    "FileInfo",
+    "get_hash_strategy",
+    "scan_folder",
 ]
 
+HashStrategy = Literal["md5", "blake2b", "xxh3", "blake3", "fingerprint"]
+"""Algorithms that can be used to compute the hash of an audio file.
+
+- ``md5``: MD5 digest of the whole file.
+- ``blake2b``: BLAKE2b digest of the whole file.
+- ``xxh3``: XXH3 128 bit digest of the whole file. Requires the
+    ``xxhash`` extra.
+- ``blake3``: BLAKE3 digest of the whole file. Requires the ``blake3``
+    extra.
+- ``fingerprint``: BLAKE2b digest of the file size, the header and a fixed
+    number of blocks sampled evenly across the file. It only reads a small
+    part of each file, but two files that differ only outside the sampled
+    blocks will get the same hash.
+"""
+
+HASH_BUFFER_SIZE = 1024 * 1024
+
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+FINGERPRINT_BLOCKS = 16
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Filesystem state of a scanned audio file or directory."""
+
+    path: Path
+    """Path relative to the scanned folder."""
+
+    size: int
+    """Size in bytes. Always 0 for directories."""
+
+    mtime: int
+    """Modification time in nanoseconds."""
+
+    inode: int
+    """Inode number (file index on Windows)."""
+
+    is_dir: bool = False
+    """Whether the entry is a directory."""
+
 
 def get_audio_files_in_folder(
-    audio_dir: Path, relative: bool = True
+    audio_dir: Path,
+    relative: bool = True,
+    max_workers: int | None = None,
 ) -> list[Path]:
     """Get all path to audio files in a directory recursively.
 
@@ -34,18 +89,164 @@ def get_audio_files_in_folder(
     relative: bool, optional
         If True, the returned paths will be relative to the audio_dir path.
         By default True.
+    max_workers: int, optional
+        Number of threads used to list directories concurrently. See
+        `scan_folder`.
 
     Returns
     -------
     recordings: list[Path]
     """
+    root = audio_dir.absolute()
     return [
-        path.relative_to(audio_dir) if relative else path.absolute()
-        for path in audio_dir.rglob("*")
-        if path.is_file() and is_audio_file(path)
+        entry.path if relative else root / entry.path
+        for batch in scan_folder(audio_dir, max_workers=max_workers)
+        for entry in batch
+        if not entry.is_dir
     ]
 
 
+def scan_folder(
+    audio_dir: Path,
+    index: Mapping[Path, FileEntry] | None = None,
+    max_workers: int | None = None,
+) -> Generator[list[FileEntry], None, None]:
+    """Scan a folder recursively for audio files.
+
+    Directories are listed concurrently with `os.scandir` on a thread pool,
+    which hides most of the latency of network file systems. Results are
+    yielded one directory at a time, as soon as the directory has been
+    listed, so callers can start processing before the scan is complete.
+
+    If an index from a previous scan is given, directories whose
+    modification time and inode are unchanged are not listed again, and
+    their entries are taken from the index. The modification time of a
+    directory changes whenever an entry is added, removed or renamed in
+    it, so only the changed directories are read. Note that files that
+    were modified in place are not detected in unchanged directories.
+
+    Parameters
+    ----------
+    audio_dir: Path
+        Path to the folder to scan.
+    index: Mapping[Path, FileEntry], optional
+        The entries of a previous scan of the same folder, keyed by path.
+    max_workers: int, optional
+        Number of threads used to list directories. Defaults to the
+        `concurrent.futures.ThreadPoolExecutor` default.
+
+    Yields
+    ------
+    entries: list[FileEntry]
+        The entry of a directory, followed by the entries of the audio
+        files it contains. Paths are relative to `audio_dir`.
+    """
+    if index is None:
+        index = {}
+
+    children = _group_by_parent(index.values())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(
+                _scan_directory, audio_dir, Path(), index, children
+            )
+        }
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, subdirs = future.result()
+
+                for subdir in subdirs:
+                    pending.add(
+                        executor.submit(
+                            _scan_directory,
+                            audio_dir,
+                            subdir,
+                            index,
+                            children,
+                        )
+                    )
+
+                if entries:
+                    yield entries
+
+
+def _group_by_parent(
+    entries: Iterable[FileEntry],
+) -> dict[Path, list[FileEntry]]:
+    grouped = defaultdict(list)
+    for entry in entries:
+        if entry.path == Path():
+            continue
+        grouped[entry.path.parent].append(entry)
+    return grouped
+
+
+def _scan_directory(
+    audio_dir: Path,
+    relative: Path,
+    index: Mapping[Path, FileEntry],
+    children: Mapping[Path, list[FileEntry]],
+) -> tuple[list[FileEntry], list[Path]]:
+    path = audio_dir / relative
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        logger.warning(f"Could not access directory: {path}")
+        return [], []
+
+    entry = FileEntry(
+        path=relative,
+        size=0,
+        mtime=stat.st_mtime_ns,
+        inode=stat.st_ino,
+        is_dir=True,
+    )
+
+    if index.get(relative) == entry:
+        cached = children.get(relative, [])
+        return (
+            [entry, *(child for child in cached if not child.is_dir)],
+            [child.path for child in cached if child.is_dir],
+        )
+
+    entries = [entry]
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for item in it:
+                if item.is_dir(follow_symlinks=False):
+                    subdirs.append(relative / item.name)
+                    continue
+
+                # NOTE: Check the extension directly, `is_audio_file` would
+                # stat the file a second time.
+                extension = os.path.splitext(item.name)[1][1:].lower()
+                if extension not in VALID_AUDIO_EXTENSIONS:
+                    continue
+
+                if not item.is_file():
+                    continue
+
+                item_stat = item.stat()
+                entries.append(
+                    FileEntry(
+                        path=relative / item.name,
+                        size=item_stat.st_size,
+                        mtime=item_stat.st_mtime_ns,
+                        inode=item_stat.st_ino,
+                    )
+                )
+    except OSError:
+        logger.warning(f"Could not list directory: {path}")
+        return [], []
+
+    return entries, subdirs
+
+
 @dataclass
 class FileInfo:
     path: Path
@@ -55,14 +256,14 @@ class FileInfo:
     media_info: MediaInfo | None = None
 
 
-def get_file_info(path: Path) -> FileInfo:
+def get_file_info(path: Path, hash_strategy: HashStrategy = "md5") -> FileInfo:
     """Get information about a file.
 
     This function will gather the following information about the file:
 
     - If the file exists.
     - If the file is an audio file.
-    - The SHA256 hash of the file.
+    - The hash of the file.
     - Information about the media file (duration, samplerate, etc).
 
     The hash and media information will only be computed if the file exists and
@@ -72,6 +273,9 @@ def get_file_info(path: Path) -> FileInfo:
     ----------
     path: Path
         Path to the file.
+    hash_strategy: HashStrategy, optional
+        The algorithm used to compute the hash of the file. See
+        `compute_hash`. By default "md5".
 
     Returns
     -------
@@ -89,7 +293,7 @@ def get_file_info(path: Path) -> FileInfo:
         return FileInfo(path=path, exists=True, is_audio=False)
 
     logger.debug(f"Computing hash of file: {path}")
-    hash = compute_md5_checksum(path)
+    hash = compute_hash(path, hash_strategy)
     logger.debug("done")
 
     try:
@@ -108,3 +312,136 @@ def get_file_info(path: Path) -> FileInfo:
         hash=hash,
         media_info=media_info,
     )
+
+
+def compute_hash(path: Path, strategy: HashStrategy = "md5") -> str:
+    """Compute the hash of a file.
+
+    Hashes are prefixed with the name of the strategy used to compute
+    them, e.g. ``xxh3:1f0e...``, so that hashes computed with different
+    strategies never collide and the strategy of a stored hash can be
+    recovered with `get_hash_strategy`. MD5 hashes are not prefixed, as
+    this was the only hash used before strategies were introduced.
+
+    Parameters
+    ----------
+    path: Path
+        Path to the file.
+    strategy: HashStrategy, optional
+        The algorithm used to compute the hash. By default "md5".
+
+    Returns
+    -------
+    hash: str
+
+    Raises
+    ------
+    ValueError
+        If the strategy is unknown.
+    ImportError
+        If the package required by the strategy is not installed.
+    """
+    if strategy == "md5":
+        return compute_md5_checksum(path)
+
+    if strategy == "fingerprint":
+        return f"{strategy}:{_compute_fingerprint(path)}"
+
+    digest = _get_hash_factory(strategy)()
+    with open(path, "rb") as fp:
+        while buffer := fp.read(HASH_BUFFER_SIZE):
+            digest.update(buffer)
+
+    return f"{strategy}:{digest.hexdigest()}"
+
+
+def get_hash_strategy(hash: str) -> HashStrategy:
+    """Get the strategy that was used to compute a hash.
+
+    Parameters
+    ----------
+    hash: str
+        A hash as returned by `compute_hash`.
+
+    Returns
+    -------
+    strategy: HashStrategy
+
+    Raises
+    ------
+    ValueError
+        If the hash prefix is not a known strategy.
+    """
+    if ":" not in hash:
+        return "md5"
+
+    strategy, _ = hash.split(":", 1)
+    if strategy not in ("blake2b", "xxh3", "blake3", "fingerprint"):
+        raise ValueError(f"Unknown hash strategy: {strategy}")
+
+    return strategy  # type: ignore
+
+
+def check_hash_strategy(strategy: HashStrategy) -> None:
+    """Check that a hash strategy can be used.
+
+    Raises
+    ------
+    ImportError
+        If the strategy requires an optional package that is not
+        installed.
+    """
+    if strategy in ("xxh3", "blake3"):
+        _get_hash_factory(strategy)
+
+
+def _get_hash_factory(strategy: HashStrategy) -> Callable[[], Any]:
+    if strategy == "blake2b":
+        return hashlib.blake2b
+
+    if strategy == "xxh3":
+        # NOTE: xxhash and blake3 are optional, so they may not be
+        # installed where the code is type checked.
+        try:
+            import xxhash  # type: ignore[import]
+        except ImportError as error:
+            raise ImportError(
+                "The xxh3 hash strategy requires the xxhash package. "
+                "Install it with `pip install whombat[xxhash]`."
+            ) from error
+
+        return xxhash.xxh3_128
+
+    if strategy == "blake3":
+        try:
+            from blake3 import blake3  # type: ignore[import]
+        except ImportError as error:
+            raise ImportError(
+                "The blake3 hash strategy requires the blake3 package. "
+                "Install it with `pip install whombat[blake3]`."
+            ) from error
+
+        return blake3
+
+    raise ValueError(f"Unknown hash strategy: {strategy}")
+
+
+def _compute_fingerprint(path: Path) -> str:
+    size = path.stat().st_size
+    digest = hashlib.blake2b(size.to_bytes(8, "little"))
+
+    with open(path, "rb") as fp:
+        if size <= FINGERPRINT_BLOCK_SIZE * FINGERPRINT_BLOCKS:
+            # Small files are hashed in full.
+            while buffer := fp.read(HASH_BUFFER_SIZE):
+                digest.update(buffer)
+            return digest.hexdigest()
+
+        # The first block holds the audio header. The remaining blocks are
+        # spread evenly so that the last one ends at the end of the file.
+        step = (size - FINGERPRINT_BLOCK_SIZE) // (FINGERPRINT_BLOCKS - 1)
+        for block in range(FINGERPRINT_BLOCKS):
+            fp.seek(block * step)
+            digest.update(fp.read(FINGERPRINT_BLOCK_SIZE))
+
+    return digest.hexdigest()
@@ -0,0 +1,302 @@
+"""Storage helpers for sound event geometries.
+
+Sound events store their time and frequency bounds next to their geometry,
+so that they can be filtered by time and frequency range in the database.
+The same bounds give the geometric features of sound events, which are
+computed for many sound events at once with
+`compute_many_geometric_features`.
+
+Geometries themselves are stored in a compact binary encoding: a header
+with the geometry type, the lengths of the nested coordinate lists, and
+the coordinates packed as little endian float64 values. Unlike JSON, it is
+decoded without parsing text, and code that only needs the coordinates
+can skip building geometry objects altogether.
+"""
+
+import struct
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+from soundevent import data, terms
+from soundevent.data.geometries import GEOMETRY_MAPPING
+from soundevent.geometry import compute_bounds
+
+__all__ = [
+    "GeometryBounds",
+    "compute_many_geometric_features",
+    "decode_geometry",
+    "encode_geometry",
+    "get_geometry_bounds",
+    "unpack_geometry",
+]
+
+ENCODING_VERSION = 1
+
+GEOMETRY_TYPES: tuple[data.GeometryType, ...] = (
+    "TimeStamp",
+    "TimeInterval",
+    "Point",
+    "BoundingBox",
+    "LineString",
+    "MultiPoint",
+    "Polygon",
+    "MultiLineString",
+    "MultiPolygon",
+)
+"""Geometry types in the order of their tag in the binary encoding.
+
+New types must be appended, as the tags of existing types are stored.
+"""
+
+_DEPTHS = {
+    "TimeStamp": 0,
+    "TimeInterval": 1,
+    "Point": 1,
+    "BoundingBox": 1,
+    "LineString": 2,
+    "MultiPoint": 2,
+    "Polygon": 3,
+    "MultiLineString": 3,
+    "MultiPolygon": 4,
+}
+"""Number of nested lists around the coordinates of each type."""
+
+_HEADER = struct.Struct("<BBI")
+
+_MULTI_GEOMETRY_TYPES = ("MultiPoint", "MultiLineString", "MultiPolygon")
+
+
+class GeometryBounds(NamedTuple):
+    """The time and frequency extent of a geometry."""
+
+    start_time: float
+    """Start time of the geometry in seconds."""
+
+    end_time: float
+    """End time of the geometry in seconds."""
+
+    low_freq: float | None
+    """Lowest frequency of the geometry in Hz.
+
+    None if the geometry only spans time.
+    """
+
+    high_freq: float | None
+    """Highest frequency of the geometry in Hz.
+
+    None if the geometry only spans time.
+    """
+
+
+def get_geometry_bounds(geometry: data.Geometry) -> GeometryBounds:
+    """Compute the time and frequency bounds of a geometry.
+
+    Parameters
+    ----------
+    geometry
+        The geometry of a sound event.
+
+    Returns
+    -------
+    GeometryBounds
+        The bounds of the geometry. Time stamps and time intervals span the
+        whole frequency range, so they have no frequency bounds.
+    """
+    start_time, low_freq, end_time, high_freq = compute_bounds(geometry)
+
+    if geometry.type in ("TimeStamp", "TimeInterval"):
+        return GeometryBounds(start_time, end_time, None, None)
+
+    return GeometryBounds(start_time, end_time, low_freq, high_freq)
+
+
+def compute_many_geometric_features(
+    geometries: Sequence[data.Geometry],
+    bounds: Sequence[GeometryBounds] | None = None,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Compute the geometric features of many geometries at once.
+
+    The features are the same as those of
+    `soundevent.geometry.compute_geometric_features`, but they are
+    computed from the bounds of all geometries with array operations
+    instead of one geometry at a time.
+
+    Parameters
+    ----------
+    geometries
+        The geometries.
+    bounds
+        The bounds of each geometry, if already known, as is the case for
+        stored sound events. Otherwise they are computed.
+
+    Returns
+    -------
+    dict[str, tuple[np.ndarray, np.ndarray]]
+        For each feature name, the indices of the geometries that have the
+        feature and the value of the feature for each of them.
+    """
+    if not geometries:
+        return {}
+
+    if bounds is None:
+        bounds = [get_geometry_bounds(geometry) for geometry in geometries]
+
+    # NOTE: Missing frequency bounds become NaN.
+    start_time, end_time, low_freq, high_freq = np.array(
+        bounds,
+        dtype=np.float64,
+    ).T
+
+    everything = np.arange(len(geometries))
+    with_frequency = np.flatnonzero(~np.isnan(low_freq))
+    multi = np.array(
+        [
+            index
+            for index, geometry in enumerate(geometries)
+            if geometry.type in _MULTI_GEOMETRY_TYPES
+        ],
+        dtype=np.int64,
+    )
+
+    features = {
+        terms.duration.name: (everything, end_time - start_time),
+        terms.low_freq.name: (with_frequency, low_freq[with_frequency]),
+        terms.high_freq.name: (with_frequency, high_freq[with_frequency]),
+        terms.bandwidth.name: (
+            with_frequency,
+            high_freq[with_frequency] - low_freq[with_frequency],
+        ),
+        terms.num_segments.name: (
+            multi,
+            np.array(
+                [len(geometries[index].coordinates) for index in multi],
+                dtype=np.float64,
+            ),
+        ),
+    }
+    return {
+        name: (indices, values)
+        for name, (indices, values) in features.items()
+        if len(indices)
+    }
+
+
+def encode_geometry(geometry: data.Geometry) -> bytes:
+    """Encode a geometry in the compact binary format.
+
+    Parameters
+    ----------
+    geometry
+        A validated geometry.
+
+    Returns
+    -------
+    bytes
+        The encoded geometry.
+    """
+    counts: list[int] = []
+    values: list[float] = []
+    _flatten(geometry.coordinates, _DEPTHS[geometry.type], counts, values)
+    return struct.pack(
+        f"<BBI{len(counts)}I{len(values)}d",
+        ENCODING_VERSION,
+        GEOMETRY_TYPES.index(geometry.type),
+        len(counts),
+        *counts,
+        *values,
+    )
+
+
+def unpack_geometry(value: bytes) -> tuple[data.GeometryType, Any]:
+    """Decode the type and coordinates of an encoded geometry.
+
+    Use this instead of `decode_geometry` when only the raw coordinates
+    are needed, as no geometry object is built.
+
+    Parameters
+    ----------
+    value
+        A geometry encoded with `encode_geometry`.
+
+    Returns
+    -------
+    geometry_type : data.GeometryType
+        The type of the geometry.
+    coordinates
+        The coordinates of the geometry, as nested lists of floats.
+    """
+    version, tag, num_counts = _HEADER.unpack_from(value)
+    if version != ENCODING_VERSION:
+        raise ValueError(f"Unknown geometry encoding version: {version}")
+
+    offset = _HEADER.size + 4 * num_counts
+    num_values = (len(value) - offset) // 8
+    counts = struct.unpack_from(f"<{num_counts}I", value, _HEADER.size)
+    values = struct.unpack_from(f"<{num_values}d", value, offset)
+
+    geometry_type = GEOMETRY_TYPES[tag]
+    return geometry_type, _nest(_DEPTHS[geometry_type], counts, values)
+
+
+def decode_geometry(value: bytes) -> data.Geometry:
+    """Decode a geometry from the compact binary format.
+
+    Parameters
+    ----------
+    value
+        A geometry encoded with `encode_geometry`.
+
+    Returns
+    -------
+    data.Geometry
+        The decoded geometry.
+    """
+    geometry_type, coordinates = unpack_geometry(value)
+    return GEOMETRY_MAPPING[geometry_type](coordinates=coordinates)
+
+
+def _flatten(
+    coordinates: Any,
+    depth: int,
+    counts: list[int],
+    values: list[float],
+) -> None:
+    if depth == 0:
+        values.append(coordinates)
+        return
+
+    counts.append(len(coordinates))
+
+    if depth == 1:
+        values.extend(coordinates)
+        return
+
+    for item in coordinates:
+        _flatten(item, depth - 1, counts, values)
+
+
+def _nest(
+    depth: int,
+    counts: Sequence[int],
+    values: Sequence[float],
+) -> Any:
+    if depth == 0:
+        return values[0]
+
+    count_index = 0
+    value_index = 0
+
+    def build(level: int) -> list:
+        nonlocal count_index, value_index
+
+        count = counts[count_index]
+        count_index += 1
+
+        if level == 1:
+            value_index += count
+            return list(values[value_index - count : value_index])
+
+        return [build(level - 1) for _ in range(count)]
+
+    return build(depth)
@@ -0,0 +1,86 @@
+"""Progress tracking for long running operations."""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+__all__ = [
+    "ProgressTracker",
+]
+
+
+@dataclass
+class ProgressTracker:
+    """Track the throughput of an operation over files.
+
+    The tracker accumulates the number of files and bytes processed and
+    derives the processing rates and the estimated time remaining from
+    the time elapsed since it was created.
+    """
+
+    total_files: int = 0
+    """The number of files to process."""
+
+    total_bytes: int = 0
+    """The number of bytes to process."""
+
+    processed_files: int = 0
+    """The number of files processed so far."""
+
+    processed_bytes: int = 0
+    """The number of bytes processed so far."""
+
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    """The clock used to measure elapsed time, in seconds."""
+
+    started: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.started = self.clock()
+
+    def advance(self, files: int = 0, size: int = 0) -> None:
+        """Record that a number of files and bytes were processed."""
+        self.processed_files += files
+        self.processed_bytes += size
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds elapsed since the tracker was created."""
+        return self.clock() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        """Number of files processed per second."""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self.processed_files / elapsed
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Number of bytes processed per second."""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self.processed_bytes / elapsed
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until all files are processed.
+
+        The estimate is based on the byte rate, as hashing time grows with
+        file size, and falls back to the file rate when sizes are unknown.
+        Returns None while no progress has been made.
+        """
+        if self.processed_files >= self.total_files:
+            return 0.0
+
+        if self.total_bytes > 0 and self.bytes_per_second > 0:
+            remaining = self.total_bytes - self.processed_bytes
+            return max(remaining, 0) / self.bytes_per_second
+
+        if self.files_per_second > 0:
+            remaining = self.total_files - self.processed_files
+            return remaining / self.files_per_second
+
+        return None
@@ -0,0 +1,157 @@
+"""Projection and downsampling of points for scatter plots.
+
+Scatter plots of sound events place each event by its features, or by a
+projection of all its features onto a few principal components. With many
+events a plot is both slow to draw and dominated by its densest regions, so
+points are downsampled on a grid: cells with few points keep all of them,
+and the densest cells are capped so that rare events remain visible. Each
+kept point carries the number of points it stands for.
+"""
+
+import numpy as np
+
+__all__ = [
+    "density_downsample",
+    "pca",
+]
+
+
+def pca(
+    matrix: np.ndarray,
+    n_components: int = 2,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Project points onto their principal components.
+
+    Features are centred and scaled to unit variance before the projection,
+    as they are measured in different units. Missing values (NaN) are
+    replaced by the mean of their feature.
+
+    Parameters
+    ----------
+    matrix
+        Array of shape (n_points, n_features).
+    n_components
+        The number of components to project onto. If there are fewer
+        features, the remaining components are zero.
+
+    Returns
+    -------
+    projected : np.ndarray
+        Float32 array of shape (n_points, n_components).
+    explained_variance_ratio : np.ndarray
+        The fraction of the variance explained by each component.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    n_points, n_features = matrix.shape
+    projected = np.zeros((n_points, n_components), dtype=np.float32)
+    explained = np.zeros(n_components, dtype=np.float64)
+    if n_points < 2 or n_features == 0:
+        return projected, explained
+
+    mean = np.nanmean(matrix, axis=0)
+    mean = np.where(np.isnan(mean), 0, mean)
+    matrix = np.where(np.isnan(matrix), mean, matrix) - mean
+    std = matrix.std(axis=0)
+    matrix /= np.where(std > 0, std, 1)
+
+    # NOTE: The covariance matrix is only n_features squared, so its eigen
+    # decomposition is cheap however many points there are.
+    covariance = matrix.T @ matrix / (n_points - 1)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = eigenvectors[:, order]
+
+    # NOTE: Eigenvectors have an arbitrary sign. Fix it so that the same
+    # data is always projected the same way.
+    signs = np.sign(
+        components[np.abs(components).argmax(axis=0), range(len(order))]
+    )
+    components *= np.where(signs == 0, 1, signs)
+
+    size = len(order)
+    projected[:, :size] = matrix @ components
+    total = eigenvalues.clip(min=0).sum()
+    if total > 0:
+        explained[:size] = eigenvalues[order].clip(min=0) / total
+    return projected, explained
+
+
+def density_downsample(
+    points: np.ndarray,
+    max_points: int,
+    bins: int = 64,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Select at most `max_points` points, favouring sparse regions.
+
+    The first two coordinates of the points are binned in a `bins` by
+    `bins` grid. Every cell keeps up to the same number of points, chosen
+    as large as possible without exceeding `max_points` in total, so cells
+    with fewer points keep all of them. Points are chosen at random within
+    each cell, with a fixed seed so that the same points are returned for
+    the same data.
+
+    Parameters
+    ----------
+    points
+        Array of shape (n_points, n_dimensions), with n_dimensions >= 2.
+    max_points
+        The maximum number of points to keep.
+    bins
+        The number of grid cells along each axis.
+    seed
+        Seed of the random choice of points within each cell.
+
+    Returns
+    -------
+    index : np.ndarray
+        Sorted indices of the kept points.
+    weights : np.ndarray
+        Float32 array with the number of points each kept point stands for.
+    """
+    n_points = len(points)
+    if n_points <= max_points:
+        return np.arange(n_points), np.ones(n_points, dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    cells = _get_cells(points[:, :2], bins)
+    counts = np.bincount(cells, minlength=bins * bins)
+    quota = _get_quota(counts, max_points)
+    if quota == 0:
+        # NOTE: There are more occupied cells than points to keep, so the
+        # points are sampled uniformly instead.
+        index = np.sort(rng.choice(n_points, size=max_points, replace=False))
+        weights = np.full(max_points, n_points / max_points, dtype=np.float32)
+        return index, weights
+
+    order = np.lexsort((rng.random(n_points), cells))
+    sorted_cells = cells[order]
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(n_points) - starts[sorted_cells]
+    index = np.sort(order[rank < quota])
+
+    kept_counts = counts[cells[index]]
+    weights = kept_counts / np.minimum(kept_counts, quota)
+    return index, weights.astype(np.float32)
+
+
+def _get_cells(points: np.ndarray, bins: int) -> np.ndarray:
+    """Get the grid cell of each point as a flat index."""
+    low = points.min(axis=0)
+    span = points.max(axis=0) - low
+    span = np.where(span > 0, span, 1)
+    position = ((points - low) / span * bins).astype(np.int64)
+    position = position.clip(0, bins - 1)
+    return position[:, 0] * bins + position[:, 1]
+
+
+def _get_quota(counts: np.ndarray, max_points: int) -> int:
+    """Find the largest number of points per cell within `max_points`."""
+    low, high = 0, int(counts.max())
+    while low < high:
+        middle = (low + high + 1) // 2
+        if np.minimum(counts, middle).sum() <= max_points:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -0,0 +1,135 @@
+"""In-memory prefix index of tags.
+
+Tag pickers query the tag vocabulary on every keystroke. The vocabulary is
+small, so it is kept in memory in a sorted list of lower case search terms
+and looked up by prefix with binary search, without querying the database.
+
+Each tag is found by prefixes of its key, of its value, of each word of
+its value and of ``key:value``.
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+__all__ = [
+    "IndexedTag",
+    "TagIndex",
+]
+
+
+class IndexedTag(NamedTuple):
+    """A tag stored in the index."""
+
+    id: int
+    """Database id of the tag."""
+
+    key: str
+    """Key of the tag."""
+
+    value: str
+    """Value of the tag."""
+
+
+class TagIndex:
+    """Sorted prefix index of tags."""
+
+    def __init__(self) -> None:
+        self.loaded = False
+        self._tags: dict[int, IndexedTag] = {}
+        self._entries: list[tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    @property
+    def max_id(self) -> int:
+        """The largest id of the indexed tags, or 0 if there are none."""
+        return max(self._tags, default=0)
+
+    def load(self, tags: Iterable[IndexedTag]) -> None:
+        """Replace the contents of the index."""
+        self._tags = {tag.id: tag for tag in tags}
+        self._entries = sorted(
+            (term, tag.id)
+            for tag in self._tags.values()
+            for term in _get_terms(tag)
+        )
+        self.loaded = True
+
+    def add(self, tag: IndexedTag) -> None:
+        """Add a tag, replacing any tag with the same id."""
+        if tag.id in self._tags:
+            self.remove(tag.id)
+
+        self._tags[tag.id] = tag
+        for term in _get_terms(tag):
+            insort(self._entries, (term, tag.id))
+
+    def remove(self, tag_id: int) -> None:
+        """Remove a tag from the index, if present."""
+        tag = self._tags.pop(tag_id, None)
+        if tag is None:
+            return
+
+        for term in _get_terms(tag):
+            entry = (term, tag_id)
+            position = bisect_left(self._entries, entry)
+            if self._entries[position : position + 1] == [entry]:
+                del self._entries[position]
+
+    def clear(self) -> None:
+        """Remove all tags and mark the index as not loaded."""
+        self._tags = {}
+        self._entries = []
+        self.loaded = False
+
+    def search(
+        self,
+        prefix: str,
+        limit: int = 10,
+        rank: Callable[[IndexedTag], float] | None = None,
+    ) -> Sequence[IndexedTag]:
+        """Find the tags that match a prefix.
+
+        Parameters
+        ----------
+        prefix
+            The text typed so far. Matching is case insensitive.
+        limit
+            The maximum number of tags to return.
+        rank
+            A score for each tag, such as how often it is used. Tags with
+            higher scores are returned first.
+
+        Returns
+        -------
+        Sequence[IndexedTag]
+            The matching tags, sorted by decreasing rank, then by the
+            length of their value and alphabetically.
+        """
+        prefix = prefix.strip().lower()
+        position = bisect_left(self._entries, (prefix,))
+
+        matches: set[int] = set()
+        for term, tag_id in self._entries[position:]:
+            if not term.startswith(prefix):
+                break
+            matches.add(tag_id)
+
+        tags = [self._tags[tag_id] for tag_id in matches]
+        return sorted(
+            tags,
+            key=lambda tag: (
+                -rank(tag) if rank is not None else 0,
+                len(tag.value),
+                tag.value,
+                tag.key,
+            ),
+        )[:limit]
+
+
+def _get_terms(tag: IndexedTag) -> set[str]:
+    key = tag.key.lower()
+    value = tag.value.lower()
+    return {key, value, f"{key}:{value}", *value.split()}
@@ -4,6 +4,7 @@ __all__ = [
     "NotFoundError",
     "DuplicateObjectError",
     "MissingDatabaseError",
+    "MissingDependencyError",
 ]
 
 
@@ -23,6 +24,10 @@ class MissingDatabaseError(RuntimeError):
     """Raised when the database is not available."""
 
 
+class MissingDependencyError(ImportError):
+    """Raised when an optional package needed by an operation is missing."""
+
+
 class DataIntegrityError(RuntimeError):
     """Raised if the operation is canceled due to database constraints.
 
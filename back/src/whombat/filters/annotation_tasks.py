@@ -3,7 +3,7 @@
 from uuid import UUID
 
 from soundevent import data
-from sqlalchemy import Select, or_
+from sqlalchemy import Select, and_, or_, select
 
 from whombat import models
 from whombat.filters import base
@@ -27,38 +27,25 @@ class RecordingTagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = (
-            query.join(
-                models.Clip,
-                models.Clip.id == models.AnnotationTask.clip_id,
-            )
-            .join(
-                models.Recording,
-                models.Recording.id == models.Clip.recording_id,
-            )
-            .join(
-                models.RecordingTag,
-                models.RecordingTag.recording_id == models.Recording.id,
-            )
-            .join(
-                models.Tag,
-                models.Tag.id == models.RecordingTag.tag_id,
-            )
-        )
-
-        if self.key is None:
-            return query.where(
-                models.Tag.value == self.value,
-            )
+        conditions = [
+            models.RecordingTag.tag_id == models.Tag.id,
+            models.RecordingTag.recording_id == models.Clip.recording_id,
+        ]
+        if self.key is not None:
+            conditions.append(models.Tag.key == self.key)
 
-        if self.value is None:
-            return query.where(
-                models.Tag.key == self.key,
-            )
+        if self.value is not None:
+            conditions.append(models.Tag.value == self.value)
 
+        query = base.join_once(
+            query,
+            (models.Clip, models.Clip.id == models.AnnotationTask.clip_id),
+        )
         return query.where(
-            models.Tag.key == self.key,
-            models.Tag.value == self.value,
+            select(models.RecordingTag.recording_id)
+            .join(models.Tag, models.Tag.id == models.RecordingTag.tag_id)
+            .where(*conditions)
+            .exists()
         )
 
 
@@ -167,12 +154,14 @@ class AssignedToFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.AnnotationStatusBadge,
-        ).where(
-            models.AnnotationStatusBadge.state
-            == data.AnnotationState.assigned,
-            models.AnnotationStatusBadge.user_id == self.eq,
+        return query.where(
+            models.AnnotationTask.status_badges.any(
+                and_(
+                    models.AnnotationStatusBadge.state
+                    == data.AnnotationState.assigned,
+                    models.AnnotationStatusBadge.user_id == self.eq,
+                )
+            )
         )
 
 
@@ -186,10 +175,13 @@ class AnnotationProjectFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.AnnotationProject,
-            models.AnnotationProject.id
-            == models.AnnotationTask.annotation_project_id,
+        return base.join_once(
+            query,
+            (
+                models.AnnotationProject,
+                models.AnnotationProject.id
+                == models.AnnotationTask.annotation_project_id,
+            ),
         ).where(
             models.AnnotationProject.uuid == self.eq,
         )
@@ -205,24 +197,22 @@ class DatasetFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
-                models.Clip,
-                models.Clip.id == models.AnnotationTask.clip_id,
-            )
-            .join(
-                models.Recording,
-                models.Recording.id == models.Clip.recording_id,
-            )
-            .join(
-                models.DatasetRecording,
-                models.DatasetRecording.recording_id == models.Recording.id,
-            )
+        query = base.join_once(
+            query,
+            (models.Clip, models.Clip.id == models.AnnotationTask.clip_id),
+        )
+        return query.where(
+            select(models.DatasetRecording.recording_id)
             .join(
                 models.Dataset,
                 models.Dataset.id == models.DatasetRecording.dataset_id,
             )
-            .where(models.Dataset.uuid == self.eq)
+            .where(
+                models.DatasetRecording.recording_id
+                == models.Clip.recording_id,
+                models.Dataset.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -233,20 +223,13 @@ class SearchRecordingsFilter(base.Filter):
 
     def filter(self, query: Select) -> Select:
         """Filter the query."""
-        query = (
-            query.join(
-                models.ClipAnnotation,
-                models.AnnotationTask.clip_annotation_id
-                == models.ClipAnnotation.id,
-            )
-            .join(
-                models.Clip,
-                models.ClipAnnotation.clip_id == models.Clip.id,
-            )
-            .join(
+        query = base.join_once(
+            query,
+            (models.Clip, models.Clip.id == models.AnnotationTask.clip_id),
+            (
                 models.Recording,
                 models.Recording.id == models.Clip.recording_id,
-            )
+            ),
         )
         fields = [models.Recording.path]
 
@@ -265,20 +248,18 @@ class SoundEventAnnotationTagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = (
-            query.join(
-                models.Clip,
-                models.Clip.id == models.AnnotationTask.clip_id,
-            )
-            .join(
-                models.ClipAnnotation,
-                models.ClipAnnotation.clip_id == models.Clip.id,
-            )
-            .join(
-                models.SoundEventAnnotation,
-                models.SoundEventAnnotation.clip_annotation_id
-                == models.ClipAnnotation.id,
-            )
+        conditions = [
+            models.SoundEventAnnotation.clip_annotation_id
+            == models.AnnotationTask.clip_annotation_id,
+        ]
+        if self.key is not None:
+            conditions.append(models.Tag.key == self.key)
+
+        if self.value is not None:
+            conditions.append(models.Tag.value == self.value)
+
+        return query.where(
+            select(models.SoundEventAnnotation.id)
             .join(
                 models.SoundEventAnnotationTag,
                 models.SoundEventAnnotationTag.sound_event_annotation_id
@@ -288,20 +269,8 @@ class SoundEventAnnotationTagFilter(base.Filter):
                 models.Tag,
                 models.Tag.id == models.SoundEventAnnotationTag.tag_id,
             )
-        )
-        if self.key is None:
-            return query.where(
-                models.Tag.value == self.value,
-            )
-
-        if self.value is None:
-            return query.where(
-                models.Tag.key == self.key,
-            )
-
-        return query.where(
-            models.Tag.key == self.key,
-            models.Tag.value == self.value,
+            .where(*conditions)
+            .exists()
         )
 
 
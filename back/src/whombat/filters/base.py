@@ -1,17 +1,28 @@
-"""Base filter classes."""
+"""Base filter classes.
+
+Filters are applied one after the other to the same query, and many of
+them need to join the same tables. Filters should join tables with
+`join_once`, which skips the tables that are already joined, so that
+combined filters neither fail on ambiguous joins nor join a table twice.
+Conditions on one-to-many or many-to-many relations, such as tags, should
+be written as ``EXISTS`` subqueries instead of joins, so that they do not
+multiply the rows of the query.
+"""
 
 import datetime
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import Type, TypeVar
+from collections.abc import Iterator
+from typing import Any, Type, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, create_model
 from pydantic.fields import FieldInfo
-from sqlalchemy import Select, or_
+from sqlalchemy import FromClause, Join, Select, inspect
 from sqlalchemy.orm import InstrumentedAttribute, MappedColumn
 
 from whombat.models.base import Base
+from whombat.models.search import search_match, search_rank
 
 __all__ = [
     "Filter",
@@ -19,6 +30,7 @@ __all__ = [
     "date_filter",
     "float_filter",
     "integer_filter",
+    "join_once",
     "optional_boolean_filter",
     "optional_date_filter",
     "optional_float_filter",
@@ -35,6 +47,60 @@ __all__ = [
 Model = TypeVar("Model", bound=Base)
 
 
+def join_once(query: Select, *joins: tuple[Any, Any]) -> Select:
+    """Join tables to a query, skipping those that are already joined.
+
+    Parameters
+    ----------
+    query
+        The query to join the tables to.
+    *joins
+        Pairs of a join target, a model or an aliased model, and the ON
+        clause to join it with. Targets are joined in order.
+
+    Returns
+    -------
+    Select
+        The query with the missing tables joined.
+
+    Notes
+    -----
+    A target counts as joined if it is the main table of the query or if
+    it appears in one of its joins. Aliases are only reused when the same
+    aliased object is passed again. The ON clause of a skipped join is not
+    checked, so filters that join the same table should join it along the
+    same relation.
+    """
+    joined = set(_joined_tables(query))
+    for target, onclause in joins:
+        selectable = inspect(target).selectable
+        if selectable in joined:
+            continue
+
+        query = query.join(target, onclause)
+        joined.add(selectable)
+
+    return query
+
+
+def _joined_tables(query: Select) -> Iterator[FromClause]:
+    froms = query.get_final_froms()
+    if froms and not isinstance(froms[0], Join):
+        yield froms[0]
+
+    for from_ in froms:
+        if isinstance(from_, Join):
+            yield from _join_members(from_)
+
+
+def _join_members(join: Join) -> Iterator[FromClause]:
+    for side in (join.left, join.right):
+        if isinstance(side, Join):
+            yield from _join_members(side)
+        else:
+            yield side
+
+
 def le_filter(
     query: Select,
     field: MappedColumn | InstrumentedAttribute,
@@ -96,8 +162,11 @@ def has_filter(
     field: MappedColumn | InstrumentedAttribute,
     value: str,
 ) -> Select:
-    """Filter a query by a has condition."""
-    return query.where(field.ilike(f"%{value}%"))
+    """Filter a query by a has condition.
+
+    Uses the search index of the column if it has one.
+    """
+    return query.where(search_match([field], value))
 
 
 def isin_filter(
@@ -363,15 +432,24 @@ class SearchFilter(Filter):
 def search_filter(
     fields: list[MappedColumn | InstrumentedAttribute],
 ) -> type[SearchFilter]:
-    """Create a filter for searching."""
+    """Create a filter for searching.
+
+    Rows match if any of the fields contains the search term, and are
+    sorted by relevance to it. The search index of the fields is used if
+    they have one.
+    """
 
     class _SearchFilter(SearchFilter):
         """Filter by a search term."""
 
         def filter(self, query: Select) -> Select:
             """Filter a query."""
-            term = f"%{self.search}%"
-            return query.where(or_(*[field.ilike(term) for field in fields]))
+            if self.search is None:
+                return query
+
+            return query.where(search_match(fields, self.search)).order_by(
+                *search_rank(fields, self.search)
+            )
 
     return _SearchFilter
 
@@ -32,24 +32,24 @@ class TagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = query.join(
-            models.ClipAnnotationTag,
+        conditions = [
             models.ClipAnnotationTag.clip_annotation_id
             == models.ClipAnnotation.id,
-        ).join(
-            models.Tag,
-            models.Tag.id == models.ClipAnnotationTag.tag_id,
-        )
-
-        if self.key is None:
-            return query.filter(models.Tag.value == self.value)
+        ]
+        if self.key is not None:
+            conditions.append(models.Tag.key == self.key)
 
-        if self.value is None:
-            return query.filter(models.Tag.key == self.key)
+        if self.value is not None:
+            conditions.append(models.Tag.value == self.value)
 
         return query.filter(
-            models.Tag.key == self.key,
-            models.Tag.value == self.value,
+            select(models.ClipAnnotationTag.clip_annotation_id)
+            .join(
+                models.Tag,
+                models.Tag.id == models.ClipAnnotationTag.tag_id,
+            )
+            .where(*conditions)
+            .exists()
         )
 
 
@@ -63,23 +63,21 @@ class AnnotationProjectFilter(base.Filter):
         if self.eq is None:
             return query
 
-        subquery = (
-            select(models.ClipAnnotation.id)
-            .join(
-                models.AnnotationTask,
-                models.AnnotationTask.clip_annotation_id
-                == models.ClipAnnotation.id,
-            )
+        return query.filter(
+            select(models.AnnotationTask.clip_annotation_id)
             .join(
                 models.AnnotationProject,
                 models.AnnotationProject.id
                 == models.AnnotationTask.annotation_project_id,
             )
-            .filter(models.AnnotationProject.uuid == self.eq)
+            .where(
+                models.AnnotationTask.clip_annotation_id
+                == models.ClipAnnotation.id,
+                models.AnnotationProject.uuid == self.eq,
+            )
+            .exists()
         )
 
-        return query.filter(models.ClipAnnotation.id.in_(subquery))
-
 
 class EvaluationSetFilter(base.Filter):
     """Filter clip annotations by evaluation set."""
@@ -91,18 +89,19 @@ class EvaluationSetFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return (
-            query.join(
-                models.EvaluationSetAnnotation,
-                models.EvaluationSetAnnotation.clip_annotation_id
-                == models.ClipAnnotation.id,
-            )
+        return query.filter(
+            select(models.EvaluationSetAnnotation.clip_annotation_id)
             .join(
                 models.EvaluationSet,
                 models.EvaluationSet.id
                 == models.EvaluationSetAnnotation.evaluation_set_id,
             )
-            .filter(models.EvaluationSet.uuid == self.eq)
+            .where(
+                models.EvaluationSetAnnotation.clip_annotation_id
+                == models.ClipAnnotation.id,
+                models.EvaluationSet.uuid == self.eq,
+            )
+            .exists()
         )
 
 
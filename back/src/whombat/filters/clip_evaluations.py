@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select, and_
+from sqlalchemy import Select, and_, select
 
 from whombat import models
 from whombat.filters import base
@@ -36,9 +36,12 @@ class EvaluationFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.Evaluation,
-            models.Evaluation.id == models.ClipEvaluation.evaluation_id,
+        return base.join_once(
+            query,
+            (
+                models.Evaluation,
+                models.Evaluation.id == models.ClipEvaluation.evaluation_id,
+            ),
         ).filter(models.Evaluation.uuid == self.eq)
 
 
@@ -52,10 +55,13 @@ class ClipAnnotationFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.ClipAnnotation,
-            models.ClipAnnotation.id
-            == models.ClipEvaluation.clip_annotation_id,
+        return base.join_once(
+            query,
+            (
+                models.ClipAnnotation,
+                models.ClipAnnotation.id
+                == models.ClipEvaluation.clip_annotation_id,
+            ),
         ).filter(models.ClipAnnotation.uuid == self.eq)
 
 
@@ -69,10 +75,13 @@ class ClipPredictionFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.ClipPrediction,
-            models.ClipPrediction.id
-            == models.ClipEvaluation.clip_prediction_id,
+        return base.join_once(
+            query,
+            (
+                models.ClipPrediction,
+                models.ClipPrediction.id
+                == models.ClipEvaluation.clip_prediction_id,
+            ),
         ).filter(models.ClipPrediction.uuid == self.eq)
 
 
@@ -88,32 +97,26 @@ class MetricFilter(base.Filter):
         if self.name is None:
             return query
 
-        query = query.join(
-            models.ClipEvaluationMetric,
+        conditions = [
             models.ClipEvaluationMetric.clip_evaluation_id
             == models.ClipEvaluation.id,
-        ).join(
-            models.FeatureName,
-            models.FeatureName.id
-            == models.ClipEvaluationMetric.feature_name_id,
-        )
-
-        if self.gt is None and self.lt is None:
-            return query.filter(models.FeatureName.name == self.name)
-
+            models.FeatureName.name == self.name,
+        ]
         if self.gt is not None:
-            return query.filter(
-                and_(
-                    models.FeatureName.name == self.name,
-                    models.ClipEvaluationMetric.value > self.gt,
-                )
-            )
+            conditions.append(models.ClipEvaluationMetric.value > self.gt)
+
+        if self.lt is not None:
+            conditions.append(models.ClipEvaluationMetric.value < self.lt)
 
         return query.filter(
-            and_(
-                models.FeatureName.name == self.name,
-                models.ClipEvaluationMetric.value < self.lt,
+            select(models.ClipEvaluationMetric.clip_evaluation_id)
+            .join(
+                models.FeatureName,
+                models.FeatureName.id
+                == models.ClipEvaluationMetric.feature_name_id,
             )
+            .where(and_(*conditions))
+            .exists()
         )
 
 
@@ -130,24 +133,10 @@ class PredictionTagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = (
-            query.join(
-                models.ClipPrediction,
-                models.ClipPrediction.id
-                == models.ClipEvaluation.clip_prediction_id,
-            )
-            .join(
-                models.ClipPredictionTag,
-                models.ClipPredictionTag.clip_prediction_id
-                == models.ClipPrediction.id,
-            )
-            .join(
-                models.Tag,
-                models.Tag.id == models.ClipPredictionTag.tag_id,
-            )
-        )
-
-        conditions = []
+        conditions = [
+            models.ClipPredictionTag.clip_prediction_id
+            == models.ClipEvaluation.clip_prediction_id,
+        ]
 
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
@@ -161,7 +150,15 @@ class PredictionTagFilter(base.Filter):
         if self.lt is not None:
             conditions.append(models.ClipPredictionTag.score < self.lt)
 
-        return query.filter(*conditions)
+        return query.filter(
+            select(models.ClipPredictionTag.clip_prediction_id)
+            .join(
+                models.Tag,
+                models.Tag.id == models.ClipPredictionTag.tag_id,
+            )
+            .where(*conditions)
+            .exists()
+        )
 
 
 class AnnotationTagFilter(base.Filter):
@@ -175,31 +172,25 @@ class AnnotationTagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = (
-            query.join(
-                models.ClipAnnotation,
-                models.ClipAnnotation.id
-                == models.ClipEvaluation.clip_annotation_id,
-            )
-            .join(
-                models.ClipAnnotationTag,
-                models.ClipAnnotationTag.clip_annotation_id
-                == models.ClipAnnotation.id,
-            )
-            .join(
-                models.Tag,
-                models.Tag.id == models.ClipAnnotationTag.tag_id,
-            )
-        )
-
-        conditions = []
+        conditions = [
+            models.ClipAnnotationTag.clip_annotation_id
+            == models.ClipEvaluation.clip_annotation_id,
+        ]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
 
         if self.value is not None:
             conditions.append(models.Tag.value == self.value)
 
-        return query.filter(*conditions)
+        return query.filter(
+            select(models.ClipAnnotationTag.clip_annotation_id)
+            .join(
+                models.Tag,
+                models.Tag.id == models.ClipAnnotationTag.tag_id,
+            )
+            .where(*conditions)
+            .exists()
+        )
 
 
 ClipEvaluationFilter = base.combine(
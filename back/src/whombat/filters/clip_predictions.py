@@ -25,9 +25,9 @@ class ClipFilter(base.Filter):
     def filter(self, query: Select) -> Select:
         if self.eq is None:
             return query
-        return query.join(
-            models.Clip,
-            models.Clip.id == models.ClipPrediction.clip_id,
+        return base.join_once(
+            query,
+            (models.Clip, models.Clip.id == models.ClipPrediction.clip_id),
         ).filter(models.Clip.uuid == self.eq)
 
 
@@ -40,17 +40,14 @@ class RecordingFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return (
-            query.join(
-                models.Clip,
-                models.Clip.id == models.ClipPrediction.clip_id,
-            )
-            .join(
+        return base.join_once(
+            query,
+            (models.Clip, models.Clip.id == models.ClipPrediction.clip_id),
+            (
                 models.Recording,
                 models.Recording.id == models.Clip.recording_id,
-            )
-            .filter(models.Recording.uuid == self.eq)
-        )
+            ),
+        ).filter(models.Recording.uuid == self.eq)
 
 
 class TagFilter(base.Filter):
@@ -70,7 +67,10 @@ class TagFilter(base.Filter):
             models.Tag.id == models.ClipPredictionTag.tag_id,
         )
 
-        conditions = []
+        conditions = [
+            models.ClipPredictionTag.clip_prediction_id
+            == models.ClipPrediction.id,
+        ]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
 
@@ -83,8 +83,7 @@ class TagFilter(base.Filter):
         if self.lt is not None:
             conditions.append(models.ClipPredictionTag.score < self.lt)
 
-        subquery = subquery.filter(and_(*conditions)).distinct()
-        return query.filter(models.ClipPrediction.id.in_(subquery))
+        return query.filter(subquery.where(and_(*conditions)).exists())
 
 
 class SoundEventTagFilter(base.Filter):
@@ -112,7 +111,10 @@ class SoundEventTagFilter(base.Filter):
             )
         )
 
-        conditions = []
+        conditions = [
+            models.SoundEventPrediction.clip_prediction_id
+            == models.ClipPrediction.id,
+        ]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
 
@@ -125,8 +127,7 @@ class SoundEventTagFilter(base.Filter):
         if self.lt is not None:
             conditions.append(models.SoundEventPredictionTag.score < self.lt)
 
-        subquery = subquery.filter(and_(*conditions)).distinct()
-        return query.filter(models.ClipPrediction.id.in_(subquery))
+        return query.filter(subquery.where(and_(*conditions)).exists())
 
 
 class ModelRunFilter(base.Filter):
@@ -137,17 +138,18 @@ class ModelRunFilter(base.Filter):
     def filter(self, query: Select) -> Select:
         if self.eq is None:
             return query
-        return (
-            query.join(
-                models.ModelRunPrediction,
-                models.ModelRunPrediction.clip_prediction_id
-                == models.ClipPrediction.id,
-            )
+        return query.filter(
+            select(models.ModelRunPrediction.clip_prediction_id)
             .join(
                 models.ModelRun,
                 models.ModelRun.id == models.ModelRunPrediction.model_run_id,
             )
-            .filter(models.ModelRun.uuid == self.eq)
+            .where(
+                models.ModelRunPrediction.clip_prediction_id
+                == models.ClipPrediction.id,
+                models.ModelRun.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -159,17 +161,18 @@ class UserRunFilter(base.Filter):
     def filter(self, query: Select) -> Select:
         if self.eq is None:
             return query
-        return (
-            query.join(
-                models.UserRunPrediction,
-                models.UserRunPrediction.clip_prediction_id
-                == models.ClipPrediction.id,
-            )
+        return query.filter(
+            select(models.UserRunPrediction.clip_prediction_id)
             .join(
                 models.UserRun,
                 models.UserRun.id == models.UserRunPrediction.user_run_id,
             )
-            .filter(models.UserRun.uuid == self.eq)
+            .where(
+                models.UserRunPrediction.clip_prediction_id
+                == models.ClipPrediction.id,
+                models.UserRun.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select
+from sqlalchemy import Select, select
 
 from whombat import models
 from whombat.filters import base
@@ -26,9 +26,12 @@ class RecordingFilter(base.Filter):
     def filter(self, query: Select) -> Select:
         if self.eq is None:
             return query
-        return query.join(
-            models.Recording,
-            models.Recording.id == models.Clip.recording_id,
+        return base.join_once(
+            query,
+            (
+                models.Recording,
+                models.Recording.id == models.Clip.recording_id,
+            ),
         ).filter(models.Recording.uuid == self.eq)
 
 
@@ -73,20 +76,18 @@ class DatasetFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return (
-            query.join(
-                models.Recording,
-                models.Recording.id == models.Clip.recording_id,
-            )
-            .join(
-                models.DatasetRecording,
-                models.DatasetRecording.recording_id == models.Recording.id,
-            )
+        return query.filter(
+            select(models.DatasetRecording.recording_id)
             .join(
                 models.Dataset,
                 models.Dataset.id == models.DatasetRecording.dataset_id,
             )
-            .filter(models.Dataset.uuid == self.eq)
+            .where(
+                models.DatasetRecording.recording_id
+                == models.Clip.recording_id,
+                models.Dataset.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -0,0 +1,33 @@
+"""Filters for Jobs."""
+
+from whombat import models
+from whombat.filters import base
+
+__all__ = [
+    "CreatedByFilter",
+    "CreatedOnFilter",
+    "JobFilter",
+    "KindFilter",
+    "StatusFilter",
+]
+
+
+KindFilter = base.string_filter(models.Job.kind)
+"""Filter jobs by the operation they run."""
+
+StatusFilter = base.string_filter(models.Job.status)
+"""Filter jobs by status."""
+
+CreatedByFilter = base.uuid_filter(models.Job.created_by_id)
+"""Filter jobs by the user that submitted them."""
+
+CreatedOnFilter = base.date_filter(models.Job.created_on)
+"""Filter jobs by submission date."""
+
+
+JobFilter = base.combine(
+    kind=KindFilter,
+    status=StatusFilter,
+    created_by=CreatedByFilter,
+    created_on=CreatedOnFilter,
+)
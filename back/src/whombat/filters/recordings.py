@@ -70,16 +70,17 @@ class DatasetFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
-                models.DatasetRecording,
-                models.Recording.id == models.DatasetRecording.recording_id,
-            )
+        return query.where(
+            select(models.DatasetRecording.recording_id)
             .join(
                 models.Dataset,
                 models.DatasetRecording.dataset_id == models.Dataset.id,
             )
-            .where(models.Dataset.uuid == self.eq)
+            .where(
+                models.DatasetRecording.recording_id == models.Recording.id,
+                models.Dataset.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -125,18 +126,18 @@ class TagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = query.join(
-            models.RecordingTag,
-            models.Recording.id == models.RecordingTag.recording_id,
-        ).join(models.Tag, models.RecordingTag.tag_id == models.Tag.id)
-
-        conditions = []
+        conditions = [models.RecordingTag.recording_id == models.Recording.id]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
         if self.value is not None:
             conditions.append(models.Tag.value == self.value)
 
-        return query.where(*conditions)
+        return query.where(
+            select(models.RecordingTag.recording_id)
+            .join(models.Tag, models.RecordingTag.tag_id == models.Tag.id)
+            .where(*conditions)
+            .exists()
+        )
 
 
 RecordingFilter = base.combine(
@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select, select, tuple_
+from sqlalchemy import Select, select
 
 from whombat import models
 from whombat.filters import base
@@ -33,10 +33,13 @@ class ClipAnnotationFilter(base.Filter):
         if not self.eq:
             return query
 
-        return query.join(
-            models.ClipAnnotation,
-            models.ClipAnnotation.id
-            == models.SoundEventAnnotation.clip_annotation_id,
+        return base.join_once(
+            query,
+            (
+                models.ClipAnnotation,
+                models.ClipAnnotation.id
+                == models.SoundEventAnnotation.clip_annotation_id,
+            ),
         ).where(
             models.ClipAnnotation.uuid == self.eq,
         )
@@ -52,9 +55,13 @@ class SoundEventFilter(base.Filter):
         if not self.eq:
             return query
 
-        return query.join(
-            models.SoundEvent,
-            models.SoundEvent.id == models.SoundEventAnnotation.sound_event_id,
+        return base.join_once(
+            query,
+            (
+                models.SoundEvent,
+                models.SoundEvent.id
+                == models.SoundEventAnnotation.sound_event_id,
+            ),
         ).where(models.SoundEvent.uuid == self.eq)
 
 
@@ -73,18 +80,19 @@ class ProjectFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
-                models.AnnotationTask,
-                models.AnnotationTask.id
-                == models.SoundEventAnnotation.clip_annotation_id,
-            )
+        return query.where(
+            select(models.AnnotationTask.clip_annotation_id)
             .join(
                 models.AnnotationProject,
                 models.AnnotationProject.id
                 == models.AnnotationTask.annotation_project_id,
             )
-            .filter(models.AnnotationProject.uuid == self.eq)
+            .where(
+                models.AnnotationTask.clip_annotation_id
+                == models.SoundEventAnnotation.clip_annotation_id,
+                models.AnnotationProject.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -98,22 +106,18 @@ class RecordingFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
-                models.AnnotationTask,
-                models.AnnotationTask.id
-                == models.SoundEventAnnotation.clip_annotation_id,
-            )
-            .join(
-                models.Clip,
-                models.Clip.id == models.AnnotationTask.clip_id,
-            )
-            .join(
+        return base.join_once(
+            query,
+            (
+                models.SoundEvent,
+                models.SoundEvent.id
+                == models.SoundEventAnnotation.sound_event_id,
+            ),
+            (
                 models.Recording,
-                models.Recording.id == models.Clip.recording_id,
-            )
-            .where(models.Recording.uuid == self.eq)
-        )
+                models.Recording.id == models.SoundEvent.recording_id,
+            ),
+        ).where(models.Recording.uuid == self.eq)
 
 
 class TagFilter(base.Filter):
@@ -127,32 +131,26 @@ class TagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        subquery = (
-            select(models.SoundEventAnnotation.id)
-            .join(
-                models.SoundEventAnnotationTag,
-                models.SoundEventAnnotationTag.sound_event_annotation_id
-                == models.SoundEventAnnotation.id,
-            )
+        conditions = [
+            models.SoundEventAnnotationTag.sound_event_annotation_id
+            == models.SoundEventAnnotation.id,
+        ]
+        if self.key is not None:
+            conditions.append(models.Tag.key == self.key)
+
+        if self.value is not None:
+            conditions.append(models.Tag.value == self.value)
+
+        return query.where(
+            select(models.SoundEventAnnotationTag.sound_event_annotation_id)
             .join(
                 models.Tag,
                 models.Tag.id == models.SoundEventAnnotationTag.tag_id,
             )
+            .where(*conditions)
+            .exists()
         )
 
-        if self.key is None:
-            subquery = subquery.where(models.Tag.value == self.value)
-        elif self.value is None:
-            subquery = subquery.where(models.Tag.key == self.key)
-        else:
-            subquery = subquery.where(
-                tuple_(models.Tag.key, models.Tag.value)
-                == (self.key, self.value)
-            )
-
-        subquery = subquery.distinct(models.SoundEventAnnotation.id)
-        return query.where(models.SoundEventAnnotation.id.in_(subquery))
-
 
 SoundEventAnnotationFilter = base.combine(
     project=ProjectFilter,
@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select, and_
+from sqlalchemy import Select, and_, select
 
 from whombat import models
 from whombat.filters import base
@@ -34,10 +34,13 @@ class ClipEvaluationFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.ClipEvaluation,
-            models.ClipEvaluation.id
-            == models.SoundEventEvaluation.clip_evaluation_id,
+        return base.join_once(
+            query,
+            (
+                models.ClipEvaluation,
+                models.ClipEvaluation.id
+                == models.SoundEventEvaluation.clip_evaluation_id,
+            ),
         ).filter(models.ClipEvaluation.uuid == self.eq)
 
 
@@ -51,10 +54,13 @@ class TargetFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.SoundEventAnnotation,
-            models.SoundEventAnnotation.id
-            == models.SoundEventEvaluation.target_id,
+        return base.join_once(
+            query,
+            (
+                models.SoundEventAnnotation,
+                models.SoundEventAnnotation.id
+                == models.SoundEventEvaluation.target_id,
+            ),
         ).filter(models.SoundEventAnnotation.uuid == self.eq)
 
 
@@ -68,10 +74,13 @@ class SourceFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.SoundEventPrediction,
-            models.SoundEventPrediction.id
-            == models.SoundEventEvaluation.source_id,
+        return base.join_once(
+            query,
+            (
+                models.SoundEventPrediction,
+                models.SoundEventPrediction.id
+                == models.SoundEventEvaluation.source_id,
+            ),
         ).filter(models.SoundEventPrediction.uuid == self.eq)
 
 
@@ -87,32 +96,30 @@ class MetricFilter(base.Filter):
         if self.name is None:
             return query
 
-        query = query.join(
-            models.SoundEventEvaluationMetric,
+        conditions = [
             models.SoundEventEvaluationMetric.sound_event_evaluation_id
             == models.SoundEventEvaluation.id,
-        ).join(
-            models.FeatureName,
-            models.FeatureName.id
-            == models.SoundEventEvaluationMetric.feature_name_id,
-        )
-
-        if self.gt is None and self.lt is None:
-            return query.filter(models.FeatureName.name == self.name)
-
+            models.FeatureName.name == self.name,
+        ]
         if self.gt is not None:
-            return query.filter(
-                and_(
-                    models.FeatureName.name == self.name,
-                    models.SoundEventEvaluationMetric.value > self.gt,
-                )
+            conditions.append(
+                models.SoundEventEvaluationMetric.value > self.gt
+            )
+
+        if self.lt is not None:
+            conditions.append(
+                models.SoundEventEvaluationMetric.value < self.lt
             )
 
         return query.filter(
-            and_(
-                models.FeatureName.name == self.name,
-                models.SoundEventEvaluationMetric.value < self.lt,
+            select(models.SoundEventEvaluationMetric.sound_event_evaluation_id)
+            .join(
+                models.FeatureName,
+                models.FeatureName.id
+                == models.SoundEventEvaluationMetric.feature_name_id,
             )
+            .where(and_(*conditions))
+            .exists()
         )
 
 
@@ -157,31 +164,25 @@ class TargetTagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = (
-            query.join(
-                models.SoundEventAnnotation,
-                models.SoundEventAnnotation.id
-                == models.SoundEventEvaluation.target_id,
-            )
-            .join(
-                models.SoundEventAnnotationTag,
-                models.SoundEventAnnotationTag.sound_event_annotation_id
-                == models.SoundEventAnnotation.id,
-            )
-            .join(
-                models.Tag,
-                models.Tag.id == models.SoundEventAnnotationTag.tag_id,
-            )
-        )
-
-        conditions = []
+        conditions = [
+            models.SoundEventAnnotationTag.sound_event_annotation_id
+            == models.SoundEventEvaluation.target_id,
+        ]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
 
         if self.value is not None:
             conditions.append(models.Tag.value == self.value)
 
-        return query.filter(*conditions)
+        return query.filter(
+            select(models.SoundEventAnnotationTag.sound_event_annotation_id)
+            .join(
+                models.Tag,
+                models.Tag.id == models.SoundEventAnnotationTag.tag_id,
+            )
+            .where(*conditions)
+            .exists()
+        )
 
 
 class SourceTagFilter(base.Filter):
@@ -199,24 +200,10 @@ class SourceTagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = (
-            query.join(
-                models.SoundEventPrediction,
-                models.SoundEventPrediction.id
-                == models.SoundEventEvaluation.source_id,
-            )
-            .join(
-                models.SoundEventPredictionTag,
-                models.SoundEventPredictionTag.sound_event_prediction_id
-                == models.SoundEventPrediction.id,
-            )
-            .join(
-                models.Tag,
-                models.Tag.id == models.SoundEventPredictionTag.tag_id,
-            )
-        )
-
-        conditions = []
+        conditions = [
+            models.SoundEventPredictionTag.sound_event_prediction_id
+            == models.SoundEventEvaluation.source_id,
+        ]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
         if self.value is not None:
@@ -230,7 +217,15 @@ class SourceTagFilter(base.Filter):
                 models.SoundEventPredictionTag.score < self.lt,
             )
 
-        return query.filter(*conditions)
+        return query.filter(
+            select(models.SoundEventPredictionTag.sound_event_prediction_id)
+            .join(
+                models.Tag,
+                models.Tag.id == models.SoundEventPredictionTag.tag_id,
+            )
+            .where(*conditions)
+            .exists()
+        )
 
 
 SoundEventEvaluationFilter = base.combine(
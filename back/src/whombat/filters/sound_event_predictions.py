@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select, and_
+from sqlalchemy import Select, and_, select
 
 from whombat import models
 from whombat.filters import base
@@ -23,10 +23,13 @@ class ClipPredictionFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.ClipPrediction,
-            models.ClipPrediction.id
-            == models.SoundEventPrediction.clip_prediction_id,
+        return base.join_once(
+            query,
+            (
+                models.ClipPrediction,
+                models.ClipPrediction.id
+                == models.SoundEventPrediction.clip_prediction_id,
+            ),
         ).filter(models.ClipPrediction.uuid == self.eq)
 
 
@@ -37,9 +40,13 @@ class SoundEventFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.SoundEvent,
-            models.SoundEvent.id == models.SoundEventPrediction.sound_event_id,
+        return base.join_once(
+            query,
+            (
+                models.SoundEvent,
+                models.SoundEvent.id
+                == models.SoundEventPrediction.sound_event_id,
+            ),
         ).filter(models.SoundEvent.uuid == self.eq)
 
 
@@ -53,22 +60,19 @@ class RecordingFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
+        return base.join_once(
+            query,
+            (
                 models.ClipPrediction,
                 models.ClipPrediction.id
                 == models.SoundEventPrediction.clip_prediction_id,
-            )
-            .join(
-                models.Clip,
-                models.Clip.id == models.ClipPrediction.clip_id,
-            )
-            .join(
+            ),
+            (models.Clip, models.Clip.id == models.ClipPrediction.clip_id),
+            (
                 models.Recording,
                 models.Recording.id == models.Clip.recording_id,
-            )
-            .where(models.Recording.uuid == self.eq)
-        )
+            ),
+        ).where(models.Recording.uuid == self.eq)
 
 
 class TagFilter(base.Filter):
@@ -84,15 +88,10 @@ class TagFilter(base.Filter):
         if self.key is None and self.value is None:
             return query
 
-        query = query.join(
-            models.SoundEventPredictionTag,
+        conditions = [
             models.SoundEventPredictionTag.sound_event_prediction_id
             == models.SoundEventPrediction.id,
-        ).join(
-            models.Tag, models.Tag.id == models.SoundEventPredictionTag.tag_id
-        )
-
-        conditions = []
+        ]
         if self.key is not None:
             conditions.append(models.Tag.key == self.key)
 
@@ -103,10 +102,16 @@ class TagFilter(base.Filter):
             conditions.append(models.SoundEventPredictionTag.score >= self.gt)
 
         if self.lt is not None:
-            conditions.append(models.SoundEventPredictionTag.score <= self.gt)
+            conditions.append(models.SoundEventPredictionTag.score <= self.lt)
 
-        return query.join(models.SoundEventPredictionTag).where(
-            and_(*conditions)
+        return query.where(
+            select(models.SoundEventPredictionTag.sound_event_prediction_id)
+            .join(
+                models.Tag,
+                models.Tag.id == models.SoundEventPredictionTag.tag_id,
+            )
+            .where(and_(*conditions))
+            .exists()
         )
 
 
@@ -120,22 +125,18 @@ class ModelRunFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
-                models.ClipPrediction,
-                models.ClipPrediction.id
-                == models.SoundEventPrediction.clip_prediction_id,
-            )
-            .join(
-                models.ModelRunPrediction,
-                models.ModelRunPrediction.clip_prediction_id
-                == models.ClipPrediction.id,
-            )
+        return query.where(
+            select(models.ModelRunPrediction.clip_prediction_id)
             .join(
                 models.ModelRun,
                 models.ModelRun.id == models.ModelRunPrediction.model_run_id,
             )
-            .where(models.ModelRun.uuid == self.eq)
+            .where(
+                models.ModelRunPrediction.clip_prediction_id
+                == models.SoundEventPrediction.clip_prediction_id,
+                models.ModelRun.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -149,22 +150,18 @@ class UserRunFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
-                models.ClipPrediction,
-                models.ClipPrediction.id
-                == models.SoundEventPrediction.clip_prediction_id,
-            )
-            .join(
-                models.UserRunPrediction,
-                models.UserRunPrediction.clip_prediction_id
-                == models.ClipPrediction.id,
-            )
+        return query.where(
+            select(models.UserRunPrediction.clip_prediction_id)
             .join(
                 models.UserRun,
                 models.UserRun.id == models.UserRunPrediction.user_run_id,
             )
-            .where(models.UserRun.uuid == self.eq)
+            .where(
+                models.UserRunPrediction.clip_prediction_id
+                == models.SoundEventPrediction.clip_prediction_id,
+                models.UserRun.uuid == self.eq,
+            )
+            .exists()
         )
 
 
@@ -178,18 +175,15 @@ class ClipFilter(base.Filter):
         if not self.eq:
             return query
 
-        return (
-            query.join(
+        return base.join_once(
+            query,
+            (
                 models.ClipPrediction,
                 models.ClipPrediction.id
                 == models.SoundEventPrediction.clip_prediction_id,
-            )
-            .join(
-                models.Clip,
-                models.Clip.id == models.ClipPrediction.clip_id,
-            )
-            .where(models.Clip.uuid == self.eq)
-        )
+            ),
+            (models.Clip, models.Clip.id == models.ClipPrediction.clip_id),
+        ).where(models.Clip.uuid == self.eq)
 
 
 SoundEventPredictionFilter = base.combine(
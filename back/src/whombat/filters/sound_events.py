@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select
+from sqlalchemy import Select, or_
 
 from whombat import models
 from whombat.filters import base
@@ -13,6 +13,12 @@ __all__ = [
     "GeometryTypeFilter",
     "CreatedOnFilter",
     "UUIDFilter",
+    "StartTimeFilter",
+    "EndTimeFilter",
+    "LowFreqFilter",
+    "HighFreqFilter",
+    "TimeRangeFilter",
+    "FrequencyRangeFilter",
 ]
 
 
@@ -24,9 +30,12 @@ class RecordingFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.Recording,
-            models.SoundEvent.recording_id == models.Recording.id,
+        return base.join_once(
+            query,
+            (
+                models.Recording,
+                models.SoundEvent.recording_id == models.Recording.id,
+            ),
         ).filter(models.Recording.uuid == self.eq)
 
 
@@ -42,6 +51,70 @@ UUIDFilter = base.uuid_filter(models.SoundEvent.uuid)
 """Filter by UUID."""
 
 
+StartTimeFilter = base.float_filter(models.SoundEvent.start_time)
+"""Filter by the start time of the geometry."""
+
+
+EndTimeFilter = base.float_filter(models.SoundEvent.end_time)
+"""Filter by the end time of the geometry."""
+
+
+LowFreqFilter = base.optional_float_filter(models.SoundEvent.low_freq)
+"""Filter by the lowest frequency of the geometry."""
+
+
+HighFreqFilter = base.optional_float_filter(models.SoundEvent.high_freq)
+"""Filter by the highest frequency of the geometry."""
+
+
+class TimeRangeFilter(base.Filter):
+    """Filter sound events that overlap a time range."""
+
+    start: float | None = None
+    end: float | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter by overlap with the time range."""
+        if self.start is not None:
+            query = query.filter(models.SoundEvent.end_time >= self.start)
+
+        if self.end is not None:
+            query = query.filter(models.SoundEvent.start_time <= self.end)
+
+        return query
+
+
+class FrequencyRangeFilter(base.Filter):
+    """Filter sound events that overlap a frequency range.
+
+    Sound events that only span time, such as time intervals, cover every
+    frequency and always overlap the range.
+    """
+
+    low: float | None = None
+    high: float | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter by overlap with the frequency range."""
+        if self.low is not None:
+            query = query.filter(
+                or_(
+                    models.SoundEvent.high_freq.is_(None),
+                    models.SoundEvent.high_freq >= self.low,
+                )
+            )
+
+        if self.high is not None:
+            query = query.filter(
+                or_(
+                    models.SoundEvent.low_freq.is_(None),
+                    models.SoundEvent.low_freq <= self.high,
+                )
+            )
+
+        return query
+
+
 class FeatureFilter(base.Filter):
     name: str | None = None
     lt: float | None = None
@@ -76,4 +149,10 @@ SoundEventFilter = base.combine(
     created_on=CreatedOnFilter,
     uuid=UUIDFilter,
     feature=FeatureFilter,
+    start_time=StartTimeFilter,
+    end_time=EndTimeFilter,
+    low_freq=LowFreqFilter,
+    high_freq=HighFreqFilter,
+    time_range=TimeRangeFilter,
+    frequency_range=FrequencyRangeFilter,
 )
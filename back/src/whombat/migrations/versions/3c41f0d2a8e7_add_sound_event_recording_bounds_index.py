@@ -0,0 +1,37 @@
+"""Add an index on the recording and bounds of sound events.
+
+Revision ID: 3c41f0d2a8e7
+Revises: 9d9b506af961
+Create Date: 2026-10-19 16:22:47.103921
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c41f0d2a8e7"
+down_revision: Union[str, None] = "9d9b506af961"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("sound_event") as batch_op:
+        batch_op.create_index(
+            "ix_sound_event_recording_bounds",
+            [
+                "recording_id",
+                "start_time",
+                "end_time",
+                "low_freq",
+                "high_freq",
+            ],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sound_event") as batch_op:
+        batch_op.drop_index("ix_sound_event_recording_bounds")
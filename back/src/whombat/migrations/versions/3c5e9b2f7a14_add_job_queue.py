@@ -0,0 +1,91 @@
+"""Add job queue.
+
+Revision ID: 3c5e9b2f7a14
+Revises: 8e4a1c7b2d90
+Create Date: 2026-10-19 21:07:36.284915
+
+"""
+
+from typing import Sequence, Union
+
+import fastapi_users_db_sqlalchemy.generics
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5e9b2f7a14"
+down_revision: Union[str, None] = "8e4a1c7b2d90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "uuid", fastapi_users_db_sqlalchemy.generics.GUID(), nullable=False
+        ),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("parameters", sa.JSON(), nullable=False),
+        sa.Column("progress", sa.Float(), nullable=False),
+        sa.Column("message", sa.String(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_by_id",
+            fastapi_users_db_sqlalchemy.generics.GUID(),
+            nullable=True,
+        ),
+        sa.Column(
+            "started_on",
+            sa.DateTime().with_variant(
+                sa.TIMESTAMP(timezone=True), "postgresql"
+            ),
+            nullable=True,
+        ),
+        sa.Column(
+            "heartbeat_on",
+            sa.DateTime().with_variant(
+                sa.TIMESTAMP(timezone=True), "postgresql"
+            ),
+            nullable=True,
+        ),
+        sa.Column(
+            "finished_on",
+            sa.DateTime().with_variant(
+                sa.TIMESTAMP(timezone=True), "postgresql"
+            ),
+            nullable=True,
+        ),
+        sa.Column(
+            "created_on",
+            sa.DateTime().with_variant(
+                sa.TIMESTAMP(timezone=True), "postgresql"
+            ),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["user.id"],
+            name=op.f("fk_job_created_by_id_user"),
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_job")),
+        sa.UniqueConstraint("uuid", name=op.f("uq_job_uuid")),
+    )
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.create_index(
+            op.f("ix_job_status"),
+            ["status"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.drop_index(op.f("ix_job_status"))
+
+    op.drop_table("job")
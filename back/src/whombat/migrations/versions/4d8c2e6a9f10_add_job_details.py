@@ -0,0 +1,28 @@
+"""Add job details.
+
+Revision ID: 4d8c2e6a9f10
+Revises: 7b1f4d8e2c63
+Create Date: 2026-10-19 23:12:40.518233
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d8c2e6a9f10"
+down_revision: Union[str, None] = "7b1f4d8e2c63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.add_column(sa.Column("details", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.drop_column("details")
@@ -0,0 +1,203 @@
+"""Store sound event geometries in a compact binary encoding.
+
+The encoding is copied from `whombat.core.geometry` as it was when this
+migration was written, so that later changes to it do not change what
+this migration writes.
+
+Revision ID: 5f2d7a9c1e36
+Revises: 3c41f0d2a8e7
+Create Date: 2026-10-19 17:48:03.552190
+
+"""
+
+import json
+import struct
+from typing import Any, Callable, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2d7a9c1e36"
+down_revision: Union[str, None] = "3c41f0d2a8e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+ENCODING_VERSION = 1
+
+GEOMETRY_TYPES = (
+    "TimeStamp",
+    "TimeInterval",
+    "Point",
+    "BoundingBox",
+    "LineString",
+    "MultiPoint",
+    "Polygon",
+    "MultiLineString",
+    "MultiPolygon",
+)
+
+DEPTHS = {
+    "TimeStamp": 0,
+    "TimeInterval": 1,
+    "Point": 1,
+    "BoundingBox": 1,
+    "LineString": 2,
+    "MultiPoint": 2,
+    "Polygon": 3,
+    "MultiLineString": 3,
+    "MultiPolygon": 4,
+}
+
+HEADER = struct.Struct("<BBI")
+
+
+def upgrade() -> None:
+    _convert_geometries(
+        sa.String(),
+        sa.LargeBinary(),
+        lambda value: _encode_geometry(json.loads(value)),
+    )
+
+
+def downgrade() -> None:
+    _convert_geometries(
+        sa.LargeBinary(),
+        sa.String(),
+        lambda value: json.dumps(
+            _decode_geometry(value),
+            separators=(",", ":"),
+        ),
+    )
+
+
+def _convert_geometries(
+    old_type: sa.types.TypeEngine,
+    new_type: sa.types.TypeEngine,
+    convert: Callable,
+) -> None:
+    with op.batch_alter_table("sound_event") as batch_op:
+        batch_op.add_column(sa.Column("geometry_new", new_type, nullable=True))
+
+    sound_event = sa.table(
+        "sound_event",
+        sa.column("id", sa.Integer()),
+        sa.column("geometry", old_type),
+        sa.column("geometry_new", new_type),
+    )
+    update = (
+        sa.update(sound_event)
+        .where(sound_event.c.id == sa.bindparam("_id"))
+        .values(geometry_new=sa.bindparam("_geometry"))
+    )
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sound_event.c.id, sound_event.c.geometry)
+            .where(sound_event.c.id > last_id)
+            .order_by(sound_event.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+
+        if not rows:
+            break
+
+        conn.execute(
+            update,
+            [
+                {"_id": id_, "_geometry": convert(geometry)}
+                for id_, geometry in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table("sound_event") as batch_op:
+        batch_op.drop_column("geometry")
+        batch_op.alter_column(
+            "geometry_new",
+            new_column_name="geometry",
+            existing_type=new_type,
+            nullable=False,
+        )
+
+
+def _encode_geometry(geometry: dict[str, Any]) -> bytes:
+    counts: list[int] = []
+    values: list[float] = []
+    _flatten(
+        geometry["coordinates"],
+        DEPTHS[geometry["type"]],
+        counts,
+        values,
+    )
+    return struct.pack(
+        f"<BBI{len(counts)}I{len(values)}d",
+        ENCODING_VERSION,
+        GEOMETRY_TYPES.index(geometry["type"]),
+        len(counts),
+        *counts,
+        *[float(value) for value in values],
+    )
+
+
+def _decode_geometry(value: bytes) -> dict[str, Any]:
+    version, tag, num_counts = HEADER.unpack_from(value)
+    if version != ENCODING_VERSION:
+        raise ValueError(f"Unknown geometry encoding version: {version}")
+
+    offset = HEADER.size + 4 * num_counts
+    num_values = (len(value) - offset) // 8
+    counts = struct.unpack_from(f"<{num_counts}I", value, HEADER.size)
+    values = struct.unpack_from(f"<{num_values}d", value, offset)
+
+    geometry_type = GEOMETRY_TYPES[tag]
+    return {
+        "type": geometry_type,
+        "coordinates": _nest(DEPTHS[geometry_type], counts, values),
+    }
+
+
+def _flatten(
+    coordinates: Any,
+    depth: int,
+    counts: list[int],
+    values: list[float],
+) -> None:
+    if depth == 0:
+        values.append(coordinates)
+        return
+
+    counts.append(len(coordinates))
+
+    if depth == 1:
+        values.extend(coordinates)
+        return
+
+    for item in coordinates:
+        _flatten(item, depth - 1, counts, values)
+
+
+def _nest(depth: int, counts: Sequence[int], values: Sequence[float]) -> Any:
+    if depth == 0:
+        return values[0]
+
+    count_index = 0
+    value_index = 0
+
+    def build(level: int) -> list:
+        nonlocal count_index, value_index
+
+        count = counts[count_index]
+        count_index += 1
+
+        if level == 1:
+            value_index += count
+            return list(values[value_index - count : value_index])
+
+        return [build(level - 1) for _ in range(count)]
+
+    return build(depth)
@@ -0,0 +1,52 @@
+"""Add dataset scan index.
+
+Revision ID: 6e3be968a4d5
+Revises: a8a44e0eea11
+Create Date: 2026-10-19 09:12:41.503118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+import whombat.models.base
+
+# revision identifiers, used by Alembic.
+revision: str = "6e3be968a4d5"
+down_revision: Union[str, None] = "a8a44e0eea11"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dataset_scan_entry",
+        sa.Column("dataset_id", sa.Integer(), nullable=False),
+        sa.Column("path", whombat.models.base.PathType(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("mtime", sa.BigInteger(), nullable=False),
+        sa.Column("inode", sa.BigInteger(), nullable=False),
+        sa.Column("is_dir", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_on",
+            sa.DateTime().with_variant(
+                sa.TIMESTAMP(timezone=True), "postgresql"
+            ),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["dataset_id"],
+            ["dataset.id"],
+            name=op.f("fk_dataset_scan_entry_dataset_id_dataset"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "dataset_id", "path", name=op.f("pk_dataset_scan_entry")
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dataset_scan_entry")
@@ -0,0 +1,32 @@
+"""Add clip evaluation fingerprints.
+
+Revision ID: 7b1f4d8e2c63
+Revises: 3c5e9b2f7a14
+Create Date: 2026-10-19 22:31:14.906512
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b1f4d8e2c63"
+down_revision: Union[str, None] = "3c5e9b2f7a14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("clip_evaluation") as batch_op:
+        batch_op.add_column(
+            sa.Column("fingerprint", sa.String(), nullable=True)
+        )
+        batch_op.add_column(sa.Column("examples", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("clip_evaluation") as batch_op:
+        batch_op.drop_column("examples")
+        batch_op.drop_column("fingerprint")
@@ -0,0 +1,27 @@
+"""Add full-text search indices.
+
+Revision ID: 8e4a1c7b2d90
+Revises: 5f2d7a9c1e36
+Create Date: 2026-10-19 18:41:03.517209
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from whombat.models.search import create_search_indices, drop_search_indices
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4a1c7b2d90"
+down_revision: Union[str, None] = "5f2d7a9c1e36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_search_indices(op.get_bind())
+
+
+def downgrade() -> None:
+    drop_search_indices(op.get_bind())
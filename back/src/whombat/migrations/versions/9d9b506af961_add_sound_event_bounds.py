@@ -0,0 +1,87 @@
+"""Add time and frequency bounds to sound events.
+
+Revision ID: 9d9b506af961
+Revises: 6e3be968a4d5
+Create Date: 2026-10-19 14:05:12.281734
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from soundevent import data
+
+from whombat.core.geometry import get_geometry_bounds
+
+# revision identifiers, used by Alembic.
+revision: str = "9d9b506af961"
+down_revision: Union[str, None] = "6e3be968a4d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+BOUNDS = ("start_time", "end_time", "low_freq", "high_freq")
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("sound_event") as batch_op:
+        for column in BOUNDS:
+            batch_op.add_column(sa.Column(column, sa.Float(), nullable=True))
+
+    sound_event = sa.table(
+        "sound_event",
+        sa.column("id", sa.Integer()),
+        sa.column("geometry", sa.String()),
+        *[sa.column(column, sa.Float()) for column in BOUNDS],
+    )
+    update = (
+        sa.update(sound_event)
+        .where(sound_event.c.id == sa.bindparam("_id"))
+        .values({column: sa.bindparam(column) for column in BOUNDS})
+    )
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sound_event.c.id, sound_event.c.geometry)
+            .where(sound_event.c.id > last_id)
+            .order_by(sound_event.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+
+        if not rows:
+            break
+
+        conn.execute(
+            update,
+            [
+                {
+                    "_id": id_,
+                    **get_geometry_bounds(
+                        data.geometry_validate(geometry, mode="json")
+                    )._asdict(),
+                }
+                for id_, geometry in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table("sound_event") as batch_op:
+        batch_op.alter_column("start_time", nullable=False)
+        batch_op.alter_column("end_time", nullable=False)
+        for column in BOUNDS:
+            batch_op.create_index(
+                op.f(f"ix_sound_event_{column}"),
+                [column],
+                unique=False,
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sound_event") as batch_op:
+        for column in BOUNDS:
+            batch_op.drop_index(op.f(f"ix_sound_event_{column}"))
+            batch_op.drop_column(column)
@@ -7,6 +7,8 @@ models into other modules without having to import the entire database
 module.
 """
 
+# NOTE: Imported so that the search indices are created with the tables.
+from whombat.models import search  # noqa: F401
 from whombat.models.annotation_project import (
     AnnotationProject,
     AnnotationProjectTag,
@@ -24,7 +26,11 @@ from whombat.models.clip_annotation import (
 )
 from whombat.models.clip_evaluation import ClipEvaluation, ClipEvaluationMetric
 from whombat.models.clip_prediction import ClipPrediction, ClipPredictionTag
-from whombat.models.dataset import Dataset, DatasetRecording
+from whombat.models.dataset import (
+    Dataset,
+    DatasetRecording,
+    DatasetScanEntry,
+)
 from whombat.models.evaluation import Evaluation, EvaluationMetric
 from whombat.models.evaluation_set import (
     EvaluationSet,
@@ -34,6 +40,7 @@ from whombat.models.evaluation_set import (
     EvaluationSetUserRun,
 )
 from whombat.models.feature import FeatureName
+from whombat.models.job import Job
 from whombat.models.model_run import (
     ModelRun,
     ModelRunEvaluation,
@@ -88,6 +95,7 @@ __all__ = [
     "ClipPredictionTag",
     "Dataset",
     "DatasetRecording",
+    "DatasetScanEntry",
     "Evaluation",
     "EvaluationMetric",
     "EvaluationSet",
@@ -96,6 +104,7 @@ __all__ = [
     "EvaluationSetTag",
     "EvaluationSetUserRun",
     "FeatureName",
+    "Job",
     "ModelRun",
     "ModelRunEvaluation",
     "ModelRunPrediction",
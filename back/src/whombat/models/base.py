@@ -15,6 +15,8 @@ from soundevent import data
 from sqlalchemy import MetaData
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
+from whombat.core.geometry import decode_geometry, encode_geometry
+
 __all__ = [
     "Base",
 ]
@@ -39,23 +41,27 @@ class PathType(types.TypeDecorator):
 
 
 class GeometryType(types.TypeDecorator):
-    """SqlAlchemy type for soundevent.Geometry objects."""
+    """SqlAlchemy type for soundevent.Geometry objects.
 
-    impl = types.String
+    Geometries are stored in the compact binary encoding of
+    `whombat.core.geometry.encode_geometry`.
+    """
+
+    impl = types.LargeBinary
 
     cache_ok = True
 
-    def process_bind_param(self, value: data.Geometry, _) -> str:  # type: ignore
-        return value.model_dump_json()
+    def process_bind_param(self, value: data.Geometry, _) -> bytes:  # type: ignore
+        return encode_geometry(value)
 
     def process_result_value(
         self,
-        value: str | None,
+        value: bytes | None,
         dialect,
     ) -> data.Geometry | None:
         if value is None:
             return value
-        return data.geometry_validate(value, mode="json")
+        return decode_geometry(value)
 
 
 class Base(AsyncAttrs, orm.MappedAsDataclass, orm.DeclarativeBase):
@@ -1,8 +1,9 @@
 """Evaluation Clip Model."""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Optional
 from uuid import UUID, uuid4
 
+import sqlalchemy as sa
 import sqlalchemy.orm as orm
 from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
@@ -73,6 +74,20 @@ class ClipEvaluation(Base):
     score: orm.Mapped[float] = orm.mapped_column(nullable=False)
     """The overall score of the clip prediction."""
 
+    fingerprint: orm.Mapped[Optional[str]] = orm.mapped_column(default=None)
+    """Fingerprint of the annotations and predictions that were evaluated.
+
+    Used to skip clips whose inputs did not change when the model run is
+    evaluated again.
+    """
+
+    examples: orm.Mapped[Optional[dict[str, Any]]] = orm.mapped_column(
+        sa.JSON(none_as_null=True),
+        default=None,
+        repr=False,
+    )
+    """Encoded examples of the clip, from which run metrics are computed."""
+
     # Relationships
     clip_annotation: orm.Mapped[ClipAnnotation] = orm.relationship(
         init=False,
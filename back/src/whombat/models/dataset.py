@@ -12,13 +12,25 @@ Each dataset can be named and described, making it easier to identify
 and manage multiple datasets within the app. Users can add new datasets
 to the app and import recordings into them, or remove datasets and their
 associated recordings from the app.
+
+To quickly report which files in the dataset directory are registered,
+missing or new, the app keeps an index of the filesystem state of the
+dataset directory from the last scan. This allows later scans to only
+list the directories that changed.
 """
 
 from pathlib import Path
 from uuid import UUID, uuid4
 
 import sqlalchemy.orm as orm
-from sqlalchemy import ForeignKey, UniqueConstraint, func, inspect, select
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    UniqueConstraint,
+    func,
+    inspect,
+    select,
+)
 
 from whombat.models.base import Base
 from whombat.models.recording import Recording
@@ -26,6 +38,7 @@ from whombat.models.recording import Recording
 __all__ = [
     "Dataset",
     "DatasetRecording",
+    "DatasetScanEntry",
 ]
 
 
@@ -83,6 +96,15 @@ class Dataset(Base):
         )
     )
 
+    scan_entries: orm.Mapped[list["DatasetScanEntry"]] = orm.relationship(
+        "DatasetScanEntry",
+        init=False,
+        repr=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        default_factory=list,
+    )
+
 
 class DatasetRecording(Base):
     """Dataset Recording Model.
@@ -137,6 +159,44 @@ class DatasetRecording(Base):
     )
 
 
+class DatasetScanEntry(Base):
+    """Dataset Scan Entry Model.
+
+    Stores the filesystem state of an audio file or directory within the
+    dataset directory, as seen in the last scan of the directory.
+
+    Notes
+    -----
+    Only directories and audio files are stored. The path is relative to
+    the dataset audio directory, and the root directory is stored with
+    the path ``.``.
+    """
+
+    __tablename__ = "dataset_scan_entry"
+
+    dataset_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("dataset.id", ondelete="CASCADE"),
+        nullable=False,
+        primary_key=True,
+    )
+    """The id of the dataset."""
+
+    path: orm.Mapped[Path] = orm.mapped_column(primary_key=True)
+    """The path of the file relative to the dataset directory."""
+
+    size: orm.Mapped[int] = orm.mapped_column(BigInteger)
+    """The size of the file in bytes."""
+
+    mtime: orm.Mapped[int] = orm.mapped_column(BigInteger)
+    """The modification time of the file in nanoseconds."""
+
+    inode: orm.Mapped[int] = orm.mapped_column(BigInteger)
+    """The inode number of the file."""
+
+    is_dir: orm.Mapped[bool] = orm.mapped_column(default=False)
+    """Whether the entry is a directory."""
+
+
 # Add a property to the Dataset model that returns the number of recordings
 # associated with the dataset.
 inspect(Dataset).add_property(
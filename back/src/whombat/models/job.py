@@ -0,0 +1,111 @@
+"""Job model.
+
+Long running operations, such as importing and exporting data or
+evaluating model runs, are run as jobs by a worker instead of within the
+request that started them. Each job is stored in the database, which acts
+as the queue from which workers claim pending jobs, and where they record
+the progress and the outcome of each job.
+"""
+
+import datetime
+from typing import Any, Optional
+from uuid import UUID, uuid4
+
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from sqlalchemy import ForeignKey
+
+from whombat.models.base import Base
+
+__all__ = [
+    "Job",
+]
+
+
+class Job(Base):
+    """Job Model.
+
+    Notes
+    -----
+    The parameters and the result of a job must be JSON serializable.
+    Files that a job reads or writes, such as uploaded documents or
+    exported data, are stored in the directory of the job and referred to
+    by name.
+    """
+
+    __tablename__ = "job"
+
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
+    """The database id of the job."""
+
+    uuid: orm.Mapped[UUID] = orm.mapped_column(
+        default_factory=uuid4,
+        kw_only=True,
+        unique=True,
+    )
+    """The UUID of the job."""
+
+    kind: orm.Mapped[str] = orm.mapped_column(nullable=False)
+    """The name of the operation the job runs."""
+
+    status: orm.Mapped[str] = orm.mapped_column(
+        nullable=False,
+        default="pending",
+        index=True,
+    )
+    """The status of the job."""
+
+    parameters: orm.Mapped[dict[str, Any]] = orm.mapped_column(
+        sa.JSON,
+        nullable=False,
+        default_factory=dict,
+    )
+    """The parameters of the operation."""
+
+    progress: orm.Mapped[float] = orm.mapped_column(nullable=False, default=0)
+    """The fraction of the job that is done, between 0 and 1."""
+
+    message: orm.Mapped[Optional[str]] = orm.mapped_column(default=None)
+    """A description of what the job is currently doing."""
+
+    details: orm.Mapped[Optional[dict[str, Any]]] = orm.mapped_column(
+        sa.JSON,
+        default=None,
+    )
+    """Structured details of the progress, such as processing rates."""
+
+    result: orm.Mapped[Optional[dict[str, Any]]] = orm.mapped_column(
+        sa.JSON,
+        default=None,
+    )
+    """The result of the operation, once the job is completed."""
+
+    error: orm.Mapped[Optional[str]] = orm.mapped_column(default=None)
+    """The error that made the job fail, if any."""
+
+    cancel_requested: orm.Mapped[bool] = orm.mapped_column(
+        nullable=False,
+        default=False,
+    )
+    """Whether the job was asked to stop while running."""
+
+    created_by_id: orm.Mapped[Optional[UUID]] = orm.mapped_column(
+        ForeignKey("user.id", ondelete="SET NULL"),
+        default=None,
+    )
+    """The id of the user that submitted the job."""
+
+    started_on: orm.Mapped[Optional[datetime.datetime]] = orm.mapped_column(
+        default=None,
+    )
+    """When a worker started running the job."""
+
+    heartbeat_on: orm.Mapped[Optional[datetime.datetime]] = orm.mapped_column(
+        default=None,
+    )
+    """When the worker running the job last reported that it is alive."""
+
+    finished_on: orm.Mapped[Optional[datetime.datetime]] = orm.mapped_column(
+        default=None,
+    )
+    """When the job completed, failed or was cancelled."""
@@ -78,7 +78,10 @@ class Recording(Base):
     """The unique identifier of the recording."""
 
     hash: orm.Mapped[str] = orm.mapped_column(unique=True, index=True)
-    """The md5 hash of the recording."""
+    """The hash of the recording.
+
+    Prefixed with the hashing strategy used, unless it is an md5 hash.
+    """
 
     path: orm.Mapped[Path] = orm.mapped_column(unique=True, index=True)
     """The path to the recording file relative to the base audio directory."""
@@ -0,0 +1,320 @@
+"""Full-text search indices of searchable tables.
+
+Search boxes filter recordings, notes, tags and annotation projects by
+substrings of their text columns. A plain ``ILIKE '%term%'`` cannot use
+a regular index and scans the whole table, so these columns are indexed
+with a trigram index:
+
+* In SQLite, each table gets an FTS5 virtual table with the ``trigram``
+  tokenizer that uses the table as external content. Triggers keep it in
+  sync on every insert, update and delete.
+* In PostgreSQL, each column gets a GIN index with the ``gin_trgm_ops``
+  operator class of the ``pg_trgm`` extension, which PostgreSQL keeps
+  in sync itself and uses for ``ILIKE`` queries.
+
+The indices are created along with the tables and by a migration for
+existing databases. Filters match against them with `search_match`, which
+falls back to ``ILIKE`` on other databases, for terms shorter than a
+trigram, and in SQLite versions older than 3.34, which lack the
+``trigram`` tokenizer.
+
+Notes
+-----
+Migrations that recreate an indexed table in SQLite, such as those using
+``batch_alter_table``, drop its triggers. They must call
+`create_search_indices` again afterwards.
+"""
+
+import sqlite3
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import cast
+
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    Connection,
+    Integer,
+    String,
+    bindparam,
+    case,
+    column,
+    event,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute, MappedColumn
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from whombat.models.base import Base
+
+__all__ = [
+    "SEARCH_INDICES",
+    "SearchIndex",
+    "SearchMatch",
+    "create_search_indices",
+    "drop_search_indices",
+    "get_search_index",
+    "search_match",
+    "search_rank",
+]
+
+MIN_TERM_LENGTH = 3
+"""Terms shorter than a trigram cannot use the index."""
+
+MIN_SQLITE_VERSION = (3, 34, 0)
+"""The first SQLite version with the ``trigram`` tokenizer of FTS5."""
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """The text columns of a table that are indexed for search."""
+
+    table: str
+    """Name of the indexed table."""
+
+    columns: tuple[str, ...]
+    """Names of the indexed columns."""
+
+    @property
+    def name(self) -> str:
+        """Name of the FTS5 table of the index in SQLite."""
+        return f"{self.table}_search"
+
+
+SEARCH_INDICES = (
+    SearchIndex("recording", ("path",)),
+    SearchIndex("note", ("message",)),
+    SearchIndex("tag", ("key", "value")),
+    SearchIndex("annotation_project", ("name", "description")),
+)
+
+
+def get_search_index(
+    fields: Sequence[InstrumentedAttribute],
+) -> SearchIndex | None:
+    """Get the index that covers all the given columns, if any."""
+    tables = {field.table.name for field in fields}
+    if len(tables) != 1:
+        return None
+
+    (table_name,) = tables
+    for index in SEARCH_INDICES:
+        if index.table == table_name and all(
+            field.key in index.columns for field in fields
+        ):
+            return index
+
+    return None
+
+
+class SearchMatch(ColumnElement[bool]):
+    """Condition that any of the columns of a row contains a term.
+
+    Compiles to a lookup in the FTS5 table of the index in SQLite and to
+    ``ILIKE`` conditions elsewhere.
+    """
+
+    type = Boolean()
+
+    # NOTE: Compile as a condition, and not as a value compared to 1, in
+    # databases without a boolean type.
+    _is_implicitly_boolean = True
+
+    inherit_cache = True
+
+    _traverse_internals = [
+        ("index_name", InternalTraversal.dp_string),
+        ("id_column", InternalTraversal.dp_clauseelement),
+        ("fields", InternalTraversal.dp_clauseelement_list),
+        ("phrase", InternalTraversal.dp_clauseelement),
+        ("pattern", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(
+        self,
+        index: SearchIndex,
+        fields: Sequence[InstrumentedAttribute],
+        term: str,
+    ):
+        self.index_name = index.name
+        self.id_column = fields[0].table.c.id
+        self.fields = [field.expression for field in fields]
+
+        columns = " ".join(field.key for field in fields)
+        escaped = term.replace('"', '""')
+        self.phrase = bindparam(
+            None,
+            f'{{{columns}}} : "{escaped}"',
+            type_=String(),
+        )
+        self.pattern = bindparam(None, f"%{term}%", type_=String())
+
+
+@compiles(SearchMatch)
+def _compile_search_match(element: SearchMatch, compiler, **kw) -> str:
+    return compiler.process(
+        or_(*[field.ilike(element.pattern) for field in element.fields]),
+        **kw,
+    )
+
+
+@compiles(SearchMatch, "sqlite")
+def _compile_search_match_sqlite(element: SearchMatch, compiler, **kw) -> str:
+    if not _sqlite_has_trigram():
+        return _compile_search_match(element, compiler, **kw)
+
+    index = table(element.index_name, column("rowid", Integer()))
+    matches = select(index.c.rowid).where(
+        literal_column(element.index_name).op("MATCH")(element.phrase)
+    )
+    return compiler.process(element.id_column.in_(matches), **kw)
+
+
+def search_match(
+    fields: Sequence[MappedColumn | InstrumentedAttribute],
+    term: str,
+) -> ColumnElement[bool]:
+    """Get a condition that any of the fields contains a term.
+
+    The match is case insensitive. It uses the search index of the table
+    of the fields when one covers them and the term is long enough.
+    """
+    # NOTE: Filters type their fields as mapped columns or attributes, but
+    # at runtime they are always attributes of a mapped class.
+    attributes = cast(Sequence[InstrumentedAttribute], fields)
+    index = get_search_index(attributes)
+    if index is None or len(term) < MIN_TERM_LENGTH:
+        return or_(*[field.ilike(f"%{term}%") for field in attributes])
+
+    return SearchMatch(index, attributes, term)
+
+
+def search_rank(
+    fields: Sequence[MappedColumn | InstrumentedAttribute],
+    term: str,
+) -> list[ColumnElement]:
+    """Get the order by clauses that sort search results by relevance.
+
+    Rows where a field equals the term come first, then those where a
+    field starts with it, and then the rest. Ties are broken by the
+    length of the shortest field, as shorter texts match more closely.
+    """
+    term = term.lower()
+    return [
+        _least(
+            [
+                case(
+                    (func.lower(field) == term, 0),
+                    (func.lower(field).startswith(term, autoescape=True), 1),
+                    else_=2,
+                )
+                for field in fields
+            ]
+        ),
+        _least([func.coalesce(func.length(field), 2**31) for field in fields]),
+    ]
+
+
+def _least(values: list[ColumnElement]) -> ColumnElement:
+    # NOTE: The minimum of several values is written as a CASE, as the
+    # function is called MIN in SQLite and LEAST in PostgreSQL.
+    least = values[0]
+    for value in values[1:]:
+        least = case((value < least, value), else_=least)
+    return least
+
+
+def create_search_indices(conn: Connection, fill: bool = True) -> None:
+    """Create the search indices of a database.
+
+    Parameters
+    ----------
+    conn
+        A connection to the database.
+    fill
+        Whether to index the rows that are already in the tables. Only
+        needed in SQLite, and can be skipped when the tables are empty.
+    """
+    if conn.dialect.name == "sqlite" and _sqlite_has_trigram():
+        for index in SEARCH_INDICES:
+            _create_sqlite_index(conn, index, fill=fill)
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index in SEARCH_INDICES:
+            for col in index.columns:
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS "
+                        f"ix_{index.table}_{col}_trgm ON {index.table} "
+                        f"USING gin ({col} gin_trgm_ops)"
+                    )
+                )
+
+
+def drop_search_indices(conn: Connection) -> None:
+    """Drop the search indices of a database."""
+    for index in SEARCH_INDICES:
+        if conn.dialect.name == "sqlite":
+            for action in ("insert", "delete", "update"):
+                conn.execute(
+                    text(f"DROP TRIGGER IF EXISTS {index.name}_{action}")
+                )
+            conn.execute(text(f"DROP TABLE IF EXISTS {index.name}"))
+
+        if conn.dialect.name == "postgresql":
+            for col in index.columns:
+                conn.execute(
+                    text(f"DROP INDEX IF EXISTS ix_{index.table}_{col}_trgm")
+                )
+
+
+def _sqlite_has_trigram() -> bool:
+    return sqlite3.sqlite_version_info >= MIN_SQLITE_VERSION
+
+
+def _create_sqlite_index(
+    conn: Connection,
+    index: SearchIndex,
+    fill: bool,
+) -> None:
+    columns = ", ".join(index.columns)
+    new = ", ".join(f"new.{col}" for col in index.columns)
+    old = ", ".join(f"old.{col}" for col in index.columns)
+    delete = (
+        f"INSERT INTO {index.name}({index.name}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = (
+        f"INSERT INTO {index.name}(rowid, {columns}) VALUES (new.id, {new});"
+    )
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.name} USING fts5("
+        f"{columns}, content='{index.table}', content_rowid='id', "
+        "tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_insert "
+        f"AFTER INSERT ON {index.table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_delete "
+        f"AFTER DELETE ON {index.table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_update "
+        f"AFTER UPDATE OF {columns} ON {index.table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+    if fill:
+        statements.append(
+            f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')"
+        )
+
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_indices_after_tables(target, connection, **kw) -> None:
+    create_search_indices(connection, fill=False)
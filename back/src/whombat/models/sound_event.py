@@ -35,7 +35,7 @@ from uuid import UUID, uuid4
 
 import sqlalchemy.orm as orm
 from soundevent import Geometry
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 
 from whombat.models.base import Base
@@ -57,10 +57,29 @@ class SoundEvent(Base):
 
     Notes
     -----
-    The geometry attribute is stored as a JSON string in the database.
+    The geometry attribute is stored in a compact binary encoding, see
+    `whombat.core.geometry.encode_geometry`.
+    Its time and frequency bounds are stored in separate, indexed columns
+    so that sound events can be queried by time and frequency range. They
+    must be kept in sync with the geometry, see
+    `whombat.core.geometry.get_geometry_bounds`.
+
+    The bounds are also indexed together with the recording, so that the
+    sound events of a recording that overlap a time and frequency window
+    can be found from the index alone.
     """
 
     __tablename__ = "sound_event"
+    __table_args__ = (
+        Index(
+            "ix_sound_event_recording_bounds",
+            "recording_id",
+            "start_time",
+            "end_time",
+            "low_freq",
+            "high_freq",
+        ),
+    )
 
     id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
     """The database id of the sound event."""
@@ -83,6 +102,36 @@ class SoundEvent(Base):
     geometry: orm.Mapped[Geometry] = orm.mapped_column(nullable=False)
     """The geometry of the mark used to mark the RoI of the sound event."""
 
+    start_time: orm.Mapped[float] = orm.mapped_column(
+        index=True,
+        kw_only=True,
+    )
+    """Start time of the geometry in seconds."""
+
+    end_time: orm.Mapped[float] = orm.mapped_column(
+        index=True,
+        kw_only=True,
+    )
+    """End time of the geometry in seconds."""
+
+    low_freq: orm.Mapped[float | None] = orm.mapped_column(
+        index=True,
+        kw_only=True,
+    )
+    """Lowest frequency of the geometry in Hz.
+
+    None for geometries that only span time.
+    """
+
+    high_freq: orm.Mapped[float | None] = orm.mapped_column(
+        index=True,
+        kw_only=True,
+    )
+    """Highest frequency of the geometry in Hz.
+
+    None for geometries that only span time.
+    """
+
     # Relations
     recording: orm.Mapped[Recording] = orm.relationship(
         init=False,
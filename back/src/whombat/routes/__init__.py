@@ -14,6 +14,7 @@ from whombat.routes.datasets import dataset_router
 from whombat.routes.evaluation_sets import get_evaluation_sets_router
 from whombat.routes.evaluations import evaluations_router
 from whombat.routes.features import features_router
+from whombat.routes.jobs import jobs_router
 from whombat.routes.model_runs import get_model_runs_router
 from whombat.routes.notes import notes_router
 from whombat.routes.plugins import plugin_router
@@ -185,6 +186,13 @@ def get_main_router(settings: Settings):
         tags=["Evaluations"],
     )
 
+    # Jobs
+    main_router.include_router(
+        jobs_router,
+        prefix="/jobs",
+        tags=["Jobs"],
+    )
+
     # Extensions
     main_router.include_router(
         plugin_router,
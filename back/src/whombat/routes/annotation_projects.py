@@ -1,17 +1,18 @@
 """REST API routes for annotation projects."""
 
+import datetime
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, UploadFile
-from fastapi.responses import Response
-from soundevent.io.aoef import to_aeof
+from fastapi.responses import StreamingResponse
 
 from whombat import api, schemas
-from whombat.api.io import aoef
+from whombat.api.io import aoef, arrow
 from whombat.filters.annotation_projects import AnnotationProjectFilter
 from whombat.routes.dependencies import Session, WhombatSettings
 from whombat.routes.dependencies.auth import get_current_user_dependency
+from whombat.routes.dependencies.session import create_session
 from whombat.routes.types import Limit, Offset
 
 __all__ = [
@@ -193,17 +194,91 @@ def get_annotation_projects_router(settings: WhombatSettings) -> APIRouter:
             whombat_project,
         )
 
-        project = await api.annotation_projects.to_soundevent(
+        async def stream():
+            # NOTE: The request session is closed before the response is
+            # sent.
+            async with create_session(settings) as stream_session:
+                async for chunk in api.annotation_projects.stream_aoef(
+                    stream_session,
+                    whombat_project,
+                    audio_dir=audio_dir / base_dir,
+                ):
+                    yield chunk
+
+        created_on = datetime.datetime.now().isoformat()
+        filename = f"{whombat_project.name}_{created_on}.json"
+        return StreamingResponse(
+            stream(),
+            media_type="application/json",
+            status_code=200,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            },
+        )
+
+    @annotation_projects_router.post(
+        "/detail/download/job/",
+        response_model=schemas.Job,
+    )
+    async def submit_export_annotation_project_job(
+        session: Session,
+        annotation_project_uuid: UUID,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ):
+        """Submit a job that exports an annotation project.
+
+        Once the job completes, the file can be downloaded from the
+        ``/jobs/detail/download/`` endpoint.
+        """
+        project = await api.annotation_projects.get(
             session,
-            whombat_project,
-            audio_dir=audio_dir / base_dir,
+            annotation_project_uuid,
+        )
+        job = await api.jobs.submit(
+            session,
+            "export_annotation_project",
+            parameters={"annotation_project_uuid": str(project.uuid)},
+            user=user,
         )
+        await session.commit()
+        return job
 
-        obj = to_aeof(project, audio_dir=audio_dir / base_dir)
-        filename = f"{project.name}_{obj.created_on.isoformat()}.json"
-        return Response(
-            obj.model_dump_json(),
-            media_type="application/json",
+    @annotation_projects_router.get(
+        "/detail/download/table/",
+    )
+    async def download_annotation_project_table(
+        session: Session,
+        annotation_project_uuid: UUID,
+        settings: WhombatSettings,
+        format: arrow.TableFormat = "parquet",
+    ):
+        """Export the sound event annotations of a project as a table."""
+        whombat_project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+        )
+
+        # NOTE: Errors raised while streaming cannot change the response,
+        # so a missing pyarrow is reported before the stream starts.
+        arrow.import_pyarrow()
+
+        async def stream():
+            # NOTE: The request session is closed before the response is
+            # sent.
+            async with create_session(settings) as stream_session:
+                async for chunk in api.annotation_projects.stream_table(
+                    stream_session,
+                    whombat_project,
+                    format=format,
+                ):
+                    yield chunk
+
+        created_on = datetime.datetime.now().isoformat()
+        extension = arrow.FILE_EXTENSIONS[format]
+        filename = f"{whombat_project.name}_{created_on}.{extension}"
+        return StreamingResponse(
+            stream(),
+            media_type=arrow.MEDIA_TYPES[format],
             status_code=200,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -232,4 +307,32 @@ def get_annotation_projects_router(settings: WhombatSettings) -> APIRouter:
         await session.refresh(db_project)
         return schemas.AnnotationProject.model_validate(db_project)
 
+    @annotation_projects_router.post(
+        "/import/job/",
+        response_model=schemas.Job,
+    )
+    async def submit_import_annotation_project_job(
+        settings: WhombatSettings,
+        session: Session,
+        annotation_project: UploadFile,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ):
+        """Submit a job that imports an annotation project."""
+        job_uuid = uuid4()
+        api.jobs.store_file(
+            job_uuid,
+            "annotation_project.json",
+            annotation_project.file,
+            jobs_dir=settings.jobs_dir,
+        )
+        job = await api.jobs.submit(
+            session,
+            "import_annotation_project",
+            parameters={"file": "annotation_project.json"},
+            user=user,
+            uuid=job_uuid,
+        )
+        await session.commit()
+        return job
+
     return annotation_projects_router
@@ -4,17 +4,20 @@ import datetime
 import logging
 from io import StringIO
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Body, Depends, UploadFile
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import StreamingResponse
 from pydantic import DirectoryPath
 from soundevent.io.aoef import DatasetObject
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, schemas
+from whombat.api.io import arrow
 from whombat.filters.datasets import DatasetFilter
 from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.routes.dependencies.session import create_session
 from whombat.routes.types import Limit, Offset
 
 __all__ = [
@@ -74,18 +77,126 @@ async def get_datasets(
 async def create_dataset(
     session: Session,
     dataset: schemas.DatasetCreate,
+    settings: WhombatSettings,
 ):
-    """Create a new dataset."""
+    """Create a new dataset.
+
+    The dataset is returned as soon as it is created. Its audio files are
+    registered by a job, and the progress of the registration can be
+    followed at the ``/detail/registration/`` endpoint.
+    """
     created = await api.datasets.create(
         session,
         name=dataset.name,
         description=dataset.description,
         dataset_dir=dataset.audio_dir,
+        audio_dir=settings.audio_dir,
+        register=False,
     )
+    await _submit_registration(session, created)
     await session.commit()
     return created
 
 
+@dataset_router.post(
+    "/job/",
+    response_model=schemas.Job,
+)
+async def submit_create_dataset_job(
+    session: Session,
+    dataset: schemas.DatasetCreate,
+):
+    """Submit a job that creates a dataset and registers its audio files.
+
+    The dataset UUID is stored in the result of the job once it completes.
+    """
+    job = await api.jobs.submit(
+        session,
+        "create_dataset",
+        parameters={
+            "name": dataset.name,
+            "description": dataset.description,
+            "audio_dir": str(dataset.audio_dir),
+        },
+    )
+    await session.commit()
+    return job
+
+
+@dataset_router.get(
+    "/detail/registration/",
+    response_model=schemas.Job,
+)
+async def get_dataset_registration(
+    session: Session,
+    dataset_uuid: UUID,
+):
+    """Get the latest job that registered the files of a dataset.
+
+    Poll this endpoint to follow the progress of the registration. The
+    ``details`` of the job hold the number of files and bytes processed so
+    far, the files and bytes processed per second, and the estimated
+    number of seconds until the registration finishes (``eta``).
+    """
+    dataset = await api.datasets.get(session, dataset_uuid)
+    job = await api.jobs.get_latest(
+        session,
+        "register_dataset_files",
+        parameters={"dataset_uuid": str(dataset.uuid)},
+    )
+    if job is None:
+        raise exceptions.NotFoundError(
+            f"No file registration found for dataset {dataset.uuid}."
+        )
+    return job
+
+
+@dataset_router.post(
+    "/detail/registration/",
+    response_model=schemas.Job,
+)
+async def register_dataset_files(
+    session: Session,
+    dataset_uuid: UUID,
+):
+    """Submit a job that registers the unregistered files of a dataset.
+
+    Use this to resume an interrupted registration or to add files that
+    were placed in the dataset directory after its creation. If the files
+    of the dataset are already being registered, that job is returned.
+    """
+    dataset = await api.datasets.get(session, dataset_uuid)
+    job = await _submit_registration(session, dataset)
+    await session.commit()
+    return job
+
+
+async def _submit_registration(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+) -> schemas.Job:
+    """Submit a job that registers the files of a dataset.
+
+    Only one registration runs at a time for each dataset, so the pending
+    or running registration is returned if there is one.
+    """
+    parameters = {"dataset_uuid": str(dataset.uuid)}
+    job = await api.jobs.get_latest(
+        session,
+        "register_dataset_files",
+        parameters=parameters,
+        active=True,
+    )
+    if job is not None:
+        return job
+
+    return await api.jobs.submit(
+        session,
+        "register_dataset_files",
+        parameters=parameters,
+    )
+
+
 @dataset_router.patch(
     "/detail/",
     response_model=schemas.Dataset,
@@ -109,10 +220,55 @@ async def update_dataset(
 async def get_file_state(
     session: Session,
     dataset_uuid: UUID,
+    settings: WhombatSettings,
+    full_scan: bool = False,
 ):
     """Get the status of the files in a dataset."""
     dataset = await api.datasets.get(session, dataset_uuid)
-    return await api.datasets.get_state(session, dataset)
+    state = await api.datasets.get_state(
+        session,
+        dataset,
+        audio_dir=settings.audio_dir,
+        full_scan=full_scan,
+    )
+    await session.commit()
+    return state
+
+
+@dataset_router.get(
+    "/detail/state/stream/",
+)
+async def stream_file_state(
+    session: Session,
+    dataset_uuid: UUID,
+    settings: WhombatSettings,
+    full_scan: bool = False,
+):
+    """Stream the status of the files in a dataset.
+
+    Files are sent as newline-delimited JSON as soon as the directory
+    containing them has been scanned.
+    """
+    dataset = await api.datasets.get(session, dataset_uuid)
+
+    async def generate():
+        # NOTE: The request session is closed before the response is sent.
+        async with create_session(settings) as stream_session:
+            async for file in api.datasets.iter_state(
+                stream_session,
+                dataset,
+                audio_dir=settings.audio_dir,
+                full_scan=full_scan,
+            ):
+                yield file.model_dump_json() + "\n"
+
+            await stream_session.commit()
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        status_code=200,
+    )
 
 
 @dataset_router.delete(
@@ -149,22 +305,56 @@ async def download_dataset_json(
     dataset_uuid: UUID,
     settings: WhombatSettings,
 ):
-    """Export a dataset."""
+    """Export a dataset.
+
+    The file is streamed while the dataset is exported, so the download
+    starts immediately regardless of the size of the dataset.
+    """
     whombat_dataset = await api.datasets.get(session, dataset_uuid)
-    obj = await api.datasets.export_dataset(
-        session,
-        whombat_dataset,
-        audio_dir=settings.audio_dir,
-    )
-    filename = f"{whombat_dataset.name}_{obj.created_on.isoformat()}.json"
-    return Response(
-        obj.model_dump_json(),
+
+    async def stream():
+        # NOTE: The request session is closed before the response is sent.
+        async with create_session(settings) as stream_session:
+            async for chunk in api.datasets.stream_aoef(
+                stream_session,
+                whombat_dataset,
+                audio_dir=settings.audio_dir,
+            ):
+                yield chunk
+
+    created_on = datetime.datetime.now().isoformat()
+    filename = f"{whombat_dataset.name}_{created_on}.json"
+    return StreamingResponse(
+        stream(),
         media_type="application/json",
         status_code=200,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
+@dataset_router.post(
+    "/detail/download/job/",
+    response_model=schemas.Job,
+)
+async def submit_export_dataset_job(
+    session: Session,
+    dataset_uuid: UUID,
+):
+    """Submit a job that exports a dataset in AOEF format.
+
+    Once the job completes, the file can be downloaded from the
+    ``/jobs/detail/download/`` endpoint.
+    """
+    dataset = await api.datasets.get(session, dataset_uuid)
+    job = await api.jobs.submit(
+        session,
+        "export_dataset",
+        parameters={"dataset_uuid": str(dataset.uuid)},
+    )
+    await session.commit()
+    return job
+
+
 @dataset_router.get(
     "/detail/download/csv/",
 )
@@ -187,6 +377,42 @@ async def download_dataset_csv(
     )
 
 
+@dataset_router.get(
+    "/detail/download/table/",
+)
+async def download_dataset_table(
+    session: Session,
+    dataset_uuid: UUID,
+    settings: WhombatSettings,
+    format: arrow.TableFormat = "parquet",
+):
+    """Export the dataset recordings as a Parquet file or Arrow stream."""
+    dataset = await api.datasets.get(session, dataset_uuid)
+
+    # NOTE: Errors raised while streaming cannot change the response,
+    # so a missing pyarrow is reported before the stream starts.
+    arrow.import_pyarrow()
+
+    async def stream():
+        # NOTE: The request session is closed before the response is sent.
+        async with create_session(settings) as stream_session:
+            async for chunk in api.datasets.stream_table(
+                stream_session,
+                dataset,
+                format=format,
+            ):
+                yield chunk
+
+    created_on = datetime.datetime.now().isoformat()
+    filename = f"{dataset.name}_{created_on}.{arrow.FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        stream(),
+        media_type=arrow.MEDIA_TYPES[format],
+        status_code=200,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
 @dataset_router.post(
     "/import/",
     response_model=schemas.Dataset,
@@ -207,3 +433,31 @@ async def import_dataset(
         dataset_audio_dir=audio_dir,
         audio_dir=settings.audio_dir,
     )
+
+
+@dataset_router.post(
+    "/import/job/",
+    response_model=schemas.Job,
+)
+async def submit_import_dataset_job(
+    settings: WhombatSettings,
+    session: Session,
+    dataset: UploadFile,
+    audio_dir: Annotated[DirectoryPath, Body()],
+):
+    """Submit a job that imports a dataset from an AOEF file."""
+    job_uuid = uuid4()
+    api.jobs.store_file(
+        job_uuid,
+        "dataset.json",
+        dataset.file,
+        jobs_dir=settings.jobs_dir,
+    )
+    job = await api.jobs.submit(
+        session,
+        "import_dataset",
+        parameters={"file": "dataset.json", "audio_dir": str(audio_dir)},
+        uuid=job_uuid,
+    )
+    await session.commit()
+    return job
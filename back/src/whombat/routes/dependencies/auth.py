@@ -23,9 +23,13 @@ def get_access_token_db(
 
 async def get_database_strategy(
     token_db: Annotated[auth.TokenDatabase, Depends(get_access_token_db)],
+    settings: WhombatSettings,
 ):
     """Get the authentication strategy."""
-    return auth.get_database_strategy(token_db)
+    return auth.get_database_strategy(
+        token_db,
+        cache_ttl=settings.auth_token_cache_ttl,
+    )
 
 
 def get_auth_backend(
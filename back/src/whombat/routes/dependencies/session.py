@@ -1,5 +1,6 @@
 """Common database session dependencies."""
 
+from contextlib import asynccontextmanager
 from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends
@@ -10,9 +11,35 @@ from whombat.system.database import (
     create_async_db_engine,
     get_async_session,
     get_database_url,
+    get_sqlite_pragmas,
 )
+from whombat.system.settings import Settings
 
-__all__ = ["Session"]
+__all__ = [
+    "Session",
+    "create_session",
+]
+
+
+@asynccontextmanager
+async def create_session(
+    settings: Settings,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Create a session for the database described in the settings.
+
+    Use this in tasks that outlive the request, such as background tasks,
+    as the request session is closed once the response is returned.
+    """
+    url = get_database_url(settings)
+    engine = create_async_db_engine(
+        url,
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
+    try:
+        async with get_async_session(engine) as session:
+            yield session
+    finally:
+        await engine.dispose()
 
 
 async def async_session(
@@ -20,7 +47,10 @@ async def async_session(
 ) -> AsyncGenerator[AsyncSession, None]:
     """Get an async session for the database."""
     url = get_database_url(settings)
-    engine = create_async_db_engine(url)
+    engine = create_async_db_engine(
+        url,
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
     async with get_async_session(engine) as session:
         yield session
 
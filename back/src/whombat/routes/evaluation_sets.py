@@ -1,18 +1,19 @@
 """REST API routes for evaluation sets."""
 
+import datetime
 import json
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Body, Depends, UploadFile
-from fastapi.responses import Response
-from soundevent.io.aoef import to_aeof
+from fastapi.responses import StreamingResponse
 
 from whombat import api, schemas
 from whombat.api.io import aoef
 from whombat.filters.evaluation_sets import EvaluationSetFilter
 from whombat.routes.dependencies import Session, WhombatSettings
 from whombat.routes.dependencies.auth import get_current_user_dependency
+from whombat.routes.dependencies.session import create_session
 from whombat.routes.types import Limit, Offset
 
 __all__ = [
@@ -253,17 +254,24 @@ def get_evaluation_sets_router(settings: WhombatSettings) -> APIRouter:
             session,
             evaluation_set_uuid,
         )
-        soundevent_object = await api.evaluation_sets.to_soundevent(
-            session,
-            evaluation_set,
-        )
-        obj = to_aeof(soundevent_object, audio_dir=settings.audio_dir)
-        filename = f"{evaluation_set.name}_{obj.created_on.isoformat()}.json"
-        return Response(
-            obj.model_dump_json(
-                exclude=set(exclude or []),
-                exclude_none=True,
-            ),
+
+        async def stream():
+            # NOTE: The request session is closed before the response is
+            # sent.
+            async with create_session(settings) as stream_session:
+                async for chunk in api.evaluation_sets.stream_aoef(
+                    stream_session,
+                    evaluation_set,
+                    audio_dir=settings.audio_dir,
+                    exclude_none=True,
+                    exclude=exclude or [],
+                ):
+                    yield chunk
+
+        created_on = datetime.datetime.now().isoformat()
+        filename = f"{evaluation_set.name}_{created_on}.json"
+        return StreamingResponse(
+            stream(),
             media_type="application/json",
             status_code=200,
             headers={
@@ -271,6 +279,35 @@ def get_evaluation_sets_router(settings: WhombatSettings) -> APIRouter:
             },
         )
 
+    @evaluation_sets_router.post(
+        "/detail/download/job/",
+        response_model=schemas.Job,
+    )
+    async def submit_export_evaluation_set_job(
+        session: Session,
+        evaluation_set_uuid: UUID,
+        exclude: list[str] | None = None,
+    ):
+        """Submit a job that exports an evaluation set.
+
+        Once the job completes, the file can be downloaded from the
+        ``/jobs/detail/download/`` endpoint.
+        """
+        evaluation_set = await api.evaluation_sets.get(
+            session,
+            evaluation_set_uuid,
+        )
+        job = await api.jobs.submit(
+            session,
+            "export_evaluation_set",
+            parameters={
+                "evaluation_set_uuid": str(evaluation_set.uuid),
+                "exclude": exclude or [],
+            },
+        )
+        await session.commit()
+        return job
+
     @evaluation_sets_router.post(
         "/import/",
         response_model=schemas.EvaluationSet,
@@ -297,4 +334,33 @@ def get_evaluation_sets_router(settings: WhombatSettings) -> APIRouter:
         await session.refresh(db_dataset)
         return schemas.EvaluationSet.model_validate(db_dataset)
 
+    @evaluation_sets_router.post(
+        "/import/job/",
+        response_model=schemas.Job,
+    )
+    async def submit_import_evaluation_set_job(
+        settings: WhombatSettings,
+        session: Session,
+        evaluation_set: UploadFile,
+        task: Annotated[str, Body()],
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ):
+        """Submit a job that imports an evaluation set."""
+        job_uuid = uuid4()
+        api.jobs.store_file(
+            job_uuid,
+            "evaluation_set.json",
+            evaluation_set.file,
+            jobs_dir=settings.jobs_dir,
+        )
+        job = await api.jobs.submit(
+            session,
+            "import_evaluation_set",
+            parameters={"file": "evaluation_set.json", "task": task},
+            user=user,
+            uuid=job_uuid,
+        )
+        await session.commit()
+        return job
+
     return evaluation_sets_router
@@ -3,7 +3,7 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from whombat import api, schemas
 from whombat.filters.evaluations import EvaluationFilter
@@ -60,6 +60,24 @@ async def get_evaluation(
     return await api.evaluations.get(session, evaluation_uuid)
 
 
+@evaluations_router.get(
+    "/detail/dashboard/",
+    response_model=schemas.EvaluationDashboard,
+)
+async def get_evaluation_dashboard(
+    session: Session,
+    evaluation_uuid: UUID,
+    max_points: Annotated[int, Query(ge=2, le=10_000)] = 200,
+) -> schemas.EvaluationDashboard:
+    """Get precision-recall curves and a confusion matrix of an evaluation."""
+    evaluation = await api.evaluations.get(session, evaluation_uuid)
+    return await api.evaluations.get_dashboard(
+        session,
+        evaluation,
+        max_points=max_points,
+    )
+
+
 @evaluations_router.post(
     "/",
     response_model=schemas.Evaluation,
@@ -0,0 +1,110 @@
+"""REST API routes for jobs."""
+
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+
+from whombat import api, schemas
+from whombat.filters.jobs import JobFilter
+from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.routes.types import Limit, Offset
+
+__all__ = [
+    "jobs_router",
+]
+
+jobs_router = APIRouter()
+
+
+@jobs_router.get(
+    "/",
+    response_model=schemas.Page[schemas.Job],
+)
+async def get_jobs(
+    session: Session,
+    filter: Annotated[
+        JobFilter,  # type: ignore
+        Depends(JobFilter),
+    ],
+    limit: Limit = 10,
+    offset: Offset = 0,
+):
+    """Get a page of jobs, most recent first."""
+    jobs, total = await api.jobs.get_many(
+        session,
+        limit=limit,
+        offset=offset,
+        filters=[filter],
+    )
+    return schemas.Page(
+        items=jobs,
+        total=total,
+        offset=offset,
+        limit=limit,
+    )
+
+
+@jobs_router.get(
+    "/detail/",
+    response_model=schemas.Job,
+)
+async def get_job(
+    session: Session,
+    job_uuid: UUID,
+):
+    """Get a job by UUID.
+
+    Poll this endpoint to follow the progress of a submitted job.
+    """
+    return await api.jobs.get(session, job_uuid)
+
+
+@jobs_router.post(
+    "/detail/cancel/",
+    response_model=schemas.Job,
+)
+async def cancel_job(
+    session: Session,
+    job_uuid: UUID,
+):
+    """Cancel a job.
+
+    Pending jobs are cancelled immediately, while running jobs stop the
+    next time they report their progress.
+    """
+    job = await api.jobs.get(session, job_uuid)
+    cancelled = await api.jobs.cancel(session, job)
+    await session.commit()
+    return cancelled
+
+
+@jobs_router.get(
+    "/detail/download/",
+)
+async def download_job_result(
+    session: Session,
+    job_uuid: UUID,
+    settings: WhombatSettings,
+):
+    """Download the file written by a completed job."""
+    job = await api.jobs.get(session, job_uuid)
+    path = api.jobs.get_result_file(job, jobs_dir=settings.jobs_dir)
+    return FileResponse(path, filename=path.name)
+
+
+@jobs_router.delete(
+    "/detail/",
+    response_model=schemas.Job,
+)
+async def delete_job(
+    session: Session,
+    job_uuid: UUID,
+    settings: WhombatSettings,
+):
+    """Delete a job and its files."""
+    job = await api.jobs.get(session, job_uuid)
+    deleted = await api.jobs.delete(session, job, jobs_dir=settings.jobs_dir)
+    await session.commit()
+    return deleted
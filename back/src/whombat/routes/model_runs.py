@@ -1,15 +1,18 @@
 """REST API routes for model runs."""
 
+import datetime
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Body, Depends, UploadFile
+from fastapi.responses import StreamingResponse
 
 from whombat import api, schemas
-from whombat.api.io import aoef
+from whombat.api.io import aoef, arrow
 from whombat.filters.model_runs import ModelRunFilter
 from whombat.routes.dependencies import Session, WhombatSettings
 from whombat.routes.dependencies.auth import get_current_user_dependency
+from whombat.routes.dependencies.session import create_session
 from whombat.routes.types import Limit, Offset
 
 __all__ = [
@@ -54,6 +57,43 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
         """Get model run."""
         return await api.model_runs.get(session, model_run_uuid)
 
+    @model_runs_router.get("/detail/download/table/")
+    async def download_model_run_table(
+        session: Session,
+        model_run_uuid: UUID,
+        settings: WhombatSettings,
+        format: arrow.TableFormat = "parquet",
+    ):
+        """Export the sound event predictions of a model run as a table."""
+        model_run = await api.model_runs.get(session, model_run_uuid)
+
+        # NOTE: Errors raised while streaming cannot change the response,
+        # so a missing pyarrow is reported before the stream starts.
+        arrow.import_pyarrow()
+
+        async def stream():
+            # NOTE: The request session is closed before the response is
+            # sent.
+            async with create_session(settings) as stream_session:
+                async for chunk in api.model_runs.stream_table(
+                    stream_session,
+                    model_run,
+                    format=format,
+                ):
+                    yield chunk
+
+        created_on = datetime.datetime.now().isoformat()
+        extension = arrow.FILE_EXTENSIONS[format]
+        filename = f"{model_run.name}_{created_on}.{extension}"
+        return StreamingResponse(
+            stream(),
+            media_type=arrow.MEDIA_TYPES[format],
+            status_code=200,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            },
+        )
+
     @model_runs_router.get(
         "/detail/evaluation/", response_model=schemas.Evaluation
     )
@@ -114,6 +154,32 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return evaluation
 
+    @model_runs_router.post(
+        "/detail/evaluate/job/", response_model=schemas.Job
+    )
+    async def submit_evaluate_model_run_job(
+        session: Session,
+        model_run_uuid: UUID,
+        evaluation_set_uuid: UUID,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ) -> schemas.Job:
+        """Submit a job that evaluates a model run on an evaluation set."""
+        model_run = await api.model_runs.get(session, model_run_uuid)
+        evaluation_set = await api.evaluation_sets.get(
+            session, evaluation_set_uuid
+        )
+        job = await api.jobs.submit(
+            session,
+            "evaluate_model_run",
+            parameters={
+                "model_run_uuid": str(model_run.uuid),
+                "evaluation_set_uuid": str(evaluation_set.uuid),
+            },
+            user=user,
+        )
+        await session.commit()
+        return job
+
     @model_runs_router.delete("/detail/", response_model=schemas.ModelRun)
     async def delete_model_run(
         session: Session,
@@ -157,4 +223,35 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return data
 
+    @model_runs_router.post("/import/job/", response_model=schemas.Job)
+    async def submit_import_model_run_job(
+        session: Session,
+        model_run: UploadFile,
+        evaluation_set_uuid: Annotated[UUID, Body()],
+        settings: WhombatSettings,
+    ) -> schemas.Job:
+        """Submit a job that imports a model run into an evaluation set."""
+        evaluation_set = await api.evaluation_sets.get(
+            session,
+            evaluation_set_uuid,
+        )
+        job_uuid = uuid4()
+        api.jobs.store_file(
+            job_uuid,
+            "model_run.json",
+            model_run.file,
+            jobs_dir=settings.jobs_dir,
+        )
+        job = await api.jobs.submit(
+            session,
+            "import_model_run",
+            parameters={
+                "file": "model_run.json",
+                "evaluation_set_uuid": str(evaluation_set.uuid),
+            },
+            uuid=job_uuid,
+        )
+        await session.commit()
+        return job
+
     return model_runs_router
@@ -1,13 +1,16 @@
 """REST API routes for sound_event_annotations."""
 
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
-from whombat import api, schemas
+from whombat import api, models, schemas
+from whombat.api import feature_matrices
 from whombat.api.scatterplots.sound_event_annotations import (
+    ScatterPlot,
     ScatterPlotData,
+    get_scatterplot,
     get_scatterplot_data,
 )
 from whombat.filters.sound_event_annotations import SoundEventAnnotationFilter
@@ -304,4 +307,73 @@ def get_sound_event_annotations_router(settings: WhombatSettings) -> APIRouter:
             offset=offset,
         )
 
+    @sound_event_annotations_router.get(
+        "/scatter_plot/points/",
+        response_model=ScatterPlot,
+    )
+    async def get_scatter_plot_points(
+        session: Session,
+        filter: Annotated[
+            SoundEventAnnotationFilter,  # type: ignore
+            Depends(SoundEventAnnotationFilter),
+        ],
+        features: Annotated[list[str] | None, Query()] = None,
+        projection: Literal["pca"] | None = None,
+        dimensions: Annotated[int, Query(ge=2, le=3)] = 2,
+        group_by: str | None = None,
+        max_points: Annotated[int, Query(ge=1, le=100_000)] = 10_000,
+    ) -> ScatterPlot:
+        """Get downsampled points of a scatter plot of annotations.
+
+        Points are placed by two or three `features`, or by the principal
+        components of the features with `projection=pca`.
+        """
+        try:
+            return await get_scatterplot(
+                session,
+                features=features,
+                projection=projection,
+                dimensions=dimensions,
+                group_by=group_by,
+                max_points=max_points,
+                filters=[filter],
+            )
+        except ValueError as error:
+            raise HTTPException(
+                status_code=422,
+                detail=str(error),
+            ) from error
+
+    @sound_event_annotations_router.get("/features/matrix/")
+    async def download_feature_matrix(
+        session: Session,
+        filter: Annotated[
+            SoundEventAnnotationFilter,  # type: ignore
+            Depends(SoundEventAnnotationFilter),
+        ],
+        features: Annotated[list[str] | None, Query()] = None,
+        format: feature_matrices.MatrixFormat = "arrow",
+    ) -> Response:
+        """Download the features of sound event annotations as a dense matrix.
+
+        There is one row per annotation and one float32 column per
+        feature, with NaN for missing features.
+        """
+        matrix = await api.get_feature_matrix(
+            session,
+            models.SoundEventAnnotation,
+            features=features,
+            filters=[filter],
+        )
+        extension = feature_matrices.FILE_EXTENSIONS[format]
+        return Response(
+            content=feature_matrices.encode_feature_matrix(matrix, format),
+            media_type=feature_matrices.MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": (
+                    f"attachment; filename=features.{extension}"
+                )
+            },
+        )
+
     return sound_event_annotations_router
@@ -3,9 +3,10 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
-from whombat import api, schemas
+from whombat import api, models, schemas
+from whombat.api import feature_matrices
 from whombat.filters.sound_event_predictions import SoundEventPredictionFilter
 from whombat.routes.dependencies import Session
 from whombat.routes.types import Limit, Offset
@@ -151,3 +152,36 @@ async def remove_predicted_tag(
     )
     await session.commit()
     return sound_event_prediction
+
+
+@sound_event_predictions_router.get("/features/matrix/")
+async def download_feature_matrix(
+    session: Session,
+    filter: Annotated[
+        SoundEventPredictionFilter,  # type: ignore
+        Depends(SoundEventPredictionFilter),
+    ],
+    features: Annotated[list[str] | None, Query()] = None,
+    format: feature_matrices.MatrixFormat = "arrow",
+) -> Response:
+    """Download the features of sound event predictions as a dense matrix.
+
+    There is one row per prediction and one float32 column per
+    feature, with NaN for missing features.
+    """
+    matrix = await api.get_feature_matrix(
+        session,
+        models.SoundEventPrediction,
+        features=features,
+        filters=[filter],
+    )
+    extension = feature_matrices.FILE_EXTENSIONS[format]
+    return Response(
+        content=feature_matrices.encode_feature_matrix(matrix, format),
+        media_type=feature_matrices.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=features.{extension}"
+            )
+        },
+    )
@@ -57,6 +57,52 @@ async def get_sound_events(
     )
 
 
+@sound_events_router.get(
+    "/viewport/",
+    response_model=schemas.Viewport,
+)
+async def get_viewport(
+    session: Session,
+    recording_uuid: UUID,
+    start_time: float,
+    end_time: float,
+    low_freq: float | None = None,
+    high_freq: float | None = None,
+    annotation_project_uuid: UUID | None = None,
+    model_run_uuid: UUID | None = None,
+    min_score: float | None = None,
+    include_annotations: bool = True,
+    include_predictions: bool = True,
+):
+    """Get the annotations and predictions that overlap a viewport."""
+    recording = await api.recordings.get(session, recording_uuid)
+
+    annotation_project = None
+    if annotation_project_uuid is not None:
+        annotation_project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+        )
+
+    model_run = None
+    if model_run_uuid is not None:
+        model_run = await api.model_runs.get(session, model_run_uuid)
+
+    return await api.get_viewport(
+        session,
+        recording,
+        start_time=start_time,
+        end_time=end_time,
+        low_freq=low_freq,
+        high_freq=high_freq,
+        annotation_project=annotation_project,
+        model_run=model_run,
+        min_score=min_score,
+        include_annotations=include_annotations,
+        include_predictions=include_predictions,
+    )
+
+
 @sound_events_router.post(
     "/",
     response_model=schemas.SoundEvent,
@@ -1,8 +1,9 @@
 """REST API routes for tags."""
 
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from whombat import api, schemas
 from whombat.filters.clip_annotation_tags import ClipAnnotationTagFilter
@@ -41,6 +42,33 @@ async def get_tags(
     )
 
 
+@tags_router.get("/autocomplete/", response_model=list[schemas.TagCount])
+async def autocomplete_tags(
+    session: Session,
+    q: str = "",
+    annotation_project_uuid: UUID | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+):
+    """Suggest tags that start with the text typed so far.
+
+    Suggestions are ranked by how often they are used in annotations, in
+    the given annotation project if any.
+    """
+    annotation_project = None
+    if annotation_project_uuid is not None:
+        annotation_project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+        )
+
+    return await api.tags.autocomplete(
+        session,
+        q,
+        annotation_project=annotation_project,
+        limit=limit,
+    )
+
+
 @tags_router.get(
     "/recording_tags/", response_model=schemas.Page[schemas.RecordingTag]
 )
@@ -52,8 +52,10 @@ from whombat.schemas.datasets import (
     DatasetFile,
     DatasetRecording,
     DatasetRecordingCreate,
+    DatasetRegistration,
     DatasetUpdate,
     FileState,
+    RegistrationStatus,
 )
 from whombat.schemas.evaluation_sets import (
     EvaluationSet,
@@ -61,9 +63,12 @@ from whombat.schemas.evaluation_sets import (
     EvaluationSetUpdate,
 )
 from whombat.schemas.evaluations import (
+    ClassPerformance,
     Evaluation,
     EvaluationCreate,
+    EvaluationDashboard,
     EvaluationUpdate,
+    PrecisionRecallCurve,
 )
 from whombat.schemas.features import (
     Feature,
@@ -71,6 +76,7 @@ from whombat.schemas.features import (
     FeatureNameCreate,
     FeatureNameUpdate,
 )
+from whombat.schemas.jobs import Job, JobCreate, JobStatus, JobUpdate
 from whombat.schemas.model_runs import ModelRun, ModelRunCreate, ModelRunUpdate
 from whombat.schemas.notes import Note, NoteCreate, NoteUpdate
 from whombat.schemas.plugin import PluginInfo
@@ -120,6 +126,11 @@ from whombat.schemas.tags import (
 )
 from whombat.schemas.user_runs import UserRun, UserRunCreate, UserRunUpdate
 from whombat.schemas.users import SimpleUser, User, UserCreate, UserUpdate
+from whombat.schemas.viewports import (
+    Viewport,
+    ViewportAnnotation,
+    ViewportPrediction,
+)
 
 __all__ = [
     "AmplitudeParameters",
@@ -134,6 +145,7 @@ __all__ = [
     "AnnotationTaskUpdate",
     "AudioParameters",
     "BaseSchema",
+    "ClassPerformance",
     "Clip",
     "ClipAnnotation",
     "ClipAnnotationCreate",
@@ -154,9 +166,11 @@ __all__ = [
     "DatasetFile",
     "DatasetRecording",
     "DatasetRecordingCreate",
+    "DatasetRegistration",
     "DatasetUpdate",
     "Evaluation",
     "EvaluationCreate",
+    "EvaluationDashboard",
     "EvaluationSet",
     "EvaluationSetCreate",
     "EvaluationSetUpdate",
@@ -166,6 +180,10 @@ __all__ = [
     "FeatureNameCreate",
     "FeatureNameUpdate",
     "FileState",
+    "Job",
+    "JobCreate",
+    "JobStatus",
+    "JobUpdate",
     "ModelRun",
     "ModelRunCreate",
     "ModelRunUpdate",
@@ -175,12 +193,14 @@ __all__ = [
     "Page",
     "Page",
     "PluginInfo",
+    "PrecisionRecallCurve",
     "PredictedTag",
     "Recording",
     "RecordingCreate",
     "RecordingNote",
     "RecordingTag",
     "RecordingUpdate",
+    "RegistrationStatus",
     "STFTParameters",
     "Scale",
     "SimpleUser",
@@ -210,5 +230,8 @@ __all__ = [
     "UserRunCreate",
     "UserRunUpdate",
     "UserUpdate",
+    "Viewport",
+    "ViewportAnnotation",
+    "ViewportPrediction",
     "Window",
 ]
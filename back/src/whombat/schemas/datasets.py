@@ -15,7 +15,9 @@ __all__ = [
     "DatasetCreate",
     "DatasetUpdate",
     "DatasetRecordingCreate",
+    "DatasetRegistration",
     "FileState",
+    "RegistrationStatus",
 ]
 
 
@@ -125,3 +127,52 @@ class DatasetRecording(BaseSchema):
 
     path: Path
     """The path to the recording in the dataset directory."""
+
+
+class RegistrationStatus(Enum):
+    """The status of the registration of the files of a dataset."""
+
+    RUNNING = "running"
+    """If files are still being registered."""
+
+    COMPLETED = "completed"
+    """If all files were processed."""
+
+    FAILED = "failed"
+    """If the registration was interrupted by an error."""
+
+
+class DatasetRegistration(BaseModel):
+    """Progress of the registration of the files of a dataset.
+
+    Files are registered in batches, and every batch is committed to the
+    database once processed. Hence, an interrupted registration can be
+    resumed by registering the files that remain unregistered.
+    """
+
+    status: RegistrationStatus
+    """The status of the registration."""
+
+    total_files: int
+    """The number of files to register."""
+
+    processed_files: int
+    """The number of files processed so far."""
+
+    total_bytes: int
+    """The total size of the files to register, in bytes."""
+
+    processed_bytes: int
+    """The size of the files processed so far, in bytes."""
+
+    files_per_second: float
+    """The number of files processed per second."""
+
+    bytes_per_second: float
+    """The number of bytes processed per second."""
+
+    eta: float | None = None
+    """The estimated number of seconds until the registration finishes."""
+
+    error: str | None = None
+    """The error that interrupted the registration, if any."""
@@ -6,11 +6,15 @@ from pydantic import BaseModel, Field
 
 from whombat.schemas.base import BaseSchema
 from whombat.schemas.features import Feature
+from whombat.schemas.tags import Tag
 
 __all__ = [
+    "ClassPerformance",
     "EvaluationCreate",
     "Evaluation",
+    "EvaluationDashboard",
     "EvaluationUpdate",
+    "PrecisionRecallCurve",
 ]
 
 
@@ -53,3 +57,65 @@ class EvaluationUpdate(BaseModel):
 
     task: str | None = None
     """Task of the evaluation."""
+
+
+class PrecisionRecallCurve(BaseModel):
+    """Precision and recall of a class at decreasing score thresholds."""
+
+    precision: list[float]
+    """Precision at each threshold."""
+
+    recall: list[float]
+    """Recall at each threshold."""
+
+    thresholds: list[float]
+    """Score thresholds, in decreasing order."""
+
+
+class ClassPerformance(BaseModel):
+    """Performance of a run on one class of the evaluation set."""
+
+    tag: Tag
+    """The tag of the class."""
+
+    support: int
+    """Number of examples of the class."""
+
+    average_precision: float | None
+    """Average precision of the class, or None if it has no examples."""
+
+    curve: PrecisionRecallCurve
+    """Precision-recall curve of the class."""
+
+
+class EvaluationDashboard(BaseModel):
+    """Aggregate metrics of an evaluation, computed from its examples."""
+
+    evaluation_uuid: UUID
+    """UUID of the evaluation."""
+
+    task: str
+    """Task of the evaluation."""
+
+    clip_count: int
+    """Number of clip evaluations with stored examples.
+
+    Clip evaluations that were imported rather than computed by whombat
+    have no stored examples and are not included.
+    """
+
+    example_count: int
+    """Number of examples, such as sound events, across the clips."""
+
+    mean_average_precision: float | None
+    """Mean of the average precision of the classes with examples."""
+
+    classes: list[ClassPerformance]
+    """Performance on each class, in the order of the evaluation tags."""
+
+    confusion_matrix: list[list[int]] | None
+    """Counts of examples by true (rows) and predicted (columns) class.
+
+    Rows and columns follow the order of `classes`, with an extra last row
+    and column for no class. None for multi-label tasks.
+    """
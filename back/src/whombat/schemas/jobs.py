@@ -0,0 +1,138 @@
+"""Schemas for handling Jobs."""
+
+import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from whombat.schemas.base import BaseSchema
+
+__all__ = [
+    "Job",
+    "JobCreate",
+    "JobStatus",
+    "JobUpdate",
+]
+
+
+class JobStatus(Enum):
+    """The status of a job."""
+
+    PENDING = "pending"
+    """If the job is waiting for a worker."""
+
+    RUNNING = "running"
+    """If a worker is running the job."""
+
+    COMPLETED = "completed"
+    """If the job finished successfully."""
+
+    FAILED = "failed"
+    """If the job was interrupted by an error."""
+
+    CANCELLED = "cancelled"
+    """If the job was cancelled before it finished."""
+
+
+class JobCreate(BaseModel):
+    """Schema for submitting a job."""
+
+    kind: str
+    """The name of the operation to run."""
+
+    parameters: dict[str, Any] = Field(default_factory=dict)
+    """The parameters of the operation."""
+
+    created_by_id: UUID | None = None
+    """The id of the user that submitted the job."""
+
+
+class Job(BaseSchema):
+    """Schema for Job objects returned to the user."""
+
+    uuid: UUID
+    """The UUID of the job."""
+
+    id: int = Field(..., exclude=True)
+    """The database id of the job."""
+
+    kind: str
+    """The name of the operation the job runs."""
+
+    status: JobStatus
+    """The status of the job."""
+
+    parameters: dict[str, Any] = Field(default_factory=dict)
+    """The parameters of the operation."""
+
+    progress: float = 0
+    """The fraction of the job that is done, between 0 and 1."""
+
+    message: str | None = None
+    """A description of what the job is currently doing."""
+
+    details: dict[str, Any] | None = None
+    """Structured details of the progress, such as processing rates."""
+
+    result: dict[str, Any] | None = None
+    """The result of the operation, once the job is completed."""
+
+    error: str | None = None
+    """The error that made the job fail, if any."""
+
+    cancel_requested: bool = False
+    """Whether the job was asked to stop while running."""
+
+    created_by_id: UUID | None = None
+    """The id of the user that submitted the job."""
+
+    started_on: datetime.datetime | None = None
+    """When a worker started running the job."""
+
+    heartbeat_on: datetime.datetime | None = None
+    """When the worker running the job last reported that it is alive."""
+
+    finished_on: datetime.datetime | None = None
+    """When the job completed, failed or was cancelled."""
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job completed, failed or was cancelled."""
+        return self.status in (
+            JobStatus.COMPLETED,
+            JobStatus.FAILED,
+            JobStatus.CANCELLED,
+        )
+
+
+class JobUpdate(BaseModel):
+    """Schema for updating a job."""
+
+    status: JobStatus | None = None
+    """The status of the job."""
+
+    progress: float | None = Field(default=None, ge=0, le=1)
+    """The fraction of the job that is done."""
+
+    message: str | None = None
+    """A description of what the job is currently doing."""
+
+    details: dict[str, Any] | None = None
+    """Structured details of the progress."""
+
+    result: dict[str, Any] | None = None
+    """The result of the operation."""
+
+    error: str | None = None
+    """The error that made the job fail."""
+
+    cancel_requested: bool | None = None
+    """Whether the job was asked to stop."""
+
+    started_on: datetime.datetime | None = None
+    """When a worker started running the job."""
+
+    finished_on: datetime.datetime | None = None
+    """When the job finished."""
@@ -0,0 +1,68 @@
+"""Schemas for the content of spectrogram viewports."""
+
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from soundevent.data.geometries import GeometryType
+
+__all__ = [
+    "Viewport",
+    "ViewportAnnotation",
+    "ViewportPrediction",
+]
+
+
+class ViewportAnnotation(BaseModel):
+    """Compact sound event annotation shown in a viewport."""
+
+    uuid: UUID
+    """The uuid of the sound event annotation."""
+
+    sound_event_uuid: UUID
+    """The uuid of the annotated sound event."""
+
+    geometry_type: GeometryType
+    """The type of the geometry of the sound event."""
+
+    coordinates: Any
+    """The coordinates of the geometry, as stored in the database."""
+
+    tags: list[tuple[str, str]] = Field(default_factory=list)
+    """The key and value of each tag of the annotation."""
+
+
+class ViewportPrediction(BaseModel):
+    """Compact sound event prediction shown in a viewport."""
+
+    uuid: UUID
+    """The uuid of the sound event prediction."""
+
+    sound_event_uuid: UUID
+    """The uuid of the predicted sound event."""
+
+    geometry_type: GeometryType
+    """The type of the geometry of the sound event."""
+
+    coordinates: Any
+    """The coordinates of the geometry, as stored in the database."""
+
+    score: float
+    """The confidence score of the prediction."""
+
+    tags: list[tuple[str, str, float]] = Field(default_factory=list)
+    """The key, value and score of each predicted tag."""
+
+
+class Viewport(BaseModel):
+    """Sound events visible in a time and frequency window of a recording.
+
+    Geometries are sent as their type and raw coordinates, without any
+    validation, so that dense sets of sound events can be drawn quickly.
+    """
+
+    annotations: list[ViewportAnnotation] = Field(default_factory=list)
+    """Sound event annotations that overlap the window."""
+
+    predictions: list[ViewportPrediction] = Field(default_factory=list)
+    """Sound event predictions that overlap the window."""
@@ -75,6 +75,30 @@ async def data_integrity_error_handler(
     )
 
 
+async def missing_dependency_error_handler(
+    _,
+    exc: exceptions.MissingDependencyError,
+):
+    """Handle missing optional dependency errors.
+
+    Parameters
+    ----------
+    _ : Request
+        The request that caused the exception (unused).
+    exc : exceptions.MissingDependencyError
+        The exception that was raised.
+
+    Returns
+    -------
+    JSONResponse
+        A JSON response with a 501 status code and an error message.
+    """
+    return JSONResponse(
+        status_code=501,
+        content={"message": str(exc)},
+    )
+
+
 def add_error_handlers(app: FastAPI, settings: Settings):
     """Add error handlers to the FastAPI application.
 
@@ -92,3 +116,6 @@ def add_error_handlers(app: FastAPI, settings: Settings):
     app.exception_handler(exceptions.DataIntegrityError)(
         data_integrity_error_handler
     )
+    app.exception_handler(exceptions.MissingDependencyError)(
+        missing_dependency_error_handler
+    )
@@ -1,9 +1,17 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
 from whombat.system.boot import whombat_init
+from whombat.system.database import (
+    create_async_db_engine,
+    get_async_session,
+    get_database_url,
+    get_sqlite_pragmas,
+)
 from whombat.system.settings import Settings
+from whombat.system.workers import shutdown_worker_pool, start_worker_pool
 
 __all__ = ["lifespan"]
 
@@ -12,5 +20,43 @@ __all__ = ["lifespan"]
 async def lifespan(settings: Settings, _: FastAPI):
     """Context manager to run startup and shutdown events."""
     await whombat_init(settings)
+    await _load_tag_index(settings)
+    start_worker_pool(settings)
 
-    yield
+    worker = None
+    worker_task = None
+    if settings.job_worker:
+        # NOTE: Import the job worker here to avoid circular imports
+        from whombat.api.jobs import JobWorker
+
+        worker = JobWorker(settings)
+        worker_task = asyncio.create_task(worker.run())
+
+    try:
+        yield
+    finally:
+        if worker_task is not None:
+            worker_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker_task
+
+        if worker is not None:
+            await worker.close()
+
+        shutdown_worker_pool()
+
+
+async def _load_tag_index(settings: Settings) -> None:
+    """Load the tag autocomplete index, so the first lookup is fast."""
+    # NOTE: Import the tags API here to avoid circular imports
+    from whombat.api.tags import tags
+
+    engine = create_async_db_engine(
+        get_database_url(settings),
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
+    try:
+        async with get_async_session(engine) as session:
+            await tags.load_index(session)
+    finally:
+        await engine.dispose()
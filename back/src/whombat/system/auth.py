@@ -1,20 +1,187 @@
-"""Authentication dependencies."""
+"""Authentication dependencies.
 
+Access tokens are stored in the database. To avoid querying the database
+on every authenticated request, validated tokens are remembered for a few
+seconds in an in-process `TokenCache`. Tokens are removed from the cache
+on logout, and all tokens of a user are removed when the user is updated
+or deleted, so that deactivated users lose access immediately. Other
+processes serving the same database only notice these changes once their
+cached entries expire.
+"""
+
+import datetime
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from fastapi_users import exceptions
 from fastapi_users.authentication import AuthenticationBackend, CookieTransport
 from fastapi_users.authentication.strategy.db import (
     AccessTokenDatabase,
     DatabaseStrategy,
 )
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from fastapi_users_db_sqlalchemy.access_token import (
     SQLAlchemyAccessTokenDatabase,
 )
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from whombat import models
 from whombat.system.settings import Settings
 
+__all__ = [
+    "CachedDatabaseStrategy",
+    "TokenDatabase",
+    "TokenCache",
+    "get_access_token_db",
+    "get_auth_backend",
+    "get_cookie_transport",
+    "get_database_strategy",
+    "token_cache",
+]
+
 TokenDatabase = AccessTokenDatabase[models.AccessToken]  # type: ignore
 
+TOKEN_LIFETIME = 24 * 3600
+"""Seconds an access token is valid for."""
+
+
+class TokenCache:
+    """In-process cache of validated access tokens.
+
+    The cache maps tokens to a snapshot of the columns of their user, and
+    never holds ORM instances, as these are bound to the session of the
+    request that loaded them.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Get the user columns of a cached token.
+
+        Returns None if the token is not cached or its entry expired.
+        """
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[token]
+            return None
+
+        self._entries.move_to_end(token)
+        return values
+
+    def set(self, token: str, user: models.User, ttl: float) -> None:
+        """Cache a validated token for `ttl` seconds."""
+        if ttl <= 0:
+            return
+
+        self._entries[token] = (
+            time.monotonic() + ttl,
+            {
+                attr.key: getattr(user, attr.key)
+                for attr in inspect(models.User).column_attrs
+            },
+        )
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """Remove a token from the cache."""
+        self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Remove all tokens of a user from the cache."""
+        for token, (_, values) in list(self._entries.items()):
+            if values["id"] == user_id:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        """Remove all tokens from the cache."""
+        self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
+class CachedDatabaseStrategy(DatabaseStrategy):
+    """Database strategy that remembers validated tokens for a while."""
+
+    def __init__(
+        self,
+        database: TokenDatabase,
+        lifetime_seconds: int | None = None,
+        cache: TokenCache = token_cache,
+        cache_ttl: float = 0,
+    ):
+        super().__init__(database, lifetime_seconds)  # type: ignore
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+
+    async def read_token(self, token, user_manager):
+        """Get the user of a token, using the cache when possible."""
+        if token is None:
+            return None
+
+        # NOTE: Cached users are attached to the session of the user
+        # database without loading them, which needs a SQLAlchemy database.
+        values = self.cache.get(token)
+        user_db = user_manager.user_db
+        if values is not None and isinstance(user_db, SQLAlchemyUserDatabase):
+            user = models.User(**values)
+            make_transient_to_detached(user)
+            return await user_db.session.merge(user, load=False)
+
+        max_age = None
+        if self.lifetime_seconds:
+            max_age = datetime.datetime.now(
+                datetime.timezone.utc
+            ) - datetime.timedelta(seconds=self.lifetime_seconds)
+
+        access_token = await self.database.get_by_token(token, max_age)
+        if access_token is None:
+            return None
+
+        try:
+            parsed_id = user_manager.parse_id(access_token.user_id)
+            user = await user_manager.get(parsed_id)
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        self.cache.set(token, user, self._get_ttl(access_token))
+        return user
+
+    async def destroy_token(self, token: str, user) -> None:
+        """Delete a token and remove it from the cache."""
+        self.cache.invalidate(token)
+        await super().destroy_token(token, user)
+
+    def _get_ttl(self, access_token: models.AccessToken) -> float:
+        if not self.lifetime_seconds:
+            return self.cache_ttl
+
+        # NOTE: Never remember a token past its expiration.
+        created_at = access_token.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=datetime.timezone.utc)
+
+        remaining = (
+            created_at
+            + datetime.timedelta(seconds=self.lifetime_seconds)
+            - datetime.datetime.now(datetime.timezone.utc)
+        ).total_seconds()
+        return min(self.cache_ttl, remaining)
+
 
 def get_access_token_db(session: AsyncSession):
     """Get the access token database."""
@@ -26,17 +193,28 @@ def get_access_token_db(session: AsyncSession):
 
 def get_database_strategy(
     access_token_db: TokenDatabase,
+    cache_ttl: float = 0,
 ) -> DatabaseStrategy:
-    """Get the database strategy."""
-    return DatabaseStrategy(
-        access_token_db,  # type: ignore
-        lifetime_seconds=24 * 3600,
+    """Get the database strategy.
+
+    Parameters
+    ----------
+    access_token_db
+        The access token database.
+    cache_ttl
+        Seconds a validated token is remembered in the token cache. If 0,
+        tokens are validated against the database on every request.
+    """
+    return CachedDatabaseStrategy(
+        access_token_db,
+        lifetime_seconds=TOKEN_LIFETIME,
+        cache_ttl=cache_ttl,
     )
 
 
 def get_cookie_transport(settings: Settings):
     return CookieTransport(
-        cookie_max_age=24 * 3600,
+        cookie_max_age=TOKEN_LIFETIME,
         cookie_name="whombatauth",
         cookie_secure=False,
         cookie_domain=settings.domain,
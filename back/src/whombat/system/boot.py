@@ -6,6 +6,7 @@ from whombat.system.database import (
     create_async_db_engine,
     get_async_session,
     get_database_url,
+    get_sqlite_pragmas,
     init_database,
 )
 from whombat.system.settings import Settings
@@ -49,7 +50,10 @@ def print_first_run_message(settings: Settings):
 async def is_first_run(settings: Settings) -> bool:
     """Check if this is the first time the application is run."""
     db_url = get_database_url(settings)
-    engine = create_async_db_engine(db_url)
+    engine = create_async_db_engine(
+        db_url,
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
     async with get_async_session(engine) as session:
         is_first_run = await is_first_user(session)
 
@@ -8,6 +8,7 @@ __all__ = [
     "get_app_data_dir",
     "get_whombat_settings_file",
     "get_whombat_db_file",
+    "get_whombat_jobs_dir",
 ]
 
 
@@ -60,3 +61,8 @@ def get_whombat_settings_file() -> Path:
 def get_whombat_db_file() -> Path:
     """Get the path to the Whombat database file."""
     return get_app_data_dir() / "whombat.db"
+
+
+def get_whombat_jobs_dir() -> Path:
+    """Get the path to the directory where job files are stored."""
+    return get_app_data_dir() / "jobs"
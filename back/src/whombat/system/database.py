@@ -3,8 +3,9 @@
 import logging
 from contextlib import asynccontextmanager
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Mapping
 
 from alembic import script
 from alembic.command import stamp, upgrade
@@ -33,6 +34,7 @@ __all__ = [
     "create_sync_db_engine",
     "get_database_url",
     "get_db_state",
+    "get_sqlite_pragmas",
     "init_database",
     "get_async_session",
     "models",
@@ -129,7 +131,33 @@ def get_database_url(
     return validate_database_url(url, is_async=is_async)
 
 
-def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
+def get_sqlite_pragmas(settings: Settings) -> dict[str, str | int]:
+    """Get the SQLite pragmas to apply to every new connection.
+
+    Parameters
+    ----------
+    settings : Settings
+        The settings for the application.
+
+    Returns
+    -------
+    dict[str, str | int]
+        A mapping from pragma name to value.
+    """
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout,
+        "cache_size": settings.sqlite_cache_size,
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+def create_async_db_engine(
+    database_url: str | URL,
+    sqlite_pragmas: Mapping[str, str | int] | None = None,
+) -> AsyncEngine:
     """Create the database engine.
 
     Parameters
@@ -138,6 +166,9 @@ def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
         The url to the database. Defaults to `sqlite+aiosqlite://`. See
         https://docs.sqlalchemy.org/en/14/core/engines.html#database-urls for
         more information on the format.
+    sqlite_pragmas : Mapping[str, str | int], optional
+        Pragmas to set on every new SQLite connection. Ignored for other
+        database backends. See `get_sqlite_pragmas`.
 
     Notes
     -----
@@ -153,10 +184,22 @@ def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
         database_url = make_url(database_url)
 
     database_url = validate_database_url(database_url, is_async=True)
-    return create_async_engine(database_url)
+    engine = create_async_engine(database_url)
+
+    if sqlite_pragmas:
+        event.listen(
+            engine.sync_engine,
+            "connect",
+            partial(set_sqlite_pragmas, pragmas=sqlite_pragmas),
+        )
+
+    return engine
 
 
-def create_sync_db_engine(database_url: str | URL) -> Engine:
+def create_sync_db_engine(
+    database_url: str | URL,
+    sqlite_pragmas: Mapping[str, str | int] | None = None,
+) -> Engine:
     """Create the database engine.
 
     Parameters
@@ -165,6 +208,9 @@ def create_sync_db_engine(database_url: str | URL) -> Engine:
         The url to the database. Defaults to `sqlite://`. See
         https://docs.sqlalchemy.org/en/14/core/engines.html#database-urls for
         more information on the format.
+    sqlite_pragmas : Mapping[str, str | int], optional
+        Pragmas to set on every new SQLite connection. Ignored for other
+        database backends. See `get_sqlite_pragmas`.
 
     Returns
     -------
@@ -174,7 +220,16 @@ def create_sync_db_engine(database_url: str | URL) -> Engine:
     if not isinstance(database_url, URL):
         database_url = make_url(database_url)
     database_url = validate_database_url(database_url, is_async=False)
-    return create_engine(database_url)
+    engine = create_engine(database_url)
+
+    if sqlite_pragmas:
+        event.listen(
+            engine,
+            "connect",
+            partial(set_sqlite_pragmas, pragmas=sqlite_pragmas),
+        )
+
+    return engine
 
 
 def create_alembic_config(db_url: str | URL, is_async: bool = True) -> Config:
@@ -280,11 +335,35 @@ def enable_foreign_key_support_sqlite(dbapi_connection: DBAPIConnection, _):
     cursor.close()
 
 
+def set_sqlite_pragmas(
+    dbapi_connection: DBAPIConnection,
+    _,
+    pragmas: Mapping[str, str | int],
+):
+    """Apply the SQLite tuning pragmas to a new connection."""
+    if not is_sqlite(dbapi_connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        # NOTE: Pragmas do not support bound parameters. Values come from
+        # the validated settings, never from user input.
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
 async def init_database(settings: Settings) -> None:
     """Create the database and tables on startup."""
     db_url = get_database_url(settings)
-    engine = create_async_db_engine(db_url)
+    engine = create_async_db_engine(
+        db_url,
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
 
     async with engine.begin() as conn:
         cfg = create_alembic_config(db_url, is_async=False)
         await conn.run_sync(create_or_update_db, cfg)
+
+    # NOTE: Close all connections so that a SQLite write-ahead log is
+    # checkpointed into the main database file.
+    await engine.dispose()
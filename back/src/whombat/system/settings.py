@@ -6,15 +6,16 @@ We are using pydantic to define our settings.
 import warnings
 from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Type
+from typing import Literal, Tuple, Type
 
-from pydantic import ValidationError
+from pydantic import Field, ValidationError, field_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
     SettingsConfigDict,
 )
 
+from whombat.core.files import HashStrategy, check_hash_strategy
 from whombat.system.data import get_whombat_db_file, get_whombat_settings_file
 
 __all__ = [
@@ -70,6 +71,82 @@ class Settings(BaseSettings):
     Only use this if you know what you are doing.
     """
 
+    sqlite_journal_mode: Literal[
+        "delete", "truncate", "persist", "memory", "wal", "off"
+    ] = "wal"
+    """SQLite journal mode.
+
+    Write-ahead logging (WAL) allows readers to proceed concurrently with
+    a writer, so annotators browsing the data are not blocked while others
+    save their work. WAL does not work on network file systems; use
+    ``delete`` if the database file lives on a network share.
+    """
+
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    """SQLite synchronous flag.
+
+    With WAL, ``normal`` is safe against corruption and only risks losing
+    the last transactions on power loss, while avoiding an fsync per
+    commit.
+    """
+
+    sqlite_busy_timeout: int = 5000
+    """Milliseconds a SQLite connection waits on a locked database.
+
+    Concurrent writers will wait for the lock instead of failing
+    immediately with a "database is locked" error.
+    """
+
+    sqlite_cache_size: int = -64000
+    """SQLite page cache size per connection.
+
+    Positive values are a number of pages, negative values are a size
+    in KiB. The default is 64 MiB.
+    """
+
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    """Maximum number of bytes of the SQLite database to memory map.
+
+    Set to 0 to disable memory-mapped I/O.
+    """
+
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
+    """Where SQLite stores temporary tables and indices."""
+
+    worker_processes: int | None = Field(default=None, ge=1)
+    """Number of worker processes used for CPU bound work.
+
+    Workers hash and probe audio files and evaluate predictions. If None,
+    half of the available CPUs are used, leaving the rest for request
+    handling.
+    """
+
+    worker_chunksize: int = Field(default=16, ge=1)
+    """Number of files or clips sent to a worker process in a single task."""
+
+    worker_niceness: int = Field(default=10, ge=0)
+    """Niceness increment of the worker processes.
+
+    Workers run with a lower priority than the application so that
+    request handling stays responsive during large imports. Only applies
+    on POSIX systems.
+    """
+
+    hash_strategy: HashStrategy = "md5"
+    """Algorithm used to hash audio files when registering recordings.
+
+    Hashes identify recordings and are used to avoid registering the same
+    file twice. ``md5`` is compatible with older versions of whombat,
+    ``blake2b``, ``xxh3`` and ``blake3`` hash the whole file faster, and
+    ``fingerprint`` only reads the header and a few sampled blocks of each
+    file, which is much faster on large archives. ``xxh3`` and ``blake3``
+    require installing whombat with the ``xxhash`` and ``blake3`` extras,
+    and are rejected at startup otherwise.
+
+    Each hash records the strategy it was computed with, so the strategy
+    can be changed at any time.
+    """
+
     audio_dir: Path = Path.home()
     """Directory where the all audio files are stored.
 
@@ -90,6 +167,45 @@ class Settings(BaseSettings):
     domain: str = "localhost"
     """Domain on which the backend is running."""
 
+    auth_token_cache_ttl: float = Field(default=60, ge=0)
+    """Seconds a validated access token is remembered in memory.
+
+    Requests with a remembered token are authenticated without querying
+    the database, which matters for endpoints that are called many times
+    in a row, such as audio and spectrogram streaming. Tokens are
+    forgotten on logout and when their user is updated or deleted. Set to
+    0 to validate every request against the database.
+    """
+
+    job_worker: bool = True
+    """Run a job worker within the application process.
+
+    Long running operations, such as imports, exports and evaluations, can
+    be submitted as jobs that are run by a worker. The worker within the
+    application shares the event loop with request handling; for heavy
+    workloads disable it and run ``whombat-worker`` as a separate process
+    instead.
+    """
+
+    job_poll_interval: float = Field(default=1, gt=0)
+    """Seconds a worker waits before checking again for pending jobs."""
+
+    job_lease: float = Field(default=300, gt=0)
+    """Seconds a running job is kept without a sign of life from its worker.
+
+    Workers record that they are alive while running a job. Running jobs
+    whose worker has not done so for longer than this, for instance because
+    the process was killed, are marked as failed by the next worker that
+    starts or checks for them.
+    """
+
+    jobs_dir: Path | None = None
+    """Directory where the files read and written by jobs are stored.
+
+    If None, a ``jobs`` directory within the application data directory is
+    used.
+    """
+
     log_config: Path = Path("logging.conf")
     """Path to the logging configuration file relative to the project root."""
 
@@ -114,6 +230,16 @@ class Settings(BaseSettings):
     open_on_startup: bool = True
     """Open the application in the browser on startup."""
 
+    @field_validator("hash_strategy")
+    @classmethod
+    def check_hash_strategy(cls, value: HashStrategy) -> HashStrategy:
+        """Check that the packages of the hash strategy are installed."""
+        try:
+            check_hash_strategy(value)
+        except ImportError as error:
+            raise ValueError(str(error)) from error
+        return value
+
     @classmethod
     def settings_customise_sources(
         cls,
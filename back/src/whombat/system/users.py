@@ -1,7 +1,9 @@
 """User Management."""
 
+from typing import Any
 from uuid import UUID
 
+from fastapi import Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import BaseUserManager, UUIDIDMixin, exceptions
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
@@ -9,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.system.auth import token_cache
 
 __all__ = [
     "UserDatabase",
@@ -150,6 +153,35 @@ class UserManager(
 
         return user
 
+    async def on_after_update(
+        self,
+        user: models.User,
+        update_dict: dict[str, Any],
+        request: Request | None = None,
+    ) -> None:
+        """Forget the cached tokens of an updated user.
+
+        This makes changes such as deactivation or a new password take
+        effect on the next request.
+        """
+        token_cache.invalidate_user(user.id)
+
+    async def on_after_reset_password(
+        self,
+        user: models.User,
+        request: Request | None = None,
+    ) -> None:
+        """Forget the cached tokens of a user that reset their password."""
+        token_cache.invalidate_user(user.id)
+
+    async def on_after_delete(
+        self,
+        user: models.User,
+        request: Request | None = None,
+    ) -> None:
+        """Forget the cached tokens of a deleted user."""
+        token_cache.invalidate_user(user.id)
+
 
 async def is_first_user(session: AsyncSession) -> bool:
     """Check if this is the first user.
@@ -0,0 +1,182 @@
+"""Process pool for CPU bound work.
+
+Hashing and probing audio files, and evaluating predictions clip by
+clip, is CPU and IO bound work that should not run on the event loop.
+This module holds a single process pool that is started with the
+application and reused for every call, so that worker processes are only
+spawned once.
+
+The size of the pool is configurable and bounded, and workers run with a
+lower scheduling priority, so that request handling is not starved while
+large batches of files are processed.
+"""
+
+import asyncio
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched
+from typing import TypeVar
+
+from whombat.system.settings import Settings
+
+__all__ = [
+    "WorkerPool",
+    "get_worker_pool",
+    "shutdown_worker_pool",
+    "start_worker_pool",
+]
+
+A = TypeVar("A")
+B = TypeVar("B")
+
+DEFAULT_CHUNKSIZE = 16
+
+
+def get_default_worker_count() -> int:
+    """Get the default number of worker processes.
+
+    Half of the available CPUs are used, leaving the rest for the
+    application itself.
+    """
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+class WorkerPool:
+    """A long-lived pool of worker processes.
+
+    Parameters
+    ----------
+    max_workers
+        The number of worker processes. If None, half of the available
+        CPUs are used.
+    chunksize
+        The number of items sent to a worker process in a single task.
+    niceness
+        The niceness increment applied to the worker processes. Ignored on
+        platforms without `os.nice`.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        niceness: int = 0,
+    ):
+        if max_workers is None:
+            max_workers = get_default_worker_count()
+
+        if max_workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+
+        if chunksize < 1:
+            raise ValueError("The chunksize must be at least 1.")
+
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.niceness = niceness
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(niceness,),
+        )
+
+    async def map(
+        self,
+        fn: Callable[[A], B],
+        items: Sequence[A],
+        chunksize: int | None = None,
+    ) -> list[B]:
+        """Apply a function to every item in the worker processes.
+
+        Items are sent to the workers in chunks to reduce the overhead of
+        inter-process communication. The results are returned in the same
+        order as the items.
+
+        Parameters
+        ----------
+        fn
+            The function to apply. It must be picklable, i.e. defined at
+            the top level of a module.
+        items
+            The items to process.
+        chunksize
+            The number of items per task. Defaults to the chunksize of the
+            pool.
+
+        Returns
+        -------
+        results : list
+        """
+        if not items:
+            return []
+
+        if chunksize is None:
+            chunksize = self.chunksize
+
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *[
+                loop.run_in_executor(self._executor, _map_chunk, fn, chunk)
+                for chunk in batched(items, chunksize)
+            ]
+        )
+        return [result for chunk in chunks for result in chunk]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pool, cancelling any pending tasks."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: WorkerPool | None = None
+
+
+def start_worker_pool(settings: Settings) -> WorkerPool:
+    """Start the worker pool of the application.
+
+    Any running pool is shut down and replaced with a pool configured
+    with the given settings.
+    """
+    global _pool
+
+    shutdown_worker_pool()
+    _pool = WorkerPool(
+        max_workers=settings.worker_processes,
+        chunksize=settings.worker_chunksize,
+        niceness=settings.worker_niceness,
+    )
+    return _pool
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get the worker pool of the application.
+
+    If the pool has not been started, a pool with the default
+    configuration is started.
+    """
+    global _pool
+
+    if _pool is None:
+        _pool = WorkerPool()
+
+    return _pool
+
+
+def shutdown_worker_pool() -> None:
+    """Shut down the worker pool of the application, if running."""
+    global _pool
+
+    if _pool is None:
+        return
+
+    _pool.shutdown()
+    _pool = None
+
+
+def _init_worker(niceness: int) -> None:
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def _map_chunk(fn: Callable[[A], B], chunk: Sequence[A]) -> list[B]:
+    return [fn(item) for item in chunk]
@@ -17,7 +17,7 @@ from sqlalchemy.engine import URL
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, cache, schemas
-from whombat.system import get_database_url, init_database
+from whombat.system import auth, get_database_url, init_database
 from whombat.system.settings import Settings
 
 # Avoid noisy logging during tests.
@@ -48,6 +48,7 @@ def clear_api_cache() -> None:
     api.users._cache.clear()
     api.notes._cache.clear()
     api.tags._cache.clear()
+    api.tags.clear_index()
     api.features._cache.clear()
     api.recordings._cache.clear()
     api.datasets._cache.clear()
@@ -65,6 +66,7 @@ def clear_api_cache() -> None:
     api.clip_evaluations._cache.clear()
     api.sound_event_evaluations._cache.clear()
     api.evaluation_sets._cache.clear()
+    auth.token_cache.clear()
 
 
 @pytest.fixture
@@ -104,6 +106,7 @@ def database_path(tmp_path: Path, database_template: Path) -> Path:
 def settings(
     audio_dir: Path,
     database_path: Path,
+    tmp_path: Path,
 ) -> Settings:
     """Fixture to return the settings."""
     return Settings(
@@ -113,6 +116,8 @@ def settings(
         open_on_startup=False,
         log_to_file=False,
         log_to_stdout=True,
+        job_worker=False,
+        jobs_dir=tmp_path / "jobs",
     )
 
 
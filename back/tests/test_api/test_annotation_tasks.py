@@ -15,3 +15,18 @@ async def test_cant_delete_annotation_task_clip(
 
     with pytest.raises(IntegrityError):
         await api.clips.delete(session, clip)
+
+
+async def test_to_soundevent_many_matches_to_soundevent(
+    session: AsyncSession,
+    annotation_task: schemas.AnnotationTask,
+):
+    (converted,) = await api.annotation_tasks.to_soundevent_many(
+        session,
+        [annotation_task],
+    )
+
+    assert converted == await api.annotation_tasks.to_soundevent(
+        session,
+        annotation_task,
+    )
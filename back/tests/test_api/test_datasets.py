@@ -5,6 +5,7 @@ from collections.abc import Callable
 from pathlib import Path
 
 import pytest
+from soundevent.io.aoef import AOEFObject, DatasetObject
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -351,6 +352,44 @@ async def test_get_dataset_files_with_missing_files(
     assert retrieved_files[0].state == schemas.FileState.MISSING
 
 
+async def test_get_dataset_files_updates_scan_index(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    audio_dir: Path,
+):
+    """Test that scanning a dataset stores and refreshes its scan index."""
+    dataset_audio_dir = audio_dir / dataset.audio_dir
+    (dataset_audio_dir / "audio_file_1.wav").touch()
+
+    await api.datasets.get_state(session, dataset, audio_dir=audio_dir)
+
+    query = select(models.DatasetScanEntry.path).where(
+        models.DatasetScanEntry.dataset_id == dataset.id,
+        models.DatasetScanEntry.is_dir.is_(False),
+    )
+    result = await session.execute(query)
+    assert set(result.scalars().all()) == {Path("audio_file_1.wav")}
+
+    (dataset_audio_dir / "audio_file_1.wav").unlink()
+    (dataset_audio_dir / "subdir").mkdir()
+    (dataset_audio_dir / "subdir" / "audio_file_2.wav").touch()
+
+    retrieved_files = await api.datasets.get_state(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+    )
+    assert {(f.path, f.state) for f in retrieved_files} == {
+        (Path("subdir") / "audio_file_2.wav", schemas.FileState.UNREGISTERED),
+    }
+
+    result = await session.execute(query)
+    assert set(result.scalars().all()) == {Path("subdir") / "audio_file_2.wav"}
+
+    # The scan index does not prevent the dataset from being deleted.
+    await api.datasets.delete(session, dataset)
+
+
 async def test_add_recording_to_dataset(
     session: AsyncSession,
     dataset: schemas.Dataset,
@@ -763,6 +802,60 @@ async def test_create_dataset_registers_all_recordings(
     assert len(all_recordings) == 2
 
 
+async def test_register_files_resumes_an_interrupted_registration(
+    session: AsyncSession,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    dataset_audio_dir = audio_dir / "audio"
+    dataset_audio_dir.mkdir()
+    for index in range(3):
+        random_wav_factory(path=dataset_audio_dir / f"audio_file_{index}.wav")
+
+    dataset = await api.datasets.create(
+        session,
+        name="test_dataset",
+        dataset_dir=dataset_audio_dir,
+        audio_dir=audio_dir,
+        register=False,
+    )
+    assert dataset.recording_count == 0
+
+    # Simulate a registration that was interrupted after the first file.
+    recording = await api.recordings.create(
+        session,
+        path=dataset_audio_dir / "audio_file_0.wav",
+        audio_dir=audio_dir,
+    )
+    await api.datasets.add_recording(session, dataset, recording)
+    await session.commit()
+    dataset = await api.datasets.get(session, dataset.uuid)
+
+    registrations: list[schemas.DatasetRegistration] = []
+
+    async def callback(registration: schemas.DatasetRegistration):
+        registrations.append(registration)
+
+    dataset = await api.datasets.register_files(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+        batch_size=1,
+        callback=callback,
+    )
+
+    assert dataset.recording_count == 3
+    assert [registration.status for registration in registrations] == [
+        schemas.RegistrationStatus.RUNNING,
+        schemas.RegistrationStatus.COMPLETED,
+    ]
+    registration = registrations[-1]
+    assert registration.total_files == 2
+    assert registration.processed_files == 2
+    assert registration.processed_bytes == registration.total_bytes > 0
+    assert registration.eta == 0
+
+
 async def test_exported_datasets_paths_are_not_absolute(
     session: AsyncSession,
     example_data_dir: Path,
@@ -789,6 +882,44 @@ async def test_exported_datasets_paths_are_not_absolute(
         assert (audio_dir / recording.path).is_file()
 
 
+async def test_streamed_dataset_matches_exported_dataset(
+    session: AsyncSession,
+    example_data_dir: Path,
+):
+    whombat_dataset = await api.datasets.import_dataset(
+        session,
+        example_data_dir / "example_dataset.json",
+        dataset_audio_dir=example_data_dir / "audio",
+        audio_dir=example_data_dir,
+    )
+    exported = await api.datasets.export_dataset(
+        session,
+        whombat_dataset,
+        audio_dir=example_data_dir,
+    )
+
+    chunks = [
+        chunk
+        async for chunk in api.datasets.stream_aoef(
+            session,
+            whombat_dataset,
+            audio_dir=example_data_dir,
+            batch_size=3,
+        )
+    ]
+    streamed = AOEFObject.model_validate_json("".join(chunks))
+
+    assert streamed.data.uuid == exported.data.uuid
+    assert isinstance(streamed.data, DatasetObject)
+    assert streamed.data.name == whombat_dataset.name
+    assert sorted(
+        recording.path for recording in streamed.data.recordings
+    ) == sorted(recording.path for recording in exported.data.recordings)
+    assert {(tag.key, tag.value) for tag in streamed.data.tags or []} == {
+        (tag.key, tag.value) for tag in exported.data.tags or []
+    }
+
+
 async def test_recording_is_deleted_if_it_does_not_belong_to_a_dataset(
     session: AsyncSession,
     dataset: schemas.Dataset,
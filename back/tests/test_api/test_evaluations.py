@@ -0,0 +1,471 @@
+"""Test suite for the evaluations API."""
+
+from uuid import uuid4
+
+import pytest
+from soundevent import data, terms
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, exceptions, models, schemas
+from whombat.api.evaluations import evaluate_predictions
+from whombat.system.workers import WorkerPool
+
+
+async def _add_clip_evaluation(
+    session: AsyncSession,
+    evaluation: schemas.Evaluation,
+    clip: schemas.Clip,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    sound_event: schemas.SoundEvent,
+) -> None:
+    clip_prediction = await api.clip_predictions.create(session, clip=clip)
+    prediction = await api.sound_event_predictions.create(
+        session,
+        clip_prediction=clip_prediction,
+        sound_event=sound_event,
+        score=0.5,
+    )
+    clip_evaluation = await api.clip_evaluations.create(
+        session,
+        evaluation=evaluation,
+        clip_prediction=clip_prediction,
+        clip_annotation=clip_annotation,
+        score=0.7,
+    )
+    await api.sound_event_evaluations.create(
+        session,
+        clip_evaluation=clip_evaluation,
+        source=prediction,
+        target=sound_event_annotation,
+        affinity=1,
+        score=0.7,
+    )
+
+
+async def test_evaluation_export_uses_constant_number_of_queries(
+    session: AsyncSession,
+    evaluation: schemas.Evaluation,
+    clip: schemas.Clip,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    sound_event: schemas.SoundEvent,
+):
+    statements = []
+
+    def count(*_):
+        statements.append(None)
+
+    engine = session.get_bind()
+    counts = []
+    for _ in range(2):
+        for _ in range(3):
+            await _add_clip_evaluation(
+                session,
+                evaluation,
+                clip,
+                clip_annotation,
+                sound_event_annotation,
+                sound_event,
+            )
+        await session.commit()
+        session.expunge_all()
+
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            exported = await api.evaluations.to_soundevent(session, evaluation)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert all(len(ce.matches) == 1 for ce in exported.clip_evaluations)
+        counts.append(len(statements))
+
+    assert len(exported.clip_evaluations) == 6
+    assert counts[0] == counts[1]
+
+
+async def _add_detection_clips(
+    session: AsyncSession,
+    random_wav_factory,
+    audio_dir,
+    user: schemas.SimpleUser,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+) -> tuple[
+    schemas.ModelRun,
+    schemas.EvaluationSet,
+    list[schemas.SoundEventAnnotation],
+]:
+    """Add five annotated and predicted clips with one event each."""
+    annotations = []
+    tags = [
+        await api.tags.create(session, key="species", value=value)
+        for value in ("a", "b")
+    ]
+    for tag in tags:
+        evaluation_set = await api.evaluation_sets.add_tag(
+            session, evaluation_set, tag
+        )
+
+    for index in range(5):
+        recording = await api.recordings.create(
+            session,
+            path=random_wav_factory(),
+            audio_dir=audio_dir,
+        )
+        clip = await api.clips.create(
+            session,
+            recording=recording,
+            start_time=0,
+            end_time=1,
+        )
+        clip_annotation = await api.clip_annotations.create(session, clip=clip)
+        evaluation_set = await api.evaluation_sets.add_clip_annotation(
+            session, evaluation_set, clip_annotation
+        )
+        clip_prediction = await api.clip_predictions.create(session, clip=clip)
+        model_run = await api.model_runs.add_clip_prediction(
+            session, model_run, clip_prediction
+        )
+
+        annotated = await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.BoundingBox(coordinates=[0.1, 100, 0.3, 200]),
+        )
+        annotation = await api.sound_event_annotations.create(
+            session,
+            clip_annotation=clip_annotation,
+            sound_event=annotated,
+            created_by=user,
+        )
+        await api.sound_event_annotations.add_tag(
+            session, annotation, tags[index % 2]
+        )
+
+        predicted = await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.BoundingBox(
+                coordinates=[0.1 + index * 0.1, 100, 0.3 + index * 0.1, 200]
+            ),
+        )
+        prediction = await api.sound_event_predictions.create(
+            session,
+            clip_prediction=clip_prediction,
+            sound_event=predicted,
+            score=0.9,
+        )
+        await api.sound_event_predictions.add_tag(
+            session, prediction, tags[0], score=0.2 + index * 0.15
+        )
+        annotations.append(annotation)
+
+    await session.commit()
+    return model_run, evaluation_set, annotations
+
+
+async def _evaluate_with_soundevent(
+    session: AsyncSession,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+) -> data.Evaluation:
+    model_run_se = await api.model_runs.to_soundevent(session, model_run)
+    evaluation_set_se = await api.evaluation_sets.to_soundevent(
+        session, evaluation_set
+    )
+    return evaluate_predictions(
+        model_run_se.clip_predictions,
+        evaluation_set_se.clip_annotations,
+        evaluation_set_se.evaluation_tags,
+        evaluation_set.task,
+    )
+
+
+@pytest.mark.parametrize("chunksize", [1, 16])
+async def test_evaluate_model_run_in_batches_matches_soundevent(
+    chunksize: int,
+    session: AsyncSession,
+    random_wav_factory,
+    audio_dir,
+    user: schemas.SimpleUser,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+):
+    model_run, evaluation_set, _ = await _add_detection_clips(
+        session,
+        random_wav_factory,
+        audio_dir,
+        user,
+        model_run,
+        evaluation_set,
+    )
+    expected = await _evaluate_with_soundevent(
+        session, model_run, evaluation_set
+    )
+
+    pool = WorkerPool(max_workers=2, chunksize=chunksize)
+    try:
+        evaluation = await api.evaluations.evaluate_model_run(
+            session,
+            model_run,
+            evaluation_set,
+            audio_dir=audio_dir,
+            user=user,
+            batch_size=2,
+            pool=pool,
+        )
+    finally:
+        pool.shutdown()
+
+    assert evaluation.task == expected.evaluation_task
+    assert evaluation.score == pytest.approx(expected.score)
+    assert len(evaluation.metrics) == len(expected.metrics) > 0
+    assert {metric.name: metric.value for metric in evaluation.metrics} == {
+        data.key_from_term(metric.term): pytest.approx(metric.value)
+        for metric in expected.metrics
+    }
+
+    clip_evaluations, count = await api.evaluations.get_clip_evaluations(
+        session, evaluation, limit=-1
+    )
+    assert count == 5
+    matches = [
+        match
+        for ce in clip_evaluations
+        for match in ce.sound_event_evaluations
+    ]
+    assert len(matches) == sum(
+        len(ce.matches) for ce in expected.clip_evaluations
+    )
+    assert all(
+        match.source is not None or match.target is not None
+        for match in matches
+    )
+
+
+class _CountingPool:
+    """Evaluate clips inline and count how many were evaluated."""
+
+    def __init__(self):
+        self.count = 0
+
+    async def map(self, fn, items, chunksize=None):
+        self.count += len(items)
+        return [fn(item) for item in items]
+
+
+async def test_reevaluating_model_run_only_evaluates_changed_clips(
+    session: AsyncSession,
+    random_wav_factory,
+    audio_dir,
+    user: schemas.SimpleUser,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+):
+    model_run, evaluation_set, annotations = await _add_detection_clips(
+        session,
+        random_wav_factory,
+        audio_dir,
+        user,
+        model_run,
+        evaluation_set,
+    )
+    pool = _CountingPool()
+    first = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+        user=user,
+        batch_size=2,
+        pool=pool,  # type: ignore
+    )
+    await session.commit()
+    assert pool.count == 5
+
+    # Nothing changed, so no clip is evaluated again.
+    pool = _CountingPool()
+    unchanged = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+        user=user,
+        batch_size=2,
+        pool=pool,  # type: ignore
+    )
+    await session.commit()
+    assert pool.count == 0
+    assert unchanged.uuid == first.uuid
+    assert unchanged.score == pytest.approx(first.score)
+
+    # Correct the class of one annotation.
+    tag_a = await api.tags.get_or_create(session, key="species", value="a")
+    tag_b = await api.tags.get_or_create(session, key="species", value="b")
+    annotation = await api.sound_event_annotations.get(
+        session, annotations[0].uuid
+    )
+    annotation = await api.sound_event_annotations.remove_tag(
+        session, annotation, tag_a
+    )
+    await api.sound_event_annotations.add_tag(session, annotation, tag_b)
+    await session.commit()
+
+    pool = _CountingPool()
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+        user=user,
+        batch_size=2,
+        pool=pool,  # type: ignore
+    )
+    await session.commit()
+    assert pool.count == 1
+    assert evaluation.uuid == first.uuid
+
+    expected = await _evaluate_with_soundevent(
+        session, model_run, evaluation_set
+    )
+    assert evaluation.score == pytest.approx(expected.score)
+    assert {metric.name: metric.value for metric in evaluation.metrics} == {
+        data.key_from_term(metric.term): pytest.approx(metric.value)
+        for metric in expected.metrics
+    }
+    _, count = await api.evaluations.get_clip_evaluations(
+        session, evaluation, limit=-1
+    )
+    assert count == 5
+
+
+async def test_evaluation_dashboard_is_cached_until_reevaluated(
+    session: AsyncSession,
+    random_wav_factory,
+    audio_dir,
+    user: schemas.SimpleUser,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+):
+    model_run, evaluation_set, annotations = await _add_detection_clips(
+        session,
+        random_wav_factory,
+        audio_dir,
+        user,
+        model_run,
+        evaluation_set,
+    )
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+        user=user,
+        pool=_CountingPool(),  # type: ignore
+    )
+    await session.commit()
+
+    dashboard = await api.evaluations.get_dashboard(session, evaluation)
+    assert dashboard.clip_count == 5
+    assert [cls.tag.value for cls in dashboard.classes] == ["a", "b"]
+    assert [cls.support for cls in dashboard.classes] == [3, 2]
+    assert dashboard.confusion_matrix is not None
+    assert sum(map(sum, dashboard.confusion_matrix)) == (
+        dashboard.example_count
+    )
+    metrics = {metric.name: metric.value for metric in evaluation.metrics}
+    assert dashboard.mean_average_precision == pytest.approx(
+        metrics[data.key_from_term(terms.mean_average_precision)]
+    )
+    assert await api.evaluations.get_dashboard(session, evaluation) is (
+        dashboard
+    )
+
+    tag_a = await api.tags.get_or_create(session, key="species", value="a")
+    tag_b = await api.tags.get_or_create(session, key="species", value="b")
+    annotation = await api.sound_event_annotations.get(
+        session, annotations[0].uuid
+    )
+    annotation = await api.sound_event_annotations.remove_tag(
+        session, annotation, tag_a
+    )
+    await api.sound_event_annotations.add_tag(session, annotation, tag_b)
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+        user=user,
+        pool=_CountingPool(),  # type: ignore
+    )
+    await session.commit()
+
+    updated = await api.evaluations.get_dashboard(session, evaluation)
+    assert updated is not dashboard
+    assert [cls.support for cls in updated.classes] == [2, 3]
+
+
+async def test_dashboard_of_imported_evaluation_fails(
+    session: AsyncSession,
+    random_wav_factory,
+    audio_dir,
+    user: schemas.SimpleUser,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+):
+    model_run, evaluation_set, _ = await _add_detection_clips(
+        session,
+        random_wav_factory,
+        audio_dir,
+        user,
+        model_run,
+        evaluation_set,
+    )
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+        user=user,
+        pool=_CountingPool(),  # type: ignore
+    )
+    exported = await api.evaluations.to_soundevent(
+        session,
+        evaluation,
+        audio_dir=audio_dir,
+    )
+
+    # Imported clip evaluations have no stored examples.
+    imported = exported.model_copy(
+        update={
+            "uuid": uuid4(),
+            "clip_evaluations": [
+                clip_evaluation.model_copy(
+                    update={
+                        "uuid": uuid4(),
+                        "matches": [
+                            match.model_copy(update={"uuid": uuid4()})
+                            for match in clip_evaluation.matches
+                        ],
+                    }
+                )
+                for clip_evaluation in exported.clip_evaluations
+            ],
+        }
+    )
+    evaluation = await api.evaluations.from_soundevent(session, imported)
+    await session.execute(
+        update(models.ModelRunEvaluation)
+        .where(models.ModelRunEvaluation.model_run_id == model_run.id)
+        .values(evaluation_id=evaluation.id)
+    )
+    _, count = await api.evaluations.get_clip_evaluations(
+        session, evaluation, limit=-1
+    )
+    assert count == 5
+
+    with pytest.raises(exceptions.DataIntegrityError, match="again"):
+        await api.evaluations.get_dashboard(session, evaluation)
@@ -0,0 +1,180 @@
+"""Test suite for the feature matrix API."""
+
+import io
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.api.feature_matrices import encode_feature_matrix
+from whombat.filters.sound_event_annotations import TagFilter
+
+
+async def _add_annotations(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+    count: int,
+) -> list[schemas.SoundEventAnnotation]:
+    tag = await api.tags.create(session, key="species", value="a")
+    annotations = []
+    for index in range(count):
+        sound_event = await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.TimeStamp(coordinates=0.1 * index),
+        )
+        await api.sound_events.add_feature(
+            session,
+            sound_event,
+            schemas.Feature(name="snr", value=index),
+        )
+        if index % 2 == 0:
+            await api.sound_events.add_feature(
+                session,
+                sound_event,
+                schemas.Feature(name="peak", value=10 * index),
+            )
+        annotation = await api.sound_event_annotations.create(
+            session,
+            created_by=user,
+            sound_event=sound_event,
+            clip_annotation=clip_annotation,
+        )
+        if index < 3:
+            annotation = await api.sound_event_annotations.add_tag(
+                session, annotation, tag
+            )
+        annotations.append(annotation)
+    return annotations
+
+
+@pytest.mark.parametrize("batch_size", [2, 100])
+async def test_feature_matrix_has_a_row_per_annotation(
+    batch_size: int,
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    annotations = await _add_annotations(
+        session, user, recording, clip_annotation, count=5
+    )
+
+    matrix = await api.get_feature_matrix(
+        session,
+        features=["snr", "peak", "missing"],
+        batch_size=batch_size,
+    )
+
+    assert matrix.uuids == [annotation.uuid for annotation in annotations]
+    assert matrix.feature_names == ["snr", "peak", "missing"]
+    assert matrix.values.dtype == np.float32
+    np.testing.assert_array_equal(
+        matrix.values,
+        [
+            [0, 0, np.nan],
+            [1, np.nan, np.nan],
+            [2, 20, np.nan],
+            [3, np.nan, np.nan],
+            [4, 40, np.nan],
+        ],
+    )
+
+
+async def test_feature_matrix_includes_repeated_features_once(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    await _add_annotations(session, user, recording, clip_annotation, count=3)
+
+    matrix = await api.get_feature_matrix(
+        session,
+        features=["peak", "snr", "peak"],
+    )
+
+    assert matrix.feature_names == ["peak", "snr"]
+    np.testing.assert_array_equal(
+        matrix.values,
+        [[0, 0], [np.nan, 1], [20, 2]],
+    )
+
+
+async def test_feature_matrix_of_filtered_annotations_has_all_features(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    annotations = await _add_annotations(
+        session, user, recording, clip_annotation, count=5
+    )
+
+    matrix = await api.get_feature_matrix(
+        session,
+        filters=[TagFilter(key="species", value="a")],
+    )
+
+    assert matrix.uuids == [annotation.uuid for annotation in annotations[:3]]
+    assert matrix.feature_names == sorted(matrix.feature_names)
+    columns = [matrix.feature_names.index(name) for name in ("peak", "snr")]
+    np.testing.assert_array_equal(
+        matrix.values[:, columns],
+        [[0, 0], [np.nan, 1], [20, 2]],
+    )
+
+
+async def test_feature_matrix_of_predictions(
+    session: AsyncSession,
+    sound_event: schemas.SoundEvent,
+    sound_event_prediction: schemas.SoundEventPrediction,
+):
+    await api.sound_events.add_feature(
+        session,
+        sound_event,
+        schemas.Feature(name="snr", value=3),
+    )
+
+    matrix = await api.get_feature_matrix(
+        session,
+        models.SoundEventPrediction,
+        features=["snr"],
+    )
+
+    assert matrix.uuids == [sound_event_prediction.uuid]
+    assert matrix.values.tolist() == [[3]]
+
+
+async def test_encoded_feature_matrix_can_be_read_back(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    annotations = await _add_annotations(
+        session, user, recording, clip_annotation, count=3
+    )
+    matrix = await api.get_feature_matrix(session, features=["snr", "peak"])
+    uuids = [str(annotation.uuid) for annotation in annotations]
+
+    with np.load(io.BytesIO(encode_feature_matrix(matrix, "npz"))) as npz:
+        np.testing.assert_array_equal(npz["values"], matrix.values)
+        assert npz["uuids"].tolist() == uuids
+        assert npz["feature_names"].tolist() == ["snr", "peak"]
+
+    table = pa.ipc.open_stream(
+        encode_feature_matrix(matrix, "arrow")
+    ).read_all()
+    assert table.column_names == ["uuid", "snr", "peak"]
+    assert table.schema.field("snr").type == pa.float32()
+    assert table.column("uuid").to_pylist() == uuids
+    np.testing.assert_array_equal(
+        table.column("peak").to_numpy(),
+        matrix.values[:, 1],
+    )
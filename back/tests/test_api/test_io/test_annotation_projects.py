@@ -1,9 +1,15 @@
+import json
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 
 import pytest
+from pydantic import BaseModel
 from soundevent import data, io, terms
-from soundevent.io.aoef import to_aeof
+from soundevent.io.aoef import (
+    AnnotationProjectObject,
+    AOEFObject,
+    to_aeof,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, filters, schemas
@@ -149,6 +155,53 @@ async def test_can_import_sound_event_annotation_with_tags(
     assert imported.name == annotation_project.name
 
 
+async def test_imported_sound_events_get_geometric_features(
+    audio_dir: Path,
+    sample_dataset_recording: data.Recording,
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+):
+    sound_event = data.SoundEvent(
+        recording=sample_dataset_recording,
+        geometry=data.BoundingBox(coordinates=[0.1, 100, 0.5, 400]),
+        features=[data.Feature(term=data.term_from_key("snr"), value=3)],
+    )
+    clip_annotation = data.ClipAnnotation(
+        clip=data.Clip(
+            recording=sample_dataset_recording,
+            start_time=0,
+            end_time=1,
+        ),
+        sound_events=[data.SoundEventAnnotation(sound_event=sound_event)],
+    )
+    annotation_project = data.AnnotationProject(
+        name="Test project",
+        description="Test description",
+        tasks=[data.AnnotationTask(clip=clip_annotation.clip)],
+        clip_annotations=[clip_annotation],
+    )
+
+    aoef_file = "test_annotation_project.aoef"
+    io.save(annotation_project, audio_dir / aoef_file, audio_dir=audio_dir)
+
+    await import_annotation_project(
+        session,
+        audio_dir / aoef_file,
+        audio_dir=audio_dir,
+        base_audio_dir=audio_dir,
+        imported_by=user,
+    )
+
+    imported = await api.sound_events.get(session, sound_event.uuid)
+    assert {f.name: f.value for f in imported.features} == {
+        "snr": 3,
+        terms.duration.name: pytest.approx(0.4),
+        terms.low_freq.name: 100,
+        terms.high_freq.name: 400,
+        terms.bandwidth.name: 300,
+    }
+
+
 async def test_exports_annotation_tags(
     annotation_project: schemas.AnnotationProject,
     tag_factory: Callable[..., Awaitable[schemas.Tag]],
@@ -270,3 +323,79 @@ async def test_can_import_example_annotation_project(
         ],
     )
     assert count == 3
+
+
+async def test_streamed_annotation_project_matches_full_export(
+    session: AsyncSession,
+    example_dataset_path: Path,
+    example_audio_dir: Path,
+    example_annotation_project_path: Path,
+    user: schemas.SimpleUser,
+):
+    await import_dataset(
+        session,
+        example_dataset_path,
+        dataset_dir=example_audio_dir,
+        audio_dir=example_audio_dir,
+    )
+    db_project = await import_annotation_project(
+        session,
+        example_annotation_project_path,
+        audio_dir=example_audio_dir,
+        base_audio_dir=example_audio_dir,
+        imported_by=user,
+    )
+    project = await api.annotation_projects.get(session, db_project.uuid)
+
+    chunks = [
+        chunk
+        async for chunk in api.annotation_projects.stream_aoef(
+            session,
+            project,
+            audio_dir=example_audio_dir,
+            batch_size=2,
+        )
+    ]
+    streamed = AOEFObject.model_validate_json("".join(chunks)).data
+
+    converted = await api.annotation_projects.to_soundevent(
+        session,
+        project,
+        audio_dir=example_audio_dir,
+    )
+    expected = to_aeof(converted, audio_dir=example_audio_dir).data
+
+    assert isinstance(streamed, AnnotationProjectObject)
+    assert isinstance(expected, AnnotationProjectObject)
+    streamed_tags = {
+        tag.id: (tag.key, tag.value) for tag in streamed.tags or []
+    }
+    expected_tags = {
+        tag.id: (tag.key, tag.value) for tag in expected.tags or []
+    }
+    assert set(streamed_tags.values()) == set(expected_tags.values())
+    assert len(streamed.project_tags or []) == 11
+
+    for field in [
+        "recordings",
+        "clips",
+        "sound_events",
+        "sound_event_annotations",
+        "clip_annotations",
+        "tasks",
+    ]:
+        assert sorted(
+            _normalize(obj, streamed_tags)
+            for obj in getattr(streamed, field) or []
+        ) == sorted(
+            _normalize(obj, expected_tags)
+            for obj in getattr(expected, field) or []
+        ), field
+
+
+def _normalize(obj: BaseModel, tags: dict[int, tuple[str, str]]) -> str:
+    # Tag ids depend on the order in which tags are first exported.
+    content = obj.model_dump(mode="json")
+    if content.get("tags"):
+        content["tags"] = sorted(tags[tag] for tag in content["tags"])
+    return json.dumps(content, sort_keys=True)
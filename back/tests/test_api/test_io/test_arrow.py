@@ -0,0 +1,100 @@
+"""Test suite for the columnar exports."""
+
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from soundevent.geometry import compute_bounds
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+from whombat.api.io import arrow
+from whombat.api.io.aoef.annotation_projects import import_annotation_project
+from whombat.api.io.aoef.datasets import import_dataset
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+async def _read(chunks) -> "pa.Table":
+    content = b"".join([chunk async for chunk in chunks])
+    return pq.read_table(pa.BufferReader(content))
+
+
+async def test_can_export_annotation_project_sound_events(
+    session: AsyncSession,
+    example_dataset_path: Path,
+    example_annotation_project_path: Path,
+    example_audio_dir: Path,
+    user: schemas.SimpleUser,
+):
+    await import_dataset(
+        session,
+        example_dataset_path,
+        dataset_dir=example_audio_dir,
+        audio_dir=example_audio_dir,
+    )
+    db_project = await import_annotation_project(
+        session,
+        example_annotation_project_path,
+        audio_dir=example_audio_dir,
+        base_audio_dir=example_audio_dir,
+        imported_by=user,
+    )
+    project = await api.annotation_projects.get(session, db_project.uuid)
+
+    table = await _read(
+        api.annotation_projects.stream_table(session, project, batch_size=7)
+    )
+
+    soundevent_project = await api.annotation_projects.to_soundevent(
+        session, project
+    )
+    expected = {
+        sound_event.uuid: sound_event
+        for clip_annotation in soundevent_project.clip_annotations
+        for sound_event in clip_annotation.sound_events
+    }
+    assert table.schema == arrow.sound_event_annotation_schema()
+    assert table.num_rows == len(expected)
+
+    for row in table.to_pylist():
+        annotation = expected[UUID(row["uuid"])]
+        start, low, end, high = compute_bounds(annotation.sound_event.geometry)
+        assert row["start_time"] == pytest.approx(start)
+        assert row["end_time"] == pytest.approx(end)
+        assert row["low_freq"] == pytest.approx(low)
+        assert row["high_freq"] == pytest.approx(high)
+        assert {tag["value"] for tag in row["tags"]} == {
+            tag.value for tag in annotation.tags
+        }
+
+
+async def test_can_export_dataset_recordings_as_arrow_stream(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    dataset_recording: schemas.Recording,
+    tag: schemas.Tag,
+):
+    await api.recordings.add_tag(session, dataset_recording, tag)
+
+    chunks = api.datasets.stream_table(session, dataset, format="arrow")
+    content = b"".join([chunk async for chunk in chunks])
+    table = pa.ipc.open_stream(content).read_all()
+
+    (row,) = table.to_pylist()
+    assert row["uuid"] == str(dataset_recording.uuid)
+    assert Path(row["path"]) == dataset_recording.path.relative_to(
+        dataset.audio_dir
+    )
+    assert row["tags"] == [{"key": tag.key, "value": tag.value}]
+
+
+async def test_export_of_empty_model_run_has_schema(
+    session: AsyncSession,
+    model_run: schemas.ModelRun,
+):
+    table = await _read(api.model_runs.stream_table(session, model_run))
+
+    assert table.num_rows == 0
+    assert table.schema == arrow.sound_event_prediction_schema()
@@ -97,3 +97,31 @@ async def test_can_import_dataset_with_missing_hashes(
     )
 
     assert imported.name == dataset.name
+
+
+async def test_can_import_dataset_in_batches(
+    session: AsyncSession,
+    random_wav_factory,
+    audio_dir: Path,
+):
+    dataset = data.Dataset(
+        name="Test dataset",
+        description="Test description",
+        recordings=[
+            data.Recording.from_file(random_wav_factory()) for _ in range(5)
+        ],
+    )
+
+    aoef_file = "test_dataset.aoef"
+    io.save(dataset, audio_dir / aoef_file, audio_dir=audio_dir)
+
+    imported = await import_dataset(
+        session,
+        audio_dir / aoef_file,
+        dataset_dir=audio_dir,
+        audio_dir=audio_dir,
+        batch_size=2,
+    )
+
+    await session.refresh(imported, ["recordings"])
+    assert len(imported.recordings) == 5
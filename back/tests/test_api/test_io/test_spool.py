@@ -0,0 +1,92 @@
+import io
+import json
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from soundevent.io.aoef.recording import RecordingObject
+
+from whombat.api.io.aoef import spool
+
+
+def test_spool_keeps_scalars_and_inline_lists_in_memory():
+    content = {
+        "version": "1.1.0",
+        "data": {
+            "uuid": str(uuid4()),
+            "name": "Test dataset",
+            "tags": [{"id": 0, "key": "species", "value": "Myotis"}],
+            "recordings": [],
+        },
+    }
+
+    with spool.spool_aoef(io.StringIO(json.dumps(content))) as spooled:
+        assert spooled.header == {"version": "1.1.0"}
+        assert spooled.data["name"] == "Test dataset"
+        assert spooled.data["tags"] == content["data"]["tags"]
+        assert "recordings" not in spooled.data
+        assert spooled.count("recordings") == 0
+        assert spooled.sections == {"recordings"}
+
+
+def test_spool_reads_lists_in_batches_across_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(spool, "CHUNK_SIZE", 7)
+    recordings = [
+        {
+            "uuid": str(uuid4()),
+            "path": f"recording_{index}.wav",
+            "duration": 1.5,
+            "channels": 1,
+            "samplerate": 44100,
+            "hash": "é" * index,
+        }
+        for index in range(25)
+    ]
+    content = json.dumps({"data": {"recordings": recordings}}, indent=2)
+
+    with spool.spool_aoef(io.BytesIO(content.encode())) as spooled:
+        batches = list(
+            spooled.iter_batches("recordings", RecordingObject, batch_size=10)
+        )
+        selected = spooled.get_by_uuid(
+            "recordings",
+            RecordingObject,
+            [recordings[3]["uuid"], recordings[20]["uuid"]],
+        )
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [str(r.uuid) for batch in batches for r in batch] == [
+        r["uuid"] for r in recordings
+    ]
+    assert batches[2][4].hash == "é" * 24
+    assert [r.path for r in selected] == [
+        Path("recording_3.wav"),
+        Path("recording_20.wav"),
+    ]
+
+
+def test_spool_removes_its_files_once_closed(tmp_path: Path):
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps({"data": {"recordings": [{"uuid": "a"}]}}))
+
+    spooled = spool.spool_aoef(path)
+    directory = spooled._directory
+    assert directory.exists()
+
+    spooled.close()
+    assert not directory.exists()
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [
+        ("[]", TypeError),
+        ('{"version": "1.1.0"}', ValueError),
+        ('{"data": {"recordings": [{"uuid": }]}}', ValueError),
+    ],
+)
+def test_spool_fails_with_invalid_files(content: str, error: type):
+    with pytest.raises(error):
+        spool.spool_aoef(io.StringIO(content))
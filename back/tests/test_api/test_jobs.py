@@ -0,0 +1,545 @@
+"""Test suite for the jobs API module."""
+
+import asyncio
+import datetime
+import json
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, exceptions, models, schemas
+from whombat.api.jobs import JobAPI, JobCancelled, JobContext, JobWorker
+from whombat.system.settings import Settings
+from whombat.system.workers import get_worker_pool
+
+
+async def test_submitted_job_is_pending(session: AsyncSession):
+    job = await api.jobs.submit(
+        session,
+        "export_dataset",
+        parameters={"dataset_uuid": "1"},
+    )
+    assert job.status == schemas.JobStatus.PENDING
+    assert job.parameters == {"dataset_uuid": "1"}
+    assert job.progress == 0
+    assert not job.is_finished
+
+
+async def test_cannot_submit_job_of_unknown_kind(session: AsyncSession):
+    with pytest.raises(ValueError):
+        await api.jobs.submit(session, "not_a_job")
+
+
+async def test_claim_returns_oldest_pending_job(session: AsyncSession):
+    first = await api.jobs.submit(session, "export_dataset")
+    second = await api.jobs.submit(session, "export_dataset")
+    await session.commit()
+
+    claimed = await api.jobs.claim(session)
+    assert claimed is not None
+    assert claimed.uuid == first.uuid
+    assert claimed.status == schemas.JobStatus.RUNNING
+    assert claimed.started_on is not None
+
+    claimed = await api.jobs.claim(session)
+    assert claimed is not None
+    assert claimed.uuid == second.uuid
+
+    assert await api.jobs.claim(session) is None
+
+
+async def test_run_records_the_result_of_the_handler(
+    session: AsyncSession,
+    tmp_path: Path,
+):
+    jobs = JobAPI()
+
+    @jobs.register("add")
+    async def add(context: JobContext):
+        await context.report(0.5, "Adding")
+        return {"sum": sum(context.parameters["numbers"])}
+
+    await jobs.submit(session, "add", parameters={"numbers": [1, 2, 3]})
+    await session.commit()
+
+    job = await jobs.claim(session)
+    assert job is not None
+    finished = await jobs.run(session, job, jobs_dir=tmp_path)
+
+    assert finished.status == schemas.JobStatus.COMPLETED
+    assert finished.result == {"sum": 6}
+    assert finished.progress == 1
+    assert finished.finished_on is not None
+
+
+async def test_failed_job_records_the_error_and_rolls_back(
+    session: AsyncSession,
+    tmp_path: Path,
+):
+    jobs = JobAPI()
+
+    @jobs.register("fail")
+    async def fail(context: JobContext):
+        await api.tags.create(context.session, key="species", value="a")
+        raise RuntimeError("Something went wrong")
+
+    await jobs.submit(session, "fail")
+    await session.commit()
+
+    job = await jobs.claim(session)
+    assert job is not None
+    finished = await jobs.run(session, job, jobs_dir=tmp_path)
+
+    assert finished.status == schemas.JobStatus.FAILED
+    assert finished.error == "Something went wrong"
+    assert await session.scalar(select(func.count(models.Tag.id))) == 0
+
+
+async def test_cancel_pending_job(session: AsyncSession):
+    job = await api.jobs.submit(session, "export_dataset")
+    cancelled = await api.jobs.cancel(session, job)
+    assert cancelled.status == schemas.JobStatus.CANCELLED
+    assert cancelled.is_finished
+
+
+async def test_running_job_stops_when_it_reports_after_cancel(
+    session: AsyncSession,
+    tmp_path: Path,
+):
+    jobs = JobAPI()
+
+    @jobs.register("slow")
+    async def slow(context: JobContext):
+        await api.tags.create(context.session, key="species", value="a")
+        await context.report(0.5)
+        return {}
+
+    await jobs.submit(session, "slow")
+    await session.commit()
+
+    job = await jobs.claim(session)
+    assert job is not None
+    job = await jobs.cancel(session, job)
+    assert job.status == schemas.JobStatus.RUNNING
+    assert job.cancel_requested
+    await session.commit()
+
+    finished = await jobs.run(session, job, jobs_dir=tmp_path)
+    assert finished.status == schemas.JobStatus.CANCELLED
+    assert await session.scalar(select(func.count(models.Tag.id))) == 0
+
+
+async def test_fail_orphaned_fails_jobs_without_recent_heartbeat(
+    session: AsyncSession,
+):
+    orphaned = await api.jobs.submit(session, "export_dataset")
+    alive = await api.jobs.submit(session, "export_dataset")
+    await session.commit()
+    assert await api.jobs.claim(session) is not None
+    assert await api.jobs.claim(session) is not None
+
+    await session.execute(
+        update(models.Job)
+        .where(models.Job.uuid == orphaned.uuid)
+        .values(
+            heartbeat_on=datetime.datetime.now(datetime.timezone.utc)
+            - datetime.timedelta(minutes=10)
+        )
+    )
+    await session.commit()
+
+    assert await api.jobs.fail_orphaned(session, lease=60) == 1
+
+    orphaned = await api.jobs.get(session, orphaned.uuid)
+    assert orphaned.status == schemas.JobStatus.FAILED
+    assert orphaned.finished_on is not None
+    alive = await api.jobs.get(session, alive.uuid)
+    assert alive.status == schemas.JobStatus.RUNNING
+
+
+async def test_worker_records_heartbeat_of_running_job(
+    session: AsyncSession,
+    settings: Settings,
+):
+    jobs = JobAPI()
+    settings = settings.model_copy(update={"job_lease": 0.3})
+
+    @jobs.register("slow")
+    async def slow(context: JobContext):
+        await asyncio.sleep(0.5)
+        return {}
+
+    job = await jobs.submit(session, "slow")
+    await session.commit()
+
+    worker = JobWorker(settings)
+    try:
+        with patch("whombat.api.jobs.worker.jobs", jobs):
+            finished = await worker.run_next()
+    finally:
+        await worker.close()
+
+    assert finished is not None
+    assert finished.uuid == job.uuid
+    assert finished.status == schemas.JobStatus.COMPLETED
+    assert finished.heartbeat_on is not None
+    assert finished.started_on is not None
+    assert finished.heartbeat_on > finished.started_on
+
+
+async def test_get_latest_job_with_parameters(session: AsyncSession):
+    first = await api.jobs.submit(
+        session,
+        "register_dataset_files",
+        parameters={"dataset_uuid": "a"},
+    )
+    await api.jobs.submit(
+        session,
+        "register_dataset_files",
+        parameters={"dataset_uuid": "b"},
+    )
+    await session.commit()
+
+    latest = await api.jobs.get_latest(
+        session,
+        "register_dataset_files",
+        parameters={"dataset_uuid": "a"},
+    )
+    assert latest is not None
+    assert latest.uuid == first.uuid
+
+    await api.jobs.cancel(session, first)
+    await session.commit()
+
+    assert (
+        await api.jobs.get_latest(
+            session,
+            "register_dataset_files",
+            parameters={"dataset_uuid": "a"},
+            active=True,
+        )
+        is None
+    )
+    assert await api.jobs.get_latest(session, "export_dataset") is None
+
+
+async def test_create_dataset_job_registers_files(
+    session: AsyncSession,
+    settings: Settings,
+    dataset_dir: Path,
+    random_wav_factory,
+):
+    for _ in range(3):
+        random_wav_factory(path=dataset_dir / f"{_}.wav")
+
+    job = await api.jobs.submit(
+        session,
+        "create_dataset",
+        parameters={"name": "test", "audio_dir": str(dataset_dir)},
+    )
+    await session.commit()
+
+    worker = JobWorker(settings)
+    try:
+        finished = await worker.run_next()
+    finally:
+        await worker.close()
+
+    assert finished is not None
+    assert finished.uuid == job.uuid
+    assert finished.status == schemas.JobStatus.COMPLETED
+    assert finished.message == "Registered 3 of 3 files"
+    assert finished.result is not None
+
+    dataset = await api.datasets.get(
+        session,
+        finished.result["dataset_uuid"],
+    )
+    assert dataset.recording_count == 3
+
+
+async def test_export_dataset_job_writes_result_file(
+    session: AsyncSession,
+    settings: Settings,
+    dataset: schemas.Dataset,
+    dataset_dir: Path,
+    random_wav_factory,
+):
+    await api.datasets.add_file(
+        session,
+        dataset,
+        random_wav_factory(path=dataset_dir / "test.wav"),
+        audio_dir=settings.audio_dir,
+    )
+    await api.jobs.submit(
+        session,
+        "export_dataset",
+        parameters={"dataset_uuid": str(dataset.uuid)},
+    )
+    await session.commit()
+
+    job = await api.jobs.claim(session)
+    assert job is not None
+    finished = await api.jobs.run(
+        session,
+        job,
+        audio_dir=settings.audio_dir,
+        jobs_dir=settings.jobs_dir,
+    )
+    assert finished.status == schemas.JobStatus.COMPLETED
+
+    path = api.jobs.get_result_file(finished, jobs_dir=settings.jobs_dir)
+    exported = json.loads(path.read_text())
+    assert exported["data"]["name"] == dataset.name
+    assert len(exported["data"]["recordings"]) == 1
+
+
+async def test_job_without_result_file_cannot_be_downloaded(
+    session: AsyncSession,
+):
+    job = await api.jobs.submit(session, "export_dataset")
+    with pytest.raises(exceptions.NotFoundError):
+        api.jobs.get_result_file(job)
+
+
+async def test_cancelled_evaluation_job_deletes_partial_evaluation(
+    session: AsyncSession,
+    settings: Settings,
+    user: schemas.SimpleUser,
+    clip: schemas.Clip,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+):
+    clip_annotation = await api.clip_annotations.create(session, clip=clip)
+    await api.evaluation_sets.add_clip_annotation(
+        session, evaluation_set, clip_annotation
+    )
+    clip_prediction = await api.clip_predictions.create(session, clip=clip)
+    await api.model_runs.add_clip_prediction(
+        session, model_run, clip_prediction
+    )
+    await api.jobs.submit(
+        session,
+        "evaluate_model_run",
+        parameters={
+            "model_run_uuid": str(model_run.uuid),
+            "evaluation_set_uuid": str(evaluation_set.uuid),
+        },
+        user=user,
+    )
+    await session.commit()
+
+    job = await api.jobs.claim(session)
+    assert job is not None
+    job = await api.jobs.cancel(session, job)
+    await session.commit()
+
+    finished = await api.jobs.run(
+        session,
+        job,
+        audio_dir=settings.audio_dir,
+        jobs_dir=settings.jobs_dir,
+    )
+    assert finished.status == schemas.JobStatus.CANCELLED
+    assert await session.scalar(select(func.count(models.Evaluation.id))) == 0
+
+
+async def test_stopped_reevaluation_job_keeps_previous_evaluation(
+    session: AsyncSession,
+    settings: Settings,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    other_clip = await api.clips.create(
+        session,
+        recording=recording,
+        start_time=0.2,
+        end_time=0.3,
+    )
+    for obj in (clip, other_clip):
+        clip_annotation = await api.clip_annotations.create(session, clip=obj)
+        await api.evaluation_sets.add_clip_annotation(
+            session, evaluation_set, clip_annotation
+        )
+        clip_prediction = await api.clip_predictions.create(session, clip=obj)
+        await api.model_runs.add_clip_prediction(
+            session, model_run, clip_prediction
+        )
+
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=settings.audio_dir,
+        user=user,
+    )
+    clip_evaluation_ids = set(
+        await session.scalars(select(models.ClipEvaluation.id))
+    )
+
+    # Mark the first clip as changed so that it is evaluated again.
+    await session.execute(
+        update(models.ClipEvaluation)
+        .where(models.ClipEvaluation.id == min(clip_evaluation_ids))
+        .values(fingerprint=None)
+    )
+    await api.jobs.submit(
+        session,
+        "evaluate_model_run",
+        parameters={
+            "model_run_uuid": str(model_run.uuid),
+            "evaluation_set_uuid": str(evaluation_set.uuid),
+        },
+        user=user,
+    )
+    await session.commit()
+
+    # Stop the job after the first of two batches.
+    monkeypatch.setattr(
+        api.evaluations,
+        "evaluate_model_run",
+        partial(api.evaluations.evaluate_model_run, batch_size=1),
+    )
+    report = JobContext.report
+    calls = []
+
+    async def report_once(self, progress, message=None, details=None):
+        calls.append(progress)
+        if len(calls) > 1:
+            raise JobCancelled
+        await report(self, progress, message, details)
+
+    monkeypatch.setattr(JobContext, "report", report_once)
+
+    job = await api.jobs.claim(session)
+    assert job is not None
+    finished = await api.jobs.run(
+        session,
+        job,
+        audio_dir=settings.audio_dir,
+        jobs_dir=settings.jobs_dir,
+    )
+    assert finished.status == schemas.JobStatus.CANCELLED
+
+    stored = await api.evaluations.get(session, evaluation.uuid)
+    assert stored.score == evaluation.score
+    assert await session.scalar(select(func.count(models.Evaluation.id))) == 1
+    assert (
+        set(await session.scalars(select(models.ClipEvaluation.id)))
+        == clip_evaluation_ids
+    )
+
+
+async def test_running_reevaluation_can_be_cancelled_from_another_session(
+    session: AsyncSession,
+    settings: Settings,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    other_clip = await api.clips.create(
+        session,
+        recording=recording,
+        start_time=0.2,
+        end_time=0.3,
+    )
+    for obj in (clip, other_clip):
+        clip_annotation = await api.clip_annotations.create(session, clip=obj)
+        await api.evaluation_sets.add_clip_annotation(
+            session, evaluation_set, clip_annotation
+        )
+        clip_prediction = await api.clip_predictions.create(session, clip=obj)
+        await api.model_runs.add_clip_prediction(
+            session, model_run, clip_prediction
+        )
+
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=settings.audio_dir,
+        user=user,
+    )
+    clip_evaluation_ids = set(
+        await session.scalars(select(models.ClipEvaluation.id))
+    )
+
+    # Mark all clips as changed so that they are evaluated again.
+    await session.execute(
+        update(models.ClipEvaluation).values(fingerprint=None)
+    )
+    job = await api.jobs.submit(
+        session,
+        "evaluate_model_run",
+        parameters={
+            "model_run_uuid": str(model_run.uuid),
+            "evaluation_set_uuid": str(evaluation_set.uuid),
+        },
+        user=user,
+    )
+    await session.commit()
+
+    # Pause the job while it evaluates the second of two batches.
+    paused = asyncio.Event()
+    resume = asyncio.Event()
+    pool = get_worker_pool()
+    batches = []
+
+    class PausingPool:
+        async def map(self, func, items):
+            batches.append(items)
+            if len(batches) == 2:
+                paused.set()
+                await resume.wait()
+            return await pool.map(func, items)
+
+    monkeypatch.setattr(
+        api.evaluations,
+        "evaluate_model_run",
+        partial(
+            api.evaluations.evaluate_model_run,
+            batch_size=1,
+            pool=PausingPool(),
+        ),
+    )
+
+    worker = JobWorker(settings)
+    try:
+        running = asyncio.create_task(worker.run_next())
+        await asyncio.wait_for(paused.wait(), timeout=30)
+
+        # The first batch is committed, so the progress is visible and the
+        # database is not locked by the job.
+        running_job = await api.jobs.get(session, job.uuid)
+        assert running_job.status == schemas.JobStatus.RUNNING
+        assert running_job.progress == 0.5
+        await api.jobs.cancel(session, running_job)
+        await session.commit()
+
+        resume.set()
+        finished = await running
+    finally:
+        resume.set()
+        await worker.close()
+
+    assert finished is not None
+    assert finished.status == schemas.JobStatus.CANCELLED
+
+    stored = await api.evaluations.get(session, evaluation.uuid)
+    assert stored.score == evaluation.score
+    assert await session.scalar(select(func.count(models.Evaluation.id))) == 1
+    assert (
+        set(await session.scalars(select(models.ClipEvaluation.id)))
+        == clip_evaluation_ids
+    )
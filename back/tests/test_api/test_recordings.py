@@ -1025,6 +1025,57 @@ async def test_create_recording_avoids_hash_duplicates(
     assert len(all_recs) == 2
 
 
+async def test_create_recordings_skips_paths_hashed_with_another_strategy(
+    session: AsyncSession,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    path = random_wav_factory()
+    recording = await api.recordings.create(
+        session,
+        path=path,
+        audio_dir=audio_dir,
+        hash_strategy="blake2b",
+    )
+    assert recording.hash.startswith("blake2b:")
+
+    created = await api.recordings.create_many(
+        session,
+        [dict(path=path)],
+        audio_dir=audio_dir,
+        hash_strategy="md5",
+    )
+
+    assert created == []
+    all_recs, _ = await api.recordings.get_many(session, limit=-1)
+    assert len(all_recs) == 1
+
+
+async def test_update_recording_path_checks_hash_with_its_strategy(
+    session: AsyncSession,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    path = random_wav_factory()
+    recording = await api.recordings.create(
+        session,
+        path=path,
+        audio_dir=audio_dir,
+        hash_strategy="fingerprint",
+    )
+    new_path = audio_dir / "moved.wav"
+    shutil.move(path, new_path)
+
+    recording = await api.recordings.update(
+        session,
+        recording,
+        data=schemas.RecordingUpdate(path=new_path),
+        audio_dir=audio_dir,
+    )
+
+    assert recording.path == new_path.relative_to(audio_dir)
+
+
 async def test_create_recordings_with_time_expansion(
     session: AsyncSession,
     random_wav_factory: Callable[..., Path],
@@ -2,11 +2,14 @@
 
 from uuid import uuid4
 
+import numpy as np
 import pytest
+from soundevent import data
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, models, schemas
+from whombat.api.scatterplots.sound_event_annotations import get_scatterplot
 
 
 async def test_created_annotation_is_stored_in_the_database(
@@ -83,3 +86,51 @@ async def test_can_get_annotations(
     """Test that all annotations can be retrieved."""
     annotations, _ = await api.sound_event_annotations.get_many(session)
     assert sound_event_annotation in annotations
+
+
+async def test_scatterplot_places_annotations_by_their_features(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    tag = await api.tags.create(session, key="species", value="a")
+    for index in range(4):
+        sound_event = await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.BoundingBox(
+                coordinates=[0.1, 100 * (index + 1), 0.2 + 0.1 * index, 1000]
+            ),
+        )
+        annotation = await api.sound_event_annotations.create(
+            session,
+            created_by=user,
+            sound_event=sound_event,
+            clip_annotation=clip_annotation,
+        )
+        if index % 2 == 0:
+            await api.sound_event_annotations.add_tag(session, annotation, tag)
+
+    plot = await get_scatterplot(
+        session,
+        features=["ac:mediaDuration", "ac:freqLow"],
+        group_by="species",
+    )
+    assert plot.total == 4
+    assert plot.axes == ["ac:mediaDuration", "ac:freqLow"]
+    coordinates = plot.coordinates.to_numpy()
+    assert coordinates.dtype == np.float32
+    np.testing.assert_allclose(
+        coordinates,
+        [[0.1, 100], [0.2, 200], [0.3, 300], [0.4, 400]],
+        rtol=1e-5,
+    )
+    assert plot.groups == [schemas.TagCreate(key="species", value="a")]
+    assert plot.group_index.to_numpy().tolist() == [0, -1, 0, -1]
+
+    projected = await get_scatterplot(session, projection="pca", max_points=2)
+    assert projected.total == 4
+    assert projected.axes == ["PC1", "PC2"]
+    assert len(projected.uuids) == 2
+    assert projected.weights.to_numpy().sum() == 4
@@ -8,7 +8,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, models, schemas
-from whombat.filters.sound_events import RecordingFilter
+from whombat.filters.sound_events import (
+    FrequencyRangeFilter,
+    HighFreqFilter,
+    RecordingFilter,
+    TimeRangeFilter,
+)
 
 
 async def test_create_a_timestamp_sound_event(
@@ -207,3 +212,75 @@ async def test_create_sound_events_with_different_geometries(
     assert len(sound_events) == 2
     assert sound_events[0].geometry_type == "Point"
     assert sound_events[1].geometry_type == "TimeStamp"
+
+
+async def test_sound_event_bounds_follow_its_geometry(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    sound_event = await api.sound_events.create(
+        session,
+        recording,
+        geometry=geometries.BoundingBox(coordinates=[0.1, 1000, 0.4, 3000]),
+    )
+
+    await api.sound_events.update(
+        session,
+        sound_event,
+        schemas.SoundEventUpdate(
+            geometry=geometries.TimeInterval(coordinates=[0.2, 0.3]),
+        ),
+    )
+
+    db_sound_event = await session.get(models.SoundEvent, sound_event.id)
+    assert db_sound_event is not None
+    await session.refresh(db_sound_event)
+    assert db_sound_event.geometry_type == "TimeInterval"
+    assert (
+        db_sound_event.start_time,
+        db_sound_event.end_time,
+        db_sound_event.low_freq,
+        db_sound_event.high_freq,
+    ) == (0.2, 0.3, None, None)
+
+
+async def test_filter_sound_events_by_time_and_frequency_range(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    low = await api.sound_events.create(
+        session,
+        recording,
+        geometry=geometries.BoundingBox(coordinates=[0.1, 1000, 0.4, 3000]),
+    )
+    high = await api.sound_events.create(
+        session,
+        recording,
+        geometry=geometries.Point(coordinates=[0.5, 25000]),
+    )
+    interval = await api.sound_events.create(
+        session,
+        recording,
+        geometry=geometries.TimeInterval(coordinates=[0.3, 0.6]),
+    )
+
+    async def get_uuids(*filters) -> set[UUID]:
+        sound_events, _ = await api.sound_events.get_many(
+            session,
+            filters=[RecordingFilter(eq=recording.uuid), *filters],
+        )
+        return {sound_event.uuid for sound_event in sound_events}
+
+    assert await get_uuids(TimeRangeFilter(start=0.45, end=1)) == {
+        high.uuid,
+        interval.uuid,
+    }
+    assert await get_uuids(HighFreqFilter(gt=20000)) == {high.uuid}
+    assert await get_uuids(FrequencyRangeFilter(low=20000)) == {
+        high.uuid,
+        interval.uuid,
+    }
+    assert await get_uuids(
+        TimeRangeFilter(end=0.35),
+        FrequencyRangeFilter(high=2000),
+    ) == {low.uuid, interval.uuid}
@@ -1,12 +1,15 @@
 """Test suite for the tags Python API."""
 
 import datetime
+from unittest.mock import patch
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, models, schemas
+from whombat.system.app.lifespan import _load_tag_index
+from whombat.system.settings import Settings
 
 
 async def test_create_tag(
@@ -414,3 +417,114 @@ async def test_get_or_create_tags_with_existing_and_nonexisting_tags(
     assert len(created_tags) == 1
     assert created_tags[0].key == "test_key2"
     assert created_tags[0].value == "test_value2"
+
+
+async def test_create_many_without_duplicates_can_return_existing_tags(
+    session: AsyncSession,
+):
+    """Test that existing and created tags are returned together."""
+    # Arrange
+    existing = await api.tags.create(
+        session,
+        key="test_key1",
+        value="test_value1",
+    )
+    tags_to_create = [
+        dict(key="test_key1", value="test_value1"),
+        dict(key="test_key2", value="test_value2"),
+        dict(key="test_key2", value="test_value2"),
+    ]
+
+    # Act
+    tags = await api.tags.create_many_without_duplicates(
+        session=session,
+        data=tags_to_create,
+        return_all=True,
+    )
+
+    # Assert
+    assert sorted((tag.key, tag.value) for tag in tags) == [
+        ("test_key1", "test_value1"),
+        ("test_key2", "test_value2"),
+    ]
+    assert existing in tags
+    result = await session.execute(select(models.Tag))
+    assert len(result.all()) == 2
+
+
+async def test_autocomplete_follows_tag_changes(session: AsyncSession):
+    """Test that the autocomplete index is updated by the tags API."""
+    tag = await api.tags.create(session, key="species", value="Myotis")
+    await api.tags.create_many(
+        session,
+        [{"key": "species", "value": "Myotis nattereri"}],
+    )
+
+    suggestions = await api.tags.autocomplete(session, "myo")
+    assert [s.tag.value for s in suggestions] == [
+        "Myotis",
+        "Myotis nattereri",
+    ]
+
+    tag = await api.tags.update(
+        session,
+        tag,
+        schemas.TagUpdate(value="Nyctalus"),
+    )
+    suggestions = await api.tags.autocomplete(session, "nyc")
+    assert [(s.tag.id, s.tag.value) for s in suggestions] == [
+        (tag.id, "Nyctalus")
+    ]
+
+    await api.tags.delete(session, tag)
+    assert await api.tags.autocomplete(session, "nyc") == []
+
+
+async def test_autocomplete_reloads_tags_changed_elsewhere(
+    session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that tags changed outside of the API are picked up."""
+    await api.tags.create(session, key="species", value="Myotis")
+    assert len(await api.tags.autocomplete(session, "myo")) == 1
+
+    await session.execute(
+        insert(models.Tag).values(
+            key="species",
+            value="Myotis daubentonii",
+            created_on=datetime.datetime.now(),
+        )
+    )
+
+    # The index is only checked against the database every few seconds.
+    suggestions = await api.tags.autocomplete(session, "myo")
+    assert [s.tag.value for s in suggestions] == ["Myotis"]
+
+    monkeypatch.setattr(api.tags, "index_check_interval", 0)
+    suggestions = await api.tags.autocomplete(session, "myo")
+    assert [s.tag.value for s in suggestions] == [
+        "Myotis",
+        "Myotis daubentonii",
+    ]
+
+    await session.execute(
+        delete(models.Tag).where(models.Tag.value == "Myotis daubentonii")
+    )
+    suggestions = await api.tags.autocomplete(session, "myo")
+    assert [s.tag.value for s in suggestions] == ["Myotis"]
+
+
+async def test_tag_index_is_loaded_at_startup(
+    session: AsyncSession,
+    settings: Settings,
+):
+    await api.tags.create(session, key="species", value="Myotis")
+    await session.commit()
+    api.tags.clear_index()
+
+    await _load_tag_index(settings)
+
+    with patch.object(api.tags, "load_index") as load_index:
+        suggestions = await api.tags.autocomplete(session, "myo")
+    load_index.assert_not_called()
+    assert [s.tag.value for s in suggestions] == ["Myotis"]
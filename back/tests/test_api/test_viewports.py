@@ -0,0 +1,139 @@
+"""Test suite for the viewport API."""
+
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+
+
+async def test_viewport_includes_overlapping_annotations_and_predictions(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+    clip_prediction: schemas.ClipPrediction,
+    tag: schemas.Tag,
+):
+    inside = await api.sound_events.create(
+        session,
+        recording,
+        geometry=data.BoundingBox(coordinates=[0.1, 1000, 0.4, 3000]),
+    )
+    outside = await api.sound_events.create(
+        session,
+        recording,
+        geometry=data.BoundingBox(coordinates=[0.5, 1000, 0.6, 3000]),
+    )
+    interval = await api.sound_events.create(
+        session,
+        recording,
+        geometry=data.TimeInterval(coordinates=[0.3, 0.7]),
+    )
+    annotation = await api.sound_event_annotations.create(
+        session,
+        clip_annotation=clip_annotation,
+        sound_event=inside,
+    )
+    await api.sound_event_annotations.add_tag(session, annotation, tag)
+    await api.sound_event_annotations.create(
+        session,
+        clip_annotation=clip_annotation,
+        sound_event=outside,
+    )
+    prediction = await api.sound_event_predictions.create(
+        session,
+        sound_event=interval,
+        clip_prediction=clip_prediction,
+        score=0.8,
+    )
+    await api.sound_event_predictions.add_tag(session, prediction, tag, 0.6)
+
+    viewport = await api.get_viewport(
+        session,
+        recording,
+        start_time=0,
+        end_time=0.45,
+        low_freq=2000,
+        high_freq=4000,
+    )
+
+    assert viewport.annotations == [
+        schemas.ViewportAnnotation(
+            uuid=annotation.uuid,
+            sound_event_uuid=inside.uuid,
+            geometry_type="BoundingBox",
+            coordinates=[0.1, 1000, 0.4, 3000],
+            tags=[(tag.key, tag.value)],
+        )
+    ]
+    assert viewport.predictions == [
+        schemas.ViewportPrediction(
+            uuid=prediction.uuid,
+            sound_event_uuid=interval.uuid,
+            geometry_type="TimeInterval",
+            coordinates=[0.3, 0.7],
+            score=0.8,
+            tags=[(tag.key, tag.value, 0.6)],
+        )
+    ]
+
+
+async def test_viewport_predictions_can_be_limited_to_a_model_run(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+    model_run: schemas.ModelRun,
+):
+    clip_predictions = []
+    predictions = []
+    for score in [0.2, 0.9]:
+        clip_prediction = await api.clip_predictions.create(
+            session,
+            clip=clip,
+        )
+        clip_predictions.append(clip_prediction)
+        sound_event = await api.sound_events.create(
+            session,
+            recording,
+            geometry=data.TimeStamp(coordinates=0.15),
+        )
+        predictions.append(
+            await api.sound_event_predictions.create(
+                session,
+                sound_event=sound_event,
+                clip_prediction=clip_prediction,
+                score=score,
+            )
+        )
+
+    await api.model_runs.add_clip_prediction(
+        session,
+        model_run,
+        clip_predictions[0],
+    )
+
+    viewport = await api.get_viewport(
+        session,
+        recording,
+        start_time=0.1,
+        end_time=0.2,
+        include_annotations=False,
+    )
+    assert len(viewport.predictions) == 2
+
+    viewport = await api.get_viewport(
+        session,
+        recording,
+        start_time=0.1,
+        end_time=0.2,
+        model_run=model_run,
+    )
+    assert [p.uuid for p in viewport.predictions] == [predictions[0].uuid]
+
+    viewport = await api.get_viewport(
+        session,
+        recording,
+        start_time=0.1,
+        end_time=0.2,
+        min_score=0.5,
+    )
+    assert [p.uuid for p in viewport.predictions] == [predictions[1].uuid]
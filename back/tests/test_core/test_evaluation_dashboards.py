@@ -0,0 +1,80 @@
+"""Test suite for the evaluation dashboard computations."""
+
+import numpy as np
+import pytest
+from sklearn import metrics
+
+from whombat.core.evaluation_dashboards import (
+    average_precision,
+    compute_class_curves,
+    confusion_matrix,
+    downsample_curve,
+    encode_true_classes,
+    precision_recall_curve,
+)
+
+
+def test_precision_recall_curve_matches_sklearn():
+    rng = np.random.default_rng(0)
+    y_true = rng.random(200) < 0.3
+    # NOTE: Rounded so that some scores are tied.
+    y_score = rng.random(200).round(2)
+
+    precision, recall, thresholds = precision_recall_curve(y_true, y_score)
+    expected_precision, expected_recall, expected_thresholds = (
+        metrics.precision_recall_curve(y_true, y_score)
+    )
+
+    # NOTE: sklearn sorts points by increasing threshold and appends a
+    # final point of precision 1 and recall 0.
+    np.testing.assert_allclose(precision, expected_precision[-2::-1])
+    np.testing.assert_allclose(recall, expected_recall[-2::-1])
+    np.testing.assert_allclose(thresholds, expected_thresholds[::-1])
+    assert average_precision(precision, recall) == pytest.approx(
+        metrics.average_precision_score(y_true, y_score)
+    )
+
+
+def test_class_without_examples_has_no_average_precision():
+    y_true, has_class = encode_true_classes([0, None, 0], num_classes=2)
+    assert has_class.tolist() == [True, False, True]
+
+    curves = compute_class_curves(
+        y_true,
+        np.array([[0.9, 0.1], [0.2, 0.7], [0.6, 0.3]]),
+    )
+    assert curves[0].support == 2
+    assert curves[0].average_precision == pytest.approx(1)
+    assert curves[1].support == 0
+    assert curves[1].average_precision is None
+
+
+def test_downsample_curve_keeps_first_and_last_points():
+    y_true = np.arange(1000) % 3 == 0
+    y_score = np.linspace(1, 0, 1000)
+    (curve,) = compute_class_curves(y_true[:, None], y_score[:, None])
+
+    downsampled = downsample_curve(curve, 10)
+    assert downsampled.thresholds.size == 10
+    assert downsampled.thresholds[0] == curve.thresholds[0]
+    assert downsampled.recall[-1] == curve.recall[-1]
+    assert downsampled.average_precision == curve.average_precision
+
+
+def test_confusion_matrix_counts_no_class():
+    counts = confusion_matrix(
+        [0, 1, None, 1],
+        np.array(
+            [
+                [0.8, 0.1],
+                [0.7, 0.2],
+                [0.1, 0.1],
+                [0.0, 0.0],
+            ]
+        ),
+    )
+    assert counts.tolist() == [
+        [1, 0, 0],
+        [1, 0, 1],
+        [0, 0, 1],
+    ]
@@ -1,5 +1,7 @@
 """Test suite of Whombat core function to manage files."""
 
+import os
+import sys
 from collections.abc import Callable
 from pathlib import Path
 
@@ -72,3 +74,93 @@ def test_get_audio_files_in_folder(
         Path("wav2.WAV"),
         Path("foo") / "wav3.wav",
     }
+
+
+def test_scan_folder_reuses_index_for_unchanged_directories(
+    tmp_path: Path,
+    random_wav_factory: Callable[..., Path],
+):
+    """Test that a rescan only lists the directories that changed."""
+    test_audio_dir = tmp_path / "test_audio_dir"
+    random_wav_factory(path=test_audio_dir / "a" / "wav1.wav")
+    random_wav_factory(path=test_audio_dir / "b" / "wav2.wav")
+
+    index = {
+        entry.path: entry
+        for batch in files.scan_folder(test_audio_dir)
+        for entry in batch
+    }
+    assert {path for path, entry in index.items() if not entry.is_dir} == {
+        Path("a") / "wav1.wav",
+        Path("b") / "wav2.wav",
+    }
+
+    # Remove a file behind the back of the index without touching the
+    # directory mtime, so only a rescan of "a" would notice.
+    stat = (test_audio_dir / "a").stat()
+    (test_audio_dir / "a" / "wav1.wav").unlink()
+    os.utime(test_audio_dir / "a", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    # Add a file to "b", which changes the directory mtime.
+    random_wav_factory(path=test_audio_dir / "b" / "wav3.wav")
+
+    rescanned = {
+        entry.path
+        for batch in files.scan_folder(test_audio_dir, index=index)
+        for entry in batch
+        if not entry.is_dir
+    }
+    assert rescanned == {
+        Path("a") / "wav1.wav",
+        Path("b") / "wav2.wav",
+        Path("b") / "wav3.wav",
+    }
+
+
+def test_compute_hash_prefixes_the_strategy(tmp_path: Path):
+    path = tmp_path / "file.wav"
+    path.write_bytes(b"audio")
+
+    md5 = files.compute_hash(path, "md5")
+    blake2b = files.compute_hash(path, "blake2b")
+
+    assert ":" not in md5
+    assert blake2b.startswith("blake2b:")
+    assert files.get_hash_strategy(md5) == "md5"
+    assert files.get_hash_strategy(blake2b) == "blake2b"
+
+
+def test_fingerprint_only_reads_sampled_blocks(tmp_path: Path):
+    block = files.FINGERPRINT_BLOCK_SIZE
+    content = bytearray(os.urandom(block * files.FINGERPRINT_BLOCKS * 4))
+    path = tmp_path / "file.wav"
+    path.write_bytes(content)
+    original = files.compute_hash(path, "fingerprint")
+
+    # A change between sampled blocks goes unnoticed...
+    content[block + 10] ^= 0xFF
+    path.write_bytes(content)
+    assert files.compute_hash(path, "fingerprint") == original
+
+    # ...but a change in the header does not.
+    content[10] ^= 0xFF
+    path.write_bytes(content)
+    assert files.compute_hash(path, "fingerprint") != original
+
+
+def test_get_hash_strategy_fails_with_unknown_prefix():
+    with pytest.raises(ValueError):
+        files.get_hash_strategy("sha1:abc")
+
+
+@pytest.mark.parametrize(
+    "strategy, module", [("xxh3", "xxhash"), ("blake3", "blake3")]
+)
+def test_check_hash_strategy_fails_without_package(
+    strategy: files.HashStrategy,
+    module: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setitem(sys.modules, module, None)
+    with pytest.raises(ImportError, match=f"whombat\\[{module}\\]"):
+        files.check_hash_strategy(strategy)
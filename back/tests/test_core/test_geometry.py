@@ -0,0 +1,66 @@
+"""Test suite for the storage helpers of geometries."""
+
+import pytest
+from soundevent import data
+from soundevent.geometry import compute_geometric_features
+
+from whombat.core.geometry import (
+    compute_many_geometric_features,
+    decode_geometry,
+    encode_geometry,
+    unpack_geometry,
+)
+
+GEOMETRIES = [
+    data.TimeStamp(coordinates=0.5),
+    data.TimeInterval(coordinates=[0.1, 0.3]),
+    data.Point(coordinates=[0.1, 1000]),
+    data.BoundingBox(coordinates=[0.1, 1000, 0.2, 3000.5]),
+    data.LineString(coordinates=[[0.1, 1000], [0.2, 3000]]),
+    data.MultiPoint(coordinates=[[0.1, 1000], [0.2, 3000]]),
+    data.Polygon(
+        coordinates=[
+            [[0, 0], [1, 0], [1, 1000]],
+            [[0.2, 200], [0.3, 200], [0.3, 300]],
+        ]
+    ),
+    data.MultiLineString(
+        coordinates=[
+            [[0.1, 1000], [0.2, 3000]],
+            [[0.4, 1000], [0.5, 3000], [0.6, 2000]],
+        ]
+    ),
+    data.MultiPolygon(
+        coordinates=[
+            [[[0, 0], [1, 0], [1, 1000]]],
+            [
+                [[2, 0], [3, 0], [3, 1000]],
+                [[2.2, 200], [2.3, 200], [2.3, 300]],
+            ],
+        ]
+    ),
+]
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES)
+def test_encoded_geometries_round_trip(geometry: data.Geometry):
+    value = encode_geometry(geometry)
+
+    assert decode_geometry(value) == geometry
+    assert unpack_geometry(value) == (geometry.type, geometry.coordinates)
+
+
+def test_many_geometric_features_match_soundevent():
+    computed = compute_many_geometric_features(GEOMETRIES)
+
+    features: dict[int, dict[str, float]] = {}
+    for name, (indices, values) in computed.items():
+        for index, value in zip(
+            indices.tolist(), values.tolist(), strict=True
+        ):
+            features.setdefault(index, {})[name] = value
+
+    assert [features[index] for index in range(len(GEOMETRIES))] == [
+        {f.name: f.value for f in compute_geometric_features(geometry)}
+        for geometry in GEOMETRIES
+    ]
@@ -0,0 +1,48 @@
+"""Test suite for the scatter plot projections and downsampling."""
+
+import numpy as np
+
+from whombat.core.scatterplots import density_downsample, pca
+
+
+def test_pca_projects_onto_the_direction_of_most_variance():
+    rng = np.random.default_rng(0)
+    t = rng.normal(size=500)
+    matrix = np.c_[t, 2 * t, rng.normal(scale=0.01, size=500)]
+
+    projected, explained = pca(matrix, n_components=2)
+
+    assert projected.shape == (500, 2)
+    assert projected.dtype == np.float32
+    assert explained[0] > 0.6
+    assert abs(np.corrcoef(projected[:, 0], t)[0, 1]) > 0.99
+
+
+def test_pca_replaces_missing_values_with_the_mean():
+    matrix = np.array([[1.0, 2.0], [3.0, np.nan], [5.0, 6.0]])
+    projected, _ = pca(matrix, n_components=3)
+    assert projected.shape == (3, 3)
+    assert not np.isnan(projected).any()
+    assert (projected[:, 2] == 0).all()
+
+
+def test_density_downsample_keeps_sparse_points():
+    rng = np.random.default_rng(0)
+    dense = rng.normal(scale=0.01, size=(10_000, 2))
+    sparse = np.array([[5.0, 5.0], [-5.0, 5.0], [5.0, -5.0]])
+    points = np.r_[dense, sparse]
+
+    index, weights = density_downsample(points, max_points=500)
+
+    assert len(index) <= 500
+    assert (np.diff(index) > 0).all()
+    assert set(range(10_000, 10_003)) <= set(index.tolist())
+    assert weights[-3:].tolist() == [1, 1, 1]
+    assert weights.sum() == len(points)
+
+
+def test_density_downsample_is_deterministic():
+    points = np.random.default_rng(0).random((1000, 3))
+    first, _ = density_downsample(points, max_points=100)
+    second, _ = density_downsample(points, max_points=100)
+    assert first.tolist() == second.tolist()
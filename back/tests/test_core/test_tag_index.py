@@ -0,0 +1,50 @@
+"""Test suite for the in-memory tag index."""
+
+from whombat.core.tag_index import IndexedTag, TagIndex
+
+
+def test_search_matches_key_value_and_words():
+    index = TagIndex()
+    index.load(
+        [
+            IndexedTag(1, "species", "Myotis daubentonii"),
+            IndexedTag(2, "species", "Pipistrellus pipistrellus"),
+            IndexedTag(3, "call_type", "feeding buzz"),
+        ]
+    )
+
+    assert [tag.id for tag in index.search("myo")] == [1]
+    assert [tag.id for tag in index.search("DAUB")] == [1]
+    assert [tag.id for tag in index.search("species")] == [1, 2]
+    assert [tag.id for tag in index.search("call_type:fee")] == [3]
+    assert index.search("zz") == []
+
+
+def test_search_ranks_and_limits_results():
+    index = TagIndex()
+    index.load(
+        [
+            IndexedTag(1, "species", "Myotis myotis"),
+            IndexedTag(2, "species", "Myotis nattereri"),
+            IndexedTag(3, "species", "Myotis"),
+        ]
+    )
+    usage = {2: 10, 1: 3}
+
+    ranked = index.search("myotis", rank=lambda tag: usage.get(tag.id, 0))
+    assert [tag.id for tag in ranked] == [2, 1, 3]
+    assert [tag.id for tag in index.search("myotis", limit=1)] == [3]
+
+
+def test_add_and_remove_keep_index_sorted():
+    index = TagIndex()
+    index.load([IndexedTag(1, "species", "Myotis myotis")])
+
+    index.add(IndexedTag(2, "species", "Eptesicus serotinus"))
+    index.add(IndexedTag(1, "species", "Nyctalus noctula"))
+    index.remove(2)
+
+    assert index.search("myo") == []
+    assert index.search("ept") == []
+    assert [tag.id for tag in index.search("noc")] == [1]
+    assert len(index) == 1
@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from whombat import models
+from whombat.system import database
+from whombat.system.settings import Settings
 
 
 def check_all_tables_exist(session: Session):
@@ -22,3 +24,35 @@ def check_all_tables_exist(session: Session):
 async def test_can_create_all_models(session: AsyncSession):
     """Test that all models can be created."""
     await session.run_sync(check_all_tables_exist)
+
+
+async def test_sqlite_pragmas_are_applied_on_connect(settings: Settings):
+    """Test that the SQLite tuning profile is set on new connections."""
+    settings = settings.model_copy(
+        update=dict(sqlite_busy_timeout=1234, sqlite_cache_size=-2000)
+    )
+    engine = database.create_async_db_engine(
+        database.get_database_url(settings),
+        sqlite_pragmas=database.get_sqlite_pragmas(settings),
+    )
+
+    async with engine.connect() as conn:
+        journal_mode = await conn.exec_driver_sql("PRAGMA journal_mode")
+        assert journal_mode.scalar() == "wal"
+
+        synchronous = await conn.exec_driver_sql("PRAGMA synchronous")
+        assert synchronous.scalar() == 1
+
+        busy_timeout = await conn.exec_driver_sql("PRAGMA busy_timeout")
+        assert busy_timeout.scalar() == 1234
+
+        cache_size = await conn.exec_driver_sql("PRAGMA cache_size")
+        assert cache_size.scalar() == -2000
+
+        temp_store = await conn.exec_driver_sql("PRAGMA temp_store")
+        assert temp_store.scalar() == 2
+
+        foreign_keys = await conn.exec_driver_sql("PRAGMA foreign_keys")
+        assert foreign_keys.scalar() == 1
+
+    await engine.dispose()
@@ -1,10 +1,18 @@
 """Test suite for migrations and database creation."""
 
+import datetime
 from pathlib import Path
+from uuid import uuid4
 
 import pytest
+from alembic import command
+from soundevent import data
+from sqlalchemy import select, text
 from sqlalchemy.engine import URL
 
+from whombat import models
+from whombat.core.geometry import decode_geometry
+from whombat.models.search import search_match
 from whombat.system import database
 from whombat.system.settings import Settings
 
@@ -66,3 +74,147 @@ def test_can_create_database(
 
     # Check that the database file exists
     assert db_path.exists()
+
+
+def test_migration_fills_sound_event_bounds(db_url: URL):
+    """Test that existing sound events get their bounds on migration."""
+    cfg = database.create_alembic_config(db_url, is_async=False)
+    command.upgrade(cfg, "6e3be968a4d5")
+
+    engine = database.create_sync_db_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO recording (id, uuid, hash, path, duration, "
+                "samplerate, channels, time_expansion, created_on) VALUES "
+                "(1, :uuid, 'hash', 'rec.wav', 10, 44100, 1, 1, :now)"
+            ),
+            {"uuid": uuid4().hex, "now": datetime.datetime.now()},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO sound_event (id, uuid, recording_id, "
+                "geometry_type, geometry, created_on) VALUES "
+                "(:id, :uuid, 1, :type, :geometry, :now)"
+            ),
+            [
+                {
+                    "id": 1,
+                    "uuid": uuid4().hex,
+                    "type": "BoundingBox",
+                    "geometry": data.BoundingBox(
+                        coordinates=[1, 1000, 2, 3000]
+                    ).model_dump_json(),
+                    "now": datetime.datetime.now(),
+                },
+                {
+                    "id": 2,
+                    "uuid": uuid4().hex,
+                    "type": "TimeInterval",
+                    "geometry": data.TimeInterval(
+                        coordinates=[3, 4]
+                    ).model_dump_json(),
+                    "now": datetime.datetime.now(),
+                },
+            ],
+        )
+
+    command.upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT start_time, end_time, low_freq, high_freq "
+                "FROM sound_event ORDER BY id"
+            )
+        ).all()
+
+    assert [tuple(row) for row in rows] == [
+        (1, 2, 1000, 3000),
+        (3, 4, None, None),
+    ]
+
+
+def test_migration_encodes_sound_event_geometries(db_url: URL):
+    """Test that existing geometries are converted to and from binary."""
+    cfg = database.create_alembic_config(db_url, is_async=False)
+    command.upgrade(cfg, "3c41f0d2a8e7")
+
+    geometry = data.Polygon(coordinates=[[[1, 1000], [2, 3000], [1.5, 500]]])
+    engine = database.create_sync_db_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO recording (id, uuid, hash, path, duration, "
+                "samplerate, channels, time_expansion, created_on) VALUES "
+                "(1, :uuid, 'hash', 'rec.wav', 10, 44100, 1, 1, :now)"
+            ),
+            {"uuid": uuid4().hex, "now": datetime.datetime.now()},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO sound_event (id, uuid, recording_id, "
+                "geometry_type, geometry, start_time, end_time, low_freq, "
+                "high_freq, created_on) VALUES "
+                "(1, :uuid, 1, 'Polygon', :geometry, 1, 2, 500, 3000, :now)"
+            ),
+            {
+                "uuid": uuid4().hex,
+                "geometry": geometry.model_dump_json(),
+                "now": datetime.datetime.now(),
+            },
+        )
+
+    command.upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        (value,) = conn.execute(text("SELECT geometry FROM sound_event")).one()
+
+    assert decode_geometry(value) == geometry
+
+    command.downgrade(cfg, "3c41f0d2a8e7")
+
+    with engine.connect() as conn:
+        (value,) = conn.execute(text("SELECT geometry FROM sound_event")).one()
+
+    assert data.geometry_validate(value, mode="json") == geometry
+
+
+def test_migration_indexes_existing_rows_for_search(db_url: URL):
+    """Test that rows added before the search indices can be found."""
+    cfg = database.create_alembic_config(db_url, is_async=False)
+    command.upgrade(cfg, "5f2d7a9c1e36")
+
+    engine = database.create_sync_db_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                'INSERT INTO tag (id, "key", value, created_on) VALUES '
+                "(1, 'species', 'Myotis myotis', :now)"
+            ),
+            {"now": datetime.datetime.now()},
+        )
+
+    command.upgrade(cfg, "head")
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                'INSERT INTO tag (id, "key", value, created_on) VALUES '
+                "(2, 'species', 'Myotis daubentonii', :now)"
+            ),
+            {"now": datetime.datetime.now()},
+        )
+        query = select(models.Tag.id).where(
+            search_match([models.Tag.value], "myotis")
+        )
+        assert conn.execute(query).scalars().all() == [1, 2]
+
+    command.downgrade(cfg, "5f2d7a9c1e36")
+
+    with engine.connect() as conn:
+        tables = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE name = 'tag_search'")
+        ).all()
+
+    assert tables == []
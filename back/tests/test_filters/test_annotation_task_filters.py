@@ -0,0 +1,78 @@
+"""Test suite for annotation task filters."""
+
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+from whombat.filters import annotation_tasks as annotation_task_filters
+
+
+async def test_combined_filters_do_not_duplicate_tasks(
+    session: AsyncSession,
+    annotation_task: schemas.AnnotationTask,
+    recording: schemas.Recording,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    tag_factory: Callable[[str, str], Awaitable[schemas.Tag]],
+):
+    """Test that combined filters sharing tables match each task once."""
+    # Arrange
+    for value in ["a", "b"]:
+        recording = await api.recordings.add_tag(
+            session,
+            recording,
+            await tag_factory("species", value),
+        )
+        sound_event_annotation = await api.sound_event_annotations.add_tag(
+            session,
+            sound_event_annotation,
+            await tag_factory("call", value),
+        )
+
+    # Act
+    tasks, count = await api.annotation_tasks.get_many(
+        session,
+        filters=[
+            annotation_task_filters.AnnotationTaskFilter(
+                search_recordings="wav",
+                recording_tag__key="species",
+                sound_event_annotation_tag__key="call",
+            )
+        ],
+    )
+
+    # Assert
+    assert count == 1
+    assert [task.uuid for task in tasks] == [annotation_task.uuid]
+
+
+async def test_sound_event_annotation_tag_filter_uses_task_annotation(
+    session: AsyncSession,
+    annotation_task: schemas.AnnotationTask,
+    clip: schemas.Clip,
+    sound_event: schemas.SoundEvent,
+    tag: schemas.Tag,
+):
+    """Test that tags of other annotations of the clip are ignored."""
+    # Arrange
+    other_annotation = await api.clip_annotations.create(session, clip=clip)
+    annotation = await api.sound_event_annotations.create(
+        session,
+        clip_annotation=other_annotation,
+        sound_event=sound_event,
+    )
+    await api.sound_event_annotations.add_tag(session, annotation, tag)
+
+    # Act
+    tasks, _ = await api.annotation_tasks.get_many(
+        session,
+        filters=[
+            annotation_task_filters.SoundEventAnnotationTagFilter(
+                key=tag.key,
+                value=tag.value,
+            )
+        ],
+    )
+
+    # Assert
+    assert tasks == []
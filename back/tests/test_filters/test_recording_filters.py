@@ -325,6 +325,32 @@ async def test_tag_filter(
     assert results[0].hash == recording_list[0].hash
 
 
+async def test_tag_filter_counts_recordings_once(
+    session: AsyncSession,
+    create_test_recording,
+    tag_factory,
+):
+    """Test that recordings with several matching tags are counted once."""
+    # Arrange
+    recording = await create_test_recording()
+    for value in ["a", "b", "c"]:
+        recording = await api.recordings.add_tag(
+            session,
+            recording,
+            await tag_factory("species", value),
+        )
+
+    # Act
+    results, count = await api.recordings.get_many(
+        session,
+        filters=[recording_filters.TagFilter(key="species")],
+    )
+
+    # Assert
+    assert count == 1
+    assert [result.hash for result in results] == [recording.hash]
+
+
 async def test_issues_filter(
     session: AsyncSession,
     create_test_recording,
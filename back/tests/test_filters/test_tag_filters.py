@@ -1,10 +1,15 @@
 """Test suite for tag filters."""
 
+import sqlite3
+
 import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from whombat import api
+from whombat import api, models
 from whombat.filters import tags as tag_filters
+from whombat.models.search import search_match
 
 
 @pytest.fixture(autouse=True)
@@ -86,3 +91,60 @@ async def test_filter_by_search(session: AsyncSession):
     # Assert.
     assert len(tags) == 10
     assert all("a" in tag.key or "a" in tag.value for tag in tags)
+
+
+async def test_search_uses_index_and_ranks_by_relevance(
+    session: AsyncSession,
+):
+    """Test that search results are sorted by how closely they match."""
+    # Arrange
+    await api.tags.create_many(
+        session,
+        [
+            dict(key="species", value="Big MYOTIS"),
+            dict(key="species", value="Myotis myotis"),
+            dict(key="genus", value="Myotis"),
+        ],
+    )
+
+    # Act
+    tags, count = await api.tags.get_many(
+        session, filters=[tag_filters.SearchFilter(search="myotis")]
+    )
+
+    # Assert.
+    assert count == 3
+    assert [tag.value for tag in tags] == [
+        "Myotis",
+        "Myotis myotis",
+        "Big MYOTIS",
+    ]
+
+
+async def test_has_filter_matches_substrings_with_index(
+    session: AsyncSession,
+):
+    """Test that has filters on indexed columns match any substring."""
+    # Act
+    tags, _ = await api.tags.get_many(
+        session, filters=[tag_filters.ValueFilter(has="BC1")]
+    )
+
+    # Assert.
+    assert [tag.value for tag in tags] == ["bc1"]
+
+
+def test_search_falls_back_to_ilike_without_trigram_tokenizer(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that old SQLite versions do not use the FTS5 index."""
+    query = select(models.Tag.id).where(
+        search_match([models.Tag.value], "myotis")
+    )
+    assert "MATCH" in str(query.compile(dialect=sqlite.dialect()))
+
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 31, 1))
+
+    compiled = str(query.compile(dialect=sqlite.dialect()))
+    assert "MATCH" not in compiled
+    assert "LIKE" in compiled
@@ -1,8 +1,10 @@
 """Test the Auth endpoints."""
 
 from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from whombat import schemas
+from whombat import api, models, schemas
 
 
 async def test_admin_can_login(client: TestClient, user: schemas.User):
@@ -31,3 +33,42 @@ async def test_can_get_active_user(
 
     assert response.status_code == 200, response.text
     assert schemas.SimpleUser.model_validate(response.json()) == user
+
+
+async def test_cached_token_authenticates_without_database(
+    client: TestClient,
+    session: AsyncSession,
+    cookies: dict[str, str],
+):
+    """Test that validated tokens are remembered until logout."""
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 200, response.text
+
+    await session.execute(delete(models.AccessToken))
+    await session.commit()
+
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 200, response.text
+
+    response = client.post("/api/v1/auth/logout", cookies=cookies)
+    assert response.status_code == 204, response.text
+
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 401
+
+
+async def test_deactivated_user_loses_access(
+    client: TestClient,
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    cookies: dict[str, str],
+):
+    """Test that updating a user invalidates their cached tokens."""
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 200, response.text
+
+    await api.users.update(session, user, schemas.UserUpdate(is_active=False))
+    await session.commit()
+
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 401
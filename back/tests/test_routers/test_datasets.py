@@ -0,0 +1,146 @@
+"""Test suite for the Datasets endpoints."""
+
+import json
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from whombat import schemas
+from whombat.api.jobs import JobWorker
+from whombat.system.settings import Settings
+
+
+async def test_stream_dataset_file_state(
+    client: TestClient,
+    dataset: schemas.Dataset,
+    dataset_recording: schemas.Recording,
+    audio_dir: Path,
+    cookies: dict[str, str],
+):
+    (audio_dir / dataset.audio_dir / "unregistered.wav").touch()
+
+    response = client.get(
+        "/api/v1/datasets/detail/state/stream/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    states = {
+        (item["path"], item["state"])
+        for item in map(json.loads, response.text.splitlines())
+    }
+    assert states == {
+        ("test_audio.wav", "registered"),
+        ("unregistered.wav", "unregistered"),
+    }
+
+
+async def test_create_dataset_registers_files_in_a_job(
+    client: TestClient,
+    settings: Settings,
+    audio_dir: Path,
+    random_wav_factory: Callable[..., Path],
+    cookies: dict[str, str],
+):
+    dataset_dir = audio_dir / "new_dataset"
+    dataset_dir.mkdir()
+    random_wav_factory(path=dataset_dir / "audio_file_1.wav")
+    random_wav_factory(path=dataset_dir / "audio_file_2.wav")
+
+    response = client.post(
+        "/api/v1/datasets/",
+        json={"name": "new_dataset", "audio_dir": str(dataset_dir)},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    dataset_uuid = response.json()["uuid"]
+
+    response = client.get(
+        "/api/v1/datasets/detail/registration/",
+        params={"dataset_uuid": dataset_uuid},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    job = response.json()
+    assert job["kind"] == "register_dataset_files"
+    assert job["status"] == "pending"
+
+    # Only one registration is submitted at a time for each dataset.
+    response = client.post(
+        "/api/v1/datasets/detail/registration/",
+        params={"dataset_uuid": dataset_uuid},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["uuid"] == job["uuid"]
+
+    worker = JobWorker(settings)
+    try:
+        await worker.run_next()
+    finally:
+        await worker.close()
+
+    response = client.get(
+        "/api/v1/datasets/detail/registration/",
+        params={"dataset_uuid": dataset_uuid},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "completed"
+    assert job["result"]["recording_count"] == 2
+    assert job["details"]["processed_files"] == 2
+    assert job["details"]["files_per_second"] > 0
+    assert job["details"]["bytes_per_second"] > 0
+    assert job["details"]["eta"] == 0
+
+    response = client.get(
+        "/api/v1/datasets/detail/",
+        params={"dataset_uuid": dataset_uuid},
+        cookies=cookies,
+    )
+    assert response.json()["recording_count"] == 2
+
+
+async def test_download_dataset_as_parquet(
+    client: TestClient,
+    dataset: schemas.Dataset,
+    dataset_recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    response = client.get(
+        "/api/v1/datasets/detail/download/table/",
+        params={"dataset_uuid": str(dataset.uuid), "format": "parquet"},
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(pa.BufferReader(response.content))
+    assert table.column("uuid").to_pylist() == [str(dataset_recording.uuid)]
+
+
+async def test_download_dataset_table_without_pyarrow(
+    client: TestClient,
+    dataset: schemas.Dataset,
+    cookies: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    response = client.get(
+        "/api/v1/datasets/detail/download/table/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+
+    assert response.status_code == 501
+    assert "pyarrow" in response.json()["message"]
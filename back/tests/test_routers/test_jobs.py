@@ -0,0 +1,127 @@
+"""Test suite for the Jobs endpoints."""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from whombat import schemas
+from whombat.api.jobs import JobWorker
+from whombat.system.settings import Settings
+
+
+async def test_submit_export_job_and_download_its_result(
+    client: TestClient,
+    settings: Settings,
+    dataset: schemas.Dataset,
+    dataset_recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    response = client.post(
+        "/api/v1/datasets/detail/download/job/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    job = response.json()
+    assert job["kind"] == "export_dataset"
+    assert job["status"] == "pending"
+
+    worker = JobWorker(settings)
+    try:
+        await worker.run_next()
+    finally:
+        await worker.close()
+
+    response = client.get(
+        "/api/v1/jobs/detail/",
+        params={"job_uuid": job["uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["progress"] == 1
+
+    response = client.get(
+        "/api/v1/jobs/detail/download/",
+        params={"job_uuid": job["uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    exported = json.loads(response.content)
+    assert exported["data"]["uuid"] == str(dataset.uuid)
+    assert len(exported["data"]["recordings"]) == 1
+
+
+async def test_submit_create_dataset_job(
+    client: TestClient,
+    settings: Settings,
+    audio_dir: Path,
+    random_wav_factory: Callable[..., Path],
+    cookies: dict[str, str],
+):
+    dataset_dir = audio_dir / "new_dataset"
+    dataset_dir.mkdir()
+    random_wav_factory(path=dataset_dir / "audio_file_1.wav")
+    random_wav_factory(path=dataset_dir / "audio_file_2.wav")
+
+    response = client.post(
+        "/api/v1/datasets/job/",
+        json={"name": "new_dataset", "audio_dir": str(dataset_dir)},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    job_uuid = response.json()["uuid"]
+
+    worker = JobWorker(settings)
+    try:
+        await worker.run_next()
+    finally:
+        await worker.close()
+
+    response = client.get(
+        "/api/v1/jobs/",
+        params={"status__eq": "completed"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert page["total"] == 1
+    assert page["items"][0]["uuid"] == job_uuid
+
+    response = client.get(
+        "/api/v1/datasets/detail/",
+        params={"dataset_uuid": page["items"][0]["result"]["dataset_uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["recording_count"] == 2
+
+
+async def test_cancel_pending_job(
+    client: TestClient,
+    dataset: schemas.Dataset,
+    cookies: dict[str, str],
+):
+    response = client.post(
+        "/api/v1/datasets/detail/download/job/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+    job_uuid = response.json()["uuid"]
+
+    response = client.post(
+        "/api/v1/jobs/detail/cancel/",
+        params={"job_uuid": job_uuid},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+
+    response = client.get(
+        "/api/v1/jobs/detail/download/",
+        params={"job_uuid": job_uuid},
+        cookies=cookies,
+    )
+    assert response.status_code == 404
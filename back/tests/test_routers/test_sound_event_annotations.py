@@ -1,7 +1,13 @@
 """Test the Sound Event Annotation endpoints."""
 
+import io
+import sys
+
+import numpy as np
+import pytest
 from fastapi.testclient import TestClient
 from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import schemas
 
@@ -24,3 +30,61 @@ async def test_can_create_a_sound_event_annotation(
     )
 
     assert response.status_code == 200
+
+
+async def test_scatter_plot_points_need_two_or_three_axes(
+    client: TestClient,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/sound_event_annotations/scatter_plot/points/",
+        params={"features": ["ac:mediaDuration"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 422
+
+    response = client.get(
+        "/api/v1/sound_event_annotations/scatter_plot/points/",
+        params={"projection": "pca", "group_by": "species"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+    assert response.json()["coordinates"]["shape"] == [0, 2]
+
+
+async def test_download_feature_matrix_as_npz(
+    client: TestClient,
+    cookies: dict[str, str],
+    session: AsyncSession,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+):
+    await session.commit()
+    response = client.get(
+        "/api/v1/sound_event_annotations/features/matrix/",
+        params={"features": ["missing"], "format": "npz"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+
+    with np.load(io.BytesIO(response.content)) as npz:
+        assert npz["uuids"].tolist() == [str(sound_event_annotation.uuid)]
+        assert npz["feature_names"].tolist() == ["missing"]
+        assert npz["values"].shape == (1, 1)
+
+
+async def test_download_feature_matrix_as_arrow_without_pyarrow(
+    client: TestClient,
+    cookies: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    response = client.get(
+        "/api/v1/sound_event_annotations/features/matrix/",
+        params={"format": "arrow"},
+        cookies=cookies,
+    )
+
+    assert response.status_code == 501
+    assert "pyarrow" in response.json()["message"]
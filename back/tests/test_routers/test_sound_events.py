@@ -0,0 +1,51 @@
+"""Test the Sound Event endpoints."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import schemas
+
+
+async def test_get_viewport(
+    session: AsyncSession,
+    client: TestClient,
+    cookies: dict[str, str],
+    recording: schemas.Recording,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    sound_event_prediction: schemas.SoundEventPrediction,
+):
+    await session.commit()
+
+    response = client.get(
+        "/api/v1/sound_events/viewport/",
+        params={
+            "recording_uuid": str(recording.uuid),
+            "start_time": 0.5,
+            "end_time": 2,
+            "high_freq": 0.5,
+        },
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    viewport = schemas.Viewport.model_validate(response.json())
+    assert [a.uuid for a in viewport.annotations] == [
+        sound_event_annotation.uuid
+    ]
+    assert [p.uuid for p in viewport.predictions] == [
+        sound_event_prediction.uuid
+    ]
+    assert viewport.annotations[0].geometry_type == "Polygon"
+
+    response = client.get(
+        "/api/v1/sound_events/viewport/",
+        params={
+            "recording_uuid": str(recording.uuid),
+            "start_time": 1.5,
+            "end_time": 2,
+        },
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"annotations": [], "predictions": []}
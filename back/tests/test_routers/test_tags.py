@@ -1,8 +1,9 @@
 """Test suite for the Tags endpoints."""
 
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from whombat import schemas
+from whombat import api, schemas
 
 
 async def test_create_tag_returns_existing_tag_if_duplicate(
@@ -29,3 +30,39 @@ async def test_create_tag_returns_existing_tag_if_duplicate(
         cookies=cookies,
     )
     assert response.status_code == 200
+
+
+async def test_autocomplete_ranks_tags_by_usage_in_project(
+    client: TestClient,
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    annotation_task: schemas.AnnotationTask,
+    clip_annotation: schemas.ClipAnnotation,
+    cookies: dict[str, str],
+):
+    rare = await api.tags.create(
+        session, key="species", value="Myotis alcathoe"
+    )
+    common = await api.tags.create(
+        session, key="species", value="Myotis myotis"
+    )
+    await api.tags.create(session, key="species", value="Pipistrellus")
+    await api.clip_annotations.add_tag(session, clip_annotation, common)
+    await session.commit()
+
+    response = client.get(
+        "/api/v1/tags/autocomplete/",
+        params={
+            "q": "myo",
+            "annotation_project_uuid": str(annotation_project.uuid),
+        },
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200, response.text
+    assert [
+        (item["tag"]["value"], item["count"]) for item in response.json()
+    ] == [
+        (common.value, 1),
+        (rare.value, 0),
+    ]
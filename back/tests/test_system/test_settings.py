@@ -0,0 +1,18 @@
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+from whombat.system.settings import Settings
+
+
+def test_hash_strategy_without_package_is_rejected(
+    test_settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setitem(sys.modules, "xxhash", None)
+
+    with pytest.raises(ValidationError, match="xxhash"):
+        Settings.model_validate(
+            {**test_settings.model_dump(), "hash_strategy": "xxh3"}
+        )
@@ -0,0 +1,46 @@
+import pytest
+
+from whombat.system import workers
+from whombat.system.settings import Settings
+
+
+async def test_worker_pool_map_preserves_order_across_chunks():
+    pool = workers.WorkerPool(max_workers=2, chunksize=2)
+    try:
+        results = await pool.map(abs, [-1, -2, 3, -4, 5])
+    finally:
+        pool.shutdown()
+
+    assert results == [1, 2, 3, 4, 5]
+
+
+async def test_worker_pool_map_with_no_items():
+    pool = workers.WorkerPool(max_workers=1)
+    try:
+        assert await pool.map(abs, []) == []
+    finally:
+        pool.shutdown()
+
+
+def test_worker_pool_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        workers.WorkerPool(max_workers=0)
+
+    with pytest.raises(ValueError):
+        workers.WorkerPool(chunksize=0)
+
+
+def test_start_worker_pool_is_configured_from_settings(
+    test_settings: Settings,
+):
+    settings = test_settings.model_copy(
+        update=dict(worker_processes=3, worker_chunksize=7)
+    )
+
+    pool = workers.start_worker_pool(settings)
+    try:
+        assert workers.get_worker_pool() is pool
+        assert pool.max_workers == 3
+        assert pool.chunksize == 7
+    finally:
+        workers.shutdown_worker_pool()